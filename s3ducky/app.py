@@ -1,204 +1,1314 @@
-# MIT License
-# 
-# Copyright (c) 2025 S3Ducky
-
-"""
-Main application controller for S3Ducky.
-"""
-
-from tkinter import messagebox
-from botocore.exceptions import ClientError, NoCredentialsError
-
-from .gui.main_window import MainWindow
-from .gui.credentials_page import CredentialsPage
-from .gui.file_browser import FileBrowser
-from .core.s3_client import S3Client
-from .core.file_manager import FileManager
-
-
-class S3DuckyApp:
-    """
-    Main application controller that manages the overall application flow.
-    """
-    
-    def __init__(self):
-        # Initialize main window
-        self.main_window = MainWindow("S3Ducky", "800x600")
-        
-        # Initialize core components
-        self.s3_client = S3Client()
-        self.file_manager = FileManager(self.s3_client)
-        
-        # Current state
-        self.files_list = []
-        self.current_page = None
-        
-        # Bind Enter key to connect action
-        self.main_window.bind_key('<Return>', self._on_enter_key)
-        
-        # Show credentials page initially
-        self.show_credentials_page()
-    
-    def _on_enter_key(self, event):
-        """Handle Enter key press."""
-        # If on credentials page and credentials page has focus, attempt to connect
-        if isinstance(self.current_page, CredentialsPage):
-            self._connect_to_s3(self.current_page.get_credentials())
-    
-    def show_credentials_page(self):
-        """Display the credentials input page."""
-        self.current_page = self.main_window.show_page(
-            CredentialsPage, 
-            connect_callback=self._connect_to_s3
-        )
-    
-    def show_file_browser_page(self):
-        """Display the file browser page."""
-        if not self.s3_client.is_connected():
-            messagebox.showerror("Error", "Not connected to S3")
-            self.show_credentials_page()
-            return
-        
-        self.current_page = self.main_window.show_page(
-            FileBrowser,
-            bucket_name=self.s3_client.bucket_name,
-            files_list=self.files_list,
-            back_callback=self.show_credentials_page,
-            refresh_callback=self._refresh_files,
-            download_callback=self._download_files
-        )
-    
-    def _connect_to_s3(self, credentials):
-        """
-        Connect to S3 using provided credentials.
-        
-        Args:
-            credentials (dict): Dictionary containing AWS credentials and connection details
-        """
-        # Validate inputs
-        required_fields = ['access_key', 'secret_key', 'region', 'bucket_name']
-        if not all([credentials.get(field) for field in required_fields]):
-            messagebox.showerror("Error", "Please fill in all required fields (Access Key, Secret Key, Region, Bucket Name)")
-            return
-        
-        # Update UI to show connecting state
-        if isinstance(self.current_page, CredentialsPage):
-            self.current_page.set_connect_button_state(False, 'Connecting...')
-            self.current_page.set_status("Connecting to AWS S3...", "orange")
-        
-        # Force UI update
-        self.main_window.get_root().update()
-        
-        try:
-            # Attempt connection
-            self.s3_client.connect(
-                access_key=credentials['access_key'],
-                secret_key=credentials['secret_key'],
-                region=credentials['region'],
-                bucket_name=credentials['bucket_name'],
-                resource_prefix=credentials.get('resource_prefix')
-            )
-            
-            # Load files list
-            self._load_files_list()
-            
-            # Connection successful - show file browser
-            self.show_file_browser_page()
-            
-        except NoCredentialsError:
-            messagebox.showerror("Error", "Invalid AWS credentials")
-            self._reset_credentials_page()
-        except ClientError as e:
-            error_code = e.response['Error']['Code']
-            if error_code == 'NoSuchBucket':
-                messagebox.showerror("Error", f"Bucket '{credentials['bucket_name']}' does not exist")
-            elif error_code == 'AccessDenied':
-                messagebox.showerror("Error", "Access denied. Check your credentials and permissions")
-            else:
-                messagebox.showerror("Error", f"AWS Error: {e.response['Error']['Message']}")
-            self._reset_credentials_page()
-        except Exception as e:
-            messagebox.showerror("Error", f"Connection failed: {str(e)}")
-            self._reset_credentials_page()
-    
-    def _reset_credentials_page(self):
-        """Reset the credentials page to normal state after connection failure."""
-        if isinstance(self.current_page, CredentialsPage):
-            self.current_page.set_connect_button_state(True, 'Connect')
-            self.current_page.set_status("Connection failed. Please check your credentials.", "red")
-    
-    def _load_files_list(self):
-        """Load files list from S3 bucket."""
-        try:
-            self.files_list = self.s3_client.list_objects()
-        except Exception as e:
-            raise Exception(f"Failed to load files: {str(e)}")
-    
-    def _refresh_files(self):
-        """Refresh the files list from S3 bucket."""
-        try:
-            # Show loading status
-            if isinstance(self.current_page, FileBrowser):
-                self.current_page.set_status("Refreshing files...", "orange")
-            
-            # Reload files from S3
-            self._load_files_list()
-            
-            # Update the file browser display
-            if isinstance(self.current_page, FileBrowser):
-                self.current_page.update_files_list(self.files_list)
-                self.current_page.set_status(f"Refreshed! Found {len(self.files_list)} files", "green")
-            
-        except Exception as e:
-            error_msg = f"Refresh failed: {str(e)}"
-            if isinstance(self.current_page, FileBrowser):
-                self.current_page.set_status(error_msg, "red")
-            messagebox.showerror("Error", error_msg)
-    
-    def _download_files(self, file_keys, destination, as_zip=False):
-        """
-        Download files asynchronously.
-        
-        Args:
-            file_keys (list): List of S3 object keys to download
-            destination (str): Destination folder path or zip file path
-            as_zip (bool): Whether to create a zip archive
-        """
-        def progress_callback(message):
-            """Update progress in the main thread."""
-            self.main_window.get_root().after(0, lambda: self._update_download_status(message, "orange"))
-        
-        def completion_callback():
-            """Handle download completion in the main thread."""
-            self.main_window.get_root().after(0, lambda: self._update_download_status("Download completed successfully!", "green"))
-            self.main_window.get_root().after(0, lambda: messagebox.showinfo("Success", "Download completed successfully!"))
-        
-        def error_callback(error_message):
-            """Handle download error in the main thread."""
-            error_msg = f"Download failed: {error_message}"
-            self.main_window.get_root().after(0, lambda: self._update_download_status(error_msg, "red"))
-            self.main_window.get_root().after(0, lambda: messagebox.showerror("Error", error_msg))
-        
-        # Start async download
-        self.file_manager.download_files_async(
-            file_keys=file_keys,
-            destination=destination,
-            as_zip=as_zip,
-            progress_callback=progress_callback,
-            completion_callback=completion_callback,
-            error_callback=error_callback
-        )
-    
-    def _update_download_status(self, message, color):
-        """Update download status on the current page."""
-        if isinstance(self.current_page, FileBrowser):
-            self.current_page.set_status(message, color)
-    
-    def run(self):
-        """Start the application."""
-        self.main_window.run()
-
-
-if __name__ == "__main__":
-    app = S3DuckyApp()
-    app.run()
+# MIT License
+# 
+# Copyright (c) 2025 S3Ducky
+
+"""
+Main application controller for S3Ducky.
+"""
+
+import bisect
+import functools
+import itertools
+import threading
+from tkinter import messagebox
+from botocore.exceptions import ClientError, NoCredentialsError
+
+from .gui.main_window import MainWindow
+from .gui.credentials_page import CredentialsPage
+from .gui.file_browser import FileBrowser
+from .gui.rollup_view import RollupView
+from .gui.bandwidth_dialog import BandwidthDialog
+from .gui.query_panel import QueryPanel
+from .core.s3_client import S3Client, endpoint_options
+from .core.local_storage import LocalBackend, LOCAL_SCHEME
+from .core.memory_storage import MemoryBackend, MEMORY_SCHEME
+from .core.file_manager import FileManager
+from .core.thumbnails import ThumbnailGenerator
+from .core.object_metadata import MetadataFetcher, may_need_restore, needs_restore, ARCHIVE_ACCESS_TIERS
+from .core.object_cache import ObjectCache
+from .core.uploads import Uploader
+from .core.workspace import ClientCache, Workspace, WorkspaceTab, credentials_location
+from .core.listing_store import ListingStore
+from .core.prefetch import Prefetcher, PrefetchCache
+from .core.prefix_download import normalize_prefix
+from .core.bandwidth import BandwidthLimiter, active_schedule_rule
+from .core.auto_refresh import RefreshPoller, POLL_FULL
+from .core.s3_select import is_queryable, DEFAULT_EXPRESSION, MAX_PREVIEW_ROWS
+from .utils.formatters import format_file_size
+from .utils.settings import load_settings, update_settings, SETTINGS_PATH
+
+
+def _prefetch_key(credentials):
+    """
+    Key of the prefetched connection matching a set of connection details.
+    
+    Only the fields that change the connection count, as the form fills
+    them in: the prefix is normalised so "logs" finds the connection
+    prefetched for "logs/", blank fields and default options are left
+    out, and a local folder or synthetic bucket keys on its name alone.
+    
+    Args:
+        credentials (dict): Connection details from the form or a tab
+        
+    Returns:
+        tuple: Hashable key for PrefetchCache
+    """
+    def text(name):
+        return (credentials.get(name) or '').strip()
+        
+    key = {'bucket_name': text('bucket_name'),
+           'resource_prefix': normalize_prefix(credentials.get('resource_prefix'))}
+    if not key['bucket_name'].startswith((LOCAL_SCHEME, MEMORY_SCHEME)):
+        for name in ('access_key', 'secret_key', 'region', 'endpoint_url', 'inventory_manifest'):
+            if text(name):
+                key[name] = text(name)
+        if text('addressing_style') not in ('', 'auto'):
+            key['addressing_style'] = text('addressing_style')
+        for name in ('accelerate', 'dualstack'):
+            if credentials.get(name):
+                key[name] = True
+        if key.get('inventory_manifest') and credentials.get('inventory_top_up'):
+            key['inventory_top_up'] = True
+    return tuple(sorted(key.items()))
+
+
+class S3DuckyApp:
+    """
+    Main application controller that manages the overall application flow.
+    """
+    
+    def __init__(self):
+        # Initialize main window
+        self.main_window = MainWindow("S3Ducky", "800x600")
+        
+        # Load user settings
+        self.settings = load_settings()
+        
+        # Initialize core components shared by all workspace tabs
+        self.client_cache = ClientCache()
+        self.object_cache = self._create_object_cache()
+        self.thumbnail_generator = ThumbnailGenerator(None)
+        self.metadata_fetcher = MetadataFetcher(None)
+        self.bandwidth_limiter = BandwidthLimiter.from_settings(self.settings, SETTINGS_PATH)
+        
+        # Low-priority warming of sibling prefixes and thumbnails (None when disabled)
+        self.prefetch_cache = PrefetchCache()
+        self.prefetcher = None
+        if self.settings['prefetch_enabled']:
+            self.prefetcher = Prefetcher(self.settings['prefetch_request_budget'], is_busy=self._is_busy)
+        
+        # Current state
+        self.workspace = Workspace()
+        self.last_credentials = None
+        self.current_page = None
+        self.rollup_view = None
+        self.rollup_view_tab = None
+        
+        # Running downloads and uploads; auto-refresh waits while there are any
+        self.active_transfers = 0
+        self._auto_refresh_job = None
+        
+        # Bind Enter key to connect action
+        self.main_window.bind_key('<Return>', self._on_enter_key)
+        
+        # Show credentials page initially
+        self.show_credentials_page()
+    
+    def _create_object_cache(self):
+        """Create the local object cache if it is enabled in settings."""
+        if not self.settings['download_cache_enabled']:
+            return None
+        try:
+            return ObjectCache(
+                self.settings['download_cache_dir'],
+                self.settings['download_cache_max_mb'] * 1024 * 1024,
+                link_mode=self.settings['download_cache_link_mode']
+            )
+        except Exception as e:
+            print(f"Failed to open download cache: {e}")
+            return None
+    
+    def _create_file_manager(self, s3_client):
+        """Create the file manager of a new tab, with upload options from settings."""
+        uploader = Uploader(
+            s3_client,
+            part_size=self.settings['upload_part_size_mb'] * 1024 * 1024,
+            concurrency=self.settings['upload_concurrency'],
+            multipart_threshold=self.settings['upload_multipart_threshold_mb'] * 1024 * 1024
+        )
+        return FileManager(s3_client, self.object_cache, uploader, verify=self.settings['verify_downloads'],
+                           download_concurrency=self.settings['download_concurrency'],
+                           copy_concurrency=self.settings['copy_concurrency'],
+                           copy_part_size=self.settings['copy_part_mb'] * 1024 * 1024,
+                           delete_concurrency=self.settings['delete_concurrency'])
+    
+    def _new_listing(self, entries=()):
+        """
+        Create a listing store that spills to disk past the memory budget in settings.
+        
+        Args:
+            entries (list, optional): Entries to start with
+            
+        Returns:
+            ListingStore: The new listing
+        """
+        files_list = ListingStore(self.settings['listing_memory_budget_mb'] * 1024 * 1024,
+                                  self.settings['listing_spill_dir'])
+        files_list.extend(entries)
+        return files_list
+    
+    def _set_download_cache_enabled(self, enabled):
+        """
+        Turn the local object cache on or off and remember the choice.
+        
+        Args:
+            enabled (bool): Whether downloads should use the cache
+        """
+        self.settings['download_cache_enabled'] = enabled
+        update_settings({'download_cache_enabled': enabled})
+        self.object_cache = self._create_object_cache()
+        for tab in self.workspace.tabs:
+            tab.file_manager.object_cache = self.object_cache
+            
+    def _on_enter_key(self, event):
+        """Handle Enter key press."""
+        # If on credentials page and credentials page has focus, attempt to connect
+        if isinstance(self.current_page, CredentialsPage):
+            self._connect_to_s3(self.current_page.get_credentials())
+    
+    def show_credentials_page(self):
+        """Display the credentials input page."""
+        self._save_browser_state()
+        self.current_page = self.main_window.show_page(
+            CredentialsPage, 
+            connect_callback=self._connect_to_s3,
+            # Endpoint options start from settings until a connection succeeds
+            initial_credentials=self.last_credentials or endpoint_options(self.settings),
+            cancel_callback=self.show_file_browser_page if self.workspace.tabs else None
+        )
+    
+    def show_file_browser_page(self):
+        """Display the file browser page for the active workspace tab."""
+        tab = self.workspace.active_tab
+        if tab is None or not tab.s3_client.is_connected():
+            messagebox.showerror("Error", "Not connected to S3")
+            self.show_credentials_page()
+            return
+        
+        # Thumbnails and details requested from now on belong to this tab's bucket
+        self.thumbnail_generator.s3_client = tab.s3_client
+        self.metadata_fetcher.s3_client = tab.s3_client
+        
+        self.current_page = self.main_window.show_page(
+            FileBrowser,
+            bucket_name=tab.s3_client.bucket_name,
+            files_list=tab.files_list,
+            back_callback=self.show_credentials_page,
+            refresh_callback=self._refresh_files,
+            download_callback=self._download_files,
+            thumbnail_generator=self.thumbnail_generator,
+            cache_enabled=self.object_cache is not None,
+            cache_toggle_callback=self._set_download_cache_enabled,
+            tab_titles=[t.title for t in self.workspace.tabs],
+            active_tab_index=self.workspace.active_index,
+            tab_switch_callback=self._switch_tab,
+            tab_close_callback=self._close_tab,
+            selection=tab.selection,
+            loading=tab.loading,
+            rollup_callback=self._show_rollup,
+            upload_callback=self._upload_files,
+            upload_prefix=tab.s3_client.resource_prefix or '',
+            bandwidth_callback=self._show_bandwidth_dialog,
+            query_callback=self._show_query_panel,
+            ui_pump=self.main_window.get_pump(),
+            auto_refresh_enabled=self.settings['auto_refresh_enabled'],
+            auto_refresh_callback=self._set_auto_refresh_enabled,
+            export_callback=self._export_listing,
+            prefetcher=self.prefetcher,
+            metadata_fetcher=self.metadata_fetcher if self.settings['object_details_enabled'] else None,
+            prefix_download_callback=self._download_prefix,
+            copy_callback=self._copy_objects,
+            delete_callback=self._delete_objects
+        )
+        self._schedule_auto_refresh()
+    
+    def _show_rollup(self):
+        """Open the folder size window for the active tab."""
+        tab = self.workspace.active_tab
+        if self.rollup_view is not None:
+            if self.rollup_view_tab is tab:
+                self.rollup_view.window.lift()
+                return
+            self.rollup_view.close()
+        
+        self.rollup_view_tab = tab
+        self.rollup_view = RollupView(
+            self.main_window.get_root(),
+            tab.get_rollup(),
+            title=f"Folder Sizes - {tab.title}",
+            close_callback=self._on_rollup_closed
+        )
+    
+    def _on_rollup_closed(self):
+        """Forget the folder size window once it is closed."""
+        self.rollup_view = None
+        self.rollup_view_tab = None
+    
+    def _update_rollup_view(self, tab):
+        """Redraw the folder size window if it shows this tab."""
+        if self.rollup_view is None or self.rollup_view_tab is not tab:
+            return
+        if self.rollup_view.rollup is not tab.rollup:
+            self.rollup_view.rollup = tab.get_rollup()
+        self.rollup_view.schedule_refresh()
+    
+    def _show_query_panel(self, key):
+        """
+        Open an S3 Select query window for one object of the active tab.
+        
+        Args:
+            key (str): S3 key of the object to query
+        """
+        if not is_queryable(key):
+            messagebox.showwarning("Warning", "Only CSV, TSV, JSON and Parquet files can be queried")
+            return
+        
+        file_manager = self.workspace.active_tab.file_manager
+        pump = self.main_window.get_pump()
+        running = {'stop': threading.Event()}
+        
+        def run_query(expression, save_path=None):
+            self._cancel_prefetch()
+            stop = running['stop'] = threading.Event()
+            
+            def show_rows(rows):
+                """Add rows in the main thread, unless the query was stopped meanwhile."""
+                if not stop.is_set():
+                    panel.add_rows(rows)
+            
+            def show_outcome(message, color):
+                if not stop.is_set():
+                    panel.finish(message, color)
+            
+            def rows_callback(rows):
+                pump.post_merged(('query rows', stop), show_rows, rows)
+            
+            def completion_callback(row_count, stats, truncated):
+                """Report the outcome in the main thread."""
+                if save_path:
+                    message = f"Saved {row_count:,} rows to {save_path}"
+                else:
+                    message = f"{row_count:,} rows"
+                    if truncated:
+                        message += f" (preview stops at {MAX_PREVIEW_ROWS:,}; save to get all)"
+                if stats:
+                    message += (f" - scanned {format_file_size(stats['scanned'])}, "
+                                f"returned {format_file_size(stats['returned'])}")
+                pump.post(show_outcome, message, "green")
+            
+            def error_callback(error_message):
+                """Report a failed query in the main thread."""
+                pump.post(show_outcome, f"Query failed: {error_message}", "red")
+            
+            file_manager.query_async(
+                key, expression,
+                save_path=save_path,
+                rows_callback=None if save_path else rows_callback,
+                completion_callback=completion_callback,
+                error_callback=error_callback,
+                should_stop=stop.is_set
+            )
+        
+        def stop_query():
+            running['stop'].set()
+            if panel.window.winfo_exists():
+                panel.finish("Query stopped", "blue")
+        
+        panel = QueryPanel(
+            self.main_window.get_root(), key, DEFAULT_EXPRESSION,
+            run_callback=run_query,
+            save_callback=run_query,
+            stop_callback=stop_query
+        )
+    
+    def _show_bandwidth_dialog(self):
+        """Open the bandwidth limit dialog."""
+        limiter = self.bandwidth_limiter
+        rule = active_schedule_rule(limiter.schedule)
+        schedule_note = None
+        if rule:
+            limits = limiter.effective_limits()
+            schedule_note = (f"Schedule {rule['start']}-{rule['end']} in force: "
+                             f"{limits['download']} KiB/s down, {limits['upload']} KiB/s up")
+        BandwidthDialog(
+            self.main_window.get_root(),
+            limiter.base['download'],
+            limiter.base['upload'],
+            schedule_note=schedule_note,
+            apply_callback=self._set_bandwidth_limits
+        )
+    
+    def _set_bandwidth_limits(self, download_kbps, upload_kbps):
+        """
+        Change the bandwidth limits of all transfers and remember them.
+        
+        Args:
+            download_kbps (int): Download limit in KiB/s (0 = unlimited)
+            upload_kbps (int): Upload limit in KiB/s (0 = unlimited)
+        """
+        self.bandwidth_limiter.set_limits(download_kbps, upload_kbps)
+        self.settings['download_limit_kbps'] = download_kbps
+        self.settings['upload_limit_kbps'] = upload_kbps
+        update_settings({'download_limit_kbps': download_kbps, 'upload_limit_kbps': upload_kbps})
+        self._update_download_status(
+            f"Bandwidth limits: {download_kbps or 'unlimited'} KiB/s down, "
+            f"{upload_kbps or 'unlimited'} KiB/s up", "blue")
+    
+    def _save_browser_state(self):
+        """Remember the selection of the tab being left."""
+        tab = self.workspace.active_tab
+        if tab and isinstance(self.current_page, FileBrowser):
+            tab.selection = self.current_page.selection.copy()
+    
+    def _switch_tab(self, index):
+        """
+        Show another open tab. Its listing is kept in memory, so no request is made.
+        
+        Args:
+            index (int): Tab index
+        """
+        if index == self.workspace.active_index:
+            return
+        self._save_browser_state()
+        tab = self.workspace.switch_to(index)
+        self.show_file_browser_page()
+        if not tab.loading:
+            self._prefetch_siblings(tab)
+    
+    def _close_tab(self, index):
+        """
+        Close a workspace tab.
+        
+        Args:
+            index (int): Tab index
+        """
+        self._save_browser_state()
+        if self.rollup_view is not None and self.rollup_view_tab is self.workspace.tabs[index]:
+            self.rollup_view.close()
+        if self.workspace.close_tab(index) is None:
+            self.current_page = None
+            self.show_credentials_page()
+        else:
+            self.show_file_browser_page()
+            
+    def _connect_to_s3(self, credentials):
+        """
+        Connect to S3 using provided credentials.
+        
+        Args:
+            credentials (dict): Dictionary containing AWS credentials and connection details
+        """
+        # Validate inputs (local folders and synthetic buckets need no credentials)
+        required_fields = ['access_key', 'secret_key', 'region', 'bucket_name']
+        if credentials.get('bucket_name', '').startswith((LOCAL_SCHEME, MEMORY_SCHEME)):
+            required_fields = ['bucket_name']
+        if not all([credentials.get(field) for field in required_fields]):
+            messagebox.showerror("Error", "Please fill in all required fields (Access Key, Secret Key, Region, Bucket Name)")
+            return
+        
+        # Update UI to show connecting state
+        if isinstance(self.current_page, CredentialsPage):
+            self.current_page.set_connect_button_state(False, 'Connecting...')
+            self.current_page.set_status("Connecting to AWS S3...", "orange")
+        
+        # Already open in a tab - just switch to it
+        existing = self.workspace.find_tab(credentials_location(credentials), credentials.get('resource_prefix'))
+        if existing is not None:
+            self.workspace.switch_to(existing)
+            self.show_file_browser_page()
+            return
+        
+        # Force UI update
+        self.main_window.get_root().update()
+        self._cancel_prefetch()
+        
+        try:
+            # Attempt connection (reusing a prefetched connection or a cached client)
+            s3_client = self.prefetch_cache.take(_prefetch_key(credentials))
+            if s3_client is None:
+                s3_client = self._create_backend(credentials)
+            
+            if s3_client.inventory is None:
+                # The connection test already fetched the first page - show it right away
+                files_list, continuation_token = s3_client.take_first_page()
+            else:
+                # The inventory replaces LIST; it is read in the background from the start
+                files_list, continuation_token = [], None
+                
+            # Connection successful - open a tab and show file browser
+            self.last_credentials = dict(credentials)
+            tab = WorkspaceTab(s3_client, self._create_file_manager(s3_client),
+                               self._new_listing(files_list), credentials=dict(credentials))
+            self.workspace.add_tab(tab)
+            if continuation_token or s3_client.inventory is not None:
+                self._continue_listing(tab, continuation_token)
+            self.show_file_browser_page()
+            if not tab.loading:
+                self._prefetch_siblings(tab)
+            
+        except NoCredentialsError:
+            messagebox.showerror("Error", "Invalid AWS credentials")
+            self._reset_credentials_page()
+        except ClientError as e:
+            error_code = e.response['Error']['Code']
+            if error_code == 'NoSuchBucket':
+                messagebox.showerror("Error", f"Bucket '{credentials['bucket_name']}' does not exist")
+            elif error_code == 'AccessDenied':
+                messagebox.showerror("Error", "Access denied. Check your credentials and permissions")
+            else:
+                messagebox.showerror("Error", f"AWS Error: {e.response['Error']['Message']}")
+            self._reset_credentials_page()
+        except Exception as e:
+            messagebox.showerror("Error", f"Connection failed: {str(e)}")
+            self._reset_credentials_page()
+    
+    def _create_backend(self, credentials):
+        """
+        Create and connect the storage backend named by the bucket field.
+        
+        "file:///path" opens a local folder and "memory://N" a synthetic
+        bucket of N objects (for benchmarks); anything else is an S3 bucket.
+        
+        Args:
+            credentials (dict): Connection details from the credentials page
+            
+        Returns:
+            StorageBackend: Connected backend
+        """
+        options = dict(
+            limiter=self.bandwidth_limiter,
+            ranged_threshold=self.settings['ranged_download_threshold_mb'] * 1024 * 1024,
+            ranged_part_size=self.settings['ranged_download_part_mb'] * 1024 * 1024,
+            ranged_concurrency=self.settings['ranged_download_concurrency']
+        )
+        bucket_name = credentials['bucket_name'].strip()
+        
+        if bucket_name.startswith(LOCAL_SCHEME):
+            backend = LocalBackend(**options)
+            backend.connect(bucket_name, credentials.get('resource_prefix'))
+        elif bucket_name.startswith(MEMORY_SCHEME):
+            backend = MemoryBackend(**options)
+            backend.connect(bucket_name, credentials.get('resource_prefix'))
+            backend.populate(int(bucket_name[len(MEMORY_SCHEME):] or 0), size=1024)
+        else:
+            backend = S3Client(**options)
+            backend.connect(
+                access_key=credentials['access_key'],
+                secret_key=credentials['secret_key'],
+                region=credentials['region'],
+                bucket_name=bucket_name,
+                resource_prefix=credentials.get('resource_prefix'),
+                client_cache=self.client_cache,
+                inventory_manifest=credentials.get('inventory_manifest'),
+                inventory_top_up=credentials.get('inventory_top_up', False),
+                endpoint_url=credentials.get('endpoint_url'),
+                addressing_style=credentials.get('addressing_style', 'auto'),
+                accelerate=credentials.get('accelerate', False),
+                dualstack=credentials.get('dualstack', False)
+            )
+        return backend
+    
+    def _is_busy(self):
+        """Whether user-started work is using the connection (prefetching waits meanwhile)."""
+        return (self.active_transfers > 0
+                or any(tab.loading for tab in list(self.workspace.tabs))
+                or self.thumbnail_generator.has_pending())
+    
+    def _cancel_prefetch(self):
+        """Drop queued prefetch requests because the user needs the connection."""
+        if self.prefetcher is not None:
+            self.prefetcher.cancel()
+    
+    def _prefetch_siblings(self, tab):
+        """
+        Warm the connection and first listing page of the folders next to a tab's prefix.
+        
+        Opening one of them afterwards skips the LIST round trip. The tab's own
+        subfolders need nothing: they are already part of its listing.
+        
+        Args:
+            tab (WorkspaceTab): Tab that finished loading
+        """
+        prefix = tab.s3_client.resource_prefix
+        if (self.prefetcher is None or not prefix or tab.credentials is None
+                or not isinstance(tab.s3_client, S3Client)):
+            return
+        folder = prefix if prefix.endswith('/') else prefix + '/'
+        parent = folder[:folder.rstrip('/').rfind('/') + 1]
+        
+        def warm(credentials):
+            key = _prefetch_key(credentials)
+            if key in self.prefetch_cache or self.workspace.find_tab(
+                    credentials_location(credentials), credentials['resource_prefix']) is not None:
+                return
+            self.prefetch_cache.put(key, self._create_backend(credentials))
+        
+        def find_siblings():
+            folders = tab.s3_client.list_folders(parent)
+            index = bisect.bisect_left(folders, folder)
+            after = [f for f in folders[index:] if f != folder]
+            before = folders[:index][::-1]
+            # Nearest siblings first, alternating after and before the open folder
+            nearest = [f for pair in itertools.zip_longest(after, before) for f in pair if f]
+            # A sibling gets a plain LIST connection, without the tab's inventory report
+            jobs = [(sibling, functools.partial(warm, dict(tab.credentials, resource_prefix=sibling,
+                                                           inventory_manifest='', inventory_top_up=False)))
+                    for sibling in nearest]
+            self.prefetcher.add('listing', jobs)
+        
+        self.prefetcher.schedule('listing', [(parent, find_siblings)])
+    
+    def _reset_credentials_page(self):
+        """Reset the credentials page to normal state after connection failure."""
+        if isinstance(self.current_page, CredentialsPage):
+            self.current_page.set_connect_button_state(True, 'Connect')
+            self.current_page.set_status("Connection failed. Please check your credentials.", "red")
+    
+    def _continue_listing(self, tab, continuation_token):
+        """
+        Load the rest of a tab's listing in the background, page by page.
+        
+        Args:
+            tab (WorkspaceTab): Tab whose listing is being loaded
+            continuation_token (str or None): Token of the page after the first one
+                (None reads an inventory report from the start)
+        """
+        self._cancel_prefetch()
+        generation = tab.start_listing()
+        pump = self.main_window.get_pump()
+        files_list = tab.files_list
+        
+        def page_callback(entries):
+            """Store a page in the listing thread, then show all pages of one interval at once."""
+            if tab.listing_generation != generation:
+                return
+            # Pages are queued whole, so column pages stay columns
+            pump.post_merged(('listing', tab, generation),
+                             lambda pages: self._on_listing_page(tab, generation, pages),
+                             [tab.add_files(entries, files_list)])
+        
+        def sort_inventory():
+            """Sort an inventory listing, whose pages arrive in report order rather than key order."""
+            if tab.s3_client.inventory is not None and tab.listing_generation == generation:
+                files_list.sort_by_key()
+        
+        def completion_callback():
+            """Sort an inventory listing in the listing thread, then finish in the main thread."""
+            sort_inventory()
+            pump.post(self._on_listing_finished, tab, generation)
+        
+        def error_callback(error_message):
+            """Sort what was read in the listing thread, then report the error in the main thread."""
+            sort_inventory()
+            pump.post(self._on_listing_finished, tab, generation, error_message)
+        
+        tab.s3_client.list_objects_async(
+            continuation_token=continuation_token,
+            page_callback=page_callback,
+            completion_callback=completion_callback,
+            error_callback=error_callback,
+            should_stop=lambda: tab.listing_generation != generation
+        )
+    
+    def _on_listing_page(self, tab, generation, pages):
+        """Count stored listing pages into the folder sizes and show them if the tab is on screen."""
+        if tab.listing_generation != generation:
+            return
+        tab.add_to_rollup(pages)
+        self._update_rollup_view(tab)
+        if tab is self.workspace.active_tab and isinstance(self.current_page, FileBrowser):
+            self.current_page.show_appended_files()
+    
+    def _on_listing_finished(self, tab, generation, error_message=None):
+        """Handle the end of a background listing."""
+        if tab.listing_generation != generation:
+            return
+        tab.loading = False
+        
+        if tab is not self.workspace.active_tab or not isinstance(self.current_page, FileBrowser):
+            return
+        
+        self.current_page.set_loading(False)
+        if not error_message:
+            self._prefetch_siblings(tab)
+        if tab.s3_client.inventory is not None:
+            self.current_page.update_files_list(tab.files_list)
+        if error_message:
+            self.current_page.set_status(f"Listing incomplete: {error_message}", "red")
+        else:
+            self.current_page.set_status(f"Loaded {len(tab.files_list)} files", "green")
+    
+    def _refresh_files(self):
+        """
+        Reload the active tab's listing in the background and patch in the changes.
+        
+        Listing and diffing run in the listing thread; the Tk thread only
+        applies the resulting ListingDiff.
+        """
+        if isinstance(self.current_page, FileBrowser):
+            self.current_page.set_status("Refreshing files...", "orange")
+        
+        # Replace any listing still loading
+        self._cancel_prefetch()
+        tab = self.workspace.active_tab
+        tab.cancel_listing()
+        generation = tab.listing_generation
+        pump = self.main_window.get_pump()
+        files_list = self._new_listing()
+        
+        def completion_callback():
+            """Sort an inventory listing and diff it in the listing thread."""
+            if tab.listing_generation != generation:
+                return
+            if tab.s3_client.inventory is not None:
+                files_list.sort_by_key()
+            self._diff_refresh(tab, generation, files_list)
+        
+        tab.s3_client.list_objects_async(
+            page_callback=files_list.extend,
+            completion_callback=completion_callback,
+            error_callback=lambda error_message: pump.post(self._on_refresh_failed, tab, generation,
+                                                           error_message),
+            should_stop=lambda: tab.listing_generation != generation
+        )
+    
+    def _diff_refresh(self, tab, generation, files_list):
+        """Work out a refreshed listing's changes (off the Tk thread) and queue them for _on_refreshed."""
+        diff, base = tab.diff_refresh(files_list)
+        self.main_window.get_pump().post(self._on_refreshed, tab, generation, files_list, diff, base)
+    
+    def _on_refreshed(self, tab, generation, files_list, diff, base):
+        """Switch a tab to its refreshed listing, patching the file browser with just the changes."""
+        if tab.listing_generation != generation or tab not in self.workspace.tabs:
+            return
+        if diff is None or not tab.is_current(base):
+            # The listing changed while it was compared; compare again in the background
+            threading.Thread(target=self._diff_refresh, args=(tab, generation, files_list), daemon=True).start()
+            return
+        
+        diff = tab.refresh_files(files_list, diff)
+        self._update_rollup_view(tab)
+        if tab is self.workspace.active_tab and isinstance(self.current_page, FileBrowser):
+            self.current_page.set_loading(False)
+            self.current_page.apply_listing_diff(tab.files_list, diff)
+            self.current_page.set_status(
+                f"Refreshed: {diff.summary()} ({len(tab.files_list)} files)", "green")
+    
+    def _on_refresh_failed(self, tab, generation, error_message):
+        """Report a refresh that could not list the bucket."""
+        if tab.listing_generation != generation:
+            return
+        error_msg = f"Refresh failed: Failed to load files: {error_message}"
+        if tab is self.workspace.active_tab and isinstance(self.current_page, FileBrowser):
+            self.current_page.set_status(error_msg, "red")
+        self.main_window.get_root().after(0, messagebox.showerror, "Error", error_msg)
+    
+    def _download_files(self, file_keys, destination, as_zip=False):
+        """
+        Download files asynchronously, after dealing with archived objects.
+        
+        Selected Glacier, Deep Archive and Intelligent-Tiering objects get a
+        HEAD request first; those without a restored copy are skipped or
+        restored (the user decides) instead of failing the job halfway.
+        
+        Args:
+            file_keys (list): List of S3 object keys to download
+            destination (str): Destination folder path or zip file path
+            as_zip (bool): Whether to create a zip archive
+        """
+        tab = self.workspace.active_tab
+        candidates = [file_info for file_info in map(tab.find_file, file_keys)
+                      if file_info is not None and may_need_restore(file_info)]
+        if not candidates:
+            self._start_download(tab, file_keys, destination, as_zip)
+            return
+        
+        self._update_download_status(f"Checking {len(candidates)} archive-class objects...", "orange")
+        pump = self.main_window.get_pump()
+        self.metadata_fetcher.fetch_async(
+            candidates,
+            lambda heads: pump.post_dialog(self._confirm_archived_download, tab, file_keys, candidates, heads,
+                                           destination, as_zip),
+            s3_client=tab.s3_client
+        )
+    
+    def _confirm_archived_download(self, tab, file_keys, candidates, heads, destination, as_zip):
+        """Ask what to do with archived objects of a download, then start it."""
+        archived = [file_info for file_info in candidates if needs_restore(file_info, heads.get(file_info['key']))]
+        if not archived:
+            self._start_download(tab, file_keys, destination, as_zip)
+            return
+        
+        restoring = [file_info['key'] for file_info in archived
+                     if (heads.get(file_info['key']) or {}).get('restore')]
+        to_restore = [file_info['key'] for file_info in archived if file_info['key'] not in restoring]
+        message = (f"{len(archived)} of the {len(file_keys)} selected objects are archived "
+                   f"(Glacier, Deep Archive or an Intelligent-Tiering archive tier) and can't be "
+                   f"downloaded until they are restored")
+        if restoring:
+            message += f"; restores of {len(restoring)} of them are already in progress"
+        message += ".\n\n"
+        if to_restore:
+            message += (f"Yes: request restores of {len(to_restore)} objects ({self.settings['restore_tier']} "
+                        f"retrieval, kept {self.settings['restore_days']} days) and download the rest now\n")
+        message += "No: skip them and download the rest\nCancel: don't download anything"
+        
+        answer = messagebox.askyesnocancel("Archived Objects", message)
+        if answer is None:
+            self._update_download_status("Download cancelled", "blue")
+            return
+        if answer and to_restore:
+            tiering_keys = [key for key in to_restore
+                            if (heads.get(key) or {}).get('archive_status') in ARCHIVE_ACCESS_TIERS]
+            self._restore_objects(tab, to_restore, tiering_keys)
+        
+        skipped = {file_info['key'] for file_info in archived}
+        remaining = [key for key in file_keys if key not in skipped]
+        if remaining:
+            self._start_download(tab, remaining, destination, as_zip)
+        elif not answer:
+            self._update_download_status("Nothing to download: every selected object is archived", "red")
+    
+    def _restore_objects(self, tab, keys, tiering_keys=()):
+        """
+        Request restores of archived objects asynchronously.
+        
+        Args:
+            tab (WorkspaceTab): Tab the objects belong to
+            keys (list): Keys of archived objects
+            tiering_keys (list): Keys in an Intelligent-Tiering archive tier
+        """
+        pump = self.main_window.get_pump()
+        status_key = ('status', object())
+        
+        def progress_callback(message):
+            pump.post_latest(status_key, self._update_download_status, message, "orange")
+        
+        def completion_callback(started, in_progress, failed):
+            """Report the restore requests in the main thread."""
+            self.metadata_fetcher.invalidate(keys)
+            message = f"Restore requested for {len(started)} objects"
+            if in_progress:
+                message += f" ({len(in_progress)} already in progress)"
+            if failed:
+                message += f", {len(failed)} failed: {next(iter(failed.values()))}"
+            message += "; download them again once restored"
+            pump.post(self._end_transfer)
+            pump.post_latest(status_key, self._update_download_status, message, "red" if failed else "green")
+        
+        def error_callback(error_message):
+            pump.post(self._end_transfer)
+            pump.post_latest(status_key, self._update_download_status,
+                             f"Restore failed: {error_message}", "red")
+        
+        self._begin_transfer()
+        tab.file_manager.restore_objects_async(
+            keys,
+            days=self.settings['restore_days'],
+            tier=self.settings['restore_tier'],
+            tiering_keys=tiering_keys,
+            progress_callback=progress_callback,
+            completion_callback=completion_callback,
+            error_callback=error_callback
+        )
+    
+    def _start_download(self, tab, file_keys, destination, as_zip=False):
+        """
+        Start a download job of a tab.
+        
+        Args:
+            tab (WorkspaceTab): Tab the objects belong to
+            file_keys (list): List of S3 object keys to download
+            destination (str): Destination folder path or zip file path
+            as_zip (bool): Whether to create a zip archive
+        """
+        file_manager = tab.file_manager
+        pump = self.main_window.get_pump()
+        # Only the newest status of this job is shown per pump interval
+        status_key = ('status', object())
+        
+        def progress_callback(message):
+            """Update progress in the main thread."""
+            pump.post_latest(status_key, self._update_download_status, message, "orange")
+        
+        def completion_callback():
+            """Handle download completion in the main thread."""
+            message = "Download completed successfully!"
+            if file_manager.last_cache_stats:
+                message += f" {file_manager.last_cache_stats.summary()}"
+            if file_manager.last_verification:
+                message += f" {file_manager.last_verification.summary()}"
+            pump.post(self._end_transfer)
+            pump.post_latest(status_key, self._report_job_outcome, message, "green",
+                             lambda: messagebox.showinfo("Success", "Download completed successfully!"))
+        
+        def error_callback(error_message):
+            """Handle download error in the main thread."""
+            error_msg = f"Download failed: {error_message}"
+            if file_manager.last_report_path:
+                error_msg += f"\nVerification report: {file_manager.last_report_path}"
+            pump.post(self._end_transfer)
+            pump.post_latest(status_key, self._report_job_outcome, error_msg, "red",
+                             lambda: messagebox.showerror("Error", error_msg))
+        
+        # Start async download
+        # Listing sizes let the job be planned largest first
+        file_infos = [file_info for file_info in map(tab.find_file, file_keys) if file_info is not None]
+        
+        self._begin_transfer()
+        file_manager.download_files_async(
+            file_keys=file_keys,
+            destination=destination,
+            as_zip=as_zip,
+            progress_callback=progress_callback,
+            completion_callback=completion_callback,
+            error_callback=error_callback,
+            file_infos=file_infos
+        )
+    
+    def _download_prefix(self, prefix, dest_folder):
+        """
+        Download everything below a prefix of the active tab asynchronously.
+        
+        Downloads start with the first listing page rather than after the
+        whole listing, and keys keep their folder structure.
+        
+        Args:
+            prefix (str): Key prefix to download ('' for the whole listing)
+            dest_folder (str): Destination folder path
+        """
+        file_manager = self.workspace.active_tab.file_manager
+        pump = self.main_window.get_pump()
+        status_key = ('status', object())
+        
+        def progress_callback(message):
+            """Update progress in the main thread."""
+            pump.post_latest(status_key, self._update_download_status, message, "orange")
+        
+        def completion_callback(count, total_bytes, skipped):
+            """Handle download completion in the main thread."""
+            message = f"Downloaded {count} files ({format_file_size(total_bytes)}) to {dest_folder}"
+            if skipped:
+                message += f"; skipped {len(skipped)} archived objects (restore them first)"
+            if file_manager.last_cache_stats:
+                message += f" {file_manager.last_cache_stats.summary()}"
+            if file_manager.last_verification:
+                message += f" {file_manager.last_verification.summary()}"
+            pump.post(self._end_transfer)
+            pump.post_latest(status_key, self._report_job_outcome, message, "green",
+                             lambda: messagebox.showinfo("Success", message))
+        
+        def error_callback(error_message):
+            """Handle download error in the main thread."""
+            error_msg = f"Download failed: {error_message}"
+            if file_manager.last_report_path:
+                error_msg += f"\nVerification report: {file_manager.last_report_path}"
+            pump.post(self._end_transfer)
+            pump.post_latest(status_key, self._report_job_outcome, error_msg, "red",
+                             lambda: messagebox.showerror("Error", error_msg))
+        
+        self._update_download_status(f"Listing {prefix or 'the bucket root'}...", "orange")
+        self._begin_transfer()
+        file_manager.download_prefix_async(
+            prefix,
+            dest_folder,
+            progress_callback=progress_callback,
+            completion_callback=completion_callback,
+            error_callback=error_callback
+        )
+    
+    def _export_listing(self, path):
+        """
+        Export the active tab's listing to a file asynchronously.
+        
+        The listing is read again page by page rather than taken from the
+        tab, so the export is complete even while the tab is still loading.
+        
+        Args:
+            path (str): Output file path (.csv, .jsonl or .parquet)
+        """
+        pump = self.main_window.get_pump()
+        status_key = ('status', object())
+        
+        def progress_callback(message):
+            """Update progress in the main thread."""
+            pump.post_latest(status_key, self._update_download_status, message, "orange")
+        
+        def completion_callback(count):
+            """Handle export completion in the main thread."""
+            message = f"Exported {count:,} objects to {path}"
+            pump.post(self._end_transfer)
+            pump.post_latest(status_key, self._update_download_status, message, "green")
+        
+        def error_callback(error_message):
+            """Handle export error in the main thread."""
+            error_msg = f"Export failed: {error_message}"
+            pump.post(self._end_transfer)
+            pump.post_latest(status_key, self._report_job_outcome, error_msg, "red",
+                             lambda: messagebox.showerror("Error", error_msg))
+        
+        self._begin_transfer()
+        self.workspace.active_tab.file_manager.export_listing_async(
+            path,
+            progress_callback=progress_callback,
+            completion_callback=completion_callback,
+            error_callback=error_callback
+        )
+    
+    def _upload_files(self, paths, dest_prefix):
+        """
+        Upload files and folders to the active tab's bucket asynchronously.
+        
+        Args:
+            paths (list): Local file and folder paths
+            dest_prefix (str): Key prefix to upload under
+        """
+        tab = self.workspace.active_tab
+        location = tab.s3_client.location
+        pump = self.main_window.get_pump()
+        status_key = ('status', object())
+        
+        def progress_callback(message):
+            """Update progress in the main thread."""
+            pump.post_latest(status_key, self._update_download_status, message, "orange")
+        
+        def file_callback(file_info):
+            """Add uploaded objects to the listings in the main thread, in batches."""
+            pump.post_merged(('uploaded', location),
+                             lambda entries: self._on_files_uploaded(location, entries), [file_info])
+        
+        def completion_callback(uploaded):
+            """Handle upload completion in the main thread."""
+            message = f"Upload completed: {len(uploaded)} files"
+            pump.post(self._end_transfer)
+            pump.post_latest(status_key, self._update_download_status, message, "green")
+        
+        def error_callback(error_message):
+            """Handle upload error in the main thread."""
+            error_msg = f"Upload failed: {error_message}"
+            pump.post(self._end_transfer)
+            pump.post_latest(status_key, self._report_job_outcome, error_msg, "red",
+                             lambda: messagebox.showerror("Error", error_msg))
+        
+        self._begin_transfer()
+        tab.file_manager.upload_files_async(
+            paths=paths,
+            dest_prefix=dest_prefix,
+            progress_callback=progress_callback,
+            completion_callback=completion_callback,
+            error_callback=error_callback,
+            file_callback=file_callback
+        )
+    
+    def _copy_objects(self, file_keys, destination, move=False):
+        """
+        Copy or move objects of the active tab server-side, asynchronously.
+        
+        Args:
+            file_keys (list): S3 keys of the objects
+            destination (str): "bucket/prefix", or a bucket alone
+            move (bool): Delete each source once it is copied
+        """
+        tab = self.workspace.active_tab
+        source_bucket = tab.s3_client.bucket_name
+        source_location = tab.s3_client.location
+        file_infos = [file_info for file_info in map(tab.find_file, file_keys) if file_info is not None]
+        
+        # Local and in-memory bucket names contain slashes themselves
+        if destination == source_bucket or destination.startswith(source_bucket + '/'):
+            dest_bucket, dest_prefix = source_bucket, destination[len(source_bucket) + 1:]
+        else:
+            dest_bucket, _, dest_prefix = destination.partition('/')
+        
+        dest_factory = None
+        if dest_bucket != source_bucket:
+            if tab.credentials is None:
+                self._update_download_status("Copies to another bucket need the credentials of this tab", "red")
+                return
+            dest_factory = functools.partial(self._create_backend,
+                                             dict(tab.credentials, bucket_name=dest_bucket, resource_prefix=None))
+        
+        pump = self.main_window.get_pump()
+        status_key = ('status', object())
+        verb = "Move" if move else "Copy"
+        
+        def progress_callback(message):
+            """Update progress in the main thread."""
+            pump.post_latest(status_key, self._update_download_status, message, "orange")
+        
+        def file_callback(location, file_info):
+            """Add copies to the listings in the main thread, in batches."""
+            pump.post_merged(('uploaded', location),
+                             lambda entries: self._on_files_uploaded(location, entries), [file_info])
+        
+        def removed_callback(key):
+            """Drop moved objects from the listings in the main thread, in batches."""
+            pump.post_merged(('removed', source_location),
+                             lambda keys: self._on_files_removed(source_location, keys), [key])
+        
+        def completion_callback(result):
+            """Handle copy completion in the main thread."""
+            message = result.summary()
+            if result.archived:
+                message += " (restore archived objects before copying them)"
+            pump.post(self._end_transfer)
+            pump.post_latest(status_key, self._update_download_status, message, "green")
+        
+        def error_callback(error_message):
+            """Handle copy error in the main thread."""
+            error_msg = f"{verb} failed: {error_message}"
+            pump.post(self._end_transfer)
+            pump.post_latest(status_key, self._report_job_outcome, error_msg, "red",
+                             lambda: messagebox.showerror("Error", error_msg))
+        
+        self._update_download_status(f"{verb} of {len(file_infos)} objects to {destination} starting...", "orange")
+        self._begin_transfer()
+        tab.file_manager.copy_objects_async(
+            file_infos,
+            dest_prefix=dest_prefix,
+            move=move,
+            dest_factory=dest_factory,
+            progress_callback=progress_callback,
+            completion_callback=completion_callback,
+            error_callback=error_callback,
+            file_callback=file_callback,
+            removed_callback=removed_callback
+        )
+    
+    def _delete_objects(self, file_keys=None, prefix=None):
+        """
+        Delete objects of the active tab asynchronously, after a dry run the user confirms.
+        
+        The dry run counts the objects and their bytes (listing the prefix
+        if one is given); only then is anything deleted.
+        
+        Args:
+            file_keys (list, optional): S3 keys of the objects
+            prefix (str, optional): Key prefix to delete instead ('' for the whole listing)
+        """
+        tab = self.workspace.active_tab
+        bucket_name = tab.s3_client.bucket_name
+        location = tab.s3_client.location
+        file_infos = None
+        if prefix is None:
+            file_infos = [file_info for file_info in map(tab.find_file, file_keys) if file_info is not None]
+            target = f"{len(file_infos)} selected objects"
+        else:
+            target = f"everything under {prefix or 'the bucket root'}"
+        pump = self.main_window.get_pump()
+        status_key = ('status', object())
+        
+        def progress_callback(message):
+            """Update progress in the main thread."""
+            pump.post_latest(status_key, self._update_download_status, message, "orange")
+        
+        def removed_callback(keys):
+            """Drop deleted objects from the listings in the main thread, in batches."""
+            pump.post_merged(('removed', location),
+                             lambda removed: self._on_files_removed(location, removed), keys)
+        
+        def confirm(preview):
+            """Ask to go ahead with what the dry run found, in the main thread."""
+            if not preview.deleted:
+                self._update_download_status("Nothing to delete", "green")
+                return
+            self._update_download_status(preview.summary(), "orange")
+            if not messagebox.askyesno(
+                    "Delete", f"Delete {target} in {bucket_name}?\n\n{preview.summary()}. "
+                              f"This cannot be undone."):
+                self._update_download_status("Delete cancelled", "green")
+                return
+            self._begin_transfer()
+            tab.file_manager.delete_objects_async(
+                file_infos,
+                prefix=prefix,
+                progress_callback=progress_callback,
+                completion_callback=completion_callback,
+                error_callback=error_callback,
+                removed_callback=removed_callback
+            )
+        
+        def dry_run_callback(preview):
+            """Hand the dry run over to the main thread."""
+            pump.post(self._end_transfer)
+            pump.post_dialog(confirm, preview)
+        
+        def completion_callback(result):
+            """Handle delete completion in the main thread."""
+            message = result.summary()
+            pump.post(self._end_transfer)
+            if not result.failed:
+                pump.post_latest(status_key, self._update_download_status, message, "green")
+                return
+            failures = "\n".join(f"{key}: {error}" for key, error in itertools.islice(result.failed.items(), 10))
+            if len(result.failed) > 10:
+                failures += f"\n... and {len(result.failed) - 10} more"
+            pump.post_latest(status_key, self._report_job_outcome, message, "red",
+                             lambda: messagebox.showerror("Delete", f"{message}:\n\n{failures}"))
+        
+        def error_callback(error_message):
+            """Handle delete error in the main thread."""
+            error_msg = f"Delete failed: {error_message}"
+            pump.post(self._end_transfer)
+            pump.post_latest(status_key, self._report_job_outcome, error_msg, "red",
+                             lambda: messagebox.showerror("Error", error_msg))
+        
+        self._update_download_status(f"Counting {target}...", "orange")
+        self._begin_transfer()
+        tab.file_manager.delete_objects_async(
+            file_infos,
+            prefix=prefix,
+            dry_run=True,
+            progress_callback=progress_callback,
+            completion_callback=dry_run_callback,
+            error_callback=error_callback
+        )
+    
+    def _begin_transfer(self):
+        """Count a download or upload job as started; queued prefetching gives way to it."""
+        self._cancel_prefetch()
+        self.active_transfers += 1
+    
+    def _end_transfer(self):
+        """Count a download or upload job as finished."""
+        self.active_transfers -= 1
+    
+    def _set_auto_refresh_enabled(self, enabled):
+        """
+        Turn background polling on or off and remember the choice.
+        
+        Args:
+            enabled (bool): Whether the active tab should be polled
+        """
+        self.settings['auto_refresh_enabled'] = enabled
+        update_settings({'auto_refresh_enabled': enabled})
+        self._schedule_auto_refresh()
+    
+    def _schedule_auto_refresh(self):
+        """(Re)start the poll timer for the active tab, if auto-refresh is on."""
+        root = self.main_window.get_root()
+        if self._auto_refresh_job is not None:
+            root.after_cancel(self._auto_refresh_job)
+            self._auto_refresh_job = None
+        
+        tab = self.workspace.active_tab
+        if not self.settings['auto_refresh_enabled'] or tab is None:
+            return
+        if tab.poller is None:
+            tab.poller = RefreshPoller(
+                interval=self.settings['auto_refresh_interval_s'],
+                max_interval=self.settings['auto_refresh_max_interval_s'],
+                full_every=self.settings['auto_refresh_full_every'],
+                new_listing=self._new_listing
+            )
+        self._auto_refresh_job = root.after(int(tab.poller.delay * 1000), self._auto_refresh)
+    
+    def _auto_refresh(self):
+        """Poll the active tab for new and changed objects in the background."""
+        self._auto_refresh_job = None
+        tab = self.workspace.active_tab
+        if tab is None or not isinstance(self.current_page, FileBrowser):
+            return
+        
+        # Transfers keep the bandwidth, and a listing still loading is refreshed anyway
+        if self.active_transfers or tab.loading:
+            self._schedule_auto_refresh()
+            return
+        
+        pump = self.main_window.get_pump()
+        generation = tab.listing_generation
+        watermark = tab.files_list[-1]['key'] if tab.files_list else None
+        
+        def completion_callback(kind, entries):
+            """Diff a full re-list in the poll thread, so the Tk thread only applies the changes."""
+            refresh = tab.diff_refresh(entries) if kind == POLL_FULL else None
+            pump.post(self._on_auto_refresh, tab, generation, kind, entries, refresh)
+        
+        tab.poller.poll_async(
+            tab.s3_client, watermark,
+            completion_callback=completion_callback,
+            error_callback=lambda error_message: pump.post(self._schedule_auto_refresh)
+        )
+    
+    def _on_auto_refresh(self, tab, generation, kind, entries, refresh=None):
+        """Apply a poll result to its tab, highlight what changed and plan the next poll."""
+        # Drop results overtaken by a manual refresh, a closed tab, or (for a full
+        # re-list) a listing that changed after it was diffed; the next poll catches up
+        current = tab.listing_generation == generation and tab in self.workspace.tabs
+        if kind == POLL_FULL and current:
+            diff, base = refresh
+            current = diff is not None and tab.is_current(base)
+        if current:
+            showing = tab is self.workspace.active_tab and isinstance(self.current_page, FileBrowser)
+            if kind == POLL_FULL:
+                diff = tab.refresh_files(entries, diff)
+                changed_keys = [tab.files_list[index]['key'] for index in diff.inserted + diff.updated]
+                changed = not diff.is_empty()
+                if showing and changed:
+                    self.current_page.apply_listing_diff(tab.files_list, diff)
+                    self.current_page.set_status(f"Auto-refresh: {diff.summary()}", "green")
+            else:
+                inserted, updated = tab.upsert_files(entries)
+                changed_keys = [tab.files_list[index]['key'] for index in inserted] + updated
+                changed = bool(changed_keys)
+                if showing and changed:
+                    self.current_page.show_upserted_files(inserted, updated)
+                    self.current_page.set_status(f"Auto-refresh: {len(inserted)} new objects", "green")
+            if changed:
+                self._update_rollup_view(tab)
+                if showing:
+                    self.current_page.highlight_rows(changed_keys)
+            tab.poller.record(changed)
+        
+        if tab is self.workspace.active_tab:
+            self._schedule_auto_refresh()
+    
+    def _on_files_uploaded(self, location, entries):
+        """Merge a batch of uploaded or copied objects into every open tab of their bucket location."""
+        for tab in self.workspace.tabs:
+            if tab.s3_client.location != location:
+                continue
+            inserted, updated = tab.upsert_files(entries)
+            self._update_rollup_view(tab)
+            if tab is self.workspace.active_tab and isinstance(self.current_page, FileBrowser):
+                self.current_page.show_upserted_files(inserted, updated)
+    
+    def _on_files_removed(self, location, keys):
+        """Drop a batch of deleted or moved objects from every open tab of their bucket location."""
+        for tab in self.workspace.tabs:
+            if tab.s3_client.location != location:
+                continue
+            if not tab.remove_files(keys):
+                continue
+            self._update_rollup_view(tab)
+            if tab is self.workspace.active_tab and isinstance(self.current_page, FileBrowser):
+                self.current_page.show_removed_files(keys)
+    
+    def _update_download_status(self, message, color):
+        """Update download status on the current page."""
+        if isinstance(self.current_page, FileBrowser):
+            self.current_page.set_status(message, color)
+    
+    def _report_job_outcome(self, message, color, show_dialog):
+        """Show the final status of a transfer job, then its dialog (outside the pump's drain)."""
+        self._update_download_status(message, color)
+        self.main_window.get_root().after(0, show_dialog)
+    
+    def run(self):
+        """Start the application."""
+        self.main_window.run()
+
+
+if __name__ == "__main__":
+    app = S3DuckyApp()
+    app.run()
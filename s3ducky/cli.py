@@ -0,0 +1,219 @@
+# MIT License
+# 
+# Copyright (c) 2025 S3Ducky
+
+"""
+Command line interface for S3Ducky.
+
+Without a command the GUI starts. --profile [MODES] (or the S3DUCKY_PROFILE
+environment variable) writes a timing report for the session, see
+utils/profiling.py. Commands:
+
+    bandwidth   Show or change the transfer bandwidth limits; running
+                sessions pick up the change within a second
+    export      Stream the listing of a bucket (or prefix) to a CSV,
+                JSON Lines or Parquet file
+    delete      Delete everything below a prefix in DeleteObjects batches;
+                --dry-run only prints the count and bytes
+"""
+
+import os
+import argparse
+from .core.bandwidth import active_schedule_rule
+from .utils.settings import load_settings, update_settings
+from .utils.profiling import enable_profiling
+
+
+def _parse_schedule_rule(value):
+    """
+    Parse "HH:MM-HH:MM=DOWN/UP" (KiB/s; "-" keeps the base limit) into a schedule rule.
+    """
+    try:
+        window, _, limits = value.partition('=')
+        start, end = window.split('-')
+        download, _, upload = limits.partition('/')
+        rule = {'start': start.strip(), 'end': end.strip()}
+        if download.strip() not in ('', '-'):
+            rule['download_kbps'] = int(download)
+        if upload.strip() not in ('', '-'):
+            rule['upload_kbps'] = int(upload)
+        return rule
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"invalid schedule rule '{value}', expected e.g. 09:00-18:00=1024/256")
+
+
+def _format_limit(kbps):
+    return f"{kbps} KiB/s" if kbps else "unlimited"
+
+
+def _cmd_bandwidth(args):
+    """Show or change the bandwidth limits."""
+    changes = {}
+    if args.download is not None:
+        changes['download_limit_kbps'] = args.download
+    if args.upload is not None:
+        changes['upload_limit_kbps'] = args.upload
+    if args.clear_schedule:
+        changes['bandwidth_schedule'] = []
+    if args.schedule:
+        changes['bandwidth_schedule'] = args.schedule
+    if changes:
+        update_settings(changes)
+        
+    settings = load_settings()
+    print(f"Download limit: {_format_limit(settings['download_limit_kbps'])}")
+    print(f"Upload limit:   {_format_limit(settings['upload_limit_kbps'])}")
+    active = active_schedule_rule(settings['bandwidth_schedule'])
+    for rule in settings['bandwidth_schedule']:
+        marker = " (in force)" if rule is active else ""
+        print(f"Schedule {rule['start']}-{rule['end']}: "
+              f"down {_format_limit(rule.get('download_kbps', settings['download_limit_kbps']))}, "
+              f"up {_format_limit(rule.get('upload_kbps', settings['upload_limit_kbps']))}{marker}")
+    return 0
+
+
+def _connect(args, resource_prefix=None):
+    """
+    Connect to the bucket given on the command line.
+    
+    Returns:
+        S3Client or None: Connected client, or None (after printing why) without credentials
+    """
+    from .core.s3_client import S3Client, endpoint_options
+    
+    access_key = args.access_key or os.environ.get('AWS_ACCESS_KEY_ID')
+    secret_key = args.secret_key or os.environ.get('AWS_SECRET_ACCESS_KEY')
+    if not access_key or not secret_key:
+        print("Error: credentials are required (--access-key/--secret-key or "
+              "AWS_ACCESS_KEY_ID/AWS_SECRET_ACCESS_KEY)")
+        return None
+        
+    # Flags override the endpoint settings (so S3DUCKY_S3_ENDPOINT_URL works too)
+    endpoint = endpoint_options(load_settings())
+    for name in endpoint:
+        if getattr(args, name) is not None:
+            endpoint[name] = getattr(args, name)
+        
+    s3_client = S3Client()
+    s3_client.connect(access_key, secret_key, args.region, args.bucket, resource_prefix, **endpoint)
+    return s3_client
+
+
+def _print_progress(message):
+    print(message, end='\r', flush=True)
+
+
+def _cmd_export(args):
+    """Export the listing of a bucket to a file."""
+    from .core.export import export_listing
+    
+    try:
+        s3_client = _connect(args, args.prefix)
+        if s3_client is None:
+            return 1
+        count = export_listing(s3_client, args.output, export_format=args.format,
+                               progress_callback=_print_progress)
+    except Exception as e:
+        print(f"Error: export failed: {e}")
+        return 1
+    print(f"Exported {count:,} objects to {args.output}")
+    return 0
+
+
+def _cmd_delete(args):
+    """Delete everything below a prefix, or count it with --dry-run."""
+    from .core.bulk_delete import bulk_delete, prefix_entries
+    
+    if not args.prefix and not args.all:
+        print("Error: an empty prefix deletes the whole bucket; pass --all to confirm")
+        return 1
+        
+    try:
+        s3_client = _connect(args, args.prefix or None)
+        if s3_client is None:
+            return 1
+        result = bulk_delete(s3_client, prefix_entries(s3_client, args.prefix),
+                             concurrency=args.concurrency or load_settings()['delete_concurrency'],
+                             dry_run=args.dry_run, progress_callback=_print_progress)
+    except Exception as e:
+        print(f"\nError: delete failed: {e}")
+        return 1
+    print(result.summary())
+    for key, error in result.failed.items():
+        print(f"Failed: {key}: {error}")
+    return 1 if result.failed else 0
+
+
+def _add_connection_arguments(parser):
+    """Add the bucket, credential and endpoint options shared by the bucket commands."""
+    parser.add_argument('--bucket', required=True, help="bucket name")
+    parser.add_argument('--region', default='us-east-1', help="AWS region (default: us-east-1)")
+    parser.add_argument('--access-key', help="AWS access key ID (default: $AWS_ACCESS_KEY_ID)")
+    parser.add_argument('--secret-key', help="AWS secret access key (default: $AWS_SECRET_ACCESS_KEY)")
+    parser.add_argument('--endpoint-url', dest='endpoint_url',
+                        help="S3-compatible endpoint, e.g. http://localhost:9000 (default: AWS)")
+    parser.add_argument('--addressing-style', dest='addressing_style', choices=['auto', 'virtual', 'path'],
+                        help="bucket addressing style (default: auto)")
+    parser.add_argument('--accelerate', action='store_true', default=None,
+                        help="use the S3 Transfer Acceleration endpoint")
+    parser.add_argument('--dualstack', action='store_true', default=None,
+                        help="use the IPv4/IPv6 dual-stack endpoint")
+
+
+def build_parser():
+    """Create the argument parser."""
+    parser = argparse.ArgumentParser(prog='s3ducky', description="S3 bucket viewer and file manager")
+    parser.add_argument('--profile', nargs='?', const='1', metavar='MODES',
+                        help="profile list, render and transfer phases; MODES is a comma-separated "
+                             "list of cpu, memory or all (report in ~/.s3ducky/profiles/)")
+    subparsers = parser.add_subparsers(dest='command')
+    
+    bandwidth = subparsers.add_parser('bandwidth', help="show or change transfer bandwidth limits")
+    bandwidth.add_argument('--download', type=int, metavar='KIBPS', help="download limit (0 = unlimited)")
+    bandwidth.add_argument('--upload', type=int, metavar='KIBPS', help="upload limit (0 = unlimited)")
+    bandwidth.add_argument('--schedule', type=_parse_schedule_rule, action='append', metavar='RULE',
+                           help="time-of-day rule HH:MM-HH:MM=DOWN/UP replacing the schedule "
+                                "(repeatable; '-' keeps the base limit)")
+    bandwidth.add_argument('--clear-schedule', action='store_true', help="remove all schedule rules")
+    bandwidth.set_defaults(func=_cmd_bandwidth)
+    
+    export = subparsers.add_parser('export', help="export a bucket listing to CSV, JSON Lines or Parquet")
+    export.add_argument('output', help="output file (.csv, .jsonl or .parquet)")
+    _add_connection_arguments(export)
+    export.add_argument('--prefix', help="only export keys under this prefix")
+    export.add_argument('--format', choices=['csv', 'jsonl', 'parquet'],
+                        help="output format (default: from the file extension)")
+    export.set_defaults(func=_cmd_export)
+    
+    delete = subparsers.add_parser('delete', help="delete everything under a prefix in 1,000-key batches")
+    _add_connection_arguments(delete)
+    delete.add_argument('--prefix', default='', help="delete keys under this prefix")
+    delete.add_argument('--all', action='store_true', help="allow an empty prefix (the whole bucket)")
+    delete.add_argument('--dry-run', action='store_true', help="only print how many objects and bytes would go")
+    delete.add_argument('--concurrency', type=int, metavar='N',
+                        help="DeleteObjects requests in flight (default: delete_concurrency setting)")
+    delete.set_defaults(func=_cmd_delete)
+    
+    return parser
+
+
+def main(argv=None):
+    """
+    Run a command, or start the GUI when none is given.
+    
+    Args:
+        argv (list, optional): Arguments (defaults to sys.argv)
+        
+    Returns:
+        int: Exit status
+    """
+    args = build_parser().parse_args(argv)
+    if args.profile:
+        enable_profiling(args.profile)
+    if args.command is None:
+        from .app import S3DuckyApp
+        app = S3DuckyApp()
+        app.run()
+        return 0
+    return args.func(args)
@@ -1,12 +1,34 @@
-# MIT License
-# 
-# Copyright (c) 2025 S3Ducky
-
-"""
-S3Ducky Core Components
-"""
-
-from .s3_client import S3Client
-from .file_manager import FileManager
-
-__all__ = ['S3Client', 'FileManager']
+# MIT License
+# 
+# Copyright (c) 2025 S3Ducky
+
+"""
+S3Ducky Core Components
+"""
+
+from .storage import StorageBackend
+from .s3_client import S3Client
+from .local_storage import LocalBackend
+from .memory_storage import MemoryBackend
+from .file_manager import FileManager
+from .disk_cache import DiskCache
+from .thumbnails import ThumbnailGenerator
+from .object_metadata import MetadataFetcher
+from .object_cache import ObjectCache
+from .workspace import ClientCache, Workspace, WorkspaceTab
+from .rollups import PrefixRollup
+from .uploads import Uploader
+from .integrity import StreamVerifier, PartVerifier, VerificationReport
+from .bandwidth import BandwidthLimiter
+from .s3_select import SelectQuery
+from .export import export_listing
+from .listing_store import ListingStore, ColumnPage
+from .prefetch import Prefetcher, PrefetchCache
+from .download_planner import DownloadPlan
+from .bulk_delete import bulk_delete, DeleteResult
+
+__all__ = ['StorageBackend', 'S3Client', 'LocalBackend', 'MemoryBackend', 'FileManager', 'DiskCache', 'ThumbnailGenerator', 'MetadataFetcher', 'ObjectCache',
+           'ClientCache', 'Workspace', 'WorkspaceTab', 'PrefixRollup', 'Uploader',
+           'StreamVerifier', 'PartVerifier', 'VerificationReport', 'BandwidthLimiter', 'SelectQuery',
+           'export_listing', 'ListingStore', 'ColumnPage', 'Prefetcher', 'PrefetchCache', 'DownloadPlan',
+           'bulk_delete', 'DeleteResult']
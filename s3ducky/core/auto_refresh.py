@@ -0,0 +1,101 @@
+# MIT License
+# 
+# Copyright (c) 2025 S3Ducky
+
+"""
+Background auto-refresh for S3Ducky.
+
+Most polls only list keys sorting after the last key already shown (the
+watermark), which is where pipelines writing time-stamped keys add new
+objects, so they cost a single LIST request. Every few polls the whole
+listing is loaded instead, to catch changes and deletions further up.
+The poll interval doubles while nothing changes and drops back as soon
+as something does.
+"""
+
+import threading
+
+
+# Kinds of poll results
+POLL_NEW = 'new'
+POLL_FULL = 'full'
+
+
+class RefreshPoller:
+    """
+    Poll timing and listing for one workspace tab.
+    """
+    
+    def __init__(self, interval=15, max_interval=300, full_every=10, new_listing=None):
+        """
+        Args:
+            interval (float): Seconds between polls while objects keep changing
+            max_interval (float): Longest wait the backoff grows to
+            full_every (int): Every n-th poll re-lists everything (0 = never)
+            new_listing (callable, optional): Creates the empty ListingStore a
+                full re-list is read into
+        """
+        self.new_listing = new_listing
+        self.interval = interval
+        self.max_interval = max(max_interval, interval)
+        self.full_every = full_every
+        self.delay = interval
+        self.polls = 0
+        
+    def record(self, changed):
+        """
+        Adjust the delay to the next poll.
+        
+        Args:
+            changed (bool): Whether the last poll found anything new or changed
+        """
+        if changed:
+            self.delay = self.interval
+        else:
+            self.delay = min(self.delay * 2, self.max_interval)
+            
+    def poll(self, s3_client, watermark):
+        """
+        List what may have changed.
+        
+        Args:
+            s3_client (S3Client): Connected client of the tab
+            watermark (str or None): Last key of the listing shown
+            
+        Returns:
+            tuple: (POLL_NEW, entries after the watermark) or
+                (POLL_FULL, the complete listing)
+        """
+        self.polls += 1
+        if watermark is None or (self.full_every and self.polls % self.full_every == 0):
+            return POLL_FULL, s3_client.list_objects(self.new_listing() if self.new_listing else None)
+            
+        entries = []
+        for page in s3_client.list_object_pages(start_after=watermark):
+            entries.extend(page)
+        return POLL_NEW, entries
+        
+    def poll_async(self, s3_client, watermark, completion_callback=None, error_callback=None):
+        """
+        Poll in a background thread.
+        
+        Args:
+            s3_client (S3Client): Connected client of the tab
+            watermark (str or None): Last key of the listing shown
+            completion_callback (callable, optional): Called with (kind, entries)
+            error_callback (callable, optional): Called with an error message on failure
+        """
+        def poll_thread():
+            try:
+                kind, entries = self.poll(s3_client, watermark)
+                if completion_callback:
+                    completion_callback(kind, entries)
+            except Exception as e:
+                print(f"Debug: Auto-refresh poll failed: {str(e)}")
+                if error_callback:
+                    error_callback(str(e))
+                    
+        thread = threading.Thread(target=poll_thread)
+        thread.daemon = True
+        thread.start()
+        return thread
@@ -0,0 +1,308 @@
+# MIT License
+# 
+# Copyright (c) 2025 S3Ducky
+
+"""
+Global bandwidth limiting for S3Ducky transfers.
+
+One token bucket per direction is shared by every download and upload
+worker of the process, so the limit holds however many transfers run at
+once. Limits come from settings (download_limit_kbps, upload_limit_kbps,
+with 0 meaning unlimited) and an optional time-of-day schedule. The
+settings file is re-read when it changes, so limits set from the GUI or
+with "python -m s3ducky bandwidth" apply to running jobs.
+"""
+
+import os
+import time
+import threading
+from datetime import datetime
+from ..utils.settings import load_settings
+
+
+DOWNLOAD = 'download'
+UPLOAD = 'upload'
+
+# How often limits are re-evaluated (settings file and schedule), in seconds
+REFRESH_INTERVAL = 1.0
+
+# Request bodies charged when sent (see throttle_on_send)
+UPLOAD_OPERATIONS = ('PutObject', 'UploadPart')
+
+# Upload body of the request each thread is sending
+_sending = threading.local()
+
+
+class TokenBucket:
+    """
+    Token bucket with up to one second of burst.
+    
+    Callers take what they need up front and then wait until the bucket
+    is out of debt, so concurrent callers share the rate between them.
+    """
+    
+    def __init__(self, rate=0):
+        """
+        Args:
+            rate (float): Bytes per second; 0 means unlimited
+        """
+        self.rate = rate
+        self.tokens = 0.0
+        self.last = time.monotonic()
+        self._lock = threading.Lock()
+        
+    def _refill(self):
+        """Add the tokens earned since the last call. Caller holds the lock."""
+        now = time.monotonic()
+        self.tokens = min(self.rate, self.tokens + (now - self.last) * self.rate)
+        self.last = now
+        
+    def set_rate(self, rate):
+        """Change the rate; waiting callers pick it up within a fraction of a second."""
+        with self._lock:
+            self._refill()
+            self.rate = rate
+            self.tokens = min(self.tokens, rate)
+            
+    def consume(self, nbytes):
+        """
+        Take nbytes worth of tokens, blocking as long as the rate requires.
+        
+        Args:
+            nbytes (int): Bytes about to be (or just) transferred
+        """
+        with self._lock:
+            if self.rate <= 0:
+                return
+            self._refill()
+            self.tokens -= nbytes
+            
+        # Sleep in short slices so a changed (or removed) limit applies at once
+        while True:
+            with self._lock:
+                if self.rate <= 0:
+                    return
+                self._refill()
+                if self.tokens >= 0:
+                    return
+                wait = min(0.25, -self.tokens / self.rate)
+            time.sleep(wait)
+
+
+def _parse_time(value):
+    """Convert "HH:MM" to minutes after midnight."""
+    hours, _, minutes = value.partition(':')
+    return int(hours) * 60 + int(minutes or 0)
+
+
+def active_schedule_rule(schedule, now=None):
+    """
+    Find the schedule rule covering the current time of day.
+    
+    Rules look like {"start": "09:00", "end": "18:00", "download_kbps": 1024,
+    "upload_kbps": 256}; a window may wrap past midnight (e.g. 22:00-06:00).
+    The first matching rule wins.
+    
+    Args:
+        schedule (list): Schedule rules
+        now (datetime, optional): Time to check (defaults to now)
+        
+    Returns:
+        dict or None: The active rule
+    """
+    now = now or datetime.now()
+    minute = now.hour * 60 + now.minute
+    for rule in schedule or []:
+        try:
+            start = _parse_time(rule['start'])
+            end = _parse_time(rule['end'])
+        except (KeyError, ValueError):
+            continue
+        if start <= end:
+            if start <= minute < end:
+                return rule
+        elif minute >= start or minute < end:
+            return rule
+    return None
+
+
+class BandwidthLimiter:
+    """
+    Download and upload limits shared by all transfers of the process.
+    """
+    
+    def __init__(self, download_kbps=0, upload_kbps=0, schedule=None, settings_path=None):
+        """
+        Args:
+            download_kbps (int): Base download limit in KiB/s (0 = unlimited)
+            upload_kbps (int): Base upload limit in KiB/s (0 = unlimited)
+            schedule (list, optional): Time-of-day rules overriding the base limits
+            settings_path (str, optional): Settings file to watch for changed limits
+        """
+        self.base = {DOWNLOAD: download_kbps, UPLOAD: upload_kbps}
+        self.schedule = schedule or []
+        self.settings_path = settings_path
+        self.buckets = {DOWNLOAD: TokenBucket(), UPLOAD: TokenBucket()}
+        
+        self._settings_mtime = self._get_settings_mtime()
+        self._next_refresh = 0.0
+        self._lock = threading.Lock()
+        self._apply()
+        
+    @classmethod
+    def from_settings(cls, settings, settings_path=None):
+        """Create a limiter from loaded settings."""
+        return cls(settings['download_limit_kbps'], settings['upload_limit_kbps'],
+                   settings['bandwidth_schedule'], settings_path)
+                   
+    def _get_settings_mtime(self):
+        if self.settings_path and os.path.exists(self.settings_path):
+            return os.path.getmtime(self.settings_path)
+        return None
+        
+    def effective_limits(self):
+        """
+        Get the limits in force right now (schedule applied).
+        
+        Returns:
+            dict: {'download': KiB/s, 'upload': KiB/s}, 0 meaning unlimited
+        """
+        limits = dict(self.base)
+        rule = active_schedule_rule(self.schedule)
+        if rule:
+            for direction in (DOWNLOAD, UPLOAD):
+                if f"{direction}_kbps" in rule:
+                    limits[direction] = rule[f"{direction}_kbps"]
+        return limits
+        
+    def _apply(self):
+        """Push the effective limits into the token buckets."""
+        for direction, kbps in self.effective_limits().items():
+            rate = max(0, kbps) * 1024
+            if self.buckets[direction].rate != rate:
+                self.buckets[direction].set_rate(rate)
+                
+    def set_limits(self, download_kbps=None, upload_kbps=None, schedule=None):
+        """
+        Change the base limits (and optionally the schedule) of running transfers.
+        
+        Args:
+            download_kbps (int, optional): New download limit in KiB/s
+            upload_kbps (int, optional): New upload limit in KiB/s
+            schedule (list, optional): New schedule rules
+        """
+        with self._lock:
+            if download_kbps is not None:
+                self.base[DOWNLOAD] = download_kbps
+            if upload_kbps is not None:
+                self.base[UPLOAD] = upload_kbps
+            if schedule is not None:
+                self.schedule = schedule
+            self._apply()
+            
+    def _refresh(self):
+        """Re-read changed settings and follow the schedule, at most once per interval."""
+        now = time.monotonic()
+        if now < self._next_refresh:
+            return
+        with self._lock:
+            if now < self._next_refresh:
+                return
+            self._next_refresh = now + REFRESH_INTERVAL
+            
+            mtime = self._get_settings_mtime()
+            if mtime != self._settings_mtime:
+                self._settings_mtime = mtime
+                settings = load_settings(self.settings_path)
+                self.base = {DOWNLOAD: settings['download_limit_kbps'],
+                             UPLOAD: settings['upload_limit_kbps']}
+                self.schedule = settings['bandwidth_schedule']
+                print(f"Debug: Bandwidth limits reloaded: {self.effective_limits()}")
+            self._apply()
+            
+    def consume(self, direction, nbytes):
+        """
+        Account for transferred bytes, blocking while over the limit.
+        
+        Args:
+            direction (str): DOWNLOAD or UPLOAD
+            nbytes (int): Bytes transferred
+        """
+        self._refresh()
+        self.buckets[direction].consume(nbytes)
+
+
+class ThrottledReader:
+    """
+    File-like request body that is charged against the limiter chunk by
+    chunk as the HTTP client sends it.
+    
+    Charging a whole body before sending it lets one upload burst at full
+    speed after a long wait; reading through the limiter paces the bytes
+    while they are on the wire, like downloads. botocore also reads a body
+    to hash or checksum it before signing (always, on plain http
+    endpoints), and again for each retry, so only the pass after the
+    client's before-send event is charged: the reader is armed by that
+    event (see throttle_on_send) and disarmed whenever it is rewound.
+    
+    Use it as a context manager around the request, so the event of this
+    thread's request finds it.
+    """
+    
+    def __init__(self, fileobj, limiter, direction=UPLOAD):
+        """
+        Args:
+            fileobj: Seekable binary file object (e.g. an open file or BytesIO)
+            limiter (BandwidthLimiter or None): Limiter to charge (None = unlimited)
+            direction (str): DOWNLOAD or UPLOAD
+        """
+        self.fileobj = fileobj
+        self.limiter = limiter
+        self.direction = direction
+        # Whether reads are the send itself rather than hashing
+        self.armed = False
+        
+    def __enter__(self):
+        _sending.reader = self
+        return self
+        
+    def __exit__(self, *exc_info):
+        _sending.reader = None
+        
+    def read(self, size=-1):
+        data = self.fileobj.read(size)
+        if data and self.armed and self.limiter is not None:
+            self.limiter.consume(self.direction, len(data))
+        return data
+        
+    def seek(self, offset, whence=os.SEEK_SET):
+        # A rewound body is about to be hashed again (e.g. for a retry)
+        self.armed = False
+        return self.fileobj.seek(offset, whence)
+        
+    def tell(self):
+        return self.fileobj.tell()
+        
+    def seekable(self):
+        return True
+
+
+def _arm_sending_reader(**kwargs):
+    """before-send handler: the body of this thread's request is going on the wire."""
+    reader = getattr(_sending, 'reader', None)
+    if reader is not None:
+        reader.armed = True
+
+
+def throttle_on_send(client):
+    """
+    Make a boto3 S3 client arm ThrottledReader bodies as their requests are sent.
+    
+    Safe to call more than once for the same (e.g. cached) client.
+    
+    Args:
+        client: boto3 S3 client
+    """
+    for operation in UPLOAD_OPERATIONS:
+        client.meta.events.register(f"before-send.s3.{operation}", _arm_sending_reader,
+                                    unique_id=f"s3ducky-throttle-{operation}")
@@ -0,0 +1,175 @@
+# MIT License
+# 
+# Copyright (c) 2025 S3Ducky
+
+"""
+Batched bulk delete for S3Ducky.
+
+Keys are packed into DeleteObjects requests of 1,000 keys, the most one
+request takes, and several requests run at the same time, so a million
+keys take about a thousand requests instead of a million. Deleting a
+prefix does not wait for its listing: each listed page becomes a batch
+as soon as it arrives, and the listing waits when the requests fall
+behind, so memory stays flat. Keys S3 refuses to delete are reported one
+by one without stopping the job. A dry run lists and counts without
+sending a single delete.
+"""
+
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from .prefix_download import normalize_prefix
+from ..utils.formatters import format_file_size
+
+
+# Most keys one DeleteObjects request accepts
+MAX_DELETE_KEYS = 1000
+
+DEFAULT_CONCURRENCY = 8
+
+
+def prefix_entries(s3_client, prefix):
+    """
+    Iterate over the listing entries below a prefix, page by page.
+    
+    The bucket is listed rather than read from an inventory report, so
+    keys written after the report are included.
+    
+    Args:
+        s3_client (StorageBackend): Connected backend
+        prefix (str): Key prefix ('' for everything the backend lists)
+        
+    Yields:
+        dict: Listing entries in key order, including the folder marker itself
+    """
+    prefix = normalize_prefix(prefix)
+    # Start just before the prefix, so its "folder/" marker is listed too
+    for entries in s3_client.list_object_pages(start_after=prefix[:-1]):
+        for file_info in entries:
+            key = file_info['key']
+            if key < prefix:
+                continue
+            # Keys come in order, so the prefix ends at the first key outside it
+            if not key.startswith(prefix):
+                return
+            yield file_info
+
+
+class DeleteResult:
+    """
+    Outcome of a bulk delete (or of its dry run).
+    """
+    
+    def __init__(self, dry_run=False):
+        self.dry_run = dry_run
+        # Objects deleted, or found by a dry run
+        self.deleted = 0
+        self.bytes_deleted = 0
+        # Error message of each key that could not be deleted
+        self.failed = {}
+        
+    def summary(self):
+        """
+        Get a one-line summary for status messages.
+        
+        Returns:
+            str: e.g. "Deleted 120,000 objects (3.2 GB), 2 failed"
+        """
+        verb = "Would delete" if self.dry_run else "Deleted"
+        line = f"{verb} {self.deleted:,} objects ({format_file_size(self.bytes_deleted)})"
+        if self.failed:
+            line += f", {len(self.failed):,} failed"
+        return line
+
+
+def bulk_delete(s3_client, file_infos, concurrency=DEFAULT_CONCURRENCY, dry_run=False,
+                progress_callback=None, deleted_callback=None):
+    """
+    Delete objects in batches of up to 1,000 keys, several batches at a time.
+    
+    A request that fails as a whole (e.g. access denied) stops the job and
+    is raised once the batches in flight have finished; keys S3 reports
+    as failed are collected in the result instead.
+    
+    Args:
+        s3_client (StorageBackend): Connected backend
+        file_infos (iterable): Listing entries to delete, e.g. a selection or
+            prefix_entries(); consumed while deleting
+        concurrency (int): DeleteObjects requests in flight at the same time
+        dry_run (bool): Only count the objects and their bytes
+        progress_callback (callable, optional): Callback for progress updates
+        deleted_callback (callable, optional): Called with the keys of each
+            deleted batch
+            
+    Returns:
+        DeleteResult: Counts, bytes and per-key failures
+    """
+    result = DeleteResult(dry_run)
+    concurrency = max(1, concurrency)
+    
+    def report_progress():
+        if progress_callback:
+            progress_callback(result.summary())
+            
+    def delete_batch(batch):
+        keys = [file_info['key'] for file_info in batch]
+        errors = s3_client.delete_objects(keys)
+        return batch, errors
+        
+    def finish(future):
+        """Account for a finished batch (in the calling thread, so no lock is needed)."""
+        batch, errors = future.result()
+        deleted = [file_info for file_info in batch if file_info['key'] not in errors]
+        result.deleted += len(deleted)
+        result.bytes_deleted += sum(file_info.get('size', 0) for file_info in deleted)
+        result.failed.update(errors)
+        for key, message in errors.items():
+            print(f"Debug: Could not delete {key}: {message}")
+        if deleted_callback and deleted:
+            deleted_callback([file_info['key'] for file_info in deleted])
+            
+    def batches():
+        batch = []
+        for file_info in file_infos:
+            batch.append(file_info)
+            if len(batch) == MAX_DELETE_KEYS:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+            
+    if dry_run:
+        for batch in batches():
+            result.deleted += len(batch)
+            result.bytes_deleted += sum(file_info.get('size', 0) for file_info in batch)
+            report_progress()
+        return result
+        
+    in_flight = set()
+    errors = []
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        try:
+            for batch in batches():
+                # Stop listing while every request is busy
+                while len(in_flight) >= concurrency and not errors:
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        try:
+                            finish(future)
+                        except Exception as e:
+                            errors.append(e)
+                    report_progress()
+                if errors:
+                    break
+                in_flight.add(executor.submit(delete_batch, batch))
+        except Exception as e:
+            # A failed listing still reports the batches already sent
+            errors.append(e)
+            
+        for future in in_flight:
+            try:
+                finish(future)
+            except Exception as e:
+                errors.append(e)
+    report_progress()
+    if errors:
+        raise errors[0]
+    return result
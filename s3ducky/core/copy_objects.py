@@ -0,0 +1,425 @@
+# MIT License
+# 
+# Copyright (c) 2025 S3Ducky
+
+"""
+Server-side copy and move for S3Ducky.
+
+Objects are copied inside S3, so no byte passes through this machine.
+Objects up to 5 GB take one CopyObject request each and are copied
+concurrently. Larger objects become multipart uploads whose parts are
+filled with UploadPartCopy in parallel; their upload ID and finished
+parts are recorded like those of uploads, so an interrupted copy goes
+on from where it stopped. Copies whose destination already holds the
+source's content are skipped, so running an interrupted job again only
+copies what is missing: the destination's ETag has to match the
+source's, or the ETag recorded when a multipart copy of that very
+source finished. A move copies every object and deletes each source
+only once its own copy exists, so it never deletes a source on the
+strength of an object it did not write.
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from .uploads import UploadState, object_id, MIN_PART_SIZE, MAX_PARTS
+from .object_metadata import needs_restore
+from ..utils.formatters import format_file_size
+
+
+# Largest object a single CopyObject request can copy
+MAX_COPY_OBJECT_SIZE = 5 * 1024 * 1024 * 1024
+
+DEFAULT_PART_SIZE = 512 * 1024 * 1024
+
+DEFAULT_STATE_PATH = os.path.join(os.path.expanduser('~'), '.s3ducky', 'copies.json')
+
+
+def copy_targets(file_infos, dest_prefix='', source_prefix=None):
+    """
+    Work out the destination key of every object to copy.
+    
+    Keys keep their path below the source prefix, which defaults to the
+    deepest folder holding all of them, e.g. copying "logs/a/1.txt" and
+    "logs/b/2.txt" to "archive/" gives "archive/a/1.txt" and "archive/b/2.txt".
+    
+    Args:
+        file_infos (list): Listing entries of the objects to copy
+        dest_prefix (str): Key prefix to copy under
+        source_prefix (str, optional): Part of the keys to replace with dest_prefix
+        
+    Returns:
+        list: (listing entry, destination key) tuples
+    """
+    if dest_prefix and not dest_prefix.endswith('/'):
+        dest_prefix += '/'
+    if source_prefix is None:
+        common = os.path.commonprefix([file_info['key'] for file_info in file_infos]) if file_infos else ''
+        source_prefix = common[:common.rfind('/') + 1]
+    return [(file_info, dest_prefix + file_info['key'][len(source_prefix):]) for file_info in file_infos]
+
+
+class CopyState(UploadState):
+    """
+    Persisted progress of multipart copies, used to resume them.
+    
+    A record is only reused while the source object keeps the ETag it had
+    when the copy started. Once the copy is complete, its record keeps
+    just the source and the ETag of the copy, which (unlike that of a
+    CopyObject copy) differs from the source's.
+    """
+    
+    def __init__(self, path=DEFAULT_STATE_PATH):
+        super().__init__(path)
+        
+    def get(self, location, key, source, part_size):
+        """
+        Find an unfinished copy of this exact source object.
+        
+        Args:
+            source (str): Source as "bucket/key@etag" (see Copier._source_id)
+            
+        Returns:
+            dict or None: Record with 'upload_id' and 'parts' ({part number: ETag})
+        """
+        with self._lock:
+            record = self._records.get(self._record_id(location, key))
+        if (record and 'upload_id' in record and record.get('source') == source
+                and record['part_size'] == part_size):
+            return record
+        return None
+        
+    def copied_etag(self, location, key, source):
+        """
+        Get the ETag of a finished multipart copy of this exact source object.
+        
+        Returns:
+            str or None: ETag without quotes, or None if no such copy was recorded
+        """
+        with self._lock:
+            record = self._records.get(self._record_id(location, key))
+        if record and 'upload_id' not in record and record.get('source') == source:
+            return record['etag']
+        return None
+        
+    def start(self, location, key, source, part_size, upload_id):
+        """Record a newly created multipart copy."""
+        with self._lock:
+            self._records[self._record_id(location, key)] = {
+                'upload_id': upload_id,
+                'source': source,
+                'part_size': part_size,
+                'parts': {}
+            }
+            self._save()
+            
+    def complete(self, location, key, source, etag):
+        """Replace the record of a finished multipart copy with the ETag of the copy."""
+        with self._lock:
+            self._records[self._record_id(location, key)] = {
+                'source': source,
+                'etag': (etag or '').strip('"')
+            }
+            self._save()
+
+
+class CopyResult:
+    """
+    Outcome of a copy or move job.
+    """
+    
+    def __init__(self, move=False):
+        self.move = move
+        # Listing entries of the copies made
+        self.copied = []
+        # Source keys deleted by a move
+        self.removed = []
+        # Copies skipped because the destination was already up to date
+        self.existing = 0
+        # Keys of archived objects that can't be copied until restored
+        self.archived = []
+        self.bytes_copied = 0
+        
+    def summary(self):
+        """
+        Get a one-line summary for status messages.
+        
+        Returns:
+            str: e.g. "Moved 40 objects (3.2 GB), 2 already there, 1 archived skipped"
+        """
+        line = f"{'Moved' if self.move else 'Copied'} {len(self.copied)} objects ({format_file_size(self.bytes_copied)})"
+        if self.existing:
+            line += f", {self.existing} already there"
+        if self.archived:
+            line += f", {len(self.archived)} archived skipped"
+        return line
+
+
+class _CopyProgress:
+    """Thread-safe byte and object counters for one copy job."""
+    
+    def __init__(self, verb, total_objects, total_bytes, callback):
+        self.verb = verb
+        self.total_objects = total_objects
+        self.total_bytes = total_bytes
+        self.objects_done = 0
+        self.bytes_done = 0
+        self.callback = callback
+        self._lock = threading.Lock()
+        
+    def add(self, nbytes, objects=0):
+        with self._lock:
+            self.bytes_done += nbytes
+            self.objects_done += objects
+            message = (f"{self.verb} {self.objects_done}/{self.total_objects} objects: "
+                       f"{format_file_size(self.bytes_done)} of {format_file_size(self.total_bytes)}")
+        if self.callback:
+            self.callback(message)
+
+
+class Copier:
+    """
+    Copies or moves objects from one backend's bucket into another's, server-side.
+    
+    The destination backend sends the requests, so its credentials need
+    read access to the source bucket.
+    """
+    
+    def __init__(self, source, dest, concurrency=16, part_size=DEFAULT_PART_SIZE, state=None):
+        """
+        Args:
+            source (StorageBackend): Connected backend of the source bucket
+            dest (StorageBackend): Connected backend of the destination bucket
+            concurrency (int): Objects or parts copied at the same time
+            part_size (int): Part size of multipart copies in bytes (at least 5 MB)
+            state (CopyState, optional): Resume records (defaults to ~/.s3ducky/copies.json)
+        """
+        self.source = source
+        self.dest = dest
+        self.concurrency = max(1, concurrency)
+        self.part_size = min(max(part_size, MIN_PART_SIZE), MAX_COPY_OBJECT_SIZE)
+        self.state = state or CopyState()
+        self._lock = threading.Lock()
+        
+    def _part_size_for(self, size):
+        """Grow the part size when needed to stay within 10,000 parts."""
+        part_size = self.part_size
+        while size > part_size * MAX_PARTS:
+            part_size *= 2
+        return part_size
+        
+    def _source_id(self, file_info):
+        """Identify a source object's content as "bucket/key@etag" (see object_id())."""
+        return f"{object_id(self.source.location, file_info['key'])}@{file_info['etag']}"
+        
+    def _existing(self, targets):
+        """
+        Find destinations that already hold a copy of their source.
+        
+        The destination is listed once below the common prefix of the
+        destination keys rather than asked about each key. Sizes and
+        dates prove nothing (a newer, different object of the same size
+        is not a copy), so only ETags count.
+        
+        Returns:
+            set: Destination keys to skip
+        """
+        wanted = {dest_key: file_info for file_info, dest_key in targets}
+        common = os.path.commonprefix(list(wanted))
+        prefix = common[:common.rfind('/') + 1]
+        existing = set()
+        try:
+            for entries in self.dest.list_object_pages(start_after=prefix or None):
+                for entry in entries:
+                    if not entry['key'].startswith(prefix):
+                        return existing
+                    file_info = wanted.get(entry['key'])
+                    if file_info is None or entry['size'] != file_info['size']:
+                        continue
+                    etag = (entry.get('etag') or '').strip('"')
+                    source_etag = (file_info.get('etag') or '').strip('"')
+                    if etag and (etag == source_etag or etag == self.state.copied_etag(
+                            self.dest.location, entry['key'], self._source_id(file_info))):
+                        existing.add(entry['key'])
+        except Exception as e:
+            print(f"Debug: Could not list the copy destination, copying everything: {e}")
+        return existing
+        
+    def _finish_object(self, file_info, dest_key, etag, storage_class, move, result, progress,
+                       file_callback, removed_callback, nbytes):
+        """Record a finished copy and, for a move, delete its source."""
+        entry = {
+            'key': dest_key,
+            'size': file_info['size'],
+            'modified': datetime.now(timezone.utc),
+            'etag': (etag or '').strip('"'),
+            'storage_class': storage_class or 'STANDARD'
+        }
+        with self._lock:
+            result.copied.append(entry)
+            result.bytes_copied += file_info['size']
+        if file_callback:
+            file_callback(entry)
+        if move:
+            self._remove_source(file_info, result, removed_callback)
+        progress.add(nbytes, objects=1)
+        
+    def _remove_source(self, file_info, result, removed_callback):
+        self.source.delete_object(file_info['key'])
+        with self._lock:
+            result.removed.append(file_info['key'])
+        if removed_callback:
+            removed_callback(file_info['key'])
+            
+    @staticmethod
+    def _storage_class(file_info):
+        """Keep the source's storage class (S3 would make every copy STANDARD)."""
+        storage_class = file_info.get('storage_class') or 'STANDARD'
+        return None if storage_class == 'STANDARD' else storage_class
+        
+    def _copy_small(self, file_info, dest_key, move, result, progress, file_callback, removed_callback):
+        """Copy an object with a single CopyObject request."""
+        storage_class = self._storage_class(file_info)
+        # A source overwritten since it was listed fails (412) rather than being copied or removed
+        etag = self.dest.copy_object(self.source.bucket_name, file_info['key'], dest_key, storage_class,
+                                     source_etag=file_info.get('etag') or None)
+        self._finish_object(file_info, dest_key, etag, storage_class, move, result, progress,
+                            file_callback, removed_callback, file_info['size'])
+                            
+    def _copy_part(self, dest_key, upload_id, part_number, file_info, start, end, progress):
+        """Copy one part of the listed version of the source, recording it for resume."""
+        etag = self.dest.upload_part_copy(dest_key, upload_id, part_number, self.source.bucket_name,
+                                          file_info['key'], start, end, source_etag=file_info.get('etag') or None)
+        self.state.add_part(self.dest.location, dest_key, part_number, etag)
+        progress.add(end - start + 1)
+        return etag
+        
+    def _copy_multipart(self, executor, file_info, dest_key, move, result, progress, file_callback,
+                        removed_callback):
+        """Copy a large object in parallel parts, resuming an earlier attempt if there is one."""
+        location = self.dest.location
+        source_key = file_info['key']
+        size = file_info['size']
+        part_size = self._part_size_for(size)
+        part_count = (size + part_size - 1) // part_size
+        source = self._source_id(file_info)
+        storage_class = self._storage_class(file_info)
+        
+        done = {}
+        record = self.state.get(location, dest_key, source, part_size)
+        if record:
+            upload_id = record['upload_id']
+            try:
+                # The parts S3 still holds are authoritative
+                done = self.dest.list_parts(dest_key, upload_id)
+            except Exception as e:
+                print(f"Debug: Using recorded parts of {dest_key}: {e}")
+                done = {int(number): etag for number, etag in record['parts'].items()}
+            if done is None:
+                print(f"Debug: Copy to {dest_key} no longer exists, starting over")
+                record = None
+                done = {}
+            else:
+                print(f"Debug: Resuming copy to {dest_key} with {len(done)}/{part_count} parts done")
+        if not record:
+            # Unlike CopyObject, a multipart upload doesn't take these from the source
+            head = self.source.head_object(source_key)
+            upload_id = self.dest.create_multipart_upload(
+                dest_key, content_type=head.get('content_type'), metadata=head.get('metadata'),
+                storage_class=storage_class)
+            self.state.start(location, dest_key, source, part_size, upload_id)
+            
+        futures = {}
+        for part_number in range(1, part_count + 1):
+            start = (part_number - 1) * part_size
+            end = min(size, start + part_size) - 1
+            if part_number in done:
+                progress.add(end - start + 1)
+                continue
+            futures[part_number] = executor.submit(
+                self._copy_part, dest_key, upload_id, part_number, file_info, start, end, progress)
+                
+        # Unfinished parts stay recorded, so a failure here can be resumed later
+        for part_number, future in futures.items():
+            done[part_number] = future.result()
+            
+        parts = [{'PartNumber': number, 'ETag': done[number]} for number in range(1, part_count + 1)]
+        etag = self.dest.complete_multipart_upload(dest_key, upload_id, parts)
+        self.state.complete(location, dest_key, source, etag)
+        self._finish_object(file_info, dest_key, etag, storage_class, move, result, progress,
+                            file_callback, removed_callback, 0)
+                            
+    def copy(self, targets, move=False, skip_existing=True, progress_callback=None, file_callback=None,
+             removed_callback=None):
+        """
+        Copy or move objects.
+        
+        Small objects are copied concurrently while objects over 5 GB go
+        one after another, each with its parts spread over the same workers.
+        
+        Args:
+            targets (list): (listing entry, destination key) tuples (see copy_targets)
+            move (bool): Delete each source once it is copied
+            skip_existing (bool): Skip destinations that already hold a copy of their
+                source (ignored by a move, which deletes only sources it copied)
+            progress_callback (callable, optional): Called with progress messages
+            file_callback (callable, optional): Called with the listing entry of each copy
+            removed_callback (callable, optional): Called with each source key a move deleted
+            
+        Returns:
+            CopyResult: What was copied, removed and skipped
+            
+        Raises:
+            RuntimeError: If either backend is not connected
+            Exception: If any object failed to copy (after the others finished)
+        """
+        if not (self.source.is_connected() and self.dest.is_connected()):
+            raise RuntimeError("S3 client is not connected")
+            
+        result = CopyResult(move)
+        same_bucket = self.source.location == self.dest.location
+        work = []
+        for file_info, dest_key in targets:
+            if same_bucket and dest_key == file_info['key']:
+                continue
+            if needs_restore(file_info):
+                result.archived.append(file_info['key'])
+                continue
+            work.append((file_info, dest_key))
+            
+        # A move only deletes a source once this job has copied it
+        existing = self._existing(work) if skip_existing and not move and work else set()
+        progress = _CopyProgress('Moved' if move else 'Copied', len(work),
+                                 sum(file_info['size'] for file_info, _ in work), progress_callback)
+        failures = []
+        
+        def finished(key, future):
+            """Collect a small-object copy as soon as it ends."""
+            try:
+                future.result()
+            except Exception as e:
+                failures.append(f"{key}: {e}")
+                
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            for file_info, dest_key in work:
+                if dest_key in existing:
+                    result.existing += 1
+                    progress.add(file_info['size'], objects=1)
+                elif file_info['size'] <= MAX_COPY_OBJECT_SIZE:
+                    future = executor.submit(self._copy_small, file_info, dest_key, move, result, progress,
+                                             file_callback, removed_callback)
+                    future.add_done_callback(lambda f, key=file_info['key']: finished(key, f))
+                    
+            for file_info, dest_key in work:
+                if dest_key not in existing and file_info['size'] > MAX_COPY_OBJECT_SIZE:
+                    try:
+                        self._copy_multipart(executor, file_info, dest_key, move, result, progress,
+                                             file_callback, removed_callback)
+                    except Exception as e:
+                        failures.append(f"{file_info['key']}: {e}")
+                        
+        if failures:
+            print(f"Debug: {len(failures)} copies failed: {failures}")
+            raise Exception(f"{len(failures)} of {len(work)} copies failed, e.g. {failures[0]}")
+        return result
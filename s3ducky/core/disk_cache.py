@@ -0,0 +1,215 @@
+# MIT License
+# 
+# Copyright (c) 2025 S3Ducky
+
+"""
+Size-capped on-disk LRU cache for S3Ducky.
+"""
+
+import os
+import shutil
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+
+
+DEFAULT_CACHE_ROOT = os.path.join(os.path.expanduser('~'), '.s3ducky', 'cache')
+
+
+def make_cache_key(*parts):
+    """
+    Build a stable cache key from its parts (e.g. bucket, key and ETag).
+    
+    Args:
+        *parts: Values identifying the cached entry
+        
+    Returns:
+        str: Hex digest usable as a file name
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(str(part).encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+class DiskCache:
+    """
+    Stores files in a directory and evicts the least recently used entries
+    once the total size exceeds a cap. Recency is kept in file modification
+    times, so the LRU order survives restarts.
+    """
+    
+    def __init__(self, cache_dir, max_bytes, suffix=''):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        self.total_bytes = 0
+        self._entries = OrderedDict()
+        # Pin count of each entry a job is still reading in place
+        self._pins = {}
+        self._lock = threading.Lock()
+        
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._load_index()
+        
+    def _load_index(self):
+        """Rebuild the in-memory LRU index from the files on disk."""
+        found = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(self.suffix) or name.startswith('.'):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            found.append((stat.st_mtime, name[:len(name) - len(self.suffix)], stat.st_size))
+            
+        for _, key, size in sorted(found):
+            self._entries[key] = size
+            self.total_bytes += size
+            
+    def _path(self, key):
+        """Get the on-disk path for a cache key."""
+        return os.path.join(self.cache_dir, key + self.suffix)
+        
+    def get(self, key, pin=False):
+        """
+        Look up an entry and mark it as recently used.
+        
+        Args:
+            key (str): Cache key
+            pin (bool): Keep the entry from being evicted until unpin() is called
+            
+        Returns:
+            str or None: Path of the cached file, or None on a miss
+        """
+        with self._lock:
+            if key not in self._entries:
+                return None
+            path = self._path(key)
+            try:
+                os.utime(path, None)
+            except OSError:
+                # File was removed behind our back
+                self.total_bytes -= self._entries.pop(key)
+                return None
+            self._entries.move_to_end(key)
+            if pin:
+                self._pins[key] = self._pins.get(key, 0) + 1
+            return path
+            
+    def unpin(self, key):
+        """
+        Release one pin taken by get(), evicting anything the pin held back.
+        
+        Args:
+            key (str): Cache key
+        """
+        with self._lock:
+            count = self._pins.get(key, 0) - 1
+            if count > 0:
+                self._pins[key] = count
+            else:
+                self._pins.pop(key, None)
+            self._evict()
+            
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+            
+    def put_bytes(self, key, data):
+        """
+        Store bytes under a cache key.
+        
+        Args:
+            key (str): Cache key
+            data (bytes): Content to store
+            
+        Returns:
+            str: Path of the cached file
+        """
+        fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, prefix='.tmp-')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        return self._commit(key, temp_path)
+        
+    def put_file(self, key, source_path, copy_func=shutil.copyfile):
+        """
+        Store a copy of a local file under a cache key.
+        
+        Args:
+            key (str): Cache key
+            source_path (str): File to copy into the cache
+            copy_func (callable, optional): Function (source, dest) used to copy
+            
+        Returns:
+            str: Path of the cached file
+        """
+        fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, prefix='.tmp-')
+        os.close(fd)
+        try:
+            copy_func(source_path, temp_path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        return self._commit(key, temp_path)
+        
+    def _commit(self, key, temp_path):
+        """Atomically move a finished temp file into place and evict if needed."""
+        path = self._path(key)
+        size = os.path.getsize(temp_path)
+        os.replace(temp_path, path)
+        
+        with self._lock:
+            if key in self._entries:
+                self.total_bytes -= self._entries.pop(key)
+            self._entries[key] = size
+            self.total_bytes += size
+            self._evict()
+        return path
+        
+    def _evict(self):
+        """Remove least recently used entries until under the size cap, skipping pinned ones."""
+        if self.total_bytes <= self.max_bytes:
+            return
+        for key in list(self._entries):
+            if self.total_bytes <= self.max_bytes or len(self._entries) <= 1:
+                break
+            if key in self._pins:
+                continue
+            self.total_bytes -= self._entries.pop(key)
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+                
+    def discard(self, key):
+        """
+        Remove an entry if present.
+        
+        Args:
+            key (str): Cache key
+        """
+        with self._lock:
+            if key not in self._entries:
+                return
+            self.total_bytes -= self._entries.pop(key)
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+                
+    def clear(self):
+        """Remove every entry from the cache."""
+        with self._lock:
+            for key in list(self._entries):
+                try:
+                    os.remove(self._path(key))
+                except OSError:
+                    pass
+            self._entries.clear()
+            self.total_bytes = 0
@@ -0,0 +1,210 @@
+# MIT License
+# 
+# Copyright (c) 2025 S3Ducky
+
+"""
+Size-aware download planning for S3Ducky.
+
+Taking a selection in selection order lets one large object that happens
+to come last stretch the whole job. A DownloadPlan orders the work by
+size, largest first. Objects at or above the ranged threshold are units
+of their own, because they already split into parallel ranges. Smaller
+objects are packed into batches for the worker pool. Each batch is sized
+from a time-per-object model, overhead plus bytes over the per-worker
+rate, and the model is refitted as units complete. Batches therefore
+shrink as the job nears its end, and the completion estimate follows the
+throughput that is actually measured.
+"""
+
+import time
+import threading
+from ..utils.formatters import format_file_size, format_duration
+
+
+# Seconds of work a batch of small objects aims for
+BATCH_SECONDS = 2.0
+
+# Most objects in one batch
+MAX_BATCH_OBJECTS = 64
+
+# Assumed until measured: job throughput and per-object request overhead
+DEFAULT_RATE = 10 * 1024 * 1024
+DEFAULT_OVERHEAD = 0.05
+
+# Weight of each new measurement in the per-object overhead estimate
+SMOOTHING = 0.3
+
+
+class DownloadPlan:
+    """
+    Work queue of one download job, ordered and batched by object size.
+    
+    Workers call next_unit() until it returns None and report each unit
+    with record(). All methods are thread-safe.
+    """
+    
+    def __init__(self, file_infos, workers=4, ranged_threshold=64 * 1024 * 1024, rate_limit=0):
+        """
+        Args:
+            file_infos (list): Listing entries ('key' and 'size') to download
+            workers (int): Units downloaded at the same time
+            ranged_threshold (int): Objects this large or larger are units of their own
+            rate_limit (int): Download limit in bytes per second (0 = unlimited)
+        """
+        self.workers = max(1, workers)
+        self.ranged_threshold = ranged_threshold
+        self.rate_limit = rate_limit
+        
+        # Largest first (the sort is stable, so equal sizes keep selection order)
+        self.remaining = sorted(file_infos, key=lambda file_info: file_info.get('size', 0), reverse=True)
+        self.count = len(self.remaining)
+        self.total_bytes = sum(file_info.get('size', 0) for file_info in self.remaining)
+        self.remaining_bytes = self.total_bytes
+        self.done_count = 0
+        self.done_bytes = 0
+        
+        self.overhead = DEFAULT_OVERHEAD
+        self.started = None
+        self._lock = threading.Lock()
+        
+    @property
+    def rate(self):
+        """Job throughput in bytes per second: measured once data arrived, else assumed."""
+        if self.started is not None and self.done_bytes:
+            elapsed = time.monotonic() - self.started
+            if elapsed > 0:
+                return self.done_bytes / elapsed
+        rate = DEFAULT_RATE
+        if self.rate_limit:
+            rate = min(rate, self.rate_limit)
+        return rate
+        
+    def _object_seconds(self, size, worker_rate):
+        return self.overhead + size / worker_rate
+        
+    def estimate_seconds(self):
+        """
+        Estimate how long the rest of the job takes.
+        
+        Returns:
+            float: Seconds until every remaining object is downloaded
+        """
+        with self._lock:
+            return self._estimate_locked()
+            
+    def _estimate_locked(self):
+        if not self.remaining and self.done_count == self.count:
+            return 0.0
+        # Requests overlap across workers; bytes share the job throughput
+        pending = self.count - self.done_count
+        estimate = self.remaining_bytes / self.rate + pending * self.overhead / self.workers
+        # A big object can't finish faster than its own transfer
+        if self.remaining:
+            estimate = max(estimate, self.remaining[0].get('size', 0) / self.rate)
+        return estimate
+        
+    def next_unit(self):
+        """
+        Take the next unit of work.
+        
+        Returns:
+            list or None: Listing entries to download one after another, or
+                None when nothing is left
+        """
+        with self._lock:
+            if self.started is None:
+                self.started = time.monotonic()
+            if not self.remaining:
+                return None
+                
+            first = self.remaining[0]
+            if first.get('size', 0) >= self.ranged_threshold:
+                return [self.remaining.pop(0)]
+                
+            # Near the end, smaller batches keep every worker busy until the last byte
+            worker_rate = self.rate / self.workers
+            target = min(BATCH_SECONDS, self._estimate_locked() / self.workers)
+            unit, seconds = [], 0.0
+            while self.remaining and len(unit) < MAX_BATCH_OBJECTS:
+                file_info = self.remaining[0]
+                cost = self._object_seconds(file_info.get('size', 0), worker_rate)
+                if unit and seconds + cost > target:
+                    break
+                unit.append(self.remaining.pop(0))
+                seconds += cost
+            return unit
+            
+    def record(self, unit, seconds):
+        """
+        Account for a finished unit and refine the per-object overhead.
+        
+        Args:
+            unit (list): Listing entries returned by next_unit()
+            seconds (float): Wall time the unit took
+        """
+        nbytes = sum(file_info.get('size', 0) for file_info in unit)
+        with self._lock:
+            self.done_count += len(unit)
+            self.done_bytes += nbytes
+            self.remaining_bytes -= nbytes
+            # Whatever the bytes don't explain is per-request overhead
+            worker_rate = self.rate / self.workers
+            measured = max(0.0, (seconds - nbytes / worker_rate) / len(unit))
+            self.overhead += SMOOTHING * (measured - self.overhead)
+            
+    def progress_text(self):
+        """
+        Describe the job's progress for status messages.
+        
+        Returns:
+            str: e.g. "Downloaded 12/40 files, 1.2 GB of 3.4 GB at 45.0 MB/s, about 50s left"
+        """
+        with self._lock:
+            done_count, done_bytes, rate = self.done_count, self.done_bytes, self.rate
+            estimate = self._estimate_locked()
+        return (f"Downloaded {done_count}/{self.count} files, {format_file_size(done_bytes)} of "
+                f"{format_file_size(self.total_bytes)} at {format_file_size(rate)}/s, "
+                f"about {format_duration(estimate)} left")
+
+
+def run_plan(plan, download, progress_callback=None):
+    """
+    Download the units of a plan with a pool of worker threads.
+    
+    The first failure stops every worker after its current object and is
+    raised once they have finished.
+    
+    Args:
+        plan (DownloadPlan): Work to do
+        download (callable): Called with each listing entry; downloads it
+        progress_callback (callable, optional): Callback for progress updates
+    """
+    errors = []
+    stop = threading.Event()
+    
+    def worker():
+        while not stop.is_set():
+            unit = plan.next_unit()
+            if unit is None:
+                return
+            started = time.monotonic()
+            for file_info in unit:
+                if stop.is_set():
+                    return
+                try:
+                    download(file_info)
+                except Exception as e:
+                    errors.append(e)
+                    stop.set()
+                    return
+            plan.record(unit, time.monotonic() - started)
+            if progress_callback:
+                progress_callback(plan.progress_text())
+                
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(min(plan.workers, plan.count))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise errors[0]
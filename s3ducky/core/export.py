@@ -0,0 +1,174 @@
+# MIT License
+# 
+# Copyright (c) 2025 S3Ducky
+
+"""
+Streaming listing export for S3Ducky.
+
+Listing pages are written out as they arrive, so only one page (or, for
+Parquet, one row group) is in memory at a time and buckets with tens of
+millions of keys can be exported on a laptop. CSV and JSON Lines use the
+standard library; Parquet needs pyarrow.
+"""
+
+import os
+import csv
+import json
+
+try:
+    import pyarrow
+    import pyarrow.parquet as pa_parquet
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+
+FORMAT_CSV = 'csv'
+FORMAT_JSONL = 'jsonl'
+FORMAT_PARQUET = 'parquet'
+
+EXTENSIONS = {'.csv': FORMAT_CSV, '.jsonl': FORMAT_JSONL, '.ndjson': FORMAT_JSONL,
+              '.json': FORMAT_JSONL, '.parquet': FORMAT_PARQUET}
+
+COLUMNS = ('key', 'size', 'last_modified', 'etag', 'storage_class')
+
+# Rows per Parquet row group
+PARQUET_ROW_GROUP = 100000
+
+
+def format_for_path(path):
+    """
+    Pick the export format from a file name.
+    
+    Args:
+        path (str): Output file path
+        
+    Returns:
+        str or None: FORMAT_CSV, FORMAT_JSONL or FORMAT_PARQUET
+    """
+    return EXTENSIONS.get(os.path.splitext(path)[1].lower())
+
+
+def _row(file_info):
+    """Convert a listing entry to an export row."""
+    return (file_info['key'], file_info['size'], file_info['modified'].isoformat(),
+            file_info['etag'], file_info.get('storage_class') or 'STANDARD')
+
+
+class _CsvWriter:
+    def __init__(self, f):
+        self.writer = csv.writer(f)
+        self.writer.writerow(COLUMNS)
+        
+    def write(self, entries):
+        self.writer.writerows(_row(file_info) for file_info in entries)
+        
+    def close(self):
+        pass
+
+
+class _JsonLinesWriter:
+    def __init__(self, f):
+        self.f = f
+        
+    def write(self, entries):
+        self.f.writelines(json.dumps(dict(zip(COLUMNS, _row(file_info)))) + '\n'
+                          for file_info in entries)
+                          
+    def close(self):
+        pass
+
+
+class _ParquetWriter:
+    """Buffers pages into row groups of PARQUET_ROW_GROUP rows."""
+    
+    def __init__(self, path):
+        self.schema = pyarrow.schema([
+            ('key', pyarrow.string()),
+            ('size', pyarrow.int64()),
+            ('last_modified', pyarrow.timestamp('ms', tz='UTC')),
+            ('etag', pyarrow.string()),
+            ('storage_class', pyarrow.string()),
+        ])
+        self.writer = pa_parquet.ParquetWriter(path, self.schema)
+        self.buffer = []
+        
+    def write(self, entries):
+        self.buffer.extend(entries)
+        if len(self.buffer) >= PARQUET_ROW_GROUP:
+            self._flush()
+            
+    def _flush(self):
+        if not self.buffer:
+            return
+        columns = [
+            [file_info['key'] for file_info in self.buffer],
+            [file_info['size'] for file_info in self.buffer],
+            [file_info['modified'] for file_info in self.buffer],
+            [file_info['etag'] for file_info in self.buffer],
+            [file_info.get('storage_class') or 'STANDARD' for file_info in self.buffer],
+        ]
+        self.writer.write_table(pyarrow.Table.from_arrays(
+            [pyarrow.array(values, type=field.type) for values, field in zip(columns, self.schema)],
+            schema=self.schema))
+        self.buffer = []
+        
+    def close(self):
+        self._flush()
+        self.writer.close()
+
+
+def export_listing(s3_client, path, export_format=None, progress_callback=None, should_stop=None):
+    """
+    Stream the listing of the connected bucket (and prefix) to a file.
+    
+    Columns are key, size, last_modified (ISO 8601), etag and storage_class.
+    The file is written next to path and moved into place when complete.
+    
+    Args:
+        s3_client (S3Client): Connected client
+        path (str): Output file path
+        export_format (str, optional): FORMAT_CSV, FORMAT_JSONL or FORMAT_PARQUET
+            (defaults to the one matching the file extension)
+        progress_callback (callable, optional): Called with progress messages
+        should_stop (callable, optional): Returns True to abandon the export
+        
+    Returns:
+        int: Objects exported
+        
+    Raises:
+        ValueError: If the format is unknown
+        RuntimeError: If Parquet is requested without pyarrow installed
+    """
+    export_format = export_format or format_for_path(path)
+    if export_format not in (FORMAT_CSV, FORMAT_JSONL, FORMAT_PARQUET):
+        raise ValueError(f"Unknown export format for {path}; use .csv, .jsonl or .parquet")
+    if export_format == FORMAT_PARQUET and not PYARROW_AVAILABLE:
+        raise RuntimeError("Parquet export needs pyarrow (pip install pyarrow)")
+        
+    temp_path = path + '.part'
+    count = 0
+    try:
+        if export_format == FORMAT_PARQUET:
+            f = None
+            writer = _ParquetWriter(temp_path)
+        else:
+            f = open(temp_path, 'w', encoding='utf-8', newline='')
+            writer = _CsvWriter(f) if export_format == FORMAT_CSV else _JsonLinesWriter(f)
+        try:
+            for entries in s3_client.list_object_pages():
+                if should_stop and should_stop():
+                    raise Exception("Export cancelled")
+                writer.write(entries)
+                count += len(entries)
+                if progress_callback:
+                    progress_callback(f"Exported {count:,} objects...")
+            writer.close()
+        finally:
+            if f is not None:
+                f.close()
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    return count
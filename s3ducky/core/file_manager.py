@@ -1,126 +1,606 @@
-# MIT License
-# 
-# Copyright (c) 2025 S3Ducky
-
-"""
-File download and management operations for S3Ducky.
-"""
-
-import os
-import zipfile
-import tempfile
-import threading
-from .s3_client import S3Client
-
-
-class FileManager:
-    """
-    Handles file download operations and management.
-    """
-    
-    def __init__(self, s3_client: S3Client):
-        self.s3_client = s3_client
-        
-    def download_files_individually(self, file_keys, dest_folder, progress_callback=None):
-        """
-        Download files individually to the destination folder.
-        
-        Args:
-            file_keys (list): List of S3 object keys to download
-            dest_folder (str): Destination folder path
-            progress_callback (callable, optional): Callback for progress updates
-        
-        Raises:
-            Exception: If download fails
-        """
-        if not self.s3_client.is_connected():
-            raise RuntimeError("S3 client is not connected")
-        
-        for i, key in enumerate(file_keys, 1):
-            # Update progress
-            if progress_callback:
-                progress_callback(f"Downloading {i}/{len(file_keys)}: {os.path.basename(key)}")
-            
-            # Create local file path
-            local_filename = os.path.basename(key) if os.path.basename(key) else key.replace('/', '_')
-            local_path = os.path.join(dest_folder, local_filename)
-            
-            # Ensure directory exists
-            os.makedirs(os.path.dirname(local_path), exist_ok=True)
-            
-            # Download file
-            self.s3_client.download_file(key, local_path)
-    
-    def download_files_as_zip(self, file_keys, zip_file_path, progress_callback=None):
-        """
-        Download files and create a zip archive.
-        
-        Args:
-            file_keys (list): List of S3 object keys to download
-            zip_file_path (str): Path for the output zip file
-            progress_callback (callable, optional): Callback for progress updates
-        
-        Raises:
-            Exception: If download or zip creation fails
-        """
-        if not self.s3_client.is_connected():
-            raise RuntimeError("S3 client is not connected")
-        
-        with tempfile.TemporaryDirectory() as temp_dir:
-            # Download files to temporary directory
-            temp_files = []
-            for i, key in enumerate(file_keys, 1):
-                # Update progress
-                if progress_callback:
-                    progress_callback(f"Downloading {i}/{len(file_keys)}: {os.path.basename(key)}")
-                
-                # Create temporary file path
-                local_filename = os.path.basename(key) if os.path.basename(key) else key.replace('/', '_')
-                temp_file_path = os.path.join(temp_dir, local_filename)
-                
-                # Ensure directory exists
-                os.makedirs(os.path.dirname(temp_file_path), exist_ok=True)
-                
-                # Download file
-                self.s3_client.download_file(key, temp_file_path)
-                temp_files.append((temp_file_path, local_filename))
-                
-            # Create zip file
-            if progress_callback:
-                progress_callback("Creating zip archive...")
-            
-            with zipfile.ZipFile(zip_file_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                for temp_file_path, archive_name in temp_files:
-                    zipf.write(temp_file_path, archive_name)
-    
-    def download_files_async(self, file_keys, destination, as_zip=False, 
-                           progress_callback=None, completion_callback=None, error_callback=None):
-        """
-        Download files asynchronously in a separate thread.
-        
-        Args:
-            file_keys (list): List of S3 object keys to download
-            destination (str): Destination folder path or zip file path
-            as_zip (bool): Whether to create a zip archive
-            progress_callback (callable, optional): Callback for progress updates
-            completion_callback (callable, optional): Callback when download completes
-            error_callback (callable, optional): Callback when download fails
-        """
-        def download_thread():
-            try:
-                if as_zip:
-                    self.download_files_as_zip(file_keys, destination, progress_callback)
-                else:
-                    self.download_files_individually(file_keys, destination, progress_callback)
-                
-                if completion_callback:
-                    completion_callback()
-                    
-            except Exception as e:
-                if error_callback:
-                    error_callback(str(e))
-        
-        thread = threading.Thread(target=download_thread)
-        thread.daemon = True
-        thread.start()
-        return thread
+# MIT License
+# 
+# Copyright (c) 2025 S3Ducky
+
+"""
+File download, upload and management operations for S3Ducky.
+"""
+
+import os
+import zipfile
+import tempfile
+import threading
+from .storage import StorageBackend
+from .object_cache import ObjectCache, CacheStats
+from .uploads import Uploader
+from .integrity import VerificationReport, CHECK_MISMATCH
+from .s3_select import SelectQuery, MAX_PREVIEW_ROWS
+from .export import export_listing
+from .object_metadata import restore_objects
+from .download_planner import DownloadPlan, run_plan
+from .prefix_download import download_prefix
+from .copy_objects import Copier, copy_targets, DEFAULT_PART_SIZE as DEFAULT_COPY_PART_SIZE
+from .bulk_delete import bulk_delete, prefix_entries, DEFAULT_CONCURRENCY as DEFAULT_DELETE_CONCURRENCY
+from ..utils.formatters import format_file_size, format_duration
+from ..utils.profiling import profile_phase, PHASE_ZIP
+
+
+# Downloads of an object whose checks keep failing before the job gives up
+MAX_FETCH_ATTEMPTS = 3
+
+
+class FileManager:
+    """
+    Handles file download and upload operations and management.
+    """
+    
+    def __init__(self, s3_client: StorageBackend, object_cache: ObjectCache = None, uploader: Uploader = None,
+                 verify: bool = True, download_concurrency: int = 4, copy_concurrency: int = 16,
+                 copy_part_size: int = DEFAULT_COPY_PART_SIZE,
+                 delete_concurrency: int = DEFAULT_DELETE_CONCURRENCY):
+        self.s3_client = s3_client
+        self.object_cache = object_cache
+        self.uploader = uploader or Uploader(s3_client)
+        self.verify = verify
+        self.download_concurrency = download_concurrency
+        self.copy_concurrency = copy_concurrency
+        self.copy_part_size = copy_part_size
+        self.delete_concurrency = delete_concurrency
+        
+        # Cache statistics of the most recent job (None when caching is off)
+        self.last_cache_stats = None
+        
+        # Verification report of the most recent job (None when verification is off)
+        self.last_verification = None
+        self.last_report_path = None
+        
+    def _fetch(self, key, local_path, report=None):
+        """
+        Download an object, checking it on the way and re-fetching it on a mismatch.
+        
+        Args:
+            key (str): S3 object key
+            local_path (str): Local file path for download
+            report (VerificationReport, optional): Job report; None skips verification
+            
+        Raises:
+            Exception: If the object still fails its checks after MAX_FETCH_ATTEMPTS
+        """
+        if report is None:
+            self.s3_client.download_file(key, local_path)
+            return
+        
+        for attempt in range(1, MAX_FETCH_ATTEMPTS + 1):
+            results = self.s3_client.download_file(key, local_path, verify=True)
+            if CHECK_MISMATCH not in results.values():
+                break
+            print(f"Debug: Verification failed for {key} (attempt {attempt}): {results}")
+        
+        report.add(key, results, attempt)
+        if CHECK_MISMATCH in results.values():
+            raise Exception(f"{key} failed verification after {attempt} attempts")
+        
+    def _download_object(self, key, local_path, cache_stats=None, report=None):
+        """
+        Download one object, serving it from the local object cache when possible.
+        
+        Args:
+            key (str): S3 object key
+            local_path (str): Local file path for download
+            cache_stats (CacheStats, optional): Counters to update
+            report (VerificationReport, optional): Job report to record checks in
+        """
+        # The cache can be turned on or off while a job runs
+        object_cache = self.object_cache
+        if object_cache is None:
+            self._fetch(key, local_path, report)
+            return
+        
+        bucket = self.s3_client.bucket_name
+        info = self.s3_client.head_object(key)
+        if object_cache.fetch(bucket, key, info['etag'], info['size'], local_path):
+            if cache_stats:
+                cache_stats.record_hit(info['size'])
+            if report:
+                report.add(key, {}, 0, cached=True)
+            return
+        
+        self._fetch(key, local_path, report)
+        object_cache.store(bucket, key, info['etag'], local_path)
+        if cache_stats:
+            cache_stats.record_miss()
+    
+    def _get_readable_copy(self, key, temp_path, cache_stats=None, report=None, pins=None):
+        """
+        Get a local path holding an object's content, downloading only on a cache miss.
+        
+        Cached objects are read in place, so zip builds don't copy them first.
+        They stay pinned in the cache until the caller releases them, so
+        later downloads of the same job can't evict them before they are read.
+        
+        Args:
+            pins (list, optional): Receives a release function for each pinned copy
+            
+        Returns:
+            str: Path to read the object from
+        """
+        object_cache = self.object_cache
+        if object_cache is None:
+            self._fetch(key, temp_path, report)
+            return temp_path
+        
+        bucket = self.s3_client.bucket_name
+        info = self.s3_client.head_object(key)
+        cached_path = object_cache.lookup(bucket, key, info['etag'], info['size'], pin=pins is not None)
+        if cached_path:
+            if pins is not None:
+                pins.append(lambda: object_cache.unpin(bucket, key, info['etag']))
+            if cache_stats:
+                cache_stats.record_hit(info['size'])
+            if report:
+                report.add(key, {}, 0, cached=True)
+            return cached_path
+        
+        self._fetch(key, temp_path, report)
+        object_cache.store(bucket, key, info['etag'], temp_path)
+        if cache_stats:
+            cache_stats.record_miss()
+        return temp_path
+    
+    def _start_cache_stats(self):
+        """Reset cache statistics at the start of a job."""
+        self.last_cache_stats = CacheStats() if self.object_cache else None
+        return self.last_cache_stats
+    
+    def _report_cache_stats(self, cache_stats):
+        """Log cache statistics at the end of a job."""
+        if cache_stats:
+            print(f"Debug: {cache_stats.summary()}")
+    
+    def _start_verification(self, job_name):
+        """Start the verification report of a job."""
+        self.last_verification = VerificationReport(job_name) if self.verify else None
+        self.last_report_path = None
+        return self.last_verification
+    
+    def _finish_verification(self, report):
+        """Write the verification report at the end of a job (including a failed one)."""
+        if report:
+            self.last_report_path = report.write()
+            print(f"Debug: {report.summary()} (report: {self.last_report_path})")
+        
+    def _plan_download(self, file_keys, file_infos, progress_callback=None):
+        """
+        Plan a download job from the listing sizes of its objects.
+        
+        Objects keep their folders below the common folder of the
+        selection, so "a/report.csv" and "b/report.csv" both arrive (a
+        selection from one folder arrives flat). Empty, "." and ".."
+        segments are dropped, as in prefix downloads; keys that still map
+        to the same name are downloaded once (the last one selected wins).
+        
+        Args:
+            file_keys (list): List of S3 object keys to download
+            file_infos (list, optional): Listing entries with sizes; keys
+                without one are planned as empty objects
+            progress_callback (callable, optional): Callback for progress updates
+            
+        Returns:
+            tuple: (DownloadPlan, {key: relative "/"-separated local name} in selection order)
+        """
+        common = os.path.commonprefix(list(file_keys))
+        folder = common[:common.rfind('/') + 1]
+        keys_by_name = {}
+        for key in file_keys:
+            parts = [part for part in key[len(folder):].split('/') if part not in ('', '.', '..')]
+            # Folder markers and keys of dots alone become a flat file name
+            name = '/'.join(parts) if parts and not key.endswith('/') else key.replace('/', '_')
+            keys_by_name[name if name.strip('.') else '_' + name] = key
+        names = {key: name for name, key in keys_by_name.items()}
+        names = {key: names[key] for key in file_keys if key in names}
+            
+        sizes = {file_info['key']: file_info.get('size', 0) for file_info in file_infos or ()}
+        rate_limit = 0
+        if self.s3_client.limiter is not None:
+            rate_limit = self.s3_client.limiter.effective_limits()['download'] * 1024
+        plan = DownloadPlan([{'key': key, 'size': sizes.get(key, 0)} for key in names],
+                            workers=self.download_concurrency,
+                            ranged_threshold=self.s3_client.ranged_threshold,
+                            rate_limit=rate_limit)
+        
+        message = (f"Downloading {plan.count} files ({format_file_size(plan.total_bytes)}), "
+                   f"about {format_duration(plan.estimate_seconds())}")
+        print(f"Debug: {message}")
+        if progress_callback:
+            progress_callback(message + "...")
+        return plan, names
+    
+    def download_files_individually(self, file_keys, dest_folder, progress_callback=None, file_infos=None):
+        """
+        Download files individually to the destination folder.
+        
+        Objects are downloaded in parallel, largest first (see DownloadPlan).
+        
+        Args:
+            file_keys (list): List of S3 object keys to download
+            dest_folder (str): Destination folder path
+            progress_callback (callable, optional): Callback for progress updates
+            file_infos (list, optional): Listing entries of the objects, used to plan by size
+        
+        Raises:
+            Exception: If download fails
+        """
+        if not self.s3_client.is_connected():
+            raise RuntimeError("S3 client is not connected")
+        
+        cache_stats = self._start_cache_stats()
+        report = self._start_verification(f"Download to {dest_folder}")
+        plan, names = self._plan_download(file_keys, file_infos, progress_callback)
+        os.makedirs(dest_folder, exist_ok=True)
+        
+        def download(file_info):
+            local_path = os.path.join(dest_folder, *names[file_info['key']].split('/'))
+            os.makedirs(os.path.dirname(local_path), exist_ok=True)
+            self._download_object(file_info['key'], local_path, cache_stats, report)
+            
+        try:
+            run_plan(plan, download, progress_callback)
+        finally:
+            self._finish_verification(report)
+        
+        self._report_cache_stats(cache_stats)
+    
+    def download_files_as_zip(self, file_keys, zip_file_path, progress_callback=None, file_infos=None):
+        """
+        Download files and create a zip archive.
+        
+        Objects are downloaded in parallel, largest first (see DownloadPlan),
+        and added to the archive in selection order.
+        
+        Args:
+            file_keys (list): List of S3 object keys to download
+            zip_file_path (str): Path for the output zip file
+            progress_callback (callable, optional): Callback for progress updates
+            file_infos (list, optional): Listing entries of the objects, used to plan by size
+        
+        Raises:
+            Exception: If download or zip creation fails
+        """
+        if not self.s3_client.is_connected():
+            raise RuntimeError("S3 client is not connected")
+        
+        cache_stats = self._start_cache_stats()
+        report = self._start_verification(f"Download to {zip_file_path}")
+        plan, names = self._plan_download(file_keys, file_infos, progress_callback)
+        # Release functions of the cached copies read in place, held until the zip is written
+        pins = []
+        try:
+            with tempfile.TemporaryDirectory() as temp_dir:
+                # Download files to temporary directory (or read them straight from the object cache)
+                source_paths = {}
+                
+                def download(file_info):
+                    key = file_info['key']
+                    temp_file_path = os.path.join(temp_dir, *names[key].split('/'))
+                    os.makedirs(os.path.dirname(temp_file_path), exist_ok=True)
+                    source_paths[key] = self._get_readable_copy(key, temp_file_path, cache_stats, report, pins)
+                    
+                run_plan(plan, download, progress_callback)
+                    
+                # Create zip file
+                if progress_callback:
+                    progress_callback("Creating zip archive...")
+                    
+                with profile_phase(PHASE_ZIP), \
+                        zipfile.ZipFile(zip_file_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
+                    for key, archive_name in names.items():
+                        zipf.write(source_paths[key], archive_name)
+        finally:
+            for release in pins:
+                release()
+            self._finish_verification(report)
+            
+        self._report_cache_stats(cache_stats)
+    
+    def download_files_async(self, file_keys, destination, as_zip=False, 
+                           progress_callback=None, completion_callback=None, error_callback=None,
+                           file_infos=None):
+        """
+        Download files asynchronously in a separate thread.
+        
+        Args:
+            file_keys (list): List of S3 object keys to download
+            destination (str): Destination folder path or zip file path
+            as_zip (bool): Whether to create a zip archive
+            progress_callback (callable, optional): Callback for progress updates
+            completion_callback (callable, optional): Callback when download completes
+            error_callback (callable, optional): Callback when download fails
+            file_infos (list, optional): Listing entries of the objects, used to plan by size
+        """
+        def download_thread():
+            try:
+                if as_zip:
+                    self.download_files_as_zip(file_keys, destination, progress_callback, file_infos)
+                else:
+                    self.download_files_individually(file_keys, destination, progress_callback, file_infos)
+                
+                if completion_callback:
+                    completion_callback()
+                    
+            except Exception as e:
+                if error_callback:
+                    error_callback(str(e))
+        
+        thread = threading.Thread(target=download_thread)
+        thread.daemon = True
+        thread.start()
+        return thread
+    
+    def download_prefix_async(self, prefix, dest_folder, progress_callback=None, completion_callback=None,
+                              error_callback=None):
+        """
+        Download everything below a prefix in a separate thread, downloading while it is listed.
+        
+        Keys keep their path below the prefix under the destination folder.
+        
+        Args:
+            prefix (str): Key prefix to download ('' for the whole listing)
+            dest_folder (str): Destination folder path
+            progress_callback (callable, optional): Callback for progress updates
+            completion_callback (callable, optional): Called with (objects, bytes, skipped archived keys)
+            error_callback (callable, optional): Callback when the download fails
+        """
+        def download_thread():
+            try:
+                if not self.s3_client.is_connected():
+                    raise RuntimeError("S3 client is not connected")
+                
+                cache_stats = self._start_cache_stats()
+                report = self._start_verification(f"Download of {prefix or 'bucket root'} to {dest_folder}")
+                try:
+                    result = download_prefix(
+                        self.s3_client, prefix, dest_folder,
+                        lambda key, local_path: self._download_object(key, local_path, cache_stats, report),
+                        workers=self.download_concurrency,
+                        progress_callback=progress_callback
+                    )
+                finally:
+                    self._finish_verification(report)
+                self._report_cache_stats(cache_stats)
+                
+                if completion_callback:
+                    completion_callback(*result)
+                    
+            except Exception as e:
+                if error_callback:
+                    error_callback(str(e))
+        
+        thread = threading.Thread(target=download_thread)
+        thread.daemon = True
+        thread.start()
+        return thread
+    
+    def copy_objects_async(self, file_infos, dest_prefix='', move=False, dest_factory=None,
+                           progress_callback=None, completion_callback=None, error_callback=None,
+                           file_callback=None, removed_callback=None):
+        """
+        Copy or move objects server-side in a separate thread.
+        
+        Keys keep their path below the deepest folder holding all of them.
+        
+        Args:
+            file_infos (list): Listing entries of the objects
+            dest_prefix (str): Key prefix to copy under
+            move (bool): Delete each source once it is copied
+            dest_factory (callable, optional): Returns the connected backend of
+                another destination bucket (called in the copy thread); defaults
+                to this bucket
+            progress_callback (callable, optional): Callback for progress updates
+            completion_callback (callable, optional): Called with the CopyResult
+            error_callback (callable, optional): Callback when the job fails
+            file_callback (callable, optional): Called with (destination location,
+                listing entry) of each copy, see StorageBackend.location
+            removed_callback (callable, optional): Called with each source key a move deleted
+        """
+        def copy_thread():
+            try:
+                dest = dest_factory() if dest_factory else self.s3_client
+                
+                def copied(entry):
+                    if file_callback:
+                        file_callback(dest.location, entry)
+                
+                copier = Copier(self.s3_client, dest, concurrency=self.copy_concurrency,
+                                part_size=self.copy_part_size)
+                result = copier.copy(copy_targets(file_infos, dest_prefix), move=move,
+                                     progress_callback=progress_callback, file_callback=copied,
+                                     removed_callback=removed_callback)
+                
+                if completion_callback:
+                    completion_callback(result)
+                    
+            except Exception as e:
+                if error_callback:
+                    error_callback(str(e))
+        
+        thread = threading.Thread(target=copy_thread)
+        thread.daemon = True
+        thread.start()
+        return thread
+    
+    def delete_objects_async(self, file_infos=None, prefix=None, dry_run=False, progress_callback=None,
+                             completion_callback=None, error_callback=None, removed_callback=None):
+        """
+        Delete a selection or everything below a prefix in a separate thread.
+        
+        Keys go out in DeleteObjects batches of 1,000, several at a time; a
+        prefix is deleted while it is listed.
+        
+        Args:
+            file_infos (list, optional): Listing entries of the objects to delete
+            prefix (str, optional): Key prefix to delete instead ('' for the whole listing)
+            dry_run (bool): Only count the objects and their bytes
+            progress_callback (callable, optional): Callback for progress updates
+            completion_callback (callable, optional): Called with the DeleteResult
+            error_callback (callable, optional): Callback when the job fails
+            removed_callback (callable, optional): Called with the keys of each deleted batch
+        """
+        def delete_thread():
+            try:
+                if not self.s3_client.is_connected():
+                    raise RuntimeError("S3 client is not connected")
+                
+                targets = file_infos if prefix is None else prefix_entries(self.s3_client, prefix)
+                result = bulk_delete(self.s3_client, targets, concurrency=self.delete_concurrency,
+                                     dry_run=dry_run, progress_callback=progress_callback,
+                                     deleted_callback=removed_callback)
+                
+                if completion_callback:
+                    completion_callback(result)
+                    
+            except Exception as e:
+                if error_callback:
+                    error_callback(str(e))
+        
+        thread = threading.Thread(target=delete_thread)
+        thread.daemon = True
+        thread.start()
+        return thread
+    
+    def upload_files_async(self, paths, dest_prefix='', progress_callback=None, completion_callback=None,
+                           error_callback=None, file_callback=None):
+        """
+        Upload files and folders asynchronously in a separate thread.
+        
+        Args:
+            paths (list): Local file and folder paths
+            dest_prefix (str): Key prefix to upload under
+            progress_callback (callable, optional): Callback for progress updates
+            completion_callback (callable, optional): Called with the listing entries
+                of all uploaded objects when the upload completes
+            error_callback (callable, optional): Callback when upload fails
+            file_callback (callable, optional): Called with the listing entry of
+                each object as soon as it is uploaded
+        """
+        def upload_thread():
+            try:
+                uploaded = self.uploader.upload(paths, dest_prefix, progress_callback, file_callback)
+                
+                if completion_callback:
+                    completion_callback(uploaded)
+                    
+            except Exception as e:
+                if error_callback:
+                    error_callback(str(e))
+        
+        thread = threading.Thread(target=upload_thread)
+        thread.daemon = True
+        thread.start()
+        return thread
+    
+    def export_listing_async(self, path, progress_callback=None, completion_callback=None,
+                             error_callback=None):
+        """
+        Stream the bucket listing to a CSV, JSON Lines or Parquet file in a separate thread.
+        
+        Args:
+            path (str): Output file path (the extension picks the format)
+            progress_callback (callable, optional): Callback for progress updates
+            completion_callback (callable, optional): Called with the number of objects exported
+            error_callback (callable, optional): Callback when the export fails
+        """
+        def export_thread():
+            try:
+                count = export_listing(self.s3_client, path, progress_callback=progress_callback)
+                
+                if completion_callback:
+                    completion_callback(count)
+                    
+            except Exception as e:
+                if error_callback:
+                    error_callback(str(e))
+        
+        thread = threading.Thread(target=export_thread)
+        thread.daemon = True
+        thread.start()
+        return thread
+    
+    def restore_objects_async(self, keys, days=7, tier='Standard', tiering_keys=(), progress_callback=None,
+                              completion_callback=None, error_callback=None):
+        """
+        Request restores of archived objects asynchronously in a separate thread.
+        
+        Args:
+            keys (list): Keys of archived objects
+            days (int): Days the restored copies are kept
+            tier (str): 'Expedited', 'Standard' or 'Bulk'
+            tiering_keys (iterable): Keys in an Intelligent-Tiering archive tier
+            progress_callback (callable, optional): Callback for progress updates
+            completion_callback (callable, optional): Called with (keys restoring now,
+                keys already being restored, {key: error} for failed requests)
+            error_callback (callable, optional): Callback when the job fails
+        """
+        def restore_thread():
+            try:
+                started, in_progress, failed = restore_objects(
+                    self.s3_client, keys, days, tier, progress_callback=progress_callback,
+                    tiering_keys=tiering_keys)
+                
+                if completion_callback:
+                    completion_callback(started, in_progress, failed)
+                    
+            except Exception as e:
+                if error_callback:
+                    error_callback(str(e))
+        
+        thread = threading.Thread(target=restore_thread)
+        thread.daemon = True
+        thread.start()
+        return thread
+    
+    def query_async(self, key, expression, save_path=None, rows_callback=None, completion_callback=None,
+                    error_callback=None, should_stop=None):
+        """
+        Run an S3 Select query asynchronously in a separate thread.
+        
+        Without save_path the rows are handed to rows_callback as they arrive,
+        and the query is stopped after MAX_PREVIEW_ROWS rows.
+        
+        Args:
+            key (str): S3 object key
+            expression (str): SQL expression
+            save_path (str, optional): Write every result row to this file instead
+            rows_callback (callable, optional): Called with each batch of rows (dicts)
+            completion_callback (callable, optional): Called with (rows, stats, truncated):
+                rows shown or written, S3's byte counts and whether the preview was cut off
+            error_callback (callable, optional): Callback when the query fails
+            should_stop (callable, optional): Returns True to abandon the query
+        """
+        def query_thread():
+            try:
+                query = SelectQuery(self.s3_client, key, expression)
+                truncated = False
+                if save_path:
+                    row_count = query.save(save_path, should_stop)
+                else:
+                    row_count = 0
+                    for rows in query.iter_batches(should_stop):
+                        rows = rows[:MAX_PREVIEW_ROWS - row_count]
+                        row_count += len(rows)
+                        if rows_callback:
+                            rows_callback(rows)
+                        if row_count >= MAX_PREVIEW_ROWS:
+                            truncated = True
+                            break
+                
+                if completion_callback:
+                    completion_callback(row_count, query.stats, truncated)
+                    
+            except Exception as e:
+                if error_callback:
+                    error_callback(str(e))
+        
+        thread = threading.Thread(target=query_thread)
+        thread.daemon = True
+        thread.start()
+        return thread
@@ -0,0 +1,371 @@
+# MIT License
+# 
+# Copyright (c) 2025 S3Ducky
+
+"""
+Integrity checks computed while objects stream to disk for S3Ducky.
+
+Every chunk is hashed as it is written, so verifying a download costs no
+extra reads. The checks are:
+
+- MD5 against a single-part ETag
+- Per-part MD5s against a multipart ETag ("<md5 of part md5s>-<parts>")
+- The object's own checksum (SHA256, SHA1, CRC32 or CRC32C) when it was
+  uploaded with one, as a full-object or composite ("...-<parts>") value
+
+Parallel ranged downloads hash each part on its own and combine the part
+digests at the end, which covers the multipart values only.
+
+Multipart values assume every part but the last has the same size. When
+that could not be proven, a multipart value that doesn't match is
+reported as skipped rather than as a mismatch.
+
+CRC32C needs the optional crc32c package.
+"""
+
+import os
+import json
+import zlib
+import base64
+import hashlib
+import threading
+from datetime import datetime
+
+try:
+    import crc32c
+    CRC32C_AVAILABLE = True
+except ImportError:
+    CRC32C_AVAILABLE = False
+
+
+REPORTS_DIR = os.path.join(os.path.expanduser('~'), '.s3ducky', 'reports')
+
+# Check outcomes
+CHECK_OK = 'ok'
+CHECK_MISMATCH = 'mismatch'
+CHECK_SKIPPED = 'skipped'
+
+
+class _Crc:
+    """hashlib-style wrapper around a CRC function."""
+    
+    def __init__(self, func):
+        self.func = func
+        self.value = 0
+        
+    def update(self, data):
+        self.value = self.func(data, self.value)
+        
+    def digest(self):
+        return self.value.to_bytes(4, 'big')
+
+
+def _new_checksum(algorithm):
+    """Create a hash object for an S3 checksum algorithm, or None if unsupported here."""
+    if algorithm == 'SHA256':
+        return hashlib.sha256()
+    if algorithm == 'SHA1':
+        return hashlib.sha1()
+    if algorithm == 'CRC32':
+        return _Crc(zlib.crc32)
+    if algorithm == 'CRC32C' and CRC32C_AVAILABLE:
+        return _Crc(crc32c.crc32c)
+    return None
+
+
+def _split_part_count(value):
+    """Split "<digest>-<parts>" into (digest, parts); parts is None for whole-object values."""
+    digest, _, parts = value.rpartition('-')
+    if digest and parts.isdigit():
+        return digest, int(parts)
+    return value, None
+
+
+def _outcome(ok, unproven=False):
+    """Check result for a comparison; a failed one that rests on assumed part sizes proves nothing."""
+    if ok:
+        return CHECK_OK
+    return CHECK_SKIPPED if unproven else CHECK_MISMATCH
+
+
+class _Digest:
+    """
+    One expected value checked against a whole-object or per-part hash.
+    """
+    
+    def __init__(self, name, new_hash, expected, encode, part_count=None):
+        self.name = name
+        self.new_hash = new_hash
+        self.expected = expected
+        self.encode = encode
+        self.part_count = part_count
+        self.current = new_hash()
+        self.part_digests = []
+        
+    def update(self, data):
+        self.current.update(data)
+        
+    def end_part(self):
+        """Close the current part (multipart values only)."""
+        self.part_digests.append(self.current.digest())
+        self.current = self.new_hash()
+        
+    def result(self):
+        if self.part_count is None:
+            return self.encode(self.current.digest()) == self.expected
+        combined = self.new_hash()
+        for digest in self.part_digests:
+            combined.update(digest)
+        return (len(self.part_digests) == self.part_count
+                and self.encode(combined.digest()) == self.expected)
+
+
+class StreamVerifier:
+    """
+    Feeds downloaded chunks to every applicable check.
+    """
+    
+    def __init__(self, etag, size, part_size=None, checksums=None, etag_is_md5=True, sizes_proven=True):
+        """
+        Args:
+            etag (str): Object ETag (without quotes)
+            size (int): Object size in bytes
+            part_size (int, optional): Size of each part for multipart objects
+            checksums (dict, optional): {algorithm: base64 value} stored with the object
+            etag_is_md5 (bool): False for SSE-KMS/SSE-C objects, whose ETag is not an MD5
+            sizes_proven (bool): False if the parts are only assumed to be part_size
+        """
+        self.size = size
+        self.part_size = part_size
+        self.sizes_proven = sizes_proven
+        self.digests = []
+        self.skipped = []
+        self.offset = 0
+        self.part_remaining = part_size or 0
+        
+        etag_value, etag_parts = _split_part_count(etag or '')
+        if not etag_value or not etag_is_md5 or (etag_parts and not part_size):
+            self.skipped.append('ETag')
+        else:
+            self.digests.append(_Digest('ETag', hashlib.md5, etag_value,
+                                        lambda digest: digest.hex(), etag_parts))
+                                        
+        for algorithm, value in (checksums or {}).items():
+            value, parts = _split_part_count(value)
+            if _new_checksum(algorithm) is None or (parts and not part_size):
+                self.skipped.append(algorithm)
+                continue
+            self.digests.append(_Digest(algorithm, lambda a=algorithm: _new_checksum(a), value,
+                                        lambda digest: base64.b64encode(digest).decode('ascii'), parts))
+                                        
+        self._multipart = [d for d in self.digests if d.part_count is not None]
+        
+    def update(self, data):
+        """
+        Hash the next chunk of the object.
+        
+        Args:
+            data (bytes): Bytes following everything passed so far
+        """
+        if not self._multipart:
+            for digest in self.digests:
+                digest.update(data)
+            self.offset += len(data)
+            return
+            
+        view = memoryview(data)
+        while len(view):
+            take = min(len(view), self.part_remaining)
+            piece = view[:take]
+            for digest in self.digests:
+                digest.update(piece)
+            view = view[take:]
+            self.offset += take
+            self.part_remaining -= take
+            if self.part_remaining == 0:
+                for digest in self._multipart:
+                    digest.end_part()
+                self.part_remaining = self.part_size
+                
+    def finish(self):
+        """
+        Finish hashing and compare against the expected values.
+        
+        Returns:
+            dict: {check name: 'ok', 'mismatch' or 'skipped'}
+        """
+        # Close a short final part
+        if self._multipart and self.part_remaining != self.part_size and self.offset:
+            for digest in self._multipart:
+                digest.end_part()
+                
+        results = {name: CHECK_SKIPPED for name in self.skipped}
+        for digest in self.digests:
+            ok = digest.result() and self.offset == self.size
+            unproven = digest.part_count is not None and not self.sizes_proven and self.offset == self.size
+            results[digest.name] = _outcome(ok, unproven)
+        return results
+
+
+class PartVerifier:
+    """
+    Checks multipart values from per-part digests, computed in any order.
+    
+    Used when parts are downloaded in parallel: each range worker hashes its
+    own part and hands the digests over, and the combined values are
+    compared at the end. Whole-object values can't be checked this way and
+    are skipped.
+    """
+    
+    def __init__(self, etag, size, part_count, checksums=None, etag_is_md5=True, sizes_proven=True):
+        """
+        Args:
+            etag (str): Object ETag (without quotes)
+            size (int): Object size in bytes
+            part_count (int): Number of parts the object was uploaded in
+            checksums (dict, optional): {algorithm: base64 value} stored with the object
+            etag_is_md5 (bool): False for SSE-KMS/SSE-C objects
+            sizes_proven (bool): False if the ranges are only assumed to match the parts
+        """
+        self.size = size
+        self.part_count = part_count
+        self.sizes_proven = sizes_proven
+        self.expected = {}
+        self.new_hashes = {}
+        self.skipped = []
+        self.parts = {}
+        self.received = 0
+        self._lock = threading.Lock()
+        
+        etag_value, etag_parts = _split_part_count(etag or '')
+        if etag_is_md5 and etag_parts == part_count:
+            self.expected['ETag'] = (etag_value, lambda digest: digest.hex())
+            self.new_hashes['ETag'] = hashlib.md5
+        else:
+            self.skipped.append('ETag')
+        
+        for algorithm, value in (checksums or {}).items():
+            value, parts = _split_part_count(value)
+            if parts != part_count or _new_checksum(algorithm) is None:
+                self.skipped.append(algorithm)
+                continue
+            self.expected[algorithm] = (value, lambda digest: base64.b64encode(digest).decode('ascii'))
+            self.new_hashes[algorithm] = lambda a=algorithm: _new_checksum(a)
+    
+    def part_hashes(self):
+        """
+        Create fresh hash objects for one part.
+        
+        Returns:
+            dict: {check name: hash object}
+        """
+        return {name: new_hash() for name, new_hash in self.new_hashes.items()}
+    
+    def add_part(self, part_number, hashes, nbytes):
+        """
+        Hand over the finished hashes of one part.
+        
+        Args:
+            part_number (int): 1-based part number
+            hashes (dict): Hash objects from part_hashes(), fed with the part's bytes
+            nbytes (int): Bytes in the part
+        """
+        with self._lock:
+            self.parts[part_number] = {name: h.digest() for name, h in hashes.items()}
+            self.received += nbytes
+    
+    def finish(self):
+        """
+        Combine the part digests and compare against the expected values.
+        
+        Returns:
+            dict: {check name: 'ok', 'mismatch' or 'skipped'}
+        """
+        results = {name: CHECK_SKIPPED for name in self.skipped}
+        complete = len(self.parts) == self.part_count and self.received == self.size
+        for name, (expected, encode) in self.expected.items():
+            combined = self.new_hashes[name]()
+            for part_number in range(1, self.part_count + 1):
+                if part_number in self.parts:
+                    combined.update(self.parts[part_number][name])
+            ok = complete and encode(combined.digest()) == expected
+            results[name] = _outcome(ok, complete and not self.sizes_proven)
+        return results
+
+
+class VerificationReport:
+    """
+    Per-job record of what was verified, re-fetched or failed.
+    """
+    
+    def __init__(self, job_name):
+        self.job_name = job_name
+        self.started = datetime.now()
+        self.entries = []
+        
+    def add(self, key, results, attempts, cached=False):
+        """
+        Record the outcome for one object.
+        
+        Args:
+            key (str): S3 object key
+            results (dict): Check results of the final attempt
+            attempts (int): Downloads needed (more than 1 means a re-fetch)
+            cached (bool): Served from the local object cache (verified when stored)
+        """
+        if cached:
+            status = 'cached'
+        elif CHECK_MISMATCH in results.values():
+            status = 'failed'
+        elif CHECK_OK not in results.values():
+            status = 'unverified'
+        else:
+            status = 'verified'
+        self.entries.append({'key': key, 'status': status, 'attempts': attempts, 'checks': results})
+        
+    def counts(self):
+        """Count objects per status."""
+        counts = {}
+        for entry in self.entries:
+            counts[entry['status']] = counts.get(entry['status'], 0) + 1
+        return counts
+        
+    def summary(self):
+        """Get a one-line summary for status messages."""
+        counts = self.counts()
+        refetched = sum(1 for entry in self.entries if entry['attempts'] > 1)
+        text = f"Verified: {counts.get('verified', 0)}"
+        if counts.get('unverified'):
+            text += f", {counts['unverified']} unverifiable"
+        if refetched:
+            text += f", {refetched} re-fetched"
+        if counts.get('failed'):
+            text += f", {counts['failed']} FAILED"
+        return text
+        
+    def write(self, reports_dir=REPORTS_DIR):
+        """
+        Write the report as JSON.
+        
+        Returns:
+            str or None: Report path, or None if it could not be written
+        """
+        stem = os.path.join(reports_dir, f"verify-{self.started.strftime('%Y%m%d-%H%M%S')}")
+        path = stem + '.json'
+        try:
+            os.makedirs(reports_dir, exist_ok=True)
+            suffix = 1
+            while os.path.exists(path):
+                path = f"{stem}-{suffix}.json"
+                suffix += 1
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump({
+                    'job': self.job_name,
+                    'started': self.started.isoformat(timespec='seconds'),
+                    'counts': self.counts(),
+                    'objects': self.entries
+                }, f, indent=2)
+            return path
+        except Exception as e:
+            print(f"Debug: Failed to write verification report: {e}")
+            return None
@@ -0,0 +1,329 @@
+# MIT License
+# 
+# Copyright (c) 2025 S3Ducky
+
+"""
+S3 Inventory reports as a listing source for S3Ducky.
+
+Reads a manifest.json (local or s3://bucket/key) and streams its CSV.gz,
+ORC or Parquet data files in fixed-size batches, so huge buckets can be
+listed without any LIST requests and without holding a whole data file in
+memory. ORC and Parquet need pyarrow; CSV uses pyarrow's streaming reader
+when it is installed and the csv module otherwise.
+
+With pyarrow each batch is filtered (old versions, delete markers, other
+prefixes) and converted with pyarrow compute kernels and handed on as a
+ColumnPage, so no per-object Python dictionary is built on the way to the
+listing store.
+"""
+
+import os
+import io
+import csv
+import gzip
+import json
+import tempfile
+from datetime import datetime, timezone
+from urllib.parse import unquote_plus
+from .listing_store import ColumnPage
+
+try:
+    import pyarrow
+    import pyarrow.csv as pa_csv
+    import pyarrow.compute as pc
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+
+# Rows converted to listing entries per batch
+BATCH_ROWS = 50000
+
+# Stand-in modification time for rows without one
+EPOCH = datetime.fromtimestamp(0, timezone.utc)
+
+
+def parse_s3_url(url):
+    """
+    Split an s3://bucket/key URL.
+    
+    Args:
+        url (str): S3 URL
+        
+    Returns:
+        tuple: (bucket, key)
+    """
+    bucket, _, key = url[len('s3://'):].partition('/')
+    return bucket, key
+
+
+def _parse_timestamp(value):
+    """Convert an inventory LastModifiedDate (ISO string or timestamp) to an aware datetime."""
+    if value is None or value == '':
+        return EPOCH
+    if isinstance(value, datetime):
+        return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+
+def _column(batch, *names):
+    """Get the first of some column names a pyarrow batch has, or None."""
+    for name in names:
+        index = batch.schema.get_field_index(name)
+        if index >= 0:
+            return batch.column(index)
+    return None
+
+
+def _blank_to_null(array):
+    """Treat empty strings (CSV's missing values) as nulls."""
+    if pyarrow.types.is_string(array.type):
+        return pc.if_else(pc.equal(array, ''), None, array)
+    return array
+
+
+def _flag_is(array, value):
+    """Mask of rows whose boolean (or 'true'/'false' string) column equals value."""
+    text = pc.utf8_lower(pc.cast(array, pyarrow.string()))
+    return pc.fill_null(pc.equal(text, value), False)
+
+
+class InventorySource:
+    """
+    Listing source backed by an S3 Inventory report.
+    """
+    
+    def __init__(self, manifest_source, top_up=False):
+        """
+        Args:
+            manifest_source (str): Path to a local manifest.json or an s3:// URL
+            top_up (bool): Also LIST keys sorting after the last inventoried key,
+                to pick up objects written since the report (works best for
+                time-ordered key layouts such as date-partitioned logs)
+        """
+        self.manifest_source = manifest_source
+        self.top_up = top_up
+        self.manifest = None
+        self.last_key = None
+        
+    def load_manifest(self, s3_client):
+        """
+        Read and validate the manifest.
+        
+        Args:
+            s3_client: boto3 S3 client used for s3:// sources
+            
+        Returns:
+            dict: Parsed manifest
+        """
+        if self.manifest_source.startswith('s3://'):
+            bucket, key = parse_s3_url(self.manifest_source)
+            body = s3_client.get_object(Bucket=bucket, Key=key)['Body'].read()
+            manifest = json.loads(body)
+        else:
+            with open(self.manifest_source, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+                
+        file_format = manifest.get('fileFormat', '').upper()
+        if file_format not in ('CSV', 'ORC', 'PARQUET'):
+            raise ValueError(f"Unsupported inventory format: {manifest.get('fileFormat')}")
+        if file_format != 'CSV' and not PYARROW_AVAILABLE:
+            raise RuntimeError(f"Reading {manifest['fileFormat']} inventories requires pyarrow")
+            
+        self.manifest = manifest
+        return manifest
+        
+    def _open_data_file(self, s3_client, file_entry):
+        """
+        Open one inventory data file, preferring a local copy next to the manifest.
+        
+        Returns:
+            file object: Binary stream (a seekable temp file for ORC/Parquet from S3)
+        """
+        if not self.manifest_source.startswith('s3://'):
+            manifest_dir = os.path.dirname(os.path.abspath(self.manifest_source))
+            for candidate in (os.path.join(manifest_dir, file_entry['key']),
+                              os.path.join(manifest_dir, 'data', os.path.basename(file_entry['key'])),
+                              os.path.join(manifest_dir, os.path.basename(file_entry['key']))):
+                if os.path.exists(candidate):
+                    return open(candidate, 'rb')
+                    
+        bucket = self.manifest['destinationBucket'].split(':::')[-1]
+        if self.manifest['fileFormat'].upper() == 'CSV':
+            return s3_client.get_object(Bucket=bucket, Key=file_entry['key'])['Body']
+            
+        # Columnar formats need random access
+        temp_file = tempfile.TemporaryFile()
+        s3_client.download_fileobj(bucket, file_entry['key'], temp_file)
+        temp_file.seek(0)
+        return temp_file
+        
+    def _csv_batches(self, stream, columns):
+        """
+        Yield batches of a gzipped CSV stream: pyarrow record batches when
+        pyarrow is installed, else column dictionaries of up to BATCH_ROWS rows.
+        """
+        if PYARROW_AVAILABLE:
+            options = pa_csv.ReadOptions(column_names=columns, block_size=8 * 1024 * 1024)
+            convert = pa_csv.ConvertOptions(column_types={name: pyarrow.string() for name in columns})
+            yield from pa_csv.open_csv(pyarrow.input_stream(stream, compression='gzip'),
+                                       read_options=options, convert_options=convert)
+            return
+            
+        text = io.TextIOWrapper(gzip.GzipFile(fileobj=stream), encoding='utf-8', newline='')
+        rows = []
+        for row in csv.reader(text):
+            rows.append(row)
+            if len(rows) >= BATCH_ROWS:
+                yield dict(zip(columns, zip(*rows)))
+                rows = []
+        if rows:
+            yield dict(zip(columns, zip(*rows)))
+            
+    def _columnar_batches(self, stream):
+        """Yield pyarrow record batches from an ORC or Parquet file."""
+        if self.manifest['fileFormat'].upper() == 'PARQUET':
+            import pyarrow.parquet as pq
+            yield from pq.ParquetFile(stream).iter_batches(batch_size=BATCH_ROWS)
+        else:
+            import pyarrow.orc as orc
+            orc_file = orc.ORCFile(stream)
+            for stripe in range(orc_file.nstripes):
+                yield orc_file.read_stripe(stripe)
+                
+    def _to_page(self, batch, prefix, is_csv):
+        """
+        Filter and convert a pyarrow batch with compute kernels, dropping old
+        versions, delete markers and keys outside the prefix.
+        
+        Returns:
+            ColumnPage or None: The batch's listing entries, None if none are left
+        """
+        keys = _column(batch, 'Key', 'key')
+        if keys is None or len(keys) == 0:
+            return None
+            
+        drop = None
+        is_latest = _column(batch, 'IsLatest', 'is_latest')
+        if is_latest is not None:
+            drop = _flag_is(is_latest, 'false')
+        delete_marker = _column(batch, 'IsDeleteMarker', 'is_delete_marker')
+        if delete_marker is not None:
+            marker = _flag_is(delete_marker, 'true')
+            drop = marker if drop is None else pc.or_(drop, marker)
+        if drop is not None:
+            batch = batch.filter(pc.invert(drop))
+            keys = _column(batch, 'Key', 'key')
+            
+        if is_csv:
+            # CSV keys are URL-encoded; only the few with escapes need Python
+            encoded = pc.match_substring_regex(keys, '[%+]')
+            if pc.any(encoded).as_py():
+                keys = pyarrow.array([unquote_plus(key) if escaped else key
+                                      for key, escaped in zip(keys.to_pylist(), encoded.to_pylist())],
+                                     pyarrow.string())
+        if prefix:
+            in_prefix = pc.starts_with(keys, prefix)
+            batch = batch.filter(in_prefix)
+            keys = keys.filter(in_prefix)
+        if len(keys) == 0:
+            return None
+            
+        sizes = _column(batch, 'Size', 'size')
+        sizes = pc.fill_null(pc.cast(_blank_to_null(sizes), pyarrow.int64()), 0) if sizes is not None \
+            else pyarrow.nulls(len(keys), pyarrow.int64()).fill_null(0)
+            
+        modified = _column(batch, 'LastModifiedDate', 'last_modified_date')
+        if modified is not None:
+            modified = pc.cast(_blank_to_null(modified), pyarrow.timestamp('us', tz='UTC'))
+            mtimes = pc.divide(pc.cast(pc.fill_null(pc.cast(modified, pyarrow.int64()), 0),
+                                       pyarrow.float64()), 1e6)
+        else:
+            mtimes = pyarrow.nulls(len(keys), pyarrow.float64()).fill_null(0.0)
+            
+        etags = _column(batch, 'ETag', 'e_tag')
+        etags = pc.utf8_trim(pc.fill_null(pc.cast(etags, pyarrow.string()), ''), '"') if etags is not None \
+            else pyarrow.nulls(len(keys), pyarrow.string()).fill_null('')
+            
+        storage = _column(batch, 'StorageClass', 'storage_class')
+        if storage is not None:
+            storage = pc.fill_null(_blank_to_null(pc.cast(storage, pyarrow.string())), 'STANDARD').to_pylist()
+            
+        return ColumnPage(keys.to_pylist(), sizes.to_pylist(), mtimes.to_pylist(), etags.to_pylist(), storage)
+        
+    def _to_entries(self, columns, prefix, is_csv):
+        """
+        Turn a column dictionary (the csv module fallback) into listing
+        entries, dropping old versions and delete markers.
+        """
+        keys = columns.get('Key') or columns.get('key')
+        if not keys:
+            return []
+        sizes = columns.get('Size') or columns.get('size')
+        modified = columns.get('LastModifiedDate') or columns.get('last_modified_date')
+        etags = columns.get('ETag') or columns.get('e_tag') or [''] * len(keys)
+        storage = columns.get('StorageClass') or columns.get('storage_class')
+        is_latest = columns.get('IsLatest') or columns.get('is_latest')
+        delete_marker = columns.get('IsDeleteMarker') or columns.get('is_delete_marker')
+        
+        entries = []
+        for i, key in enumerate(keys):
+            if is_latest is not None and str(is_latest[i]).lower() == 'false':
+                continue
+            if delete_marker is not None and str(delete_marker[i]).lower() == 'true':
+                continue
+            if is_csv:
+                key = unquote_plus(key)
+            if prefix and not key.startswith(prefix):
+                continue
+                
+            entry = {
+                'key': key,
+                'size': int(sizes[i] or 0),
+                'modified': _parse_timestamp(modified[i]) if modified else EPOCH,
+                'etag': (etags[i] or '').strip('"')
+            }
+            if storage is not None:
+                entry['storage_class'] = storage[i] or 'STANDARD'
+            entries.append(entry)
+        return entries
+        
+    def iter_pages(self, s3_client, prefix=None):
+        """
+        Stream the inventory as pages of listing entries.
+        
+        Pages follow the order of the data files, not key order.
+        
+        Args:
+            s3_client: boto3 S3 client
+            prefix (str, optional): Only include keys under this prefix
+            
+        Yields:
+            ColumnPage or list: Listing entries of each batch (a ColumnPage
+                when read with pyarrow)
+        """
+        if self.manifest is None:
+            self.load_manifest(s3_client)
+            
+        is_csv = self.manifest['fileFormat'].upper() == 'CSV'
+        columns = [name.strip() for name in self.manifest.get('fileSchema', '').split(',')]
+        
+        for file_entry in self.manifest['files']:
+            print(f"Debug: Reading inventory file {file_entry['key']}")
+            stream = self._open_data_file(s3_client, file_entry)
+            try:
+                batches = self._csv_batches(stream, columns) if is_csv else self._columnar_batches(stream)
+                for batch in batches:
+                    if isinstance(batch, dict):
+                        entries = self._to_entries(batch, prefix, is_csv)
+                        keys = [entry['key'] for entry in entries]
+                    else:
+                        entries = self._to_page(batch, prefix, is_csv)
+                        keys = entries.keys if entries is not None else None
+                    if entries:
+                        last_key = max(keys)
+                        if self.last_key is None or last_key > self.last_key:
+                            self.last_key = last_key
+                        yield entries
+            finally:
+                stream.close()
@@ -0,0 +1,70 @@
+# MIT License
+# 
+# Copyright (c) 2025 S3Ducky
+
+"""
+Listing diffs for S3Ducky.
+
+A refresh compares the new listing with the one on screen so that only
+the objects that changed have to be touched in the file tree.
+"""
+
+
+class ListingDiff:
+    """
+    Differences between two listings sorted by key.
+    """
+    
+    def __init__(self):
+        # Indexes into the new listing, ascending
+        self.inserted = []
+        # Indexes into the old listing, ascending
+        self.deleted = []
+        # Indexes into the new listing of objects whose size, ETag or
+        # modification time changed
+        self.updated = []
+        
+    def is_empty(self):
+        """Check whether the listings are the same."""
+        return not (self.inserted or self.deleted or self.updated)
+        
+    def summary(self):
+        """Get a short summary like "+12 / −3 / ~5"."""
+        return f"+{len(self.inserted)} / −{len(self.deleted)} / ~{len(self.updated)}"
+
+
+def _changed(old, new):
+    return (old['size'] != new['size'] or old['etag'] != new['etag']
+            or old['modified'] != new['modified'])
+
+
+def diff_listings(old_list, new_list):
+    """
+    Compare two listings with a merge-join on their (sorted) keys.
+    
+    Args:
+        old_list (list): Listing entries currently shown, sorted by key
+        new_list (list): Freshly loaded listing entries, sorted by key
+        
+    Returns:
+        ListingDiff: Inserted, deleted and updated entries
+    """
+    diff = ListingDiff()
+    i = j = 0
+    while i < len(old_list) and j < len(new_list):
+        old_key = old_list[i]['key']
+        new_key = new_list[j]['key']
+        if old_key == new_key:
+            if _changed(old_list[i], new_list[j]):
+                diff.updated.append(j)
+            i += 1
+            j += 1
+        elif old_key < new_key:
+            diff.deleted.append(i)
+            i += 1
+        else:
+            diff.inserted.append(j)
+            j += 1
+    diff.deleted.extend(range(i, len(old_list)))
+    diff.inserted.extend(range(j, len(new_list)))
+    return diff
@@ -0,0 +1,482 @@
+# MIT License
+# 
+# Copyright (c) 2025 S3Ducky
+
+"""
+Bounded-memory listing storage for S3Ducky.
+
+A listing lives in a plain list until its estimated size passes the
+memory budget. From then on it spills to a temporary SQLite file keyed
+and ordered by object key, and is read back in blocks, so memory stays
+flat however many keys a bucket holds. A small index of block
+boundaries (one key per ~1,000 objects) turns positions into key
+ranges, so inserting or removing an object touches one block instead
+of renumbering everything after it. Every user of a tab's listing (file
+tree, diffs, uploads, folder sizes) goes through the same list-like
+interface either way.
+
+Pages can also arrive as ColumnPage batches (one list per column, e.g.
+from an inventory report), which go to disk without ever becoming one
+dictionary per object.
+"""
+
+import os
+import bisect
+import sqlite3
+import tempfile
+import weakref
+import threading
+import itertools
+from datetime import datetime, timezone
+
+
+# Rough size of one listing entry in memory (dict, datetime, strings)
+ENTRY_OVERHEAD = 600
+
+# Rows read from disk at a time; a block is split once it holds twice as many
+BLOCK_ROWS = 1024
+
+_COLUMNS = 'key, size, modified, etag, storage_class'
+
+
+def _to_row(file_info):
+    return (file_info['key'], file_info['size'], file_info['modified'].timestamp(),
+            file_info['etag'], file_info.get('storage_class') or 'STANDARD')
+
+
+def _remove_spill_file(db, path):
+    db.close()
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _to_file_info(row):
+    return {'key': row[0], 'size': row[1], 'modified': datetime.fromtimestamp(row[2], timezone.utc),
+            'etag': row[3], 'storage_class': row[4]}
+
+
+class ColumnPage:
+    """
+    A page of listing entries held as columns rather than one dict per object.
+    
+    Reads like a list of listing entries (building each dict on access),
+    while ListingStore and PrefixRollup take the columns as they are.
+    """
+    
+    def __init__(self, keys, sizes, mtimes, etags, storage_classes=None):
+        """
+        Args:
+            keys (list): S3 keys
+            sizes (list): Sizes in bytes
+            mtimes (list): Modification times as POSIX timestamps (UTC)
+            etags (list): ETags without quotes
+            storage_classes (list, optional): Storage classes (None if not known)
+        """
+        self.keys = keys
+        self.sizes = sizes
+        self.mtimes = mtimes
+        self.etags = etags
+        self.storage_classes = storage_classes
+        
+    def __len__(self):
+        return len(self.keys)
+        
+    def __bool__(self):
+        return len(self.keys) > 0
+        
+    def __getitem__(self, index):
+        file_info = {
+            'key': self.keys[index],
+            'size': self.sizes[index],
+            'modified': datetime.fromtimestamp(self.mtimes[index], timezone.utc),
+            'etag': self.etags[index]
+        }
+        if self.storage_classes is not None:
+            file_info['storage_class'] = self.storage_classes[index]
+        return file_info
+        
+    def __iter__(self):
+        return (self[index] for index in range(len(self.keys)))
+        
+    def rows(self):
+        """Iterate over (key, size, mtime, etag, storage class) tuples."""
+        storage_classes = self.storage_classes or ['STANDARD'] * len(self.keys)
+        return zip(self.keys, self.sizes, self.mtimes, self.etags, storage_classes)
+
+
+class ListingStore:
+    """
+    List of listing entries that moves to disk once it outgrows its budget.
+    
+    Supports len(), indexing (including negative indexes), iteration,
+    item assignment, extend() and insert() like a list, and removing
+    entries by key. Keys must be unique. A spilled listing is always in
+    key order, whatever order its pages arrived in.
+    
+    The listing thread fills the store while the Tk thread reads it; every
+    method holds `lock`, which callers can also hold to read it whole.
+    """
+    
+    def __init__(self, memory_budget=0, spill_dir=None):
+        """
+        Args:
+            memory_budget (int): Bytes of entries kept in memory before spilling
+                to disk (0 = never spill)
+            spill_dir (str, optional): Directory for the spill file (defaults to
+                the system temporary directory)
+        """
+        self.memory_budget = memory_budget
+        self.spill_dir = spill_dir or None
+        self.lock = threading.RLock()
+        # Number of extend() calls so far, to tell pages apart
+        self.pages_added = 0
+        # Number of changes so far, so a diff worked out in another thread can tell it is stale
+        self.version = 0
+        self._entries = []
+        # Whether the in-memory entries are sorted by key (not so while an inventory loads)
+        self._key_ordered = True
+        self._estimated_bytes = 0
+        self._db = None
+        self._finalizer = None
+        self._length = 0
+        # Spilled rows: block i holds the keys from _fences[i] up to _fences[i + 1]
+        self._fences = []
+        self._counts = []
+        # Position of each block's first row, rebuilt after changes
+        self._starts = None
+        self._block_index = None
+        self._block = []
+        
+    @property
+    def spilled(self):
+        """Whether the entries are on disk."""
+        return self._db is not None
+        
+    def __len__(self):
+        return self._length if self._db is not None else len(self._entries)
+        
+    def __bool__(self):
+        return len(self) > 0
+        
+    def _position(self, index):
+        length = len(self)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError("listing index out of range")
+        return index
+        
+    def _block_starts(self):
+        if self._starts is None:
+            self._starts = list(itertools.accumulate(self._counts[:-1], initial=0))
+        return self._starts
+        
+    def _key_range(self, block):
+        """SQL condition and parameters selecting the keys of a block."""
+        if block + 1 < len(self._fences):
+            return "key >= ? AND key < ?", (self._fences[block], self._fences[block + 1])
+        return "key >= ?", (self._fences[block],)
+        
+    def _read_block(self, block):
+        if self._block_index != block:
+            condition, params = self._key_range(block)
+            cursor = self._db.execute(f"SELECT {_COLUMNS} FROM objects WHERE {condition} ORDER BY key", params)
+            self._block = [_to_file_info(row) for row in cursor]
+            self._block_index = block
+        return self._block
+        
+    def __getitem__(self, index):
+        with self.lock:
+            if self._db is None:
+                return self._entries[index]
+            index = self._position(index)
+            starts = self._block_starts()
+            # Empty blocks share their start with the next one; bisect_right skips them
+            block = bisect.bisect_right(starts, index) - 1
+            return self._read_block(block)[index - starts[block]]
+            
+    def __iter__(self):
+        if self._db is None:
+            return iter(self._entries)
+        return self._iter_spilled()
+        
+    def _iter_spilled(self):
+        """Read the spilled rows in key order, a block per query (resuming after the last key)."""
+        last_key = None
+        while True:
+            with self.lock:
+                if self._db is None:
+                    return
+                if last_key is None:
+                    rows = self._db.execute(f"SELECT {_COLUMNS} FROM objects ORDER BY key LIMIT ?",
+                                            (BLOCK_ROWS,)).fetchall()
+                else:
+                    rows = self._db.execute(f"SELECT {_COLUMNS} FROM objects WHERE key > ? ORDER BY key LIMIT ?",
+                                            (last_key, BLOCK_ROWS)).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield _to_file_info(row)
+            last_key = rows[-1][0]
+            
+    def __setitem__(self, index, file_info):
+        with self.lock:
+            self.version += 1
+            if self._db is None:
+                self._entries[index] = file_info
+                return
+            old_key = self[index]['key']
+            if old_key == file_info['key']:
+                self._db.execute(
+                    "UPDATE objects SET size = ?, modified = ?, etag = ?, storage_class = ? WHERE key = ?",
+                    _to_row(file_info)[1:] + (old_key,))
+                self._block_index = None
+            else:
+                self._delete_keys([old_key])
+                self._insert_rows([file_info])
+                
+    def extend(self, entries):
+        """
+        Append listing entries, spilling to disk when the budget is exceeded.
+        
+        Args:
+            entries (list or ColumnPage): Listing entries
+            
+        Returns:
+            int: Number of pages added so far, counting this one
+        """
+        with self.lock:
+            self.pages_added += 1
+            self.version += 1
+            if self._db is None and self.memory_budget:
+                keys = entries.keys if isinstance(entries, ColumnPage) else \
+                    (file_info['key'] for file_info in entries)
+                self._estimated_bytes += sum(ENTRY_OVERHEAD + len(key) for key in keys)
+                if self._estimated_bytes > self.memory_budget:
+                    # Spill first, so a column page goes to disk as it is
+                    self._spill()
+            if self._db is None:
+                if self._key_ordered and entries:
+                    keys = entries.keys if isinstance(entries, ColumnPage) else \
+                        [file_info['key'] for file_info in entries]
+                    self._key_ordered = ((not self._entries or self._entries[-1]['key'] < keys[0])
+                                         and all(a < b for a, b in zip(keys, keys[1:])))
+                self._entries.extend(entries)
+            else:
+                self._insert_rows(entries)
+            return self.pages_added
+            
+    def insert(self, index, file_info):
+        """
+        Insert an entry before a position, moving the following ones down.
+        
+        A spilled listing places the entry by its key instead.
+        
+        Args:
+            index (int): Position of the new entry
+            file_info (dict): Listing entry
+        """
+        with self.lock:
+            self.version += 1
+            if self._db is None:
+                self._entries.insert(index, file_info)
+            else:
+                self._insert_rows([file_info])
+                
+    def _insert_rows(self, entries):
+        """Write entries to the spill file and count them into their blocks."""
+        if isinstance(entries, ColumnPage):
+            keys, rows = entries.keys, entries.rows()
+        else:
+            entries = list(entries)
+            keys, rows = [file_info['key'] for file_info in entries], map(_to_row, entries)
+        changes = self._db.total_changes
+        self._db.execute("BEGIN")
+        self._db.executemany(f"INSERT OR IGNORE INTO objects ({_COLUMNS}) VALUES (?, ?, ?, ?, ?)", rows)
+        self._db.execute("COMMIT")
+        added = self._db.total_changes - changes
+        self._length += added
+        if added == len(keys):
+            self._count_keys(keys, 1)
+        else:
+            # A key listed twice kept its first entry; count the blocks again
+            print(f"Debug: Listing had {len(keys) - added} duplicate keys")
+            self._rebuild_blocks()
+        self._split_blocks()
+        
+    def _delete_keys(self, keys):
+        """Remove keys from the spill file; returns the removed rows in key order."""
+        self._db.execute("BEGIN")
+        self._db.execute("CREATE TEMP TABLE removed_keys (key TEXT PRIMARY KEY)")
+        self._db.executemany("INSERT OR IGNORE INTO removed_keys VALUES (?)", ((key,) for key in keys))
+        rows = self._db.execute(f"SELECT {_COLUMNS} FROM objects "
+                                f"WHERE key IN (SELECT key FROM removed_keys) ORDER BY key").fetchall()
+        if rows:
+            self._db.execute("DELETE FROM objects WHERE key IN (SELECT key FROM removed_keys)")
+        self._db.execute("DROP TABLE removed_keys")
+        self._db.execute("COMMIT")
+        if rows:
+            self._length -= len(rows)
+            self._count_keys([row[0] for row in rows], -1)
+            # Drop emptied blocks; their key range falls to the block before
+            for block in range(len(self._counts) - 1, 0, -1):
+                if not self._counts[block]:
+                    del self._fences[block]
+                    del self._counts[block]
+        return rows
+        
+    def _count_keys(self, keys, step):
+        """Add step to the row count of the block of each key."""
+        if len(keys) < len(self._fences):
+            for key in keys:
+                self._counts[bisect.bisect_right(self._fences, key) - 1] += step
+        else:
+            keys = sorted(keys)
+            begin = 0
+            for block in range(len(self._fences)):
+                end = bisect.bisect_left(keys, self._fences[block + 1]) \
+                    if block + 1 < len(self._fences) else len(keys)
+                self._counts[block] += step * (end - begin)
+                begin = end
+        self._starts = None
+        self._block_index = None
+        
+    def _split_blocks(self):
+        """Split blocks that grew past twice BLOCK_ROWS into blocks of BLOCK_ROWS."""
+        for block in range(len(self._counts) - 1, -1, -1):
+            if self._counts[block] <= 2 * BLOCK_ROWS:
+                continue
+            condition, params = self._key_range(block)
+            keys = [row[0] for row in self._db.execute(
+                f"SELECT key FROM objects WHERE {condition} ORDER BY key", params)]
+            starts = range(0, len(keys), BLOCK_ROWS)
+            self._fences[block + 1:block + 1] = [keys[start] for start in starts][1:]
+            self._counts[block:block + 1] = [min(BLOCK_ROWS, len(keys) - start) for start in starts]
+            self._starts = None
+            self._block_index = None
+            
+    def _rebuild_blocks(self):
+        """Work out the blocks from scratch, one boundary key per BLOCK_ROWS rows."""
+        self._fences = ['']
+        self._counts = [0]
+        for position, (key,) in enumerate(self._db.execute("SELECT key FROM objects ORDER BY key")):
+            if position and position % BLOCK_ROWS == 0:
+                self._fences.append(key)
+                self._counts.append(0)
+            self._counts[-1] += 1
+        self._starts = None
+        self._block_index = None
+        
+    def remove_keys(self, keys):
+        """
+        Remove the entries of some keys (e.g. after deleting objects).
+        
+        In a listing sorted by key each key is found by bisection, so the
+        cost grows with the number of keys rather than with the listing;
+        a listing in another order is filtered in one pass.
+        
+        Args:
+            keys (iterable): S3 keys; keys that are not listed are ignored
+            
+        Returns:
+            list: The removed entries, in listing order
+        """
+        keys = set(keys)
+        with self.lock:
+            self.version += 1
+            if self._db is None and not self._key_ordered:
+                removed = [file_info for file_info in self._entries if file_info['key'] in keys]
+                if removed:
+                    self._entries = [file_info for file_info in self._entries if file_info['key'] not in keys]
+                return removed
+            if self._db is None:
+                positions = []
+                for key in keys:
+                    index = self.bisect_key(key)
+                    if index < len(self._entries) and self._entries[index]['key'] == key:
+                        positions.append(index)
+                positions.sort()
+                removed = [self._entries[index] for index in positions]
+                # Neighbours go as one slice, from the end so earlier positions hold
+                runs = []
+                for index in positions:
+                    if runs and runs[-1][1] == index:
+                        runs[-1][1] += 1
+                    else:
+                        runs.append([index, index + 1])
+                for start, end in reversed(runs):
+                    del self._entries[start:end]
+                return removed
+            return [_to_file_info(row) for row in self._delete_keys(keys)]
+            
+    def bisect_key(self, key):
+        """
+        Find where a key is or would be in a listing sorted by key.
+        
+        Args:
+            key (str): S3 key
+            
+        Returns:
+            int: Position of the first entry whose key is not less than key
+        """
+        with self.lock:
+            if self._db is None:
+                low, high = 0, len(self._entries)
+                while low < high:
+                    middle = (low + high) // 2
+                    if self._entries[middle]['key'] < key:
+                        low = middle + 1
+                    else:
+                        high = middle
+                return low
+            block = bisect.bisect_right(self._fences, key) - 1
+            before = self._db.execute("SELECT COUNT(*) FROM objects WHERE key >= ? AND key < ?",
+                                      (self._fences[block], key)).fetchone()[0]
+            return self._block_starts()[block] + before
+            
+    def sort_by_key(self):
+        """Sort the entries by key (e.g. after reading an inventory report)."""
+        with self.lock:
+            # A spilled listing is kept in key order already
+            if self._db is None:
+                self.version += 1
+                self._entries.sort(key=lambda x: x['key'])
+                self._key_ordered = True
+                
+    def _spill(self):
+        """Move the in-memory entries to a new SQLite file."""
+        fd, path = tempfile.mkstemp(prefix='s3ducky-listing-', suffix='.sqlite', dir=self.spill_dir)
+        os.close(fd)
+        # Tk and listing threads share the store; the lock serialises them
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        # Deletes the file when the store is closed, collected or the app exits
+        self._finalizer = weakref.finalize(self, _remove_spill_file, self._db, path)
+        # A lost spill file is rebuilt by listing again, so skip durability
+        self._db.execute("PRAGMA journal_mode = OFF")
+        self._db.execute("PRAGMA synchronous = OFF")
+        self._db.execute("CREATE TABLE objects (key TEXT PRIMARY KEY, size INTEGER, modified REAL, "
+                         "etag TEXT, storage_class TEXT) WITHOUT ROWID")
+        # Every key sorts at or after '', so the first block takes everything
+        self._fences = ['']
+        self._counts = [0]
+        entries, self._entries = self._entries, []
+        self._length = 0
+        self._insert_rows(entries)
+        print(f"Debug: Listing passed its memory budget, spilled {self._length} entries to {path}")
+        
+    def close(self):
+        """Release the spill file (the store is empty afterwards)."""
+        with self.lock:
+            self._entries = []
+            self._estimated_bytes = 0
+            if self._db is not None:
+                self._finalizer()
+                self._db = None
+                self._length = 0
+                self._fences = []
+                self._counts = []
+                self._starts = None
+                self._block = []
+                self._block_index = None
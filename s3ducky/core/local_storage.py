@@ -0,0 +1,167 @@
+# MIT License
+# 
+# Copyright (c) 2025 S3Ducky
+
+"""
+Local-directory storage backend for S3Ducky.
+
+Browses a folder (e.g. a local mirror of a bucket) as if it were a
+bucket: files are objects, their paths relative to the folder are keys.
+"""
+
+import os
+import tempfile
+from datetime import datetime, timezone
+from .storage import SimpleBackend
+from .ranged_download import TEMP_SUFFIX
+
+
+# Bucket names starting with this open a local folder instead of S3
+LOCAL_SCHEME = 'file://'
+
+# Process umask, applied to written objects (mkstemp creates them owner-only)
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def _entry_name(entry):
+    """Sort name of a directory entry: directories sort as "name/", like their keys."""
+    return entry.name + '/' if entry.is_dir(follow_symlinks=False) else entry.name
+
+
+class LocalBackend(SimpleBackend):
+    """
+    Storage backend reading and writing a local directory.
+    
+    ETags are derived from modification time and size, so listing never
+    reads file contents (and downloads can't check them).
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.root = None
+        
+    def connect(self, root, resource_prefix=None):
+        """
+        Open a directory.
+        
+        Args:
+            root (str): Directory path, optionally as a file:// URL
+            resource_prefix (str, optional): Prefix filter for keys
+            
+        Returns:
+            bool: True once the directory is open
+            
+        Raises:
+            FileNotFoundError: If the directory does not exist
+        """
+        if root.startswith(LOCAL_SCHEME):
+            root = root[len(LOCAL_SCHEME):]
+        root = os.path.abspath(os.path.expanduser(root))
+        if not os.path.isdir(root):
+            raise FileNotFoundError(f"Folder '{root}' does not exist")
+            
+        self.root = root
+        self.bucket_name = LOCAL_SCHEME + root
+        resource_input = resource_prefix.strip() if resource_prefix else ""
+        self.resource_prefix = resource_input if resource_input else None
+        return True
+        
+    def disconnect(self):
+        super().disconnect()
+        self.root = None
+        
+    def _path(self, key):
+        """Get the file path of a key, refusing keys that leave the root."""
+        path = os.path.normpath(os.path.join(self.root, *key.split('/')))
+        if os.path.commonpath([self.root, path]) != self.root or path == self.root:
+            raise ValueError(f"Invalid key '{key}'")
+        return path
+        
+    def _file_info(self, key, stat):
+        return {
+            'key': key,
+            'size': stat.st_size,
+            'modified': datetime.fromtimestamp(stat.st_mtime, timezone.utc),
+            'etag': f"{stat.st_mtime_ns:x}{stat.st_size:x}",
+            'storage_class': 'STANDARD'
+        }
+        
+    def _iter_objects(self, start_after=None):
+        prefix = self.resource_prefix or ''
+        yield from self._walk(self.root, '', prefix, start_after or '')
+        
+    def _walk(self, directory, key_prefix, prefix, start_after):
+        """
+        Yield the files under a directory in key order.
+        
+        Entries are visited sorted by name with directories as "name/", so
+        every key below a directory sorts right where the directory does.
+        Directories that can't hold keys matching the prefix or sorting
+        after start_after are skipped without being read.
+        """
+        try:
+            with os.scandir(directory) as entries:
+                entries = sorted(entries, key=_entry_name)
+        except OSError as e:
+            print(f"Debug: Skipping unreadable folder {directory}: {e}")
+            return
+            
+        for entry in entries:
+            name = _entry_name(entry)
+            key = key_prefix + name
+            if entry.is_dir(follow_symlinks=False):
+                if not (key.startswith(prefix) or prefix.startswith(key)):
+                    continue
+                if key < start_after[:len(key)]:
+                    continue
+                yield from self._walk(entry.path, key, prefix, start_after)
+            elif key.startswith(prefix) and key > start_after and not key.endswith(TEMP_SUFFIX):
+                try:
+                    yield self._file_info(key, entry.stat())
+                except OSError:
+                    continue
+                    
+    def _read(self, key, start, end):
+        with open(self._path(key), 'rb') as f:
+            f.seek(start)
+            return f.read(end - start + 1)
+            
+    def _stat(self, key):
+        try:
+            return self._file_info(key, os.stat(self._path(key)))
+        except (OSError, ValueError):
+            raise KeyError(key)
+            
+    def _write(self, key, chunks):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # A unique name per write, so concurrent writes of one key don't share a
+        # temporary file; the suffix keeps it out of listings
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.' + os.path.basename(path) + '.',
+                                         suffix=TEMP_SUFFIX)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                for chunk in chunks:
+                    f.write(chunk)
+            os.chmod(temp_path, 0o666 & ~_UMASK)
+            os.replace(temp_path, path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        return self._stat(key)
+        
+    def _delete(self, key):
+        path = self._path(key)
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            raise KeyError(key)
+        # Folders only exist through their files, so drop the ones left empty
+        directory = os.path.dirname(path)
+        while directory != self.root:
+            try:
+                os.rmdir(directory)
+            except OSError:
+                break
+            directory = os.path.dirname(directory)
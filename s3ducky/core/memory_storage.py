@@ -0,0 +1,173 @@
+# MIT License
+# 
+# Copyright (c) 2025 S3Ducky
+
+"""
+Deterministic in-memory storage backend for S3Ducky.
+
+Holds objects in a dictionary and can add a fixed latency, a bandwidth
+cap and injected errors to every request. Whether a request fails
+depends only on the seed, the operation, the key and how often that
+key was requested before, not on thread timing, so transfer scheduling
+and UI scaling can be benchmarked reproducibly without a network.
+"""
+
+import time
+import random
+import hashlib
+import threading
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime, timedelta, timezone
+from .storage import SimpleBackend
+
+
+# Bucket names starting with this open a synthetic in-memory bucket
+MEMORY_SCHEME = 'memory://'
+
+# Modification time of the first synthetic object
+SYNTHETIC_EPOCH = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+class InjectedError(Exception):
+    """Failure injected by MemoryBackend."""
+
+
+class MemoryBackend(SimpleBackend):
+    """
+    Storage backend keeping objects in memory.
+    """
+    
+    # ETags are real MD5 digests, so verified downloads are checked
+    etag_is_md5 = True
+    
+    def __init__(self, *args, latency=0.0, bytes_per_second=0, error_rate=0.0, seed=0, **kwargs):
+        """
+        Args:
+            latency (float): Seconds added to every request
+            bytes_per_second (int): Transfer rate of each request (0 = unlimited)
+            error_rate (float): Fraction of requests that raise InjectedError
+            seed (int): Seed deciding which requests fail
+        """
+        super().__init__(*args, **kwargs)
+        self.latency = latency
+        self.bytes_per_second = bytes_per_second
+        self.error_rate = error_rate
+        self.seed = seed
+        self.request_counts = {}
+        self._objects = {}
+        self._keys = []
+        self._lock = threading.Lock()
+        
+    def connect(self, bucket_name='memory', resource_prefix=None):
+        """
+        Open the in-memory bucket.
+        
+        Args:
+            bucket_name (str): Name shown for the bucket
+            resource_prefix (str, optional): Prefix filter for keys
+            
+        Returns:
+            bool: True
+        """
+        self.bucket_name = bucket_name
+        resource_input = resource_prefix.strip() if resource_prefix else ""
+        self.resource_prefix = resource_input if resource_input else None
+        return True
+        
+    def add_object(self, key, data, modified=None):
+        """
+        Store an object.
+        
+        Args:
+            key (str): Object key
+            data (bytes): Content
+            modified (datetime, optional): Modification time (defaults to now)
+            
+        Returns:
+            dict: Listing entry of the object
+        """
+        file_info = {
+            'key': key,
+            'size': len(data),
+            'modified': modified or datetime.now(timezone.utc),
+            'etag': hashlib.md5(data).hexdigest(),
+            'storage_class': 'STANDARD'
+        }
+        with self._lock:
+            if key not in self._objects:
+                insort(self._keys, key)
+            self._objects[key] = (data, file_info)
+        return file_info
+        
+    def populate(self, count, size=0, prefix='object-'):
+        """
+        Add synthetic objects for benchmarks.
+        
+        Keys are prefix plus a zero-padded number. All objects share one
+        zero-filled buffer, so even large counts cost little memory.
+        
+        Args:
+            count (int): Number of objects
+            size (int): Bytes per object
+            prefix (str): Key prefix
+        """
+        data = bytes(size)
+        etag = hashlib.md5(data).hexdigest()
+        with self._lock:
+            for i in range(count):
+                key = f"{prefix}{i:09d}"
+                if key not in self._objects:
+                    insort(self._keys, key)
+                self._objects[key] = (data, {
+                    'key': key, 'size': size, 'modified': SYNTHETIC_EPOCH + timedelta(seconds=i),
+                    'etag': etag, 'storage_class': 'STANDARD'})
+                    
+    def _request(self, operation, key, nbytes=0):
+        """Apply the configured latency and bandwidth, then maybe fail the request."""
+        with self._lock:
+            count = self.request_counts.get((operation, key), 0)
+            self.request_counts[(operation, key)] = count + 1
+            
+        delay = self.latency
+        if self.bytes_per_second:
+            delay += nbytes / self.bytes_per_second
+        if delay:
+            time.sleep(delay)
+            
+        if self.error_rate and random.Random(f"{self.seed}:{operation}:{key}:{count}").random() < self.error_rate:
+            raise InjectedError(f"Injected {operation} error for '{key}' (request {count + 1})")
+            
+    def _iter_objects(self, start_after=None):
+        prefix = self.resource_prefix or ''
+        last_key = start_after if start_after and start_after >= prefix else None
+        while True:
+            with self._lock:
+                # Keys may be added while listing; continue after the last one seen
+                if last_key is None:
+                    index = bisect_left(self._keys, prefix)
+                else:
+                    index = bisect_right(self._keys, last_key)
+                if index >= len(self._keys):
+                    return
+                last_key = self._keys[index]
+                file_info = self._objects[last_key][1]
+            if not last_key.startswith(prefix):
+                return
+            yield file_info
+            
+    def _read(self, key, start, end):
+        with self._lock:
+            data = self._objects[key][0]
+        return data[start:end + 1]
+        
+    def _stat(self, key):
+        with self._lock:
+            return self._objects[key][1]
+            
+    def _write(self, key, chunks):
+        return self.add_object(key, b''.join(chunks))
+        
+    def _delete(self, key):
+        with self._lock:
+            del self._objects[key]
+            del self._keys[bisect_left(self._keys, key)]
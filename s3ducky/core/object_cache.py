@@ -0,0 +1,181 @@
+# MIT License
+# 
+# Copyright (c) 2025 S3Ducky
+
+"""
+Local object cache for downloads in S3Ducky.
+"""
+
+import os
+import shutil
+import threading
+from .disk_cache import DiskCache, make_cache_key
+from ..utils.formatters import format_file_size
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# Linux FICLONE ioctl: copy-on-write clone on btrfs, XFS and similar
+FICLONE = 0x40049409
+
+
+def _reflink(source_path, dest_path):
+    """Clone a file with copy-on-write. Raises OSError where unsupported."""
+    if fcntl is None:
+        raise OSError("reflink not supported on this platform")
+    try:
+        with open(source_path, 'rb') as src, open(dest_path, 'wb') as dst:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+    except OSError:
+        if os.path.exists(dest_path):
+            os.remove(dest_path)
+        raise
+
+
+def place_file(source_path, dest_path, link_mode='auto'):
+    """
+    Make dest_path a copy of source_path as cheaply as possible.
+    
+    Files are never hardlinked: a user editing a downloaded file in place
+    would silently change the cached copy too. A reflink shares blocks
+    only until one side is written, so it is as safe as a copy.
+    
+    Args:
+        source_path (str): Existing file
+        dest_path (str): Target path (replaced if it exists)
+        link_mode (str): 'auto' tries reflink, then copies; 'copy' always copies
+            
+    Returns:
+        str: Method used ('reflink' or 'copy')
+    """
+    if os.path.lexists(dest_path):
+        os.remove(dest_path)
+        
+    if link_mode == 'auto':
+        try:
+            _reflink(source_path, dest_path)
+            return 'reflink'
+        except OSError:
+            pass
+            
+    shutil.copyfile(source_path, dest_path)
+    return 'copy'
+
+
+class CacheStats:
+    """
+    Hit/miss counters for a single download job.
+    """
+    
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+        # Parallel download workers share the counters
+        self._lock = threading.Lock()
+        
+    def record_hit(self, size):
+        with self._lock:
+            self.hits += 1
+            self.bytes_saved += size
+        
+    def record_miss(self):
+        with self._lock:
+            self.misses += 1
+        
+    def summary(self):
+        """
+        Get a one-line summary for status messages.
+        
+        Returns:
+            str: e.g. "Cache: 3 hits, 1 miss, 12.0 MB saved"
+        """
+        hits = "hit" if self.hits == 1 else "hits"
+        misses = "miss" if self.misses == 1 else "misses"
+        return (f"Cache: {self.hits} {hits}, {self.misses} {misses}, "
+                f"{format_file_size(self.bytes_saved)} saved")
+
+
+class ObjectCache:
+    """
+    Keeps downloaded objects on disk keyed by bucket, key and ETag, so the
+    same object is only transferred from S3 again once it changes.
+    """
+    
+    def __init__(self, cache_dir, max_bytes, link_mode='auto'):
+        self.link_mode = link_mode
+        self.disk_cache = DiskCache(cache_dir, max_bytes)
+        
+    def lookup(self, bucket, key, etag, size, pin=False):
+        """
+        Find a cached copy of an object.
+        
+        Args:
+            bucket (str): Bucket name
+            key (str): S3 object key
+            etag (str): Current ETag of the object
+            size (int): Current size of the object
+            pin (bool): Keep the copy from being evicted until unpin() is called
+            
+        Returns:
+            str or None: Path of the cached copy, or None on a miss
+        """
+        if not etag:
+            return None
+        cache_key = make_cache_key(bucket, key, etag)
+        path = self.disk_cache.get(cache_key, pin=pin)
+        if path is None:
+            return None
+            
+        # The file may have been changed on disk behind our back; never serve that
+        if os.path.getsize(path) != size:
+            if pin:
+                self.disk_cache.unpin(cache_key)
+            self.disk_cache.discard(cache_key)
+            return None
+        return path
+        
+    def unpin(self, bucket, key, etag):
+        """
+        Release a copy pinned by lookup(), letting it be evicted again.
+        
+        Args:
+            bucket (str): Bucket name
+            key (str): S3 object key
+            etag (str): ETag the copy was looked up with
+        """
+        self.disk_cache.unpin(make_cache_key(bucket, key, etag))
+        
+    def fetch(self, bucket, key, etag, size, dest_path):
+        """
+        Materialize a cached object at dest_path if it is in the cache.
+        
+        Returns:
+            bool: True on a cache hit
+        """
+        path = self.lookup(bucket, key, etag, size)
+        if path is None:
+            return False
+        place_file(path, dest_path, self.link_mode)
+        return True
+        
+    def store(self, bucket, key, etag, local_path):
+        """
+        Add a freshly downloaded file to the cache.
+        
+        Args:
+            bucket (str): Bucket name
+            key (str): S3 object key
+            etag (str): ETag of the downloaded object
+            local_path (str): Downloaded file
+        """
+        if not etag:
+            return
+        try:
+            self.disk_cache.put_file(make_cache_key(bucket, key, etag), local_path,
+                                     copy_func=lambda src, dst: place_file(src, dst, self.link_mode))
+        except Exception as e:
+            # Caching is best effort; the download itself succeeded
+            print(f"Debug: Failed to cache {key}: {str(e)}")
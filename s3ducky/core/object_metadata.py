@@ -0,0 +1,359 @@
+# MIT License
+# 
+# Copyright (c) 2025 S3Ducky
+
+"""
+Object metadata (HEAD) and archive awareness for S3Ducky.
+
+Listings carry the storage class of every object, but content type, user
+metadata and restore status need a HEAD request each. MetadataFetcher
+issues those lazily, in parallel and only for rows that are on screen or
+selected. Before a download starts the same metadata tells which objects
+are archived in Glacier or Deep Archive (or an Intelligent-Tiering archive
+tier) and not restored, so the job can skip them or request restores
+instead of failing halfway through.
+"""
+
+import queue
+import itertools
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+
+
+# Storage classes whose objects must be restored before they can be read
+ARCHIVED_STORAGE_CLASSES = ('GLACIER', 'DEEP_ARCHIVE')
+
+# Intelligent-Tiering archive tiers (reported by HEAD as ArchiveStatus)
+ARCHIVE_ACCESS_TIERS = ('ARCHIVE_ACCESS', 'DEEP_ARCHIVE_ACCESS')
+
+# Retrieval tiers of RestoreObject (Deep Archive has no Expedited)
+RESTORE_TIERS = ('Expedited', 'Standard', 'Bulk')
+
+# Queue priorities (lower runs first)
+PRIORITY_SELECTED = 0
+PRIORITY_VISIBLE = 1
+
+# HEAD results kept in memory
+MAX_CACHED_ENTRIES = 20000
+
+
+def parse_restore(header):
+    """
+    Parse the x-amz-restore header of a HEAD response.
+    
+    Args:
+        header (str or None): e.g. 'ongoing-request="false", expiry-date="Fri, 21 Dec 2012 00:00:00 GMT"'
+        
+    Returns:
+        dict or None: {'ongoing': bool, 'expiry': datetime or None}, or None
+            when no restore was ever requested
+    """
+    if not header:
+        return None
+    fields = {}
+    for part in header.split('",'):
+        name, _, value = part.partition('=')
+        fields[name.strip()] = value.strip().strip('"')
+    expiry = None
+    if fields.get('expiry-date'):
+        try:
+            expiry = parsedate_to_datetime(fields['expiry-date'])
+        except (TypeError, ValueError):
+            pass
+    return {'ongoing': fields.get('ongoing-request') == 'true', 'expiry': expiry}
+
+
+def may_need_restore(file_info):
+    """
+    Check from a listing entry alone whether an object might be archived.
+    
+    Intelligent-Tiering objects only show their archive tier in a HEAD
+    response, so they count as candidates too.
+    """
+    storage_class = file_info.get('storage_class') or 'STANDARD'
+    return storage_class in ARCHIVED_STORAGE_CLASSES or storage_class == 'INTELLIGENT_TIERING'
+
+
+def needs_restore(file_info, head=None):
+    """
+    Check whether an object has to be restored before it can be downloaded.
+    
+    Args:
+        file_info (dict): Listing entry
+        head (dict, optional): head_object() result for the object
+        
+    Returns:
+        bool: True if the object is archived and no restored copy is available
+    """
+    if head is None:
+        return (file_info.get('storage_class') or 'STANDARD') in ARCHIVED_STORAGE_CLASSES
+    archived = (head.get('storage_class') in ARCHIVED_STORAGE_CLASSES
+                or head.get('archive_status') in ARCHIVE_ACCESS_TIERS)
+    restore = head.get('restore')
+    return archived and (restore is None or restore['ongoing'])
+
+
+def storage_label(file_info, head=None):
+    """
+    Describe the storage class of an object for the file list.
+    
+    Returns:
+        str: e.g. "STANDARD", "GLACIER (restoring)", "DEEP_ARCHIVE (restored until 2025-03-01)"
+    """
+    if head is None:
+        return file_info.get('storage_class') or 'STANDARD'
+    label = head.get('storage_class') or file_info.get('storage_class') or 'STANDARD'
+    if head.get('archive_status'):
+        label += f" ({head['archive_status'].lower()})"
+    restore = head.get('restore')
+    if restore is not None:
+        if restore['ongoing']:
+            label += " (restoring)"
+        elif restore['expiry'] is not None:
+            label += f" (restored until {restore['expiry'].strftime('%Y-%m-%d')})"
+        else:
+            label += " (restored)"
+    return label
+
+
+def describe_metadata(head):
+    """
+    Summarise the content type and user metadata of an object in one line.
+    
+    Args:
+        head (dict): head_object() result
+        
+    Returns:
+        str: e.g. "image/png, owner=alice, source=camera"
+    """
+    parts = [head.get('content_type') or 'unknown type']
+    parts += [f"{name}={value}" for name, value in sorted((head.get('metadata') or {}).items())]
+    return ', '.join(parts)
+
+
+def restore_objects(s3_client, keys, days=7, tier='Standard', concurrency=8, progress_callback=None,
+                    tiering_keys=()):
+    """
+    Request restores of archived objects in parallel.
+    
+    Args:
+        s3_client (StorageBackend): Connected backend
+        keys (list): Keys of archived objects
+        days (int): Days the restored copy is kept
+        tier (str): One of RESTORE_TIERS
+        concurrency (int): Requests sent at the same time
+        progress_callback (callable, optional): Callback for progress updates
+        tiering_keys (iterable): Keys in an Intelligent-Tiering archive tier,
+            restored without an expiry
+        
+    Returns:
+        tuple: (keys restoring now, keys already being restored, {key: error} for failures)
+    """
+    started, in_progress, failed = [], [], {}
+    tiering_keys = set(tiering_keys)
+    lock = threading.Lock()
+    
+    def restore(key):
+        try:
+            newly_started = s3_client.restore_object(key, None if key in tiering_keys else days, tier)
+        except Exception as e:
+            with lock:
+                failed[key] = str(e)
+            return
+        with lock:
+            (started if newly_started else in_progress).append(key)
+            done = len(started) + len(in_progress) + len(failed)
+        if progress_callback:
+            progress_callback(f"Requesting restores... {done}/{len(keys)}")
+            
+    with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(keys)))) as executor:
+        list(executor.map(restore, keys))
+    return started, in_progress, failed
+
+
+class _MetadataRequest:
+    """A queued HEAD request for a single object."""
+    
+    def __init__(self, s3_client, file_info, priority, callback):
+        self.s3_client = s3_client
+        self.file_info = file_info
+        self.priority = priority
+        self.callbacks = [callback]
+
+
+class MetadataFetcher:
+    """
+    Fetches HEAD metadata of objects in a pool of worker threads.
+    
+    Results are kept in memory keyed by bucket, key and ETag. Requests for
+    selected rows jump ahead of those for rows that are merely visible.
+    Like ThumbnailGenerator, each request remembers the client that was
+    current when it was queued, so s3_client can follow the active tab.
+    """
+    
+    def __init__(self, s3_client, workers=8):
+        self.s3_client = s3_client
+        self.workers = workers
+        
+        self._cache = OrderedDict()
+        self._queue = queue.PriorityQueue()
+        self._pending = {}
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        self._stopped = False
+        
+        self._threads = []
+        for _ in range(workers):
+            thread = threading.Thread(target=self._worker)
+            thread.daemon = True
+            thread.start()
+            self._threads.append(thread)
+            
+    def _cache_key(self, file_info, s3_client=None):
+        bucket_name = (s3_client or self.s3_client).bucket_name
+        return (bucket_name, file_info['key'], file_info.get('etag', ''))
+        
+    def get_cached(self, file_info, s3_client=None):
+        """
+        Get fetched metadata without queueing any work.
+        
+        Returns:
+            dict or None: head_object() result, or None if not fetched yet
+        """
+        with self._lock:
+            return self._cache.get(self._cache_key(file_info, s3_client))
+            
+    def _store(self, cache_key, head):
+        with self._lock:
+            self._cache[cache_key] = head
+            self._cache.move_to_end(cache_key)
+            while len(self._cache) > MAX_CACHED_ENTRIES:
+                self._cache.popitem(last=False)
+                
+    def invalidate(self, keys):
+        """Forget fetched metadata of some keys (e.g. after requesting restores)."""
+        keys = set(keys)
+        with self._lock:
+            for cache_key in [cache_key for cache_key in self._cache if cache_key[1] in keys]:
+                del self._cache[cache_key]
+                
+    def request(self, file_info, callback, selected=False):
+        """
+        Queue a HEAD request for an object.
+        
+        The callback is invoked from a worker thread with (key, head), where
+        head is None if the request failed.
+        
+        Args:
+            file_info (dict): Listing entry
+            callback (callable): Called when the metadata is available
+            selected (bool): Whether the row is selected (fetched first)
+        """
+        head = self.get_cached(file_info)
+        if head is not None:
+            callback(file_info['key'], head)
+            return
+            
+        priority = PRIORITY_SELECTED if selected else PRIORITY_VISIBLE
+        key = file_info['key']
+        with self._lock:
+            pending = self._pending.get(key)
+            if pending:
+                if callback not in pending.callbacks:
+                    pending.callbacks.append(callback)
+                if priority >= pending.priority:
+                    return
+                # Re-queue with the better priority; the old entry goes stale
+                pending.priority = priority
+            else:
+                pending = _MetadataRequest(self.s3_client, file_info, priority, callback)
+                self._pending[key] = pending
+            self._queue.put((priority, next(self._counter), key))
+            
+    def cancel_pending(self):
+        """Drop all queued requests that have not started yet (e.g. after scrolling away)."""
+        with self._lock:
+            self._pending.clear()
+            
+    def fetch(self, file_infos, s3_client=None):
+        """
+        Fetch the metadata of several objects now, in parallel.
+        
+        Args:
+            file_infos (list): Listing entries
+            s3_client (StorageBackend, optional): Backend to ask (defaults to the current one)
+            
+        Returns:
+            dict: Key -> head_object() result (None where the request failed)
+        """
+        s3_client = s3_client or self.s3_client
+        results = {}
+        
+        def head(file_info):
+            results[file_info['key']] = self._head(s3_client, file_info)
+            
+        if file_infos:
+            with ThreadPoolExecutor(max_workers=max(1, min(self.workers, len(file_infos)))) as executor:
+                list(executor.map(head, file_infos))
+        return results
+        
+    def fetch_async(self, file_infos, completion_callback, s3_client=None):
+        """
+        Fetch the metadata of several objects in a separate thread.
+        
+        Args:
+            file_infos (list): Listing entries
+            completion_callback (callable): Called with the fetch() result
+            s3_client (StorageBackend, optional): Backend to ask (defaults to the current one)
+        """
+        def fetch_thread():
+            completion_callback(self.fetch(file_infos, s3_client))
+        
+        thread = threading.Thread(target=fetch_thread)
+        thread.daemon = True
+        thread.start()
+        return thread
+        
+    def _head(self, s3_client, file_info):
+        """Get the metadata of one object from the cache or a HEAD request."""
+        cache_key = self._cache_key(file_info, s3_client)
+        with self._lock:
+            head = self._cache.get(cache_key)
+        if head is not None:
+            return head
+        try:
+            head = s3_client.head_object(file_info['key'])
+        except Exception as e:
+            print(f"Debug: HEAD failed for {file_info['key']}: {str(e)}")
+            return None
+        self._store(cache_key, head)
+        return head
+        
+    def _worker(self):
+        """Worker loop: take the most urgent request and fetch its metadata."""
+        while True:
+            priority, _, key = self._queue.get()
+            if self._stopped:
+                return
+                
+            with self._lock:
+                pending = self._pending.get(key)
+                if pending is None or pending.priority != priority:
+                    continue
+                del self._pending[key]
+                
+            head = self._head(pending.s3_client, pending.file_info)
+            for callback in pending.callbacks:
+                try:
+                    callback(key, head)
+                except Exception as e:
+                    print(f"Debug: Metadata callback failed for {key}: {str(e)}")
+                    
+    def shutdown(self):
+        """Stop the worker threads after their current request."""
+        self._stopped = True
+        self.cancel_pending()
+        for _ in self._threads:
+            self._queue.put((-1, next(self._counter), None))
@@ -0,0 +1,184 @@
+# MIT License
+# 
+# Copyright (c) 2025 S3Ducky
+
+"""
+Predictive prefetching for S3Ducky.
+
+While the user looks at a listing, one low-priority thread warms the
+caches for the likely next steps: the first listing page of sibling
+prefixes (so opening one as a tab needs no round trip) and thumbnails of
+the rows ahead of the viewport. Each navigation step gets a fixed request
+budget, work waits while the application is busy, and anything the user
+starts cancels whatever has not been sent yet.
+"""
+
+import time
+import threading
+from collections import OrderedDict
+
+
+# Requests one navigation step may spend on prefetching
+DEFAULT_BUDGET = 16
+
+# Seconds a prefetched result stays usable
+DEFAULT_TTL = 120
+
+# Seconds between checks while the application is busy
+BUSY_POLL_INTERVAL = 0.25
+
+
+class PrefetchCache:
+    """
+    Small expiring store of prefetched results (e.g. connected backends).
+    """
+    
+    def __init__(self, ttl=DEFAULT_TTL, max_entries=64):
+        """
+        Args:
+            ttl (float): Seconds an entry stays valid
+            max_entries (int): Oldest entries are dropped past this count
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        
+    def put(self, key, value):
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (time.monotonic(), value)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                
+    def __contains__(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and time.monotonic() - entry[0] < self.ttl
+            
+    def take(self, key):
+        """
+        Remove and return a fresh entry.
+        
+        Returns:
+            The stored value, or None if missing or expired
+        """
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None or time.monotonic() - entry[0] >= self.ttl:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entry[1]
+            
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class Prefetcher:
+    """
+    Runs prefetch jobs one at a time on a background thread.
+    
+    Jobs are grouped (e.g. 'listing', 'thumbnails'). Scheduling a group
+    replaces its queued jobs and resets its budget, so only the latest
+    navigation step is prefetched for; every job counts as one request
+    against the budget of its group.
+    """
+    
+    def __init__(self, budget=DEFAULT_BUDGET, is_busy=None):
+        """
+        Args:
+            budget (int): Requests per group and navigation step
+            is_busy (callable, optional): Returns True while user work needs the
+                connection; prefetching waits until it returns False
+        """
+        self.budget = budget
+        self.is_busy = is_busy
+        self.requests_made = 0
+        self._queues = OrderedDict()
+        self._spent = {}
+        self._generation = 0
+        self._condition = threading.Condition()
+        self._stopped = False
+        
+        thread = threading.Thread(target=self._worker)
+        thread.daemon = True
+        thread.start()
+        
+    def schedule(self, group, jobs):
+        """
+        Replace the queued jobs of a group.
+        
+        Args:
+            group (str): Job group
+            jobs (list): (key, callable) pairs, most likely first; keys only
+                need to be unique within the group
+        """
+        with self._condition:
+            self._spent[group] = 0
+            self._queues[group] = OrderedDict()
+            self._add(group, jobs)
+            
+    def add(self, group, jobs):
+        """Queue more jobs for a group without resetting its budget (e.g. from a job)."""
+        with self._condition:
+            self._add(group, jobs)
+            
+    def _add(self, group, jobs):
+        queue = self._queues.setdefault(group, OrderedDict())
+        room = self.budget - self._spent.get(group, 0) - len(queue)
+        for key, job in jobs:
+            if room <= 0:
+                break
+            if key not in queue:
+                queue[key] = job
+                room -= 1
+        self._condition.notify()
+        
+    def cancel(self):
+        """Drop every queued job (a request that is already in flight completes)."""
+        with self._condition:
+            self._queues.clear()
+            self._generation += 1
+            
+    def _next_job(self):
+        """Wait for a job of any group, oldest group first."""
+        with self._condition:
+            while not self._stopped:
+                for group, queue in self._queues.items():
+                    if queue:
+                        key, job = queue.popitem(last=False)
+                        self._spent[group] = self._spent.get(group, 0) + 1
+                        return group, key, job, self._generation
+                self._condition.wait()
+        return None
+        
+    def _worker(self):
+        """Worker loop: run queued jobs whenever the application is idle."""
+        while True:
+            next_job = self._next_job()
+            if next_job is None:
+                return
+            group, key, job, generation = next_job
+            
+            while self.is_busy is not None and self.is_busy() and not self._stopped:
+                time.sleep(BUSY_POLL_INTERVAL)
+            with self._condition:
+                if self._stopped or generation != self._generation:
+                    continue
+                    
+            try:
+                job()
+                self.requests_made += 1
+            except Exception as e:
+                print(f"Debug: Prefetch of {group} {key} failed: {str(e)}")
+                
+    def shutdown(self):
+        """Stop the worker thread after its current job."""
+        with self._condition:
+            self._stopped = True
+            self._queues.clear()
+            self._condition.notify()
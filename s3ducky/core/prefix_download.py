@@ -0,0 +1,171 @@
+# MIT License
+# 
+# Copyright (c) 2025 S3Ducky
+
+"""
+Pipelined recursive downloads for S3Ducky.
+
+Downloading a whole prefix does not wait for its listing. One thread
+pages through the keys below the prefix and feeds a bounded queue, and a
+pool of download workers takes objects off it as soon as the first page
+arrives. When the workers fall behind, the listing waits, so memory stays
+flat however many keys the prefix holds. Keys keep their path below the
+prefix under the destination folder, so "a/report.csv" and
+"b/report.csv" no longer overwrite each other.
+"""
+
+import os
+import queue
+import threading
+from .object_metadata import needs_restore
+from ..utils.formatters import format_file_size
+
+
+# Listing entries waiting for a download worker
+DEFAULT_QUEUE_SIZE = 1000
+
+# Seconds between checks for a failed job while the queue is full or empty
+POLL_INTERVAL = 0.25
+
+
+def normalize_prefix(prefix):
+    """
+    Turn a folder name into the key prefix of its contents.
+    
+    Returns:
+        str: '' for the whole bucket, else the prefix ending in '/'
+    """
+    prefix = (prefix or '').strip()
+    if prefix and not prefix.endswith('/'):
+        prefix += '/'
+    return prefix
+
+
+def local_path_for(key, prefix, dest_folder):
+    """
+    Map a key below a prefix to its path under the destination folder.
+    
+    Empty, "." and ".." path segments are dropped, so no key can write
+    outside the destination.
+    
+    Args:
+        key (str): S3 object key
+        prefix (str): Prefix being downloaded (see normalize_prefix)
+        dest_folder (str): Destination folder path
+        
+    Returns:
+        str or None: Local file path, or None for folder markers ("photos/")
+    """
+    if key.endswith('/'):
+        return None
+    parts = [part for part in key[len(prefix):].split('/') if part not in ('', '.', '..')]
+    if not parts:
+        return None
+    return os.path.join(dest_folder, *parts)
+
+
+def download_prefix(s3_client, prefix, dest_folder, download, workers=4, queue_size=DEFAULT_QUEUE_SIZE,
+                    progress_callback=None):
+    """
+    List and download every object below a prefix at the same time.
+    
+    Objects that are archived according to the listing (Glacier, Deep
+    Archive) are skipped, since they can't be read until restored. The
+    first failure stops the listing and every worker after its current
+    object and is raised once they have finished.
+    
+    Args:
+        s3_client (StorageBackend): Connected backend
+        prefix (str): Key prefix to download ('' for everything the backend lists)
+        dest_folder (str): Destination folder path
+        download (callable): Called with (key, local_path) to download one object
+        workers (int): Objects downloaded at the same time
+        queue_size (int): Listed objects allowed to wait for a worker
+        progress_callback (callable, optional): Callback for progress updates
+        
+    Returns:
+        tuple: (objects downloaded, bytes downloaded, keys of skipped archived objects)
+    """
+    prefix = normalize_prefix(prefix)
+    workers = max(1, workers)
+    pending = queue.Queue(maxsize=max(1, queue_size))
+    stop = threading.Event()
+    errors = []
+    skipped = []
+    lock = threading.Lock()
+    counts = {'listed': 0, 'done': 0, 'bytes': 0, 'listing': True}
+    
+    def report_progress():
+        if progress_callback:
+            with lock:
+                listed = f"{counts['listed']}+" if counts['listing'] else counts['listed']
+                message = (f"Downloaded {counts['done']}/{listed} files "
+                           f"({format_file_size(counts['bytes'])}) from {prefix or 'the bucket root'}")
+            progress_callback(message)
+            
+    def put(item):
+        """Queue an item, giving up once the job has failed."""
+        while not stop.is_set():
+            try:
+                pending.put(item, timeout=POLL_INTERVAL)
+                return True
+            except queue.Full:
+                pass
+        return False
+        
+    def list_keys():
+        try:
+            # Keys come in order, so the prefix ends at the first key outside it
+            for entries in s3_client.list_object_pages(start_after=prefix or None):
+                for file_info in entries:
+                    if not file_info['key'].startswith(prefix):
+                        return
+                    if needs_restore(file_info):
+                        skipped.append(file_info['key'])
+                        continue
+                    local_path = local_path_for(file_info['key'], prefix, dest_folder)
+                    if local_path is None:
+                        continue
+                    with lock:
+                        counts['listed'] += 1
+                    if not put((file_info, local_path)):
+                        return
+        except Exception as e:
+            errors.append(e)
+            stop.set()
+        finally:
+            with lock:
+                counts['listing'] = False
+            for _ in range(workers):
+                put(None)
+                
+    def worker():
+        while not stop.is_set():
+            try:
+                item = pending.get(timeout=POLL_INTERVAL)
+            except queue.Empty:
+                continue
+            if item is None:
+                return
+            file_info, local_path = item
+            try:
+                os.makedirs(os.path.dirname(local_path), exist_ok=True)
+                download(file_info['key'], local_path)
+            except Exception as e:
+                errors.append(e)
+                stop.set()
+                return
+            with lock:
+                counts['done'] += 1
+                counts['bytes'] += file_info.get('size', 0)
+            report_progress()
+            
+    threads = [threading.Thread(target=list_keys, daemon=True)]
+    threads += [threading.Thread(target=worker, daemon=True) for _ in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise errors[0]
+    return counts['done'], counts['bytes'], skipped
@@ -0,0 +1,210 @@
+# MIT License
+# 
+# Copyright (c) 2025 S3Ducky
+
+"""
+Parallel ranged downloads for S3Ducky.
+
+Large objects are fetched as several byte ranges at once. The destination
+file is preallocated to its final size and every range worker writes its
+bytes straight to their offset, so nothing is buffered or reassembled in
+memory and the ranges can finish in any order. Offsets are written with
+os.pwrite, or through a shared memory map where pwrite is not available
+(Windows).
+
+Ranged and streamed downloads both go to a file next to the destination,
+which only replaces it once complete and with no failed check; a corrupt
+download is deleted and the existing file left alone.
+"""
+
+import os
+import mmap
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from .integrity import CHECK_MISMATCH
+
+
+# Suffix of the file an object is written to before it is moved into place
+TEMP_SUFFIX = '.s3ducky-part'
+
+
+def preallocate(fd, size):
+    """
+    Reserve the full size of a file up front.
+    
+    posix_fallocate allocates the blocks, so the download can't run out of
+    space halfway and the file isn't fragmented by out-of-order writes.
+    Elsewhere (or on filesystems that don't support it) the file is just
+    extended to its size.
+    
+    Args:
+        fd (int): File descriptor opened for writing
+        size (int): Final file size in bytes
+    """
+    if hasattr(os, 'posix_fallocate'):
+        try:
+            os.posix_fallocate(fd, 0, size)
+            return
+        except OSError as e:
+            print(f"Debug: posix_fallocate not supported here, extending file instead: {e}")
+    os.ftruncate(fd, size)
+
+
+class OffsetWriter:
+    """
+    Writes data at absolute offsets of one file, safely from many threads.
+    """
+    
+    def __init__(self, fd, size):
+        """
+        Args:
+            fd (int): File descriptor of a file already extended to size
+            size (int): File size in bytes
+        """
+        self.fd = fd
+        self.map = None
+        if not hasattr(os, 'pwrite'):
+            self.map = mmap.mmap(fd, size)
+            
+    def write(self, offset, data):
+        """
+        Write data starting at offset.
+        
+        Args:
+            offset (int): Byte offset in the file
+            data (bytes): Data to write
+        """
+        if self.map is not None:
+            self.map[offset:offset + len(data)] = data
+            return
+        view = memoryview(data)
+        while len(view):
+            written = os.pwrite(self.fd, view, offset)
+            view = view[written:]
+            offset += written
+            
+    def close(self):
+        """Flush and release the memory map, if one is used."""
+        if self.map is not None:
+            self.map.flush()
+            self.map.close()
+            self.map = None
+
+
+def _finish_download(temp_path, local_path, verifier):
+    """Move a complete download into place unless it failed a check; returns the check results."""
+    results = verifier.finish() if verifier else None
+    if results and CHECK_MISMATCH in results.values():
+        print(f"Debug: Discarding corrupt download of {local_path}: {results}")
+        os.remove(temp_path)
+    else:
+        os.replace(temp_path, local_path)
+    return results
+
+
+def write_stream(local_path, chunks, verifier=None):
+    """
+    Write an object to disk in order, hashing each chunk on its way through.
+    
+    Args:
+        local_path (str): Destination file path
+        chunks (iterable): The object's bytes, in order
+        verifier (StreamVerifier, optional): Receives every chunk
+        
+    Returns:
+        dict or None: Check results when verifying
+    """
+    temp_path = local_path + TEMP_SUFFIX
+    try:
+        with open(temp_path, 'wb') as f:
+            for chunk in chunks:
+                if verifier:
+                    verifier.update(chunk)
+                f.write(chunk)
+        return _finish_download(temp_path, local_path, verifier)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def split_ranges(size, part_size):
+    """
+    Split an object into consecutive byte ranges.
+    
+    Args:
+        size (int): Object size in bytes
+        part_size (int): Bytes per range (the last one may be shorter)
+        
+    Returns:
+        list: (part_number, start, end) tuples with inclusive, 1-based ranges
+    """
+    return [(number, start, min(start + part_size, size) - 1)
+            for number, start in enumerate(range(0, size, part_size), start=1)]
+
+
+def download_ranges(local_path, size, part_size, fetch_range, concurrency=8, verifier=None):
+    """
+    Download an object range by range into a preallocated file.
+    
+    The object is written next to local_path and only moved into place once
+    every range arrived and passed its checks. The first failing range stops
+    the others.
+    
+    Args:
+        local_path (str): Destination file path
+        size (int): Object size in bytes
+        part_size (int): Bytes per range; the upload part size when verifying,
+            so that each range is exactly one part
+        fetch_range (callable): Called with (part_number, start, end) from a
+            worker thread; returns an iterable of chunks of that range
+        concurrency (int): Ranges downloaded at the same time
+        verifier (PartVerifier, optional): Receives the hashes of each range
+        
+    Returns:
+        dict or None: Check results when verifying
+        
+    Raises:
+        Exception: If a range could not be downloaded completely
+    """
+    ranges = split_ranges(size, part_size)
+    cancelled = threading.Event()
+    temp_path = local_path + TEMP_SUFFIX
+    
+    try:
+        with open(temp_path, 'wb+') as f:
+            preallocate(f.fileno(), size)
+            writer = OffsetWriter(f.fileno(), size)
+            
+            def fetch(part_number, start, end):
+                """Stream one range to its offset, hashing it on the way."""
+                if cancelled.is_set():
+                    return
+                hashes = verifier.part_hashes() if verifier else {}
+                offset = start
+                for chunk in fetch_range(part_number, start, end):
+                    if cancelled.is_set():
+                        return
+                    for part_hash in hashes.values():
+                        part_hash.update(chunk)
+                    writer.write(offset, chunk)
+                    offset += len(chunk)
+                if offset != end + 1:
+                    raise Exception(f"Range {start}-{end} ended after {offset - start} bytes")
+                if verifier:
+                    verifier.add_part(part_number, hashes, offset - start)
+                    
+            try:
+                with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(ranges)))) as executor:
+                    futures = [executor.submit(fetch, *byte_range) for byte_range in ranges]
+                    try:
+                        for future in futures:
+                            future.result()
+                    except Exception:
+                        cancelled.set()
+                        raise
+            finally:
+                writer.close()
+        return _finish_download(temp_path, local_path, verifier)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
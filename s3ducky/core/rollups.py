@@ -0,0 +1,252 @@
+# MIT License
+# 
+# Copyright (c) 2025 S3Ducky
+
+"""
+Per-prefix size rollups ("du" for a bucket) for S3Ducky.
+"""
+
+from datetime import datetime, timezone
+from .listing_store import ColumnPage
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+class PrefixRollup:
+    """
+    Totals (bytes, object count, newest and oldest modification time) for
+    every folder prefix of a listing, at every depth.
+    
+    Each prefix gets an integer code the first time it is seen, together with
+    its parent's code. A page of entries is reduced to one code per object
+    (its folder) and grouped with NumPy unique/bincount. The per-folder
+    totals are then pushed up one level at a time through the parent codes
+    with ufunc.at. Only the (much smaller) set of distinct folders in the page
+    is walked, so pages can be added incrementally as the listing arrives.
+    Deleted objects are subtracted the same way. Without NumPy the same
+    steps run in plain Python.
+    """
+    
+    ROOT = ''
+    
+    def __init__(self):
+        self.prefixes = [self.ROOT]
+        self.codes = {self.ROOT: 0}
+        self.parents = [-1]
+        self.children = {0: []}
+        
+        if NUMPY_AVAILABLE:
+            self.parent_codes = np.full(1, -1, dtype=np.int64)
+            self.bytes = np.zeros(1, dtype=np.int64)
+            self.counts = np.zeros(1, dtype=np.int64)
+            self.newest = np.full(1, -np.inf)
+            self.oldest = np.full(1, np.inf)
+        else:
+            self.bytes = [0]
+            self.counts = [0]
+            self.newest = [float('-inf')]
+            self.oldest = [float('inf')]
+            
+    def _register(self, prefix):
+        """Assign codes to a prefix and any of its ancestors not seen yet."""
+        code = self.codes.get(prefix)
+        if code is not None:
+            return code
+            
+        parent_prefix = prefix[:-1].rpartition('/')[0]
+        parent_prefix = parent_prefix + '/' if parent_prefix else self.ROOT
+        parent = self._register(parent_prefix)
+        
+        code = len(self.prefixes)
+        self.prefixes.append(prefix)
+        self.codes[prefix] = code
+        self.parents.append(parent)
+        self.children[parent].append(code)
+        self.children[code] = []
+        return code
+        
+    def _grow(self):
+        """Extend the aggregate arrays to cover newly registered prefixes."""
+        missing = len(self.prefixes) - len(self.bytes)
+        if missing <= 0:
+            return
+        if NUMPY_AVAILABLE:
+            self.parent_codes = np.asarray(self.parents, dtype=np.int64)
+            self.bytes = np.concatenate([self.bytes, np.zeros(missing, dtype=np.int64)])
+            self.counts = np.concatenate([self.counts, np.zeros(missing, dtype=np.int64)])
+            self.newest = np.concatenate([self.newest, np.full(missing, -np.inf)])
+            self.oldest = np.concatenate([self.oldest, np.full(missing, np.inf)])
+        else:
+            self.bytes.extend([0] * missing)
+            self.counts.extend([0] * missing)
+            self.newest.extend([float('-inf')] * missing)
+            self.oldest.extend([float('inf')] * missing)
+            
+    def add_entries(self, entries):
+        """
+        Add a page of listing entries to the totals.
+        
+        Args:
+            entries (list or ColumnPage): Listing entries with 'key', 'size' and 'modified'
+        """
+        if not entries:
+            return
+            
+        keys, sizes, mtimes = self._columns(entries)
+        codes = self._folder_codes(keys)
+        if NUMPY_AVAILABLE:
+            self._add_vectorized(np.asarray(codes), np.asarray(sizes, dtype=np.int64),
+                                 np.asarray(mtimes, dtype=np.float64))
+        else:
+            self._add_python(codes, sizes, mtimes)
+            
+    def remove_entries(self, entries):
+        """
+        Subtract listing entries that went away (deleted, moved or replaced).
+        
+        Bytes and counts stay exact. Newest and oldest times can't be taken
+        back without rescanning the folder, so they stay as bounds until
+        the folder is empty.
+        
+        Args:
+            entries (list or ColumnPage): Listing entries with 'key', 'size' and 'modified'
+        """
+        if not entries:
+            return
+            
+        keys, sizes, _ = self._columns(entries)
+        codes = self._folder_codes(keys)
+        if NUMPY_AVAILABLE:
+            self._add_vectorized(np.asarray(codes), -np.asarray(sizes, dtype=np.int64), None, sign=-1)
+            empty = self.counts <= 0
+            self.newest[empty] = -np.inf
+            self.oldest[empty] = np.inf
+        else:
+            for code, size in zip(codes, sizes):
+                while code != -1:
+                    self.bytes[code] -= size
+                    self.counts[code] -= 1
+                    if self.counts[code] <= 0:
+                        self.newest[code] = float('-inf')
+                        self.oldest[code] = float('inf')
+                    code = self.parents[code]
+                    
+    @staticmethod
+    def _columns(entries):
+        """Get the keys, sizes and modification timestamps of some entries."""
+        if isinstance(entries, ColumnPage):
+            return entries.keys, entries.sizes, entries.mtimes
+        keys = [entry['key'] for entry in entries]
+        sizes = [entry['size'] for entry in entries]
+        mtimes = [entry['modified'].timestamp() for entry in entries]
+        return keys, sizes, mtimes
+        
+    def _folder_codes(self, keys):
+        """Map each key to the code of its folder, registering new folders."""
+        # The only per-object Python work
+        codes = []
+        folder_codes = {}
+        for key in keys:
+            folder = key.rpartition('/')[0]
+            code = folder_codes.get(folder)
+            if code is None:
+                code = self._register(folder + '/' if folder else self.ROOT)
+                folder_codes[folder] = code
+            codes.append(code)
+        self._grow()
+        return codes
+        
+    def _add_vectorized(self, codes, sizes, mtimes, sign=1):
+        """
+        Group the page by folder code and push the totals up with NumPy.
+        
+        With sign=-1 (and negated sizes, no times) the objects are subtracted.
+        """
+        folders, inverse = np.unique(codes, return_inverse=True)
+        folder_bytes = np.zeros(len(folders), dtype=np.int64)
+        np.add.at(folder_bytes, inverse, sizes)
+        folder_counts = sign * np.bincount(inverse, minlength=len(folders)).astype(np.int64)
+        folder_newest = np.full(len(folders), -np.inf)
+        folder_oldest = np.full(len(folders), np.inf)
+        if mtimes is not None:
+            np.maximum.at(folder_newest, inverse, mtimes)
+            np.minimum.at(folder_oldest, inverse, mtimes)
+        
+        # Each pass adds the folder totals to the current ancestor, then moves one level up
+        targets = folders
+        while len(targets):
+            np.add.at(self.bytes, targets, folder_bytes)
+            np.add.at(self.counts, targets, folder_counts)
+            if mtimes is not None:
+                np.maximum.at(self.newest, targets, folder_newest)
+                np.minimum.at(self.oldest, targets, folder_oldest)
+            
+            targets = self.parent_codes[targets]
+            keep = targets >= 0
+            targets = targets[keep]
+            folder_bytes = folder_bytes[keep]
+            folder_counts = folder_counts[keep]
+            folder_newest = folder_newest[keep]
+            folder_oldest = folder_oldest[keep]
+            
+    def _add_python(self, codes, sizes, mtimes):
+        """Fallback for add_entries() when NumPy is not installed."""
+        for code, size, mtime in zip(codes, sizes, mtimes):
+            while code != -1:
+                self.bytes[code] += size
+                self.counts[code] += 1
+                if mtime > self.newest[code]:
+                    self.newest[code] = mtime
+                if mtime < self.oldest[code]:
+                    self.oldest[code] = mtime
+                code = self.parents[code]
+                
+    def get(self, prefix=ROOT):
+        """
+        Get the totals for one prefix.
+        
+        Args:
+            prefix (str): Folder prefix ending in '/', or '' for the whole listing
+            
+        Returns:
+            dict or None: 'prefix', 'bytes', 'count', 'newest', 'oldest'
+        """
+        code = self.codes.get(prefix)
+        if code is None:
+            return None
+        return self._row(code)
+        
+    def _row(self, code):
+        """Build the totals dictionary for a prefix code."""
+        count = int(self.counts[code])
+        return {
+            'prefix': self.prefixes[code],
+            'bytes': int(self.bytes[code]),
+            'count': count,
+            'newest': datetime.fromtimestamp(self.newest[code], timezone.utc) if count else None,
+            'oldest': datetime.fromtimestamp(self.oldest[code], timezone.utc) if count else None,
+        }
+        
+    def child_rows(self, prefix=ROOT):
+        """
+        Get the totals of the folders directly under a prefix.
+        
+        Args:
+            prefix (str): Parent folder prefix
+            
+        Returns:
+            list: Totals dictionaries, one per child folder that still holds objects
+        """
+        code = self.codes.get(prefix)
+        if code is None:
+            return []
+        return [self._row(child) for child in self.children[code] if self.counts[child] > 0]
+        
+    def has_children(self, prefix):
+        """Check whether a prefix has sub-folders that still hold objects."""
+        code = self.codes.get(prefix)
+        return code is not None and any(self.counts[child] > 0 for child in self.children[code])
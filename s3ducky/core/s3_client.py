@@ -1,202 +1,944 @@
-# MIT License
-# 
-# Copyright (c) 2025 S3Ducky
-
-"""
-S3 client and connection management for S3Ducky.
-"""
-
-import boto3
-from boto3.session import Session
-from botocore.exceptions import ClientError, NoCredentialsError, BotoCoreError
-
-
-class S3Client:
-    """
-    Handles S3 connection and basic operations.
-    """
-    
-    def __init__(self):
-        self.session = None
-        self.s3_client = None
-        self.s3_resource = None
-        self.bucket_name = ""
-        self.resource_prefix = None
-        
-    def connect(self, access_key, secret_key, region, bucket_name, resource_prefix=None):
-        """
-        Connect to S3 using provided credentials.
-        
-        Args:
-            access_key (str): AWS Access Key ID
-            secret_key (str): AWS Secret Access Key
-            region (str): AWS region
-            bucket_name (str): S3 bucket name
-            resource_prefix (str, optional): Prefix filter for objects
-            
-        Returns:
-            bool: True if connection successful, False otherwise
-            
-        Raises:
-            NoCredentialsError: Invalid AWS credentials
-            ClientError: AWS service errors
-            Exception: Other connection errors
-        """
-        # Validate inputs
-        if not all([access_key, secret_key, region, bucket_name]):
-            raise ValueError("All connection parameters are required")
-            
-        try:
-            # Create S3 session and resource (more reliable than client for listing)
-            self.session = Session(
-                aws_access_key_id=access_key,
-                aws_secret_access_key=secret_key,
-                region_name=region
-            )
-            
-            # Create both client and resource for different operations
-            self.s3_client = self.session.client('s3')
-            self.s3_resource = self.session.resource('s3')
-            
-            # Store connection details
-            self.bucket_name = bucket_name
-            # Only use prefix if it's not empty and not just whitespace
-            resource_input = resource_prefix.strip() if resource_prefix else ""
-            self.resource_prefix = resource_input if resource_input else None
-            
-            # Test connection by attempting to list objects
-            self._test_connection()
-            
-            return True
-            
-        except Exception as e:
-            # Clean up on failure
-            self.disconnect()
-            raise e
-    
-    def _test_connection(self):
-        """
-        Test the S3 connection by attempting to list objects.
-        
-        Raises:
-            ClientError: If bucket doesn't exist or access denied
-        """
-        try:
-            # Try to list objects (limit to 1 for quick test)
-            params = {'Bucket': self.bucket_name, 'MaxKeys': 1}
-            if self.resource_prefix:
-                params['Prefix'] = self.resource_prefix
-            
-            self.s3_client.list_objects_v2(**params)
-        except ClientError as e:
-            error_code = e.response['Error']['Code']
-            if error_code == 'NoSuchBucket':
-                raise ClientError(
-                    error_response={'Error': {'Code': 'NoSuchBucket', 
-                                            'Message': f"Bucket '{self.bucket_name}' does not exist"}},
-                    operation_name='list_objects_v2'
-                )
-            elif error_code == 'AccessDenied':
-                raise ClientError(
-                    error_response={'Error': {'Code': 'AccessDenied', 
-                                            'Message': "Access denied. Check your credentials and permissions"}},
-                    operation_name='list_objects_v2'
-                )
-            else:
-                raise e
-    
-    def disconnect(self):
-        """
-        Disconnect from S3 and clean up resources.
-        """
-        self.session = None
-        self.s3_client = None
-        self.s3_resource = None
-        self.bucket_name = ""
-        self.resource_prefix = None
-    
-    def is_connected(self):
-        """
-        Check if currently connected to S3.
-        
-        Returns:
-            bool: True if connected, False otherwise
-        """
-        return self.s3_client is not None and self.bucket_name
-    
-    def list_objects(self):
-        """
-        List all objects in the connected bucket with optional prefix filter.
-        
-        Returns:
-            list: List of object dictionaries with keys: 'key', 'size', 'modified'
-            
-        Raises:
-            RuntimeError: If not connected to S3
-            Exception: If listing fails
-        """
-        if not self.is_connected():
-            raise RuntimeError("Not connected to S3. Call connect() first.")
-        
-        try:
-            files_list = []
-            
-            print(f"Debug: Loading files from bucket: {self.bucket_name}")
-            if self.resource_prefix:
-                print(f"Debug: Using prefix filter: {self.resource_prefix}")
-            
-            # Use client method with pagination (most reliable)
-            paginator = self.s3_client.get_paginator('list_objects_v2')
-            
-            # Set up pagination parameters
-            page_params = {'Bucket': self.bucket_name}
-            if self.resource_prefix:
-                page_params['Prefix'] = self.resource_prefix
-            
-            page_iterator = paginator.paginate(**page_params)
-            
-            total_files = 0
-            for page in page_iterator:
-                if 'Contents' in page:
-                    for obj in page['Contents']:
-                        total_files += 1
-                        files_list.append({
-                            'key': obj['Key'],
-                            'size': obj['Size'],
-                            'modified': obj['LastModified']
-                        })
-                        
-                        # Log progress for large buckets
-                        if total_files % 1000 == 0:
-                            print(f"Debug: Loaded {total_files} files so far...")
-            
-            print(f"Debug: Successfully loaded {len(files_list)} files from S3")
-            
-            # Sort files by name
-            files_list.sort(key=lambda x: x['key'])
-            
-            return files_list
-            
-        except Exception as e:
-            print(f"Debug: Failed to load files: {str(e)}")
-            raise Exception(f"Failed to load files: {str(e)}")
-    
-    def download_file(self, s3_key, local_path):
-        """
-        Download a single file from S3.
-        
-        Args:
-            s3_key (str): S3 object key
-            local_path (str): Local file path for download
-            
-        Raises:
-            RuntimeError: If not connected to S3
-            Exception: If download fails
-        """
-        if not self.is_connected():
-            raise RuntimeError("Not connected to S3. Call connect() first.")
-        
-        try:
-            self.s3_client.download_file(self.bucket_name, s3_key, local_path)
-        except Exception as e:
-            raise Exception(f"Failed to download {s3_key}: {str(e)}")
+# MIT License
+# 
+# Copyright (c) 2025 S3Ducky
+
+"""
+S3 client and connection management for S3Ducky.
+"""
+
+import io
+import time
+import http.client
+import boto3
+from boto3.session import Session
+from botocore.config import Config
+from botocore.exceptions import (ClientError, NoCredentialsError, BotoCoreError, IncompleteReadError,
+                                 ResponseStreamingError, ReadTimeoutError, ConnectionClosedError)
+from .inventory import InventorySource
+from .object_metadata import parse_restore
+from .storage import StorageBackend
+from .integrity import StreamVerifier, PartVerifier
+from .ranged_download import download_ranges, write_stream
+from .bandwidth import DOWNLOAD, UPLOAD, ThrottledReader, throttle_on_send
+from ..utils.profiling import profiled, PHASE_LIST, PHASE_DOWNLOAD
+
+
+# Errors of a response body dropped mid-stream; the rest is requested again
+STREAM_ERRORS = (IncompleteReadError, ResponseStreamingError, ReadTimeoutError, ConnectionClosedError,
+                 http.client.IncompleteRead, ConnectionError, TimeoutError)
+
+# Times one range is resumed after a dropped connection
+MAX_STREAM_RETRIES = 3
+
+# 'auto' uses virtual-hosted URLs where the bucket name allows them, 'path'
+# puts the bucket in the path (needed by most S3-compatible servers)
+ADDRESSING_STYLES = ('auto', 'virtual', 'path')
+
+
+def endpoint_options(settings):
+    """
+    Get the endpoint keyword arguments of S3Client.connect() from settings.
+    
+    Args:
+        settings (dict): Loaded settings
+        
+    Returns:
+        dict: endpoint_url, addressing_style, accelerate and dualstack
+    """
+    return {
+        'endpoint_url': settings['s3_endpoint_url'],
+        'addressing_style': settings['s3_addressing_style'],
+        'accelerate': settings['s3_accelerate'],
+        'dualstack': settings['s3_dualstack']
+    }
+
+
+def client_config(endpoint_url=None, addressing_style='auto', accelerate=False, dualstack=False):
+    """
+    Build the botocore config for an S3 endpoint.
+    
+    Args:
+        endpoint_url (str, optional): Custom endpoint, e.g. http://localhost:9000
+        addressing_style (str): One of ADDRESSING_STYLES
+        accelerate (bool): Use the S3 Transfer Acceleration endpoint
+        dualstack (bool): Use the IPv4/IPv6 dual-stack endpoint
+        
+    Returns:
+        Config: Client configuration
+        
+    Raises:
+        ValueError: For options S3 can't combine
+    """
+    if addressing_style not in ADDRESSING_STYLES:
+        raise ValueError(f"Unknown addressing style '{addressing_style}' "
+                         f"(expected one of {', '.join(ADDRESSING_STYLES)})")
+    if endpoint_url and not endpoint_url.startswith(('http://', 'https://')):
+        raise ValueError(f"Endpoint URL '{endpoint_url}' must start with http:// or https://")
+    if accelerate and endpoint_url:
+        raise ValueError("Transfer acceleration can't be combined with a custom endpoint")
+    if accelerate and addressing_style == 'path':
+        raise ValueError("Transfer acceleration needs virtual-hosted addressing")
+    if dualstack and endpoint_url:
+        raise ValueError("Dual-stack can't be combined with a custom endpoint")
+    return Config(s3={
+        'addressing_style': addressing_style,
+        'use_accelerate_endpoint': bool(accelerate),
+        'use_dualstack_endpoint': bool(dualstack)
+    })
+
+
+def _quoted_etag(etag):
+    """Quote an ETag as S3's conditional headers expect (listings store it bare)."""
+    return '"' + etag.strip('"') + '"'
+
+
+def _copy_error(error):
+    """Describe a failed copy, naming a source that changed since it was listed."""
+    code = error.response.get('Error', {}).get('Code') if isinstance(error, ClientError) else None
+    if code in ('PreconditionFailed', '412'):
+        return "the source changed since it was listed (precondition failed)"
+    return str(error)
+
+
+def to_file_info(obj):
+    """
+    Convert a list_objects_v2 'Contents' entry to a listing entry.
+    
+    Args:
+        obj (dict): Object summary returned by S3
+        
+    Returns:
+        dict: Listing entry with keys: 'key', 'size', 'modified', 'etag', 'storage_class'
+    """
+    return {
+        'key': obj['Key'],
+        'size': obj['Size'],
+        'modified': obj['LastModified'],
+        'etag': obj.get('ETag', '').strip('"'),
+        'storage_class': obj.get('StorageClass', 'STANDARD')
+    }
+
+
+class S3Client(StorageBackend):
+    """
+    Storage backend for an S3 bucket: handles the connection and all requests.
+    """
+    
+    def __init__(self, limiter=None, ranged_threshold=64 * 1024 * 1024,
+                 ranged_part_size=16 * 1024 * 1024, ranged_concurrency=8):
+        """
+        Args:
+            limiter (BandwidthLimiter, optional): Limits shared by all transfers
+            ranged_threshold (int): Objects this large or larger download as parallel ranges
+            ranged_part_size (int): Bytes per range (multipart objects use their part size
+                when verified)
+            ranged_concurrency (int): Ranges of one object downloaded at the same time
+        """
+        super().__init__(limiter, ranged_threshold, ranged_part_size, ranged_concurrency)
+        self.session = None
+        self.s3_client = None
+        self.s3_resource = None
+        # Custom endpoint (None for AWS) and access key of the connection
+        self.endpoint_url = None
+        self.access_key = None
+        
+        # First listing page fetched while testing the connection
+        self.first_page = None
+        
+    def connect(self, access_key, secret_key, region, bucket_name, resource_prefix=None,
+                client_cache=None, inventory_manifest=None, inventory_top_up=False,
+                endpoint_url=None, addressing_style='auto', accelerate=False, dualstack=False):
+        """
+        Connect to S3 using provided credentials.
+        
+        Args:
+            access_key (str): AWS Access Key ID
+            secret_key (str): AWS Secret Access Key
+            region (str): AWS region
+            bucket_name (str): S3 bucket name
+            resource_prefix (str, optional): Prefix filter for objects
+            client_cache (ClientCache, optional): Shared cache to take the boto3
+                session and client from instead of building new ones
+            inventory_manifest (str, optional): Local manifest.json path or s3:// URL
+                of an S3 Inventory report to list from instead of list_objects_v2
+            inventory_top_up (bool): Also LIST keys after the last inventoried key
+            endpoint_url (str, optional): Custom S3-compatible endpoint (MinIO, Ceph,
+                a local test server); empty uses AWS
+            addressing_style (str): 'auto', 'virtual' or 'path'
+            accelerate (bool): Use the S3 Transfer Acceleration endpoint
+            dualstack (bool): Use the IPv4/IPv6 dual-stack endpoint
+            
+        Returns:
+            bool: True if connection successful, False otherwise
+            
+        Raises:
+            NoCredentialsError: Invalid AWS credentials
+            ClientError: AWS service errors
+            Exception: Other connection errors
+        """
+        # Validate inputs
+        if not all([access_key, secret_key, region, bucket_name]):
+            raise ValueError("All connection parameters are required")
+        endpoint = dict(endpoint_url=endpoint_url.strip() if endpoint_url else None,
+                        addressing_style=addressing_style or 'auto',
+                        accelerate=accelerate, dualstack=dualstack)
+        config = client_config(**endpoint)
+            
+        try:
+            if client_cache is not None:
+                # Reuse the session, client and connection pool of earlier connections
+                self.session, self.s3_client, self.s3_resource = client_cache.get(
+                    access_key, secret_key, region, **endpoint)
+            else:
+                # Create S3 session and resource (more reliable than client for listing)
+                self.session = Session(
+                    aws_access_key_id=access_key,
+                    aws_secret_access_key=secret_key,
+                    region_name=region
+                )
+                
+                # Create both client and resource for different operations
+                self.s3_client = self.session.client(
+                    's3', endpoint_url=endpoint['endpoint_url'], config=config)
+                self.s3_resource = self.session.resource(
+                    's3', endpoint_url=endpoint['endpoint_url'], config=config)
+            throttle_on_send(self.s3_client)
+            
+            # Store connection details
+            self.bucket_name = bucket_name
+            self.endpoint_url = endpoint['endpoint_url'] or None
+            self.access_key = access_key.strip()
+            # Only use prefix if it's not empty and not just whitespace
+            resource_input = resource_prefix.strip() if resource_prefix else ""
+            self.resource_prefix = resource_input if resource_input else None
+            
+            # Test connection by attempting to list objects
+            self._test_connection()
+            
+            if inventory_manifest and inventory_manifest.strip():
+                self.inventory = InventorySource(inventory_manifest.strip(), top_up=inventory_top_up)
+                self.inventory.load_manifest(self.s3_client)
+                
+            return True
+            
+        except Exception as e:
+            # Clean up on failure
+            self.disconnect()
+            if client_cache is not None:
+                client_cache.discard(access_key, secret_key, region, **endpoint)
+            raise e
+    
+    @property
+    def location(self):
+        """Where the bucket's objects live: (endpoint URL, access key, bucket name)."""
+        return (self.endpoint_url, self.access_key, self.bucket_name)
+    
+    def _test_connection(self):
+        """
+        Test the S3 connection by attempting to list objects.
+        
+        The response is a full first page of results and is kept in
+        first_page, so showing the listing doesn't repeat the request.
+        
+        Raises:
+            ClientError: If bucket doesn't exist or access denied
+        """
+        try:
+            self.first_page = self._list_page()
+        except ClientError as e:
+            error_code = e.response['Error']['Code']
+            if error_code == 'NoSuchBucket':
+                raise ClientError(
+                    error_response={'Error': {'Code': 'NoSuchBucket', 
+                                            'Message': f"Bucket '{self.bucket_name}' does not exist"}},
+                    operation_name='list_objects_v2'
+                )
+            elif error_code == 'AccessDenied':
+                raise ClientError(
+                    error_response={'Error': {'Code': 'AccessDenied', 
+                                            'Message': "Access denied. Check your credentials and permissions"}},
+                    operation_name='list_objects_v2'
+                )
+            else:
+                raise e
+    
+    def disconnect(self):
+        """
+        Disconnect from S3 and clean up resources.
+        
+        Clients taken from a ClientCache stay alive in the cache.
+        """
+        self.session = None
+        self.s3_client = None
+        self.s3_resource = None
+        self.endpoint_url = None
+        self.access_key = None
+        self.bucket_name = ""
+        self.resource_prefix = None
+        self.first_page = None
+        self.inventory = None
+        
+    def is_connected(self):
+        """
+        Check if currently connected to S3.
+        
+        Returns:
+            bool: True if connected, False otherwise
+        """
+        return self.s3_client is not None and self.bucket_name
+    
+    @profiled(PHASE_LIST)
+    def _list_page(self, continuation_token=None, start_after=None):
+        """
+        Request one page (up to 1000 keys) of the listing.
+        
+        Args:
+            continuation_token (str, optional): Token from the previous page
+            start_after (str, optional): Only list keys sorting after this one
+            
+        Returns:
+            dict: Raw list_objects_v2 response
+        """
+        params = {'Bucket': self.bucket_name}
+        if self.resource_prefix:
+            params['Prefix'] = self.resource_prefix
+        if continuation_token:
+            params['ContinuationToken'] = continuation_token
+        elif start_after:
+            params['StartAfter'] = start_after
+        return self.s3_client.list_objects_v2(**params)
+    
+    def list_folders(self, prefix=''):
+        """
+        List the folders directly under a prefix (one request, up to 1000).
+        
+        Args:
+            prefix (str): Parent prefix ending in '/' ('' for the bucket root)
+            
+        Returns:
+            list: Folder prefixes in key order, each ending in '/'
+        """
+        params = {'Bucket': self.bucket_name, 'Delimiter': '/'}
+        if prefix:
+            params['Prefix'] = prefix
+        response = self.s3_client.list_objects_v2(**params)
+        return [entry['Prefix'] for entry in response.get('CommonPrefixes', [])]
+        
+    def take_first_page(self):
+        """
+        Hand over the listing page fetched by connect().
+        
+        Returns:
+            tuple: (list of listing entries, continuation token or None when
+                the listing is already complete)
+        """
+        page = self.first_page or self._list_page()
+        self.first_page = None
+        entries = [to_file_info(obj) for obj in page.get('Contents', [])]
+        return entries, page.get('NextContinuationToken') if page.get('IsTruncated') else None
+    
+    def list_object_pages(self, continuation_token=None, start_after=None):
+        """
+        Iterate over the listing one page at a time, in S3 (key) order.
+        
+        With an inventory report configured (and no continuation token) the
+        pages come from the report instead, in report order.
+        
+        Args:
+            continuation_token (str, optional): Resume after this page token
+            start_after (str, optional): Only list keys sorting after this one
+            
+        Yields:
+            list: Listing entries of each page
+            
+        Raises:
+            RuntimeError: If not connected to S3
+        """
+        if not self.is_connected():
+            raise RuntimeError("Not connected to S3. Call connect() first.")
+        
+        if self.inventory is not None and continuation_token is None and start_after is None:
+            for entries in self.inventory.iter_pages(self.s3_client, self.resource_prefix):
+                yield entries
+            if not self.inventory.top_up:
+                return
+            # Pick up keys written after the report (sorting after its last key)
+            start_after = self.inventory.last_key
+        
+        while True:
+            page = self._list_page(continuation_token, start_after)
+            yield [to_file_info(obj) for obj in page.get('Contents', [])]
+            
+            if not page.get('IsTruncated'):
+                return
+            continuation_token = page['NextContinuationToken']
+    
+    @profiled(PHASE_DOWNLOAD)
+    def download_file(self, s3_key, local_path, verify=False):
+        """
+        Download a single file from S3.
+        
+        Objects at or above the ranged threshold are fetched as parallel
+        byte ranges written straight into a preallocated file. When
+        verifying, that needs a multipart object (the ranges follow its
+        parts); single-part objects stream in order through one MD5.
+        
+        Args:
+            s3_key (str): S3 object key
+            local_path (str): Local file path for download
+            verify (bool): Check the ETag and any stored checksum while the
+                bytes stream to disk
+            
+        Returns:
+            dict or None: Check results ({check: 'ok'/'mismatch'/'skipped'}) when verifying
+            
+        Raises:
+            RuntimeError: If not connected to S3
+            Exception: If download fails
+        """
+        if not self.is_connected():
+            raise RuntimeError("Not connected to S3. Call connect() first.")
+        
+        try:
+            params = {'Bucket': self.bucket_name, 'Key': s3_key}
+            if verify:
+                params['ChecksumMode'] = 'ENABLED'
+            try:
+                response = self.s3_client.get_object(**params)
+            except ClientError as e:
+                if e.response['Error']['Code'] == 'InvalidObjectState':
+                    raise Exception("the object is archived and has to be restored before it can be downloaded")
+                raise
+            size = response['ContentLength']
+            etag = response.get('ETag', '').strip('"')
+            checksums = {name[len('Checksum'):]: response[name]
+                         for name in ('ChecksumCRC32', 'ChecksumCRC32C', 'ChecksumSHA1', 'ChecksumSHA256')
+                         if response.get(name)}
+            
+            # Multipart values are per part, so the part size is needed to check them
+            part_size = None
+            sizes_proven = True
+            if verify and ('-' in etag or any('-' in value for value in checksums.values())):
+                part_size, sizes_proven = self.get_part_size(s3_key, size)
+            
+            # SSE-KMS and SSE-C ETags are not MD5 digests
+            etag_is_md5 = (response.get('ServerSideEncryption') != 'aws:kms'
+                           and not response.get('SSECustomerAlgorithm'))
+            
+            if size >= self.ranged_threshold and (part_size or not verify):
+                verifier = None
+                if verify:
+                    part_count = (size + part_size - 1) // part_size
+                    verifier = PartVerifier(etag, size, part_count, checksums, etag_is_md5, sizes_proven)
+                return self._download_ranged(s3_key, local_path, response, etag, size,
+                                             part_size or self.ranged_part_size, verifier)
+            
+            verifier = (StreamVerifier(etag, size, part_size, checksums, etag_is_md5, sizes_proven)
+                        if verify else None)
+            return self._download_streamed(s3_key, local_path, response, etag, size, verifier)
+        except Exception as e:
+            raise Exception(f"Failed to download {s3_key}: {str(e)}")
+    
+    def _stream_range(self, s3_key, etag, start, end, body=None, chunk_size=1024 * 1024):
+        """
+        Yield the bytes start..end of an object, resuming after a dropped connection.
+        
+        When the response body fails mid-stream (incomplete read, reset
+        connection, read timeout), the rest of the range is requested again
+        from the current offset with If-Match, so the bytes already passed
+        on are never fetched twice and can't come from another version.
+        
+        Args:
+            s3_key (str): S3 object key
+            etag (str): ETag of the object being read
+            start (int): First byte offset
+            end (int): Last byte offset (inclusive)
+            body (StreamingBody, optional): Open body starting at start (requested if None)
+            chunk_size (int): Bytes per read
+        """
+        offset = start
+        retries = 0
+        while True:
+            try:
+                if offset > end:
+                    return
+                if body is None:
+                    params = {'Bucket': self.bucket_name, 'Key': s3_key, 'Range': f"bytes={offset}-{end}"}
+                    if etag:
+                        params['IfMatch'] = f'"{etag}"'
+                    body = self.s3_client.get_object(**params)['Body']
+                for chunk in body.iter_chunks(min(chunk_size, end - offset + 1)):
+                    # A body covering more than the range (the first GET) is cut off
+                    chunk = chunk[:end - offset + 1]
+                    self._throttle(DOWNLOAD, len(chunk))
+                    offset += len(chunk)
+                    yield chunk
+                    if offset > end:
+                        return
+                raise IncompleteReadError(actual_bytes=offset - start, expected_bytes=end - start + 1)
+            except STREAM_ERRORS as e:
+                retries += 1
+                if retries > MAX_STREAM_RETRIES:
+                    raise
+                print(f"Debug: Stream of {s3_key} broke at byte {offset} ({e}), resuming")
+                time.sleep(0.5 * retries)
+            finally:
+                if body is not None:
+                    body.close()
+                    body = None
+    
+    def _download_streamed(self, s3_key, local_path, response, etag, size, verifier=None,
+                           chunk_size=1024 * 1024):
+        """
+        Stream an object to disk in order, hashing each chunk on its way through.
+        
+        The file is written next to local_path and only moved into place
+        once complete and with none of its checks failed. A dropped
+        connection resumes from the current offset.
+        
+        Returns:
+            dict or None: Check results when verifying
+        """
+        chunks = self._stream_range(s3_key, etag, 0, size - 1, response['Body'], chunk_size)
+        return write_stream(local_path, chunks, verifier)
+    
+    def _download_ranged(self, s3_key, local_path, response, etag, size, part_size,
+                         verifier=None, chunk_size=1024 * 1024):
+        """
+        Download an object as parallel byte ranges.
+        
+        The first range is read from the GET that is already open; the
+        others are requested with If-Match, so a concurrent overwrite fails
+        the download instead of mixing two versions. A range whose
+        connection drops resumes from where it broke off.
+        """
+        def fetch_range(part_number, start, end):
+            body = response['Body'] if part_number == 1 else None
+            return self._stream_range(s3_key, etag, start, end, body, chunk_size)
+            
+        try:
+            return download_ranges(local_path, size, part_size, fetch_range, self.ranged_concurrency, verifier)
+        finally:
+            # The first GET covers the whole object; drop it even if its range was cancelled unread
+            response['Body'].close()
+    
+    def get_part_size(self, s3_key, size):
+        """
+        Get the part size of a multipart object, and whether every part has it.
+        
+        Multipart values can only be recomputed from the download when all
+        parts but the last are the same size. HEAD of part 1 gives its size
+        and the part count, and HEAD of the last part must fit; with up to
+        three parts that proves the sizes. Beyond that the middle parts
+        would need a request each, so equal sizes are only assumed.
+        
+        Args:
+            s3_key (str): S3 object key
+            size (int): Object size in bytes
+            
+        Returns:
+            tuple: (part size in bytes, True if the part sizes are proven), or
+                (None, False) if the parts are known to differ in size
+        """
+        response = self.s3_client.head_object(Bucket=self.bucket_name, Key=s3_key, PartNumber=1)
+        part_size = response['ContentLength']
+        part_count = response.get('PartsCount') or 1
+        if not part_size or part_count != (size + part_size - 1) // part_size:
+            return None, False
+        if part_count > 1:
+            last = self.s3_client.head_object(Bucket=self.bucket_name, Key=s3_key,
+                                              PartNumber=part_count)['ContentLength']
+            if last != size - (part_count - 1) * part_size:
+                return None, False
+        return part_size, part_count <= 3
+    
+    def get_object_bytes(self, s3_key, byte_range=None):
+        """
+        Read an object (or a byte range of it) into memory.
+        
+        Args:
+            s3_key (str): S3 object key
+            byte_range (tuple, optional): Inclusive (start, end) byte offsets
+            
+        Returns:
+            bytes: Object content
+            
+        Raises:
+            RuntimeError: If not connected to S3
+            Exception: If the request fails
+        """
+        if not self.is_connected():
+            raise RuntimeError("Not connected to S3. Call connect() first.")
+        
+        params = {'Bucket': self.bucket_name, 'Key': s3_key}
+        if byte_range:
+            params['Range'] = f"bytes={byte_range[0]}-{byte_range[1]}"
+        
+        try:
+            response = self.s3_client.get_object(**params)
+            data = response['Body'].read()
+            self._throttle(DOWNLOAD, len(data))
+            return data
+        except Exception as e:
+            raise Exception(f"Failed to read {s3_key}: {str(e)}")
+    
+    def select_object(self, s3_key, expression, input_serialization, stats=None):
+        """
+        Run an S3 Select SQL expression against an object, streaming the result.
+        
+        Results come back as JSON lines. Record payloads are yielded as they
+        arrive and may split a line between them.
+        
+        Args:
+            s3_key (str): S3 object key
+            expression (str): SQL expression, e.g. "SELECT s.name FROM s3object s"
+            input_serialization (dict): How the object is stored (CSV, JSON or
+                Parquet, plus its compression)
+            stats (dict, optional): Filled with 'scanned', 'processed' and
+                'returned' byte counts when S3 reports them
+                
+        Yields:
+            bytes: Record payloads
+            
+        Raises:
+            RuntimeError: If not connected to S3
+            Exception: If the query fails
+        """
+        if not self.is_connected():
+            raise RuntimeError("Not connected to S3. Call connect() first.")
+        
+        try:
+            response = self.s3_client.select_object_content(
+                Bucket=self.bucket_name, Key=s3_key, ExpressionType='SQL', Expression=expression,
+                InputSerialization=input_serialization, OutputSerialization={'JSON': {'RecordDelimiter': '\n'}})
+        except Exception as e:
+            raise Exception(f"Failed to query {s3_key}: {str(e)}")
+        
+        event_stream = response['Payload']
+        try:
+            for event in event_stream:
+                if 'Records' in event:
+                    payload = event['Records']['Payload']
+                    self._throttle(DOWNLOAD, len(payload))
+                    yield payload
+                elif 'Stats' in event and stats is not None:
+                    details = event['Stats']['Details']
+                    stats.update(scanned=details.get('BytesScanned', 0),
+                                 processed=details.get('BytesProcessed', 0),
+                                 returned=details.get('BytesReturned', 0))
+        finally:
+            # Stopping early drops the rest of the stream instead of reading it
+            event_stream.close()
+    
+    def head_object(self, s3_key):
+        """
+        Fetch the current metadata of an object.
+        
+        Args:
+            s3_key (str): S3 object key
+            
+        Returns:
+            dict: Object info with keys: 'key', 'size', 'modified', 'etag',
+                'storage_class', 'content_type', 'metadata' (user metadata),
+                'restore' (see parse_restore) and 'archive_status'
+                (Intelligent-Tiering archive tier or None)
+            
+        Raises:
+            RuntimeError: If not connected to S3
+            Exception: If the request fails
+        """
+        if not self.is_connected():
+            raise RuntimeError("Not connected to S3. Call connect() first.")
+        
+        try:
+            response = self.s3_client.head_object(Bucket=self.bucket_name, Key=s3_key)
+        except Exception as e:
+            raise Exception(f"Failed to read metadata for {s3_key}: {str(e)}")
+        
+        return {
+            'key': s3_key,
+            'size': response['ContentLength'],
+            'modified': response['LastModified'],
+            'etag': response.get('ETag', '').strip('"'),
+            'storage_class': response.get('StorageClass', 'STANDARD'),
+            'content_type': response.get('ContentType'),
+            'metadata': response.get('Metadata', {}),
+            'restore': parse_restore(response.get('Restore')),
+            'archive_status': response.get('ArchiveStatus')
+        }
+        
+    def restore_object(self, s3_key, days=7, tier='Standard'):
+        """
+        Request a temporary restored copy of an archived object.
+        
+        Args:
+            s3_key (str): S3 object key
+            days (int or None): Days to keep the restored copy (None for objects in an
+                Intelligent-Tiering archive tier, which move back to a frequent tier)
+            tier (str): 'Expedited', 'Standard' or 'Bulk'
+            
+        Returns:
+            bool: True if a restore was started, False if one was already running
+            
+        Raises:
+            RuntimeError: If not connected to S3
+            Exception: If the request fails
+        """
+        if not self.is_connected():
+            raise RuntimeError("Not connected to S3. Call connect() first.")
+        
+        request = {'GlacierJobParameters': {'Tier': tier}}
+        if days is not None:
+            request['Days'] = days
+        try:
+            self.s3_client.restore_object(Bucket=self.bucket_name, Key=s3_key, RestoreRequest=request)
+            return True
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'RestoreAlreadyInProgress':
+                return False
+            raise Exception(f"Failed to restore {s3_key}: {str(e)}")
+    
+    def _throttled_body(self, fileobj):
+        """
+        Wrap an upload body so the limiter paces it while it is sent.
+        
+        Returns:
+            ThrottledReader: Body to send inside its own with-block
+        """
+        return ThrottledReader(fileobj, self.limiter, UPLOAD)
+    
+    def put_file(self, s3_key, local_path):
+        """
+        Upload a local file with a single PUT.
+        
+        Args:
+            s3_key (str): S3 object key
+            local_path (str): Local file path
+            
+        Returns:
+            str: ETag of the new object
+            
+        Raises:
+            RuntimeError: If not connected to S3
+            Exception: If the upload fails
+        """
+        if not self.is_connected():
+            raise RuntimeError("Not connected to S3. Call connect() first.")
+        
+        try:
+            with open(local_path, 'rb') as f, self._throttled_body(f) as body:
+                response = self.s3_client.put_object(Bucket=self.bucket_name, Key=s3_key, Body=body)
+            return response.get('ETag', '').strip('"')
+        except Exception as e:
+            raise Exception(f"Failed to upload {s3_key}: {str(e)}")
+    
+    def create_multipart_upload(self, s3_key, content_type=None, metadata=None, storage_class=None):
+        """
+        Start a multipart upload.
+        
+        Args:
+            s3_key (str): S3 object key
+            content_type (str, optional): Content type of the new object
+            metadata (dict, optional): User metadata of the new object
+            storage_class (str, optional): Storage class of the new object
+            
+        Returns:
+            str: Upload ID
+        """
+        if not self.is_connected():
+            raise RuntimeError("Not connected to S3. Call connect() first.")
+        
+        params = {'Bucket': self.bucket_name, 'Key': s3_key}
+        if content_type:
+            params['ContentType'] = content_type
+        if metadata:
+            params['Metadata'] = metadata
+        if storage_class:
+            params['StorageClass'] = storage_class
+        try:
+            response = self.s3_client.create_multipart_upload(**params)
+            return response['UploadId']
+        except Exception as e:
+            raise Exception(f"Failed to start upload of {s3_key}: {str(e)}")
+    
+    def upload_part(self, s3_key, upload_id, part_number, data, content_md5=None):
+        """
+        Upload one part of a multipart upload.
+        
+        Args:
+            s3_key (str): S3 object key
+            upload_id (str): Upload ID
+            part_number (int): Part number (1-based)
+            data (bytes): Part content
+            content_md5 (str, optional): Base64 MD5 of data for S3 to check on arrival
+            
+        Returns:
+            str: ETag of the part
+        """
+        params = {'Bucket': self.bucket_name, 'Key': s3_key, 'UploadId': upload_id,
+                  'PartNumber': part_number}
+        if content_md5:
+            params['ContentMD5'] = content_md5
+        try:
+            with self._throttled_body(io.BytesIO(data)) as body:
+                response = self.s3_client.upload_part(Body=body, **params)
+            return response['ETag']
+        except Exception as e:
+            raise Exception(f"Failed to upload part {part_number} of {s3_key}: {str(e)}")
+    
+    def list_parts(self, s3_key, upload_id):
+        """
+        List the parts already uploaded for a multipart upload.
+        
+        Args:
+            s3_key (str): S3 object key
+            upload_id (str): Upload ID
+            
+        Returns:
+            dict or None: {part number: ETag}, or None if the upload no longer exists
+        """
+        parts = {}
+        params = {'Bucket': self.bucket_name, 'Key': s3_key, 'UploadId': upload_id}
+        try:
+            while True:
+                response = self.s3_client.list_parts(**params)
+                for part in response.get('Parts', []):
+                    parts[part['PartNumber']] = part['ETag']
+                if not response.get('IsTruncated'):
+                    return parts
+                params['PartNumberMarker'] = response['NextPartNumberMarker']
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'NoSuchUpload':
+                return None
+            raise e
+    
+    def complete_multipart_upload(self, s3_key, upload_id, parts):
+        """
+        Assemble the uploaded parts into the final object.
+        
+        Args:
+            s3_key (str): S3 object key
+            upload_id (str): Upload ID
+            parts (list): {'PartNumber', 'ETag'} dictionaries in part order
+            
+        Returns:
+            str: ETag of the new object
+        """
+        try:
+            response = self.s3_client.complete_multipart_upload(
+                Bucket=self.bucket_name, Key=s3_key, UploadId=upload_id,
+                MultipartUpload={'Parts': parts})
+            return response.get('ETag', '').strip('"')
+        except Exception as e:
+            raise Exception(f"Failed to complete upload of {s3_key}: {str(e)}")
+    
+    def copy_object(self, source_bucket, source_key, s3_key, storage_class=None, source_etag=None):
+        """
+        Copy an object (up to 5 GB) into this bucket inside S3.
+        
+        Metadata and content type are copied along; nothing passes through
+        this machine.
+        
+        Args:
+            source_bucket (str): Bucket holding the source object
+            source_key (str): Key of the source object
+            s3_key (str): Key of the copy
+            storage_class (str, optional): Storage class of the copy (S3 uses
+                STANDARD when none is given)
+            source_etag (str, optional): Only copy while the source has this
+                ETag (CopySourceIfMatch)
+            
+        Returns:
+            str: ETag of the copy
+            
+        Raises:
+            Exception: If the copy fails, e.g. with 412 Precondition Failed
+                when the source changed since it was listed
+        """
+        if not self.is_connected():
+            raise RuntimeError("Not connected to S3. Call connect() first.")
+        
+        params = {'Bucket': self.bucket_name, 'Key': s3_key,
+                  'CopySource': {'Bucket': source_bucket, 'Key': source_key}}
+        if storage_class:
+            params['StorageClass'] = storage_class
+        if source_etag:
+            params['CopySourceIfMatch'] = _quoted_etag(source_etag)
+        try:
+            response = self.s3_client.copy_object(**params)
+            return response['CopyObjectResult'].get('ETag', '').strip('"')
+        except Exception as e:
+            raise Exception(f"Failed to copy {source_key} to {s3_key}: {_copy_error(e)}")
+    
+    def upload_part_copy(self, s3_key, upload_id, part_number, source_bucket, source_key, start, end,
+                         source_etag=None):
+        """
+        Fill one part of a multipart upload from a byte range of another object, inside S3.
+        
+        Args:
+            s3_key (str): S3 object key
+            upload_id (str): Upload ID
+            part_number (int): Part number (1-based)
+            source_bucket (str): Bucket holding the source object
+            source_key (str): Key of the source object
+            start (int): First byte of the range
+            end (int): Last byte of the range (inclusive)
+            source_etag (str, optional): Only copy while the source has this
+                ETag (CopySourceIfMatch)
+            
+        Returns:
+            str: ETag of the part
+        """
+        params = {'Bucket': self.bucket_name, 'Key': s3_key, 'UploadId': upload_id, 'PartNumber': part_number,
+                  'CopySource': {'Bucket': source_bucket, 'Key': source_key},
+                  'CopySourceRange': f"bytes={start}-{end}"}
+        if source_etag:
+            params['CopySourceIfMatch'] = _quoted_etag(source_etag)
+        try:
+            response = self.s3_client.upload_part_copy(**params)
+            return response['CopyPartResult']['ETag']
+        except Exception as e:
+            raise Exception(f"Failed to copy part {part_number} of {s3_key}: {_copy_error(e)}")
+    
+    def delete_object(self, s3_key):
+        """
+        Delete an object (deleting a missing key succeeds).
+        
+        Args:
+            s3_key (str): S3 object key
+        """
+        if not self.is_connected():
+            raise RuntimeError("Not connected to S3. Call connect() first.")
+        
+        try:
+            self.s3_client.delete_object(Bucket=self.bucket_name, Key=s3_key)
+        except Exception as e:
+            raise Exception(f"Failed to delete {s3_key}: {str(e)}")
+    
+    def delete_objects(self, keys):
+        """
+        Delete up to 1,000 objects with one DeleteObjects request.
+        
+        Args:
+            keys (list): S3 keys (at most 1,000)
+            
+        Returns:
+            dict: Error message of each key S3 could not delete
+            
+        Raises:
+            Exception: If the request itself fails
+        """
+        if not self.is_connected():
+            raise RuntimeError("Not connected to S3. Call connect() first.")
+        if not keys:
+            return {}
+        
+        try:
+            # Quiet mode only lists the failures, keeping responses small
+            response = self.s3_client.delete_objects(
+                Bucket=self.bucket_name,
+                Delete={'Objects': [{'Key': key} for key in keys], 'Quiet': True})
+        except Exception as e:
+            raise Exception(f"Failed to delete {len(keys)} objects: {str(e)}")
+        return {error['Key']: f"{error.get('Code', 'Error')}: {error.get('Message', '')}"
+                for error in response.get('Errors', [])}
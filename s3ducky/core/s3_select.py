@@ -0,0 +1,143 @@
+# MIT License
+# 
+# Copyright (c) 2025 S3Ducky
+
+"""
+S3 Select queries for S3Ducky.
+
+A SQL expression runs inside S3 against one CSV, JSON or Parquet object
+and only the matching rows and columns come back, so answering a question
+about a large object doesn't mean downloading it. Results stream back as
+JSON lines and are turned into rows as they arrive.
+"""
+
+import csv
+import json
+
+
+DEFAULT_EXPRESSION = "SELECT * FROM s3object s LIMIT 100"
+
+# Rows kept for display; a query returning more is stopped there (saving
+# the result writes every row)
+MAX_PREVIEW_ROWS = 10000
+
+_COMPRESSION = {'.gz': 'GZIP', '.bz2': 'BZIP2'}
+
+
+def input_serialization(key):
+    """
+    Work out how S3 Select should read an object from its name.
+    
+    CSV files are read with their first line as the header, .json files as
+    JSON documents and .jsonl/.ndjson files as JSON lines; .gz and .bz2
+    compression is supported for both.
+    
+    Args:
+        key (str): S3 object key
+        
+    Returns:
+        dict or None: InputSerialization for select_object_content, or None
+            if the object can't be queried
+    """
+    name = key.lower()
+    compression = 'NONE'
+    for extension, value in _COMPRESSION.items():
+        if name.endswith(extension):
+            name = name[:-len(extension)]
+            compression = value
+            
+    if name.endswith('.csv'):
+        return {'CSV': {'FileHeaderInfo': 'USE'}, 'CompressionType': compression}
+    if name.endswith('.tsv'):
+        return {'CSV': {'FileHeaderInfo': 'USE', 'FieldDelimiter': '\t'}, 'CompressionType': compression}
+    if name.endswith(('.jsonl', '.ndjson')):
+        return {'JSON': {'Type': 'LINES'}, 'CompressionType': compression}
+    if name.endswith('.json'):
+        return {'JSON': {'Type': 'DOCUMENT'}, 'CompressionType': compression}
+    if name.endswith('.parquet') and compression == 'NONE':
+        return {'Parquet': {}}
+    return None
+
+
+def is_queryable(key):
+    """Check whether an object can be queried with S3 Select."""
+    return input_serialization(key) is not None
+
+
+class SelectQuery:
+    """
+    One S3 Select query against one object.
+    """
+    
+    def __init__(self, s3_client, key, expression):
+        """
+        Args:
+            s3_client (S3Client): Connected client
+            key (str): S3 object key
+            expression (str): SQL expression
+            
+        Raises:
+            ValueError: If the object's format can't be queried
+        """
+        self.s3_client = s3_client
+        self.key = key
+        self.expression = expression
+        self.serialization = input_serialization(key)
+        if self.serialization is None:
+            raise ValueError(f"{key} is not a CSV, JSON or Parquet object")
+            
+        # Byte counts reported by S3 at the end of the query
+        self.stats = {}
+        self.row_count = 0
+        
+    def iter_batches(self, should_stop=None):
+        """
+        Run the query, yielding rows as result records arrive.
+        
+        Args:
+            should_stop (callable, optional): Returns True to abandon the query
+            
+        Yields:
+            list: Rows (dicts of column name to value) of each record payload
+        """
+        pending = b''
+        for payload in self.s3_client.select_object(self.key, self.expression,
+                                                    self.serialization, self.stats):
+            if should_stop and should_stop():
+                return
+            # Payloads don't end on row boundaries
+            lines = (pending + payload).split(b'\n')
+            pending = lines.pop()
+            rows = [json.loads(line) for line in lines if line.strip()]
+            if rows:
+                self.row_count += len(rows)
+                yield rows
+        if pending.strip():
+            self.row_count += 1
+            yield [json.loads(pending)]
+            
+    def save(self, path, should_stop=None):
+        """
+        Run the query and write every result row to a file.
+        
+        A .csv path gets a header line and one line per row (columns from
+        the first row); anything else is written as JSON lines.
+        
+        Args:
+            path (str): Output file path
+            should_stop (callable, optional): Returns True to abandon the query
+            
+        Returns:
+            int: Rows written
+        """
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            writer = None
+            for rows in self.iter_batches(should_stop):
+                if not path.lower().endswith('.csv'):
+                    f.writelines(json.dumps(row) + '\n' for row in rows)
+                    continue
+                if writer is None:
+                    writer = csv.DictWriter(f, fieldnames=list(rows[0]), extrasaction='ignore')
+                    writer.writeheader()
+                writer.writerows(rows)
+        return self.row_count
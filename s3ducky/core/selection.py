@@ -0,0 +1,109 @@
+# MIT License
+# 
+# Copyright (c) 2025 S3Ducky
+
+"""
+Selected objects of a listing for S3Ducky.
+
+"Select All" on a listing of millions of keys (possibly spilled to disk)
+must not read every key, so selecting everything is a flag plus the keys
+deselected since. The listing is only read when an action asks for the
+selected keys.
+"""
+
+
+class Selection:
+    """
+    Keys selected in one listing.
+    
+    Either a set of selected keys, or everything except a set of
+    deselected keys.
+    """
+    
+    def __init__(self, keys=()):
+        """
+        Args:
+            keys (iterable): Keys to start with selected
+        """
+        self.everything = False
+        # Selected keys, or the deselected ones while everything is selected
+        self._keys = set(keys)
+        
+    def __contains__(self, key):
+        return (key not in self._keys) if self.everything else (key in self._keys)
+        
+    def copy(self):
+        """Get an independent copy (e.g. to keep with a tab)."""
+        selection = Selection(self._keys)
+        selection.everything = self.everything
+        return selection
+        
+    def select(self, key):
+        """Select one key."""
+        if self.everything:
+            self._keys.discard(key)
+        else:
+            self._keys.add(key)
+            
+    def deselect(self, key):
+        """Deselect one key."""
+        if self.everything:
+            self._keys.add(key)
+        else:
+            self._keys.discard(key)
+            
+    def select_all(self):
+        """Select every key of the listing, including keys added to it later."""
+        self.everything = True
+        self._keys.clear()
+        
+    def clear(self):
+        """Deselect everything."""
+        self.everything = False
+        self._keys.clear()
+        
+    def forget(self, keys):
+        """Drop keys that left the listing, so they count neither way."""
+        self._keys.difference_update(keys)
+        
+    def count(self, total):
+        """
+        Count the selected keys.
+        
+        Args:
+            total (int): Number of entries in the listing
+            
+        Returns:
+            int: Selected keys
+        """
+        return total - len(self._keys) if self.everything else len(self._keys)
+        
+    def first(self, files_list):
+        """
+        Get the first selected key, reading the listing only up to it.
+        
+        Args:
+            files_list (ListingStore): Listing the selection belongs to
+            
+        Returns:
+            str: First selected key in key order, or None if nothing is selected
+        """
+        if not self.everything:
+            return min(self._keys, default=None)
+        return min((file_info['key'] for file_info in files_list if file_info['key'] not in self._keys),
+                   default=None)
+        
+    def resolve(self, files_list):
+        """
+        Get the selected keys, reading the listing only if everything is selected.
+        
+        Args:
+            files_list (ListingStore): Listing the selection belongs to
+            
+        Returns:
+            list: Selected keys in key order
+        """
+        if not self.everything:
+            return sorted(self._keys)
+        # Linear for a listing that is already sorted; inventories sort once loaded
+        return sorted(file_info['key'] for file_info in files_list if file_info['key'] not in self._keys)
@@ -0,0 +1,673 @@
+# MIT License
+# 
+# Copyright (c) 2025 S3Ducky
+
+"""
+Storage backend interface for S3Ducky.
+
+Tabs, the file manager, uploads and thumbnails only talk to a
+StorageBackend: paged listings, ranged reads, HEAD, PUT, multipart
+uploads, server-side copies and deletes. S3Client implements it against
+S3. SimpleBackend implements the whole interface on five primitives
+(iterate, read, stat, write, delete), which is
+all the local-directory and in-memory backends provide, so S3Ducky can
+browse local mirrors and be exercised and benchmarked offline.
+"""
+
+import os
+import shutil
+import hashlib
+import mimetypes
+import tempfile
+import threading
+import uuid
+from abc import ABC, abstractmethod
+from .integrity import StreamVerifier
+from .listing_store import ListingStore
+from .ranged_download import download_ranges, write_stream
+from .bandwidth import DOWNLOAD, UPLOAD
+from ..utils.profiling import profiled, profile_phase, PHASE_LIST, PHASE_DOWNLOAD
+
+
+# Keys per listing page, as with S3
+PAGE_SIZE = 1000
+
+# Bytes per read when streaming an object
+CHUNK_SIZE = 1024 * 1024
+
+
+class StorageBackend(ABC):
+    """
+    Object storage a tab browses and transfers with.
+    
+    Keys are listed in key order. Listing entries are dictionaries with
+    'key', 'size', 'modified', 'etag' and 'storage_class'. A backend that
+    leaves out one of the abstract requests fails when it is created
+    rather than halfway through a transfer; S3 Select and restores are
+    optional.
+    """
+    
+    def __init__(self, limiter=None, ranged_threshold=64 * 1024 * 1024,
+                 ranged_part_size=16 * 1024 * 1024, ranged_concurrency=8):
+        """
+        Args:
+            limiter (BandwidthLimiter, optional): Limits shared by all transfers
+            ranged_threshold (int): Objects this large or larger download as parallel ranges
+            ranged_part_size (int): Bytes per range
+            ranged_concurrency (int): Ranges of one object downloaded at the same time
+        """
+        self.limiter = limiter
+        self.ranged_threshold = ranged_threshold
+        self.ranged_part_size = ranged_part_size
+        self.ranged_concurrency = ranged_concurrency
+        self.bucket_name = ""
+        self.resource_prefix = None
+        
+        # S3 Inventory report used instead of listing (S3 only)
+        self.inventory = None
+        
+    def _throttle(self, direction, nbytes):
+        """Account transferred bytes against the bandwidth limit, if there is one."""
+        if self.limiter is not None:
+            self.limiter.consume(direction, nbytes)
+            
+    @property
+    def location(self):
+        """
+        Where the backend's objects live: (endpoint URL, access key, bucket name).
+        
+        Backends with the same location show the same objects. Local and
+        in-memory buckets have no endpoint or access key.
+        """
+        return (None, None, self.bucket_name)
+        
+    def is_connected(self):
+        """Check whether the backend is ready for requests."""
+        return bool(self.bucket_name)
+        
+    def disconnect(self):
+        """Release the connection."""
+        self.bucket_name = ""
+        self.resource_prefix = None
+        
+    @abstractmethod
+    def take_first_page(self):
+        """
+        Get the first listing page.
+        
+        Returns:
+            tuple: (list of listing entries, continuation token or None when
+                the listing is already complete)
+        """
+        raise NotImplementedError
+        
+    @abstractmethod
+    def list_object_pages(self, continuation_token=None, start_after=None):
+        """
+        Iterate over the listing one page at a time, in key order.
+        
+        Args:
+            continuation_token (str, optional): Resume after this page token
+            start_after (str, optional): Only list keys sorting after this one
+            
+        Yields:
+            list: Listing entries of each page
+        """
+        raise NotImplementedError
+        
+    def list_objects_async(self, continuation_token=None, page_callback=None,
+                           completion_callback=None, error_callback=None, should_stop=None):
+        """
+        Continue a listing in a background thread, reporting each page as it arrives.
+        
+        Args:
+            continuation_token (str, optional): Resume after this page token
+            page_callback (callable, optional): Called with each page's entries
+            completion_callback (callable, optional): Called when the listing is complete
+            error_callback (callable, optional): Called with an error message on failure
+            should_stop (callable, optional): Returns True to abandon the listing
+        """
+        def listing_thread():
+            try:
+                for entries in self.list_object_pages(continuation_token):
+                    if should_stop and should_stop():
+                        return
+                    if page_callback:
+                        page_callback(entries)
+                        
+                if completion_callback:
+                    completion_callback()
+                    
+            except Exception as e:
+                print(f"Debug: Failed to load files: {str(e)}")
+                if error_callback:
+                    error_callback(str(e))
+                    
+        thread = threading.Thread(target=listing_thread)
+        thread.daemon = True
+        thread.start()
+        return thread
+        
+    def list_objects(self, files_list=None):
+        """
+        List all objects under the prefix filter.
+        
+        Args:
+            files_list (ListingStore, optional): Empty store to fill, e.g. one that
+                spills to disk (defaults to a store kept in memory)
+                
+        Returns:
+            ListingStore: Listing entries sorted by key
+            
+        Raises:
+            RuntimeError: If not connected
+            Exception: If listing fails
+        """
+        if not self.is_connected():
+            raise RuntimeError("Not connected. Call connect() first.")
+            
+        try:
+            if files_list is None:
+                files_list = ListingStore()
+                
+            print(f"Debug: Loading files from bucket: {self.bucket_name}")
+            if self.resource_prefix:
+                print(f"Debug: Using prefix filter: {self.resource_prefix}")
+                
+            for entries in self.list_object_pages():
+                files_list.extend(entries)
+                
+                # Log progress for large buckets
+                print(f"Debug: Loaded {len(files_list)} files so far...")
+                
+            print(f"Debug: Successfully loaded {len(files_list)} files")
+            
+            # Listings come in key order; inventory reports don't
+            if self.inventory is not None:
+                files_list.sort_by_key()
+                
+            return files_list
+            
+        except Exception as e:
+            print(f"Debug: Failed to load files: {str(e)}")
+            raise Exception(f"Failed to load files: {str(e)}")
+            
+    @abstractmethod
+    def download_file(self, s3_key, local_path, verify=False):
+        """
+        Download an object to a local file.
+        
+        Args:
+            s3_key (str): Object key
+            local_path (str): Local file path for download
+            verify (bool): Check the ETag and any stored checksum on the way
+            
+        Returns:
+            dict or None: Check results ({check: 'ok'/'mismatch'/'skipped'}) when verifying
+        """
+        raise NotImplementedError
+        
+    @abstractmethod
+    def get_object_bytes(self, s3_key, byte_range=None):
+        """
+        Read an object (or a byte range of it) into memory.
+        
+        Args:
+            s3_key (str): Object key
+            byte_range (tuple, optional): Inclusive (start, end) byte offsets
+            
+        Returns:
+            bytes: Object content
+        """
+        raise NotImplementedError
+        
+    def select_object(self, s3_key, expression, input_serialization, stats=None):
+        """Run an S3 Select query (S3 only)."""
+        raise NotImplementedError("SQL queries need an S3 bucket")
+        
+    @abstractmethod
+    def head_object(self, s3_key):
+        """
+        Fetch the current metadata of an object.
+        
+        Returns:
+            dict: Object info with keys: 'key', 'size', 'modified', 'etag',
+                'storage_class', 'content_type', 'metadata', 'restore' and
+                'archive_status'
+        """
+        raise NotImplementedError
+        
+    def restore_object(self, s3_key, days=7, tier='Standard'):
+        """Request a restored copy of an archived object (S3 only)."""
+        raise NotImplementedError("Restores need an S3 bucket")
+        
+    @abstractmethod
+    def put_file(self, s3_key, local_path):
+        """
+        Upload a local file in one request.
+        
+        Returns:
+            str: ETag of the new object
+        """
+        raise NotImplementedError
+        
+    @abstractmethod
+    def create_multipart_upload(self, s3_key, content_type=None, metadata=None, storage_class=None):
+        """
+        Start a multipart upload.
+        
+        Args:
+            content_type (str, optional): Content type of the new object
+            metadata (dict, optional): User metadata of the new object
+            storage_class (str, optional): Storage class of the new object
+            
+        Returns:
+            str: Upload ID
+        """
+        raise NotImplementedError
+        
+    @abstractmethod
+    def upload_part(self, s3_key, upload_id, part_number, data, content_md5=None):
+        """
+        Upload one part of a multipart upload.
+        
+        Returns:
+            str: ETag of the part
+        """
+        raise NotImplementedError
+        
+    @abstractmethod
+    def list_parts(self, s3_key, upload_id):
+        """
+        List the parts already uploaded for a multipart upload.
+        
+        Returns:
+            dict or None: {part number: ETag}, or None if the upload no longer exists
+        """
+        raise NotImplementedError
+        
+    @abstractmethod
+    def complete_multipart_upload(self, s3_key, upload_id, parts):
+        """
+        Assemble the uploaded parts into the final object.
+        
+        Args:
+            parts (list): {'PartNumber', 'ETag'} dictionaries in part order
+            
+        Returns:
+            str: ETag of the new object
+        """
+        raise NotImplementedError
+        
+    @abstractmethod
+    def copy_object(self, source_bucket, source_key, s3_key, storage_class=None, source_etag=None):
+        """
+        Copy an object (up to 5 GB) into this bucket without downloading it.
+        
+        Args:
+            source_bucket (str): Bucket holding the source object
+            source_key (str): Key of the source object
+            s3_key (str): Key of the copy
+            storage_class (str, optional): Storage class of the copy
+            source_etag (str, optional): Only copy while the source has this ETag
+            
+        Returns:
+            str: ETag of the copy
+            
+        Raises:
+            Exception: If the copy fails, including when the source no longer
+                has source_etag (S3 answers 412 Precondition Failed)
+        """
+        raise NotImplementedError
+        
+    @abstractmethod
+    def upload_part_copy(self, s3_key, upload_id, part_number, source_bucket, source_key, start, end,
+                         source_etag=None):
+        """
+        Fill one part of a multipart upload from a byte range of another object.
+        
+        Args:
+            start (int): First byte of the range
+            end (int): Last byte of the range (inclusive)
+            source_etag (str, optional): Only copy while the source has this ETag
+            
+        Returns:
+            str: ETag of the part
+        """
+        raise NotImplementedError
+        
+    @abstractmethod
+    def delete_object(self, s3_key):
+        """Delete an object (deleting a missing key succeeds, as with S3)."""
+        raise NotImplementedError
+        
+    def delete_objects(self, keys):
+        """
+        Delete up to 1,000 objects, reporting failures per key.
+        
+        Backends without a batch request delete the keys one at a time.
+        
+        Args:
+            keys (list): S3 keys
+            
+        Returns:
+            dict: Error message of each key that could not be deleted
+        """
+        errors = {}
+        for key in keys:
+            try:
+                self.delete_object(key)
+            except Exception as e:
+                errors[key] = str(e)
+        return errors
+
+
+class SimpleBackend(StorageBackend):
+    """
+    Backend built on five primitives that subclasses implement:
+    
+    - _iter_objects(start_after): listing entries under the prefix, in key order
+    - _read(key, start, end): bytes of an inclusive range
+    - _stat(key): listing entry of one object (KeyError if missing)
+    - _write(key, chunks): store an object from an iterable of bytes, returning its entry
+    - _delete(key): remove an object (KeyError if missing)
+    
+    Multipart uploads are staged in a temporary directory. Copies only work
+    within the backend itself. _request() is called before every request,
+    so a subclass can add latency or errors.
+    """
+    
+    # Whether ETags are MD5 digests of the content, so downloads can check them
+    etag_is_md5 = False
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Upload ID -> {'key', 'dir', 'parts': {part number: ETag}}
+        self._uploads = {}
+        self._uploads_lock = threading.Lock()
+        
+    def _request(self, operation, key, nbytes=0):
+        """Hook run before each request (operation is 'list', 'get', 'head', 'put', 'copy' or 'delete')."""
+        
+    @abstractmethod
+    def _iter_objects(self, start_after=None):
+        """
+        Iterate the listing entries under resource_prefix, in key order.
+        
+        Entries have 'key', 'size', 'modified', 'etag' and 'storage_class'.
+        Called from the listing thread; the iterator is consumed one page
+        at a time and may be closed early.
+        
+        Args:
+            start_after (str): Only yield keys sorting after this one
+        """
+        raise NotImplementedError
+        
+    @abstractmethod
+    def _read(self, key, start, end):
+        """
+        Read an inclusive byte range of an object.
+        
+        May be called from several threads at once.
+        
+        Returns:
+            bytes: The range (shorter only if the object is)
+        
+        Raises:
+            KeyError or OSError: If the object doesn't exist
+        """
+        raise NotImplementedError
+        
+    @abstractmethod
+    def _stat(self, key):
+        """
+        Get the listing entry of one object, as _iter_objects() yields it.
+        
+        Raises:
+            KeyError: If the object doesn't exist
+        """
+        raise NotImplementedError
+        
+    @abstractmethod
+    def _write(self, key, chunks):
+        """
+        Create or replace an object.
+        
+        Readers see either the old object or the whole new one, never a
+        partial write; if iterating chunks raises, the old object stays.
+        
+        Args:
+            key (str): Key of the object
+            chunks (iterable): Content as bytes pieces
+            
+        Returns:
+            dict: Listing entry of the written object
+        """
+        raise NotImplementedError
+        
+    @abstractmethod
+    def _delete(self, key):
+        """
+        Remove an object.
+        
+        Raises:
+            KeyError: If the object doesn't exist
+        """
+        raise NotImplementedError
+        
+    def _check_connected(self):
+        if not self.is_connected():
+            raise RuntimeError("Not connected. Call connect() first.")
+            
+    def take_first_page(self):
+        pages = self.list_object_pages()
+        entries = next(pages)
+        token = entries[-1]['key'] if len(entries) == PAGE_SIZE else None
+        pages.close()
+        return entries, token
+        
+    def list_object_pages(self, continuation_token=None, start_after=None):
+        self._check_connected()
+        # Page tokens are simply the last key of the previous page
+        objects = self._iter_objects(continuation_token or start_after)
+        while True:
+            with profile_phase(PHASE_LIST):
+                self._request('list', self.resource_prefix or '')
+                entries = []
+                for file_info in objects:
+                    entries.append(file_info)
+                    if len(entries) == PAGE_SIZE:
+                        break
+            yield entries
+            if len(entries) < PAGE_SIZE:
+                return
+                
+    def head_object(self, s3_key):
+        self._check_connected()
+        self._request('head', s3_key)
+        try:
+            file_info = self._stat(s3_key)
+        except KeyError:
+            raise Exception(f"Failed to read metadata for {s3_key}: no such object")
+        head = {key: file_info[key] for key in ('key', 'size', 'modified', 'etag', 'storage_class')}
+        head.update(content_type=mimetypes.guess_type(s3_key)[0], metadata={}, restore=None,
+                    archive_status=None)
+        return head
+        
+    def get_object_bytes(self, s3_key, byte_range=None):
+        self._check_connected()
+        try:
+            if byte_range:
+                start, end = byte_range
+            else:
+                start, end = 0, self._stat(s3_key)['size'] - 1
+            self._request('get', s3_key, end - start + 1)
+            data = self._read(s3_key, start, end)
+            self._throttle(DOWNLOAD, len(data))
+            return data
+        except Exception as e:
+            raise Exception(f"Failed to read {s3_key}: {str(e)}")
+            
+    def _iter_chunks(self, s3_key, start, end):
+        """Read an inclusive byte range in CHUNK_SIZE pieces."""
+        while start <= end:
+            chunk_end = min(end, start + CHUNK_SIZE - 1)
+            self._request('get', s3_key, chunk_end - start + 1)
+            chunk = self._read(s3_key, start, chunk_end)
+            self._throttle(DOWNLOAD, len(chunk))
+            yield chunk
+            start = chunk_end + 1
+            
+    @profiled(PHASE_DOWNLOAD)
+    def download_file(self, s3_key, local_path, verify=False):
+        """
+        Download an object, as parallel ranges at or above the ranged threshold.
+        
+        Verified downloads stream in order, so the whole object goes
+        through one digest.
+        """
+        self._check_connected()
+        try:
+            self._request('head', s3_key)
+            file_info = self._stat(s3_key)
+            size = file_info['size']
+            
+            if size >= self.ranged_threshold and not verify:
+                download_ranges(local_path, size, self.ranged_part_size,
+                                lambda part_number, start, end: self._iter_chunks(s3_key, start, end),
+                                self.ranged_concurrency)
+                return None
+                
+            verifier = StreamVerifier(file_info['etag'], size, etag_is_md5=self.etag_is_md5) if verify else None
+            return write_stream(local_path, self._iter_chunks(s3_key, 0, size - 1), verifier)
+        except Exception as e:
+            raise Exception(f"Failed to download {s3_key}: {str(e)}")
+            
+    def put_file(self, s3_key, local_path):
+        self._check_connected()
+        
+        def chunks():
+            with open(local_path, 'rb') as f:
+                for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+                    self._throttle(UPLOAD, len(chunk))
+                    yield chunk
+                    
+        try:
+            self._request('put', s3_key, os.path.getsize(local_path))
+            return self._write(s3_key, chunks())['etag']
+        except Exception as e:
+            raise Exception(f"Failed to upload {s3_key}: {str(e)}")
+            
+    def create_multipart_upload(self, s3_key, content_type=None, metadata=None, storage_class=None):
+        self._check_connected()
+        self._request('put', s3_key)
+        upload_id = uuid.uuid4().hex
+        with self._uploads_lock:
+            self._uploads[upload_id] = {'key': s3_key, 'parts': {},
+                                        'dir': tempfile.mkdtemp(prefix='s3ducky-upload-')}
+        return upload_id
+        
+    def upload_part(self, s3_key, upload_id, part_number, data, content_md5=None):
+        self._request('put', s3_key, len(data))
+        with self._uploads_lock:
+            upload = self._uploads.get(upload_id)
+        if upload is None:
+            raise Exception(f"Failed to upload part {part_number} of {s3_key}: no such upload")
+        self._throttle(UPLOAD, len(data))
+        with open(os.path.join(upload['dir'], str(part_number)), 'wb') as f:
+            f.write(data)
+        etag = f'"{hashlib.md5(data).hexdigest()}"'
+        with self._uploads_lock:
+            upload['parts'][part_number] = etag
+        return etag
+        
+    def list_parts(self, s3_key, upload_id):
+        self._request('list', s3_key)
+        with self._uploads_lock:
+            upload = self._uploads.get(upload_id)
+            return dict(upload['parts']) if upload is not None else None
+            
+    def complete_multipart_upload(self, s3_key, upload_id, parts):
+        self._request('put', s3_key)
+        with self._uploads_lock:
+            upload = self._uploads.pop(upload_id, None)
+        if upload is None:
+            raise Exception(f"Failed to complete upload of {s3_key}: no such upload")
+            
+        def chunks():
+            for part in parts:
+                with open(os.path.join(upload['dir'], str(part['PartNumber'])), 'rb') as f:
+                    for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+                        yield chunk
+                        
+        try:
+            return self._write(s3_key, chunks())['etag']
+        except Exception as e:
+            raise Exception(f"Failed to complete upload of {s3_key}: {str(e)}")
+        finally:
+            shutil.rmtree(upload['dir'], ignore_errors=True)
+            
+    def _check_same_bucket(self, source_bucket, source_key):
+        if source_bucket != self.bucket_name:
+            raise Exception(f"Failed to copy {source_key}: copies between {source_bucket} and "
+                            f"{self.bucket_name} need S3")
+                            
+    def _check_source_etag(self, source_key, source_etag):
+        """Fail like S3's CopySourceIfMatch when the source no longer has the expected ETag."""
+        if not source_etag:
+            return
+        try:
+            etag = self._stat(source_key)['etag']
+        except KeyError:
+            raise Exception(f"Failed to copy {source_key}: no such object")
+        if etag.strip('"') != source_etag.strip('"'):
+            raise Exception(f"Failed to copy {source_key}: precondition failed (changed since it was listed)")
+            
+    def copy_object(self, source_bucket, source_key, s3_key, storage_class=None, source_etag=None):
+        self._check_connected()
+        self._check_same_bucket(source_bucket, source_key)
+        self._check_source_etag(source_key, source_etag)
+        
+        def chunks():
+            start, end = 0, self._stat(source_key)['size'] - 1
+            while start <= end:
+                chunk_end = min(end, start + CHUNK_SIZE - 1)
+                yield self._read(source_key, start, chunk_end)
+                start = chunk_end + 1
+                
+        try:
+            self._request('copy', s3_key)
+            return self._write(s3_key, chunks())['etag']
+        except Exception as e:
+            raise Exception(f"Failed to copy {source_key} to {s3_key}: {str(e)}")
+            
+    def upload_part_copy(self, s3_key, upload_id, part_number, source_bucket, source_key, start, end,
+                         source_etag=None):
+        self._check_connected()
+        self._check_same_bucket(source_bucket, source_key)
+        self._check_source_etag(source_key, source_etag)
+        self._request('copy', s3_key)
+        try:
+            data = self._read(source_key, start, end)
+        except Exception as e:
+            raise Exception(f"Failed to copy part {part_number} of {s3_key}: {str(e)}")
+        with self._uploads_lock:
+            upload = self._uploads.get(upload_id)
+        if upload is None:
+            raise Exception(f"Failed to copy part {part_number} of {s3_key}: no such upload")
+        with open(os.path.join(upload['dir'], str(part_number)), 'wb') as f:
+            f.write(data)
+        etag = f'"{hashlib.md5(data).hexdigest()}"'
+        with self._uploads_lock:
+            upload['parts'][part_number] = etag
+        return etag
+        
+    def delete_object(self, s3_key):
+        self._check_connected()
+        self._request('delete', s3_key)
+        try:
+            self._delete(s3_key)
+        except KeyError:
+            pass
+        except Exception as e:
+            raise Exception(f"Failed to delete {s3_key}: {str(e)}")
@@ -0,0 +1,218 @@
+# MIT License
+# 
+# Copyright (c) 2025 S3Ducky
+
+"""
+Background thumbnail generation for image objects in S3Ducky.
+"""
+
+import os
+import queue
+import itertools
+import threading
+from .s3_client import S3Client
+from .disk_cache import DiskCache, DEFAULT_CACHE_ROOT, make_cache_key
+from ..utils.image_utils import create_thumbnail, extract_exif_thumbnail, is_image_file
+
+
+THUMBNAIL_CACHE_DIR = os.path.join(DEFAULT_CACHE_ROOT, 'thumbnails')
+THUMBNAIL_CACHE_MAX_BYTES = 200 * 1024 * 1024
+THUMBNAIL_SIZE = 48
+
+# Objects larger than this are not fetched just to draw a thumbnail
+MAX_SOURCE_BYTES = 25 * 1024 * 1024
+
+# Start of a JPEG fetched first, enough for the EXIF block and its preview
+PREVIEW_BYTES = 256 * 1024
+
+JPEG_EXTENSIONS = ('.jpg', '.jpeg')
+
+# Queue priorities (lower runs first)
+PRIORITY_VISIBLE = 0
+PRIORITY_NEARBY = 1
+
+
+class _ThumbnailRequest:
+    """A queued thumbnail job for a single object."""
+    
+    def __init__(self, s3_client, file_info, priority, callback):
+        self.s3_client = s3_client
+        self.file_info = file_info
+        self.priority = priority
+        self.callbacks = [callback]
+
+
+class ThumbnailGenerator:
+    """
+    Generates thumbnails for image objects in a pool of worker threads.
+    
+    Thumbnails are stored in a DiskCache keyed by bucket, key and ETag, so an
+    object is only fetched and decoded again once it changes. Requests for
+    rows that are on screen jump ahead of everything else in the queue.
+    
+    Each request remembers the client that was current when it was queued,
+    so s3_client can be swapped when another workspace tab is shown.
+    """
+    
+    def __init__(self, s3_client: S3Client, cache=None, workers=4, size=THUMBNAIL_SIZE):
+        self.s3_client = s3_client
+        self.cache = cache or DiskCache(THUMBNAIL_CACHE_DIR, THUMBNAIL_CACHE_MAX_BYTES, suffix='.png')
+        self.size = size
+        
+        self._queue = queue.PriorityQueue()
+        self._pending = {}
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        self._stopped = False
+        
+        self._threads = []
+        for _ in range(workers):
+            thread = threading.Thread(target=self._worker)
+            thread.daemon = True
+            thread.start()
+            self._threads.append(thread)
+            
+    def _cache_key(self, file_info, s3_client=None):
+        """Build the cache key for an object listing entry."""
+        bucket_name = (s3_client or self.s3_client).bucket_name
+        return make_cache_key(bucket_name, file_info['key'], file_info.get('etag', ''), self.size)
+                              
+    def is_supported(self, file_info):
+        """
+        Check whether a thumbnail can be generated for an object.
+        
+        Args:
+            file_info (dict): Listing entry with 'key' and 'size'
+            
+        Returns:
+            bool: True if the object is an image small enough to fetch
+        """
+        return (is_image_file(file_info['key'])
+                and 0 < file_info.get('size', 0) <= MAX_SOURCE_BYTES)
+                
+    def get_cached(self, file_info):
+        """
+        Get the cached thumbnail path without queueing any work.
+        
+        Args:
+            file_info (dict): Listing entry
+            
+        Returns:
+            str or None: Path to the thumbnail PNG, or None if not cached
+        """
+        return self.cache.get(self._cache_key(file_info))
+        
+    def request(self, file_info, callback, visible=True):
+        """
+        Queue thumbnail generation for an object.
+        
+        The callback is invoked from a worker thread with (key, path), where
+        path is None if no thumbnail could be produced.
+        
+        Args:
+            file_info (dict): Listing entry with 'key', 'size' and 'etag'
+            callback (callable): Called when the thumbnail is ready
+            visible (bool): Whether the row is currently on screen
+        """
+        if not self.is_supported(file_info):
+            return
+            
+        path = self.get_cached(file_info)
+        if path:
+            callback(file_info['key'], path)
+            return
+            
+        priority = PRIORITY_VISIBLE if visible else PRIORITY_NEARBY
+        key = file_info['key']
+        with self._lock:
+            pending = self._pending.get(key)
+            if pending:
+                if callback not in pending.callbacks:
+                    pending.callbacks.append(callback)
+                if priority >= pending.priority:
+                    return
+                # Re-queue with the better priority; the old entry goes stale
+                pending.priority = priority
+            else:
+                pending = _ThumbnailRequest(self.s3_client, file_info, priority, callback)
+                self._pending[key] = pending
+            self._queue.put((priority, next(self._counter), key))
+            
+    def has_pending(self):
+        """Whether requested thumbnails are still waiting to be generated."""
+        with self._lock:
+            return bool(self._pending)
+            
+    def warm(self, file_info, s3_client=None):
+        """
+        Generate a thumbnail into the cache on the calling thread (for prefetching).
+        
+        Args:
+            file_info (dict): Listing entry
+            s3_client (StorageBackend, optional): Backend to fetch from (defaults
+                to the current one)
+        """
+        if self.is_supported(file_info):
+            self._generate(s3_client or self.s3_client, file_info)
+            
+    def cancel_pending(self):
+        """Drop all queued requests that have not started yet (e.g. after scrolling away)."""
+        with self._lock:
+            self._pending.clear()
+            
+    def _worker(self):
+        """Worker loop: take the most urgent request and generate its thumbnail."""
+        while True:
+            priority, _, key = self._queue.get()
+            if self._stopped:
+                return
+                
+            with self._lock:
+                pending = self._pending.get(key)
+                if pending is None or pending.priority != priority:
+                    continue
+                del self._pending[key]
+                
+            path = None
+            try:
+                path = self._generate(pending.s3_client, pending.file_info)
+            except Exception as e:
+                print(f"Debug: Thumbnail failed for {key}: {str(e)}")
+                
+            for callback in pending.callbacks:
+                try:
+                    callback(key, path)
+                except Exception as e:
+                    print(f"Debug: Thumbnail callback failed for {key}: {str(e)}")
+                    
+    def _generate(self, s3_client, file_info):
+        """
+        Fetch an image object, create its thumbnail and store it in the cache.
+        
+        Large JPEGs are read with a ranged GET of their first PREVIEW_BYTES
+        and thumbnailed from the EXIF preview when it has one.
+        """
+        cache_key = self._cache_key(file_info, s3_client)
+        path = self.cache.get(cache_key)
+        if path:
+            return path
+        
+        key = file_info['key']
+        data = None
+        if key.lower().endswith(JPEG_EXTENSIONS) and file_info.get('size', 0) > PREVIEW_BYTES:
+            # Camera JPEGs carry a small preview up front; the full image is the fallback
+            head = s3_client.get_object_bytes(key, (0, PREVIEW_BYTES - 1))
+            data = extract_exif_thumbnail(head, self.size)
+        if data is None:
+            data = s3_client.get_object_bytes(key)
+        thumbnail = create_thumbnail(data, self.size, self.size)
+        if thumbnail is None:
+            return None
+        return self.cache.put_bytes(cache_key, thumbnail)
+        
+    def shutdown(self):
+        """Stop the worker threads after their current job."""
+        self._stopped = True
+        self.cancel_pending()
+        for _ in self._threads:
+            self._queue.put((-1, next(self._counter), None))
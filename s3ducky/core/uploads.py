@@ -0,0 +1,354 @@
+# MIT License
+# 
+# Copyright (c) 2025 S3Ducky
+
+"""
+Upload engine for S3Ducky.
+
+Files at or above the multipart threshold are sent as multipart uploads
+with their parts uploaded in parallel; smaller files are uploaded
+concurrently with one PUT each. The upload ID and finished parts of every
+multipart upload are recorded in a small state file, so an interrupted
+upload continues from where it stopped instead of starting over.
+"""
+
+import os
+import json
+import base64
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from ..utils.formatters import format_file_size
+
+
+# S3 limits for multipart uploads
+MIN_PART_SIZE = 5 * 1024 * 1024
+MAX_PARTS = 10000
+
+DEFAULT_STATE_PATH = os.path.join(os.path.expanduser('~'), '.s3ducky', 'uploads.json')
+
+
+def collect_upload_files(paths, dest_prefix=''):
+    """
+    Expand files and folders into the list of files to upload.
+    
+    A folder keeps its own name and inner layout under the destination
+    prefix, e.g. uploading /data/photos puts /data/photos/a/1.jpg at
+    "<prefix>photos/a/1.jpg".
+    
+    Args:
+        paths (list): Local file and folder paths
+        dest_prefix (str): Key prefix to upload under
+        
+    Returns:
+        list: (local_path, key) tuples
+    """
+    if dest_prefix and not dest_prefix.endswith('/'):
+        dest_prefix += '/'
+        
+    files = []
+    for path in paths:
+        path = os.path.abspath(path)
+        if os.path.isdir(path):
+            base = os.path.dirname(path)
+            for root, dirs, names in os.walk(path):
+                dirs.sort()
+                for name in sorted(names):
+                    local_path = os.path.join(root, name)
+                    relative = os.path.relpath(local_path, base).replace(os.sep, '/')
+                    files.append((local_path, dest_prefix + relative))
+        else:
+            files.append((path, dest_prefix + os.path.basename(path)))
+    return files
+
+
+def object_id(location, key):
+    """
+    Identify an object across buckets and endpoints, e.g. in persisted records.
+    
+    Objects on AWS are "bucket/key"; on a custom endpoint the endpoint
+    comes first, so the same bucket name elsewhere is another object.
+    
+    Args:
+        location (tuple): (endpoint URL, access key, bucket name), see StorageBackend.location
+        key (str): Object key
+        
+    Returns:
+        str: Object identifier
+    """
+    endpoint_url, _, bucket_name = location
+    return f"{endpoint_url}/{bucket_name}/{key}" if endpoint_url else f"{bucket_name}/{key}"
+
+
+class UploadState:
+    """
+    Persisted progress of multipart uploads, used to resume them.
+    
+    A record is only reused while the local file keeps the size and
+    modification time it had when the upload started.
+    """
+    
+    def __init__(self, path=DEFAULT_STATE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._records = self._load()
+        
+    def _load(self):
+        """Read the state file, starting empty if it is missing or unreadable."""
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"Debug: Ignoring unreadable upload state {self.path}: {e}")
+            return {}
+            
+    def _save(self):
+        """Write the state file atomically. Caller holds the lock."""
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            temp_path = self.path + '.tmp'
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._records, f)
+            os.replace(temp_path, self.path)
+        except Exception as e:
+            print(f"Debug: Failed to save upload state: {e}")
+            
+    @staticmethod
+    def _record_id(location, key):
+        return object_id(location, key)
+        
+    def get(self, location, key, local_path, part_size):
+        """
+        Find an unfinished upload of this exact file.
+        
+        Returns:
+            dict or None: Record with 'upload_id' and 'parts' ({part number: ETag})
+        """
+        stat = os.stat(local_path)
+        with self._lock:
+            record = self._records.get(self._record_id(location, key))
+        if (record and record['local_path'] == local_path and record['size'] == stat.st_size
+                and record['mtime'] == stat.st_mtime and record['part_size'] == part_size):
+            return record
+        return None
+        
+    def start(self, location, key, local_path, part_size, upload_id):
+        """Record a newly created multipart upload."""
+        stat = os.stat(local_path)
+        with self._lock:
+            self._records[self._record_id(location, key)] = {
+                'upload_id': upload_id,
+                'local_path': local_path,
+                'size': stat.st_size,
+                'mtime': stat.st_mtime,
+                'part_size': part_size,
+                'parts': {}
+            }
+            self._save()
+            
+    def add_part(self, location, key, part_number, etag):
+        """Record a finished part."""
+        with self._lock:
+            record = self._records.get(self._record_id(location, key))
+            if record is not None:
+                record['parts'][str(part_number)] = etag
+                self._save()
+                
+    def finish(self, location, key):
+        """Forget an upload once it is complete (or abandoned)."""
+        with self._lock:
+            if self._records.pop(self._record_id(location, key), None) is not None:
+                self._save()
+
+
+class _UploadProgress:
+    """Thread-safe byte and file counters for one upload job."""
+    
+    def __init__(self, total_files, total_bytes, callback):
+        self.total_files = total_files
+        self.total_bytes = total_bytes
+        self.files_done = 0
+        self.bytes_done = 0
+        self.callback = callback
+        self._lock = threading.Lock()
+        
+    def add(self, nbytes, files=0):
+        with self._lock:
+            self.bytes_done += nbytes
+            self.files_done += files
+            message = (f"Uploading {self.files_done}/{self.total_files} files: "
+                       f"{format_file_size(self.bytes_done)} of {format_file_size(self.total_bytes)}")
+        if self.callback:
+            self.callback(message)
+
+
+class Uploader:
+    """
+    Uploads local files and folders to the connected bucket.
+    """
+    
+    def __init__(self, s3_client, part_size=8 * 1024 * 1024, concurrency=8,
+                 multipart_threshold=16 * 1024 * 1024, state=None):
+        """
+        Args:
+            s3_client (S3Client): Connected client to upload through
+            part_size (int): Multipart part size in bytes (at least 5 MB)
+            concurrency (int): Files or parts uploaded at the same time
+            multipart_threshold (int): Files this large or larger use multipart uploads
+            state (UploadState, optional): Resume records (defaults to ~/.s3ducky/uploads.json)
+        """
+        self.s3_client = s3_client
+        self.part_size = max(part_size, MIN_PART_SIZE)
+        self.concurrency = max(1, concurrency)
+        self.multipart_threshold = max(multipart_threshold, self.part_size)
+        self.state = state or UploadState()
+        
+    def _part_size_for(self, size):
+        """Grow the part size when needed to stay within 10,000 parts."""
+        part_size = self.part_size
+        while size > part_size * MAX_PARTS:
+            part_size *= 2
+        return part_size
+        
+    def _upload_small(self, local_path, key, progress):
+        """Upload a file with a single PUT."""
+        etag = self.s3_client.put_file(key, local_path)
+        size = os.path.getsize(local_path)
+        progress.add(size, files=1)
+        return self._file_info(key, size, etag)
+        
+    def _upload_part(self, local_path, key, upload_id, part_number, offset, length, progress):
+        """Read and upload one part, recording it for resume."""
+        with open(local_path, 'rb') as f:
+            f.seek(offset)
+            data = f.read(length)
+        # S3 rejects the part if it arrives with a different MD5
+        content_md5 = base64.b64encode(hashlib.md5(data).digest()).decode('ascii')
+        etag = self.s3_client.upload_part(key, upload_id, part_number, data, content_md5)
+        self.state.add_part(self.s3_client.location, key, part_number, etag)
+        progress.add(length)
+        return etag
+        
+    def _upload_multipart(self, executor, local_path, key, progress):
+        """Upload a large file in parallel parts, resuming an earlier attempt if there is one."""
+        location = self.s3_client.location
+        size = os.path.getsize(local_path)
+        part_size = self._part_size_for(size)
+        part_count = (size + part_size - 1) // part_size
+        
+        done = {}
+        record = self.state.get(location, key, local_path, part_size)
+        if record:
+            upload_id = record['upload_id']
+            try:
+                # The parts S3 still holds are authoritative
+                done = self.s3_client.list_parts(key, upload_id)
+            except Exception as e:
+                print(f"Debug: Using recorded parts of {key}: {e}")
+                done = {int(number): etag for number, etag in record['parts'].items()}
+            if done is None:
+                print(f"Debug: Upload of {key} no longer exists, starting over")
+                record = None
+                done = {}
+            else:
+                print(f"Debug: Resuming upload of {key} with {len(done)}/{part_count} parts done")
+        if not record:
+            upload_id = self.s3_client.create_multipart_upload(key)
+            self.state.start(location, key, local_path, part_size, upload_id)
+            
+        futures = {}
+        for part_number in range(1, part_count + 1):
+            offset = (part_number - 1) * part_size
+            length = min(part_size, size - offset)
+            if part_number in done:
+                progress.add(length)
+                continue
+            futures[part_number] = executor.submit(
+                self._upload_part, local_path, key, upload_id, part_number, offset, length, progress)
+                
+        # Unfinished parts stay recorded, so a failure here can be resumed later
+        for part_number, future in futures.items():
+            done[part_number] = future.result()
+            
+        parts = [{'PartNumber': number, 'ETag': done[number]} for number in range(1, part_count + 1)]
+        etag = self.s3_client.complete_multipart_upload(key, upload_id, parts)
+        self.state.finish(location, key)
+        progress.add(0, files=1)
+        return self._file_info(key, size, etag)
+        
+    @staticmethod
+    def _file_info(key, size, etag):
+        """Build a listing entry for a freshly uploaded object."""
+        return {
+            'key': key,
+            'size': size,
+            'modified': datetime.now(timezone.utc),
+            'etag': (etag or '').strip('"')
+        }
+        
+    def upload(self, paths, dest_prefix='', progress_callback=None, file_callback=None):
+        """
+        Upload files and folders.
+        
+        Small files are uploaded concurrently while large files go up one
+        after another, each with its parts spread over the same workers.
+        
+        Args:
+            paths (list): Local file and folder paths
+            dest_prefix (str): Key prefix to upload under
+            progress_callback (callable, optional): Called with progress messages
+            file_callback (callable, optional): Called with the listing entry of
+                each uploaded object
+                
+        Returns:
+            list: Listing entries of the uploaded objects
+            
+        Raises:
+            RuntimeError: If not connected to S3
+            Exception: If any file failed to upload (after the others finished)
+        """
+        if not self.s3_client.is_connected():
+            raise RuntimeError("S3 client is not connected")
+            
+        files = collect_upload_files(paths, dest_prefix)
+        sizes = [os.path.getsize(local_path) for local_path, _ in files]
+        progress = _UploadProgress(len(files), sum(sizes), progress_callback)
+        
+        uploaded = []
+        failures = []
+        
+        def finished(key, future):
+            """Collect a small-file upload as soon as it ends."""
+            try:
+                file_info = future.result()
+            except Exception as e:
+                failures.append(f"{key}: {e}")
+                return
+            uploaded.append(file_info)
+            if file_callback:
+                file_callback(file_info)
+                
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            for (local_path, key), size in zip(files, sizes):
+                if size < self.multipart_threshold:
+                    future = executor.submit(self._upload_small, local_path, key, progress)
+                    future.add_done_callback(lambda f, key=key: finished(key, f))
+                    
+            for (local_path, key), size in zip(files, sizes):
+                if size >= self.multipart_threshold:
+                    try:
+                        file_info = self._upload_multipart(executor, local_path, key, progress)
+                    except Exception as e:
+                        failures.append(f"{key}: {e}")
+                        continue
+                    uploaded.append(file_info)
+                    if file_callback:
+                        file_callback(file_info)
+                        
+        if failures:
+            print(f"Debug: {len(failures)} uploads failed: {failures}")
+            raise Exception(f"{len(failures)} of {len(files)} uploads failed, e.g. {failures[0]}")
+        return uploaded
@@ -0,0 +1,437 @@
+# MIT License
+# 
+# Copyright (c) 2025 S3Ducky
+
+"""
+Workspace of open bucket tabs and shared boto3 clients for S3Ducky.
+"""
+
+import threading
+from boto3.session import Session
+from .rollups import PrefixRollup
+from .listing_diff import diff_listings
+from .listing_store import ListingStore
+from .selection import Selection
+from .s3_client import client_config
+from .local_storage import LOCAL_SCHEME
+from .memory_storage import MEMORY_SCHEME
+
+
+def credentials_location(credentials):
+    """
+    Location a set of connection details opens, as StorageBackend.location gives it.
+    
+    Args:
+        credentials (dict): Connection details from the form or a tab
+        
+    Returns:
+        tuple: (endpoint URL, access key, bucket name)
+    """
+    def text(name):
+        return (credentials.get(name) or '').strip() or None
+        
+    bucket_name = text('bucket_name') or ''
+    if bucket_name.startswith((LOCAL_SCHEME, MEMORY_SCHEME)):
+        return (None, None, bucket_name)
+    return (text('endpoint_url'), text('access_key'), bucket_name)
+
+
+class ClientCache:
+    """
+    Creates boto3 sessions and clients once per set of credentials, region
+    and endpoint, and hands the same objects to every tab that needs them.
+    
+    Building a client costs tens of milliseconds and each one owns its own
+    connection pool, so reusing them keeps tab switches and reconnects cheap.
+    """
+    
+    def __init__(self):
+        self._clients = {}
+        self._lock = threading.Lock()
+        
+    def get(self, access_key, secret_key, region, endpoint_url=None, addressing_style='auto',
+            accelerate=False, dualstack=False):
+        """
+        Get (or create) the session, client and resource for a connection.
+        
+        Args:
+            access_key (str): AWS Access Key ID
+            secret_key (str): AWS Secret Access Key
+            region (str): AWS region
+            endpoint_url (str, optional): Custom S3 endpoint
+            addressing_style (str): 'auto', 'virtual' or 'path'
+            accelerate (bool): Use the S3 Transfer Acceleration endpoint
+            dualstack (bool): Use the IPv4/IPv6 dual-stack endpoint
+            
+        Returns:
+            tuple: (session, client, resource)
+        """
+        cache_key = (access_key, secret_key, region, endpoint_url, addressing_style,
+                     bool(accelerate), bool(dualstack))
+        with self._lock:
+            entry = self._clients.get(cache_key)
+            if entry is None:
+                session = Session(
+                    aws_access_key_id=access_key,
+                    aws_secret_access_key=secret_key,
+                    region_name=region
+                )
+                config = client_config(endpoint_url, addressing_style, accelerate, dualstack)
+                entry = (
+                    session,
+                    session.client('s3', endpoint_url=endpoint_url, config=config),
+                    session.resource('s3', endpoint_url=endpoint_url, config=config)
+                )
+                self._clients[cache_key] = entry
+            return entry
+            
+    def discard(self, access_key, secret_key, region, endpoint_url=None, addressing_style='auto',
+                accelerate=False, dualstack=False):
+        """Forget a cached client (e.g. after its credentials were rejected)."""
+        with self._lock:
+            self._clients.pop((access_key, secret_key, region, endpoint_url, addressing_style,
+                               bool(accelerate), bool(dualstack)), None)
+            
+    def clear(self):
+        """Forget all cached clients."""
+        with self._lock:
+            self._clients.clear()
+
+
+class WorkspaceTab:
+    """
+    One open bucket/prefix view with its own client binding and listing.
+    """
+    
+    def __init__(self, s3_client, file_manager, files_list=None, credentials=None):
+        self.s3_client = s3_client
+        self.file_manager = file_manager
+        # Connection details the tab was opened with (to prefetch its neighbours)
+        self.credentials = credentials
+        # ListingStore sorted by key (in report order while an inventory loads)
+        self.files_list = files_list if files_list is not None else ListingStore()
+        self.selection = Selection()
+        
+        # Folder size totals, built the first time they are asked for, and the
+        # number of files_list pages they include
+        self.rollup = None
+        self._rollup_pages = 0
+        
+        # Background listing state; bumping the generation abandons a running listing
+        self.loading = False
+        self.listing_generation = 0
+        
+        # Auto-refresh timing (RefreshPoller), created when polling starts
+        self.poller = None
+        
+    @property
+    def title(self):
+        """Short label for the tab, e.g. "my-bucket/logs/"."""
+        if self.s3_client.resource_prefix:
+            return f"{self.s3_client.bucket_name}/{self.s3_client.resource_prefix}"
+        return self.s3_client.bucket_name
+        
+    def add_files(self, entries, files_list=None):
+        """
+        Append a page of listing entries; runs in the listing thread.
+        
+        Spilling to disk happens here, off the Tk thread. The folder totals
+        are not touched: hand the returned page to add_to_rollup() on the
+        Tk thread.
+        
+        Args:
+            entries (list or ColumnPage): Listing entries
+            files_list (ListingStore, optional): Store the listing started
+                with, so a page of an abandoned listing never lands in the
+                store that replaced it (defaults to the current one)
+                
+        Returns:
+            tuple: (page number in its store, entries)
+        """
+        return (files_list or self.files_list).extend(entries), entries
+    
+    def add_to_rollup(self, pages):
+        """
+        Add pages stored by add_files() to the folder totals, if there are any.
+        
+        Pages the totals already include (they were built after the page
+        was stored) are skipped.
+        
+        Args:
+            pages (list): (page number, entries) tuples from add_files()
+        """
+        if self.rollup is None:
+            return
+        for number, entries in pages:
+            if number > self._rollup_pages:
+                self.rollup.add_entries(entries)
+                self._rollup_pages = number
+    
+    def find_file(self, key):
+        """
+        Look up the listing entry of a key.
+        
+        Returns:
+            dict or None: Listing entry, or None if the key is not listed
+        """
+        index = self.files_list.bisect_key(key)
+        if index < len(self.files_list) and self.files_list[index]['key'] == key:
+            return self.files_list[index]
+        return None
+    
+    def set_files(self, files_list):
+        """
+        Replace the whole listing.
+        
+        Args:
+            files_list (list): Listing entries
+        """
+        self.files_list = files_list
+        if self.rollup is not None:
+            self.rollup = None
+            self.get_rollup()
+    
+    def diff_refresh(self, files_list):
+        """
+        Work out what a freshly loaded listing changes, in the thread that loaded it.
+        
+        The listing shown isn't locked for the whole merge-join, so the Tk
+        thread keeps drawing from it; changes made meanwhile make the
+        result stale instead (see is_current).
+        
+        Args:
+            files_list (ListingStore): New listing entries, sorted by key
+            
+        Returns:
+            tuple: (ListingDiff, base) to hand to is_current() and refresh_files()
+        """
+        old_list = self.files_list
+        version = old_list.version
+        try:
+            diff = diff_listings(old_list, files_list)
+        except IndexError:
+            # The listing shrank while it was read
+            diff, version = None, None
+        return diff, (old_list, version)
+    
+    def is_current(self, base):
+        """Check whether the listing is unchanged since diff_refresh() returned base."""
+        old_list, version = base
+        return self.files_list is old_list and old_list.version == version
+    
+    def refresh_files(self, files_list, diff=None):
+        """
+        Replace the listing with a freshly loaded one.
+        
+        Args:
+            files_list (ListingStore): New listing entries, sorted by key
+            diff (ListingDiff, optional): Changes from diff_refresh(), if is_current()
+                still holds; worked out here if omitted
+            
+        Returns:
+            ListingDiff: Changes against the previous listing
+        """
+        old_list = self.files_list
+        if diff is None:
+            diff = diff_listings(old_list, files_list)
+        self.files_list = files_list
+        if self.rollup is not None:
+            # Changed objects leave the totals in their old version and join them in the new one
+            updated = [files_list[index] for index in diff.updated]
+            self.rollup.remove_entries([old_list[index] for index in diff.deleted] +
+                                       [old_list[old_list.bisect_key(file_info['key'])] for file_info in updated])
+            self.rollup.add_entries([files_list[index] for index in diff.inserted] + updated)
+            self._rollup_pages = files_list.pages_added
+        return diff
+    
+    def upsert_files(self, entries):
+        """
+        Merge new or changed objects (e.g. just uploaded) into the sorted listing.
+        
+        Keys outside the tab's prefix are ignored, as are keys beyond the end of
+        a listing still loading (its next pages will bring them).
+        
+        Args:
+            entries (list): Listing entries
+            
+        Returns:
+            tuple: (indexes of inserted entries in ascending order, keys of updated entries)
+        """
+        prefix = self.s3_client.resource_prefix or ''
+        inserted = []
+        updated = []
+        replaced = []
+        
+        for file_info in sorted(entries, key=lambda x: x['key']):
+            key = file_info['key']
+            if not key.startswith(prefix):
+                continue
+            if self.loading and (not self.files_list or key > self.files_list[-1]['key']):
+                continue
+            index = self.files_list.bisect_key(key)
+            if index < len(self.files_list) and self.files_list[index]['key'] == key:
+                replaced.append(self.files_list[index])
+                self.files_list[index] = file_info
+                updated.append(file_info)
+            else:
+                self.files_list.insert(index, file_info)
+                inserted.append(index)
+        
+        if self.rollup is not None:
+            # A replaced object leaves the totals before its new version joins them
+            self.rollup.remove_entries(replaced)
+            self.rollup.add_entries([self.files_list[index] for index in inserted] + updated)
+        
+        # Entries are merged in key order, so later insertions never shift earlier ones
+        return inserted, [file_info['key'] for file_info in updated]
+    
+    def remove_files(self, keys):
+        """
+        Drop deleted or moved objects from the listing.
+        
+        Args:
+            keys (iterable): S3 keys of the objects
+            
+        Returns:
+            list: The removed entries (empty if none was listed)
+        """
+        keys = set(keys)
+        removed = self.files_list.remove_keys(keys)
+        if not removed:
+            return []
+        self.selection.forget(keys)
+        if self.rollup is not None:
+            self.rollup.remove_entries(removed)
+        return removed
+    
+    def get_rollup(self):
+        """
+        Get the folder size totals, computing them on first use.
+        
+        Returns:
+            PrefixRollup: Totals kept up to date as pages are added
+        """
+        if self.rollup is None:
+            rollup = PrefixRollup()
+            # Hold the store while reading it, so the page count matches what was read
+            with self.files_list.lock:
+                rollup.add_entries(self.files_list)
+                self._rollup_pages = self.files_list.pages_added
+            self.rollup = rollup
+        return self.rollup
+    
+    def start_listing(self):
+        """
+        Mark a new background listing as started.
+        
+        Returns:
+            int: Generation number identifying this listing
+        """
+        self.listing_generation += 1
+        self.loading = True
+        return self.listing_generation
+    
+    def cancel_listing(self):
+        """Abandon any background listing still running for this tab."""
+        self.listing_generation += 1
+        self.loading = False
+    
+    def matches(self, location, resource_prefix):
+        """
+        Check whether this tab shows the given bucket and prefix.
+        
+        The same bucket name on another endpoint, or opened with another
+        access key, is another tab.
+        
+        Args:
+            location (tuple): (endpoint URL, access key, bucket name), see credentials_location()
+            resource_prefix (str or None): Prefix filter
+            
+        Returns:
+            bool: True if the tab is for the same location
+        """
+        prefix = resource_prefix.strip() if resource_prefix else None
+        return (self.s3_client.location == tuple(location)
+                and self.s3_client.resource_prefix == (prefix or None))
+
+
+class Workspace:
+    """
+    Ordered set of open tabs with one active tab.
+    """
+    
+    def __init__(self):
+        self.tabs = []
+        self.active_index = None
+        
+    @property
+    def active_tab(self):
+        """The tab currently shown, or None if no tab is open."""
+        if self.active_index is None:
+            return None
+        return self.tabs[self.active_index]
+        
+    def add_tab(self, tab):
+        """
+        Open a tab and make it active.
+        
+        Args:
+            tab (WorkspaceTab): Tab to add
+            
+        Returns:
+            int: Index of the new tab
+        """
+        self.tabs.append(tab)
+        self.active_index = len(self.tabs) - 1
+        return self.active_index
+        
+    def find_tab(self, location, resource_prefix):
+        """
+        Find an open tab for a bucket location and prefix.
+        
+        Args:
+            location (tuple): (endpoint URL, access key, bucket name), see credentials_location()
+            resource_prefix (str or None): Prefix filter
+            
+        Returns:
+            int or None: Index of the matching tab
+        """
+        for index, tab in enumerate(self.tabs):
+            if tab.matches(location, resource_prefix):
+                return index
+        return None
+        
+    def switch_to(self, index):
+        """
+        Make another tab active.
+        
+        Args:
+            index (int): Tab index
+            
+        Returns:
+            WorkspaceTab: The newly active tab
+        """
+        if not 0 <= index < len(self.tabs):
+            raise IndexError(f"No tab at index {index}")
+        self.active_index = index
+        return self.tabs[index]
+        
+    def close_tab(self, index):
+        """
+        Close a tab and activate its neighbour.
+        
+        Args:
+            index (int): Tab index
+            
+        Returns:
+            WorkspaceTab or None: The newly active tab, or None if none are left
+        """
+        tab = self.tabs.pop(index)
+        tab.cancel_listing()
+        tab.s3_client.disconnect()
+        
+        if not self.tabs:
+            self.active_index = None
+        elif self.active_index >= len(self.tabs) or self.active_index > index:
+            self.active_index = max(0, self.active_index - 1)
+        return self.active_tab
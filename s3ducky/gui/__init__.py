@@ -1,14 +1,19 @@
-# MIT License
-# 
-# Copyright (c) 2025 S3Ducky
-
-"""
-S3Ducky GUI Components
-"""
-
-from .main_window import MainWindow
-from .credentials_page import CredentialsPage
-from .file_browser import FileBrowser
-from .footer import Footer
-
-__all__ = ['MainWindow', 'CredentialsPage', 'FileBrowser', 'Footer']
+# MIT License
+# 
+# Copyright (c) 2025 S3Ducky
+
+"""
+S3Ducky GUI Components
+"""
+
+from .main_window import MainWindow
+from .credentials_page import CredentialsPage
+from .file_browser import FileBrowser
+from .footer import Footer
+from .rollup_view import RollupView
+from .bandwidth_dialog import BandwidthDialog
+from .query_panel import QueryPanel
+from .ui_pump import UIPump
+
+__all__ = ['MainWindow', 'CredentialsPage', 'FileBrowser', 'Footer', 'RollupView', 'BandwidthDialog', 'QueryPanel',
+           'UIPump']
@@ -0,0 +1,74 @@
+# MIT License
+# 
+# Copyright (c) 2025 S3Ducky
+
+"""
+Bandwidth limit dialog for S3Ducky.
+"""
+
+import tkinter as tk
+from tkinter import ttk, messagebox
+
+
+class BandwidthDialog:
+    """
+    Small window for changing the download and upload limits of running transfers.
+    """
+    
+    def __init__(self, parent, download_kbps, upload_kbps, schedule_note=None, apply_callback=None):
+        """
+        Args:
+            parent: Parent window
+            download_kbps (int): Current download limit in KiB/s (0 = unlimited)
+            upload_kbps (int): Current upload limit in KiB/s (0 = unlimited)
+            schedule_note (str, optional): Description of a schedule rule in force
+            apply_callback (callable, optional): Called with (download_kbps, upload_kbps)
+        """
+        self.apply_callback = apply_callback
+        self.download_var = tk.StringVar(value=str(download_kbps))
+        self.upload_var = tk.StringVar(value=str(upload_kbps))
+        
+        self.window = tk.Toplevel(parent)
+        self.window.title("Bandwidth Limits")
+        self.window.resizable(False, False)
+        self.window.transient(parent)
+        
+        self._create_widgets(schedule_note)
+        
+    def _create_widgets(self, schedule_note):
+        """Create the limit fields and buttons."""
+        frame = ttk.Frame(self.window, padding=15)
+        frame.pack(fill=tk.BOTH, expand=True)
+        
+        for row, (label, var) in enumerate((("Download limit:", self.download_var),
+                                            ("Upload limit:", self.upload_var))):
+            ttk.Label(frame, text=label).grid(row=row, column=0, sticky=tk.W, pady=5)
+            ttk.Spinbox(frame, textvariable=var, from_=0, to=10 ** 7, increment=256,
+                        width=10).grid(row=row, column=1, padx=(10, 5), pady=5)
+            ttk.Label(frame, text="KiB/s").grid(row=row, column=2, sticky=tk.W)
+            
+        ttk.Label(frame, text="0 means unlimited. Changes apply to running transfers.",
+                  font=("Arial", 8), foreground="gray").grid(row=2, column=0, columnspan=3, pady=(5, 0))
+        if schedule_note:
+            ttk.Label(frame, text=schedule_note, font=("Arial", 8),
+                      foreground="orange").grid(row=3, column=0, columnspan=3, pady=(5, 0))
+                      
+        button_frame = ttk.Frame(frame)
+        button_frame.grid(row=4, column=0, columnspan=3, pady=(15, 0))
+        ttk.Button(button_frame, text="Apply", command=self._apply).pack(side=tk.LEFT, padx=(0, 10))
+        ttk.Button(button_frame, text="Close", command=self.window.destroy).pack(side=tk.LEFT)
+        
+    def _apply(self):
+        """Validate the fields and hand the new limits over."""
+        try:
+            download_kbps = int(self.download_var.get() or 0)
+            upload_kbps = int(self.upload_var.get() or 0)
+            if download_kbps < 0 or upload_kbps < 0:
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("Error", "Limits must be whole numbers of KiB/s (0 for unlimited)",
+                                 parent=self.window)
+            return
+            
+        if self.apply_callback:
+            self.apply_callback(download_kbps, upload_kbps)
@@ -1,157 +1,243 @@
-# MIT License
-# 
-# Copyright (c) 2025 S3Ducky
-
-"""
-Credentials input page for S3Ducky.
-"""
-
-import tkinter as tk
-from tkinter import ttk
-import os
-from ..utils.image_utils import load_png_image
-from .footer import Footer
-
-
-class CredentialsPage:
-    """
-    Page for entering AWS credentials and connection details.
-    """
-    
-    def __init__(self, parent_frame, connect_callback=None):
-        self.parent_frame = parent_frame
-        self.connect_callback = connect_callback
-        
-        # Variables for form inputs
-        self.access_key_var = tk.StringVar()
-        self.secret_key_var = tk.StringVar()
-        self.region_var = tk.StringVar(value="us-east-1")
-        self.bucket_var = tk.StringVar()
-        self.resource_var = tk.StringVar()
-        
-        # UI components
-        self.connect_button = None
-        self.status_label = None
-        self.logo_photo = None
-        
-        self._create_widgets()
-        
-    def _create_widgets(self):
-        """Create and layout all widgets for the credentials page."""
-        # Title with logo
-        title_frame = ttk.Frame(self.parent_frame)
-        title_frame.pack(pady=(0, 20))
-        
-        # Load and display logo
-        logo_path = os.path.join(os.path.dirname(__file__), '..', '..', 'asset', 'logo.png')
-        logo_path = os.path.abspath(logo_path)
-        self.logo_photo = load_png_image(logo_path, 48, 48)
-        
-        if self.logo_photo:
-            logo_label = ttk.Label(title_frame, image=self.logo_photo)
-            logo_label.pack(side=tk.LEFT, padx=(0, 10))
-        
-        title_label = ttk.Label(title_frame, text="S3Ducky", 
-                               font=("Arial", 16, "bold"))
-        title_label.pack(side=tk.LEFT)
-        
-        # Credentials frame
-        cred_frame = ttk.LabelFrame(self.parent_frame, text="AWS Credentials", padding=20)
-        cred_frame.pack(fill=tk.X, pady=(0, 20))
-        
-        # AWS Access Key
-        ttk.Label(cred_frame, text="AWS Access Key:").grid(row=0, column=0, sticky=tk.W, pady=5)
-        self.access_key_entry = ttk.Entry(cred_frame, textvariable=self.access_key_var, width=50)
-        self.access_key_entry.grid(row=0, column=1, padx=(10, 0), pady=5, sticky=tk.EW)
-        
-        # AWS Secret Key
-        ttk.Label(cred_frame, text="AWS Secret Key:").grid(row=1, column=0, sticky=tk.W, pady=5)
-        self.secret_key_entry = ttk.Entry(cred_frame, textvariable=self.secret_key_var, 
-                                         width=50, show="*")
-        self.secret_key_entry.grid(row=1, column=1, padx=(10, 0), pady=5, sticky=tk.EW)
-        
-        # AWS Region
-        ttk.Label(cred_frame, text="AWS Region:").grid(row=2, column=0, sticky=tk.W, pady=5)
-        self.region_entry = ttk.Entry(cred_frame, textvariable=self.region_var, width=50)
-        self.region_entry.grid(row=2, column=1, padx=(10, 0), pady=5, sticky=tk.EW)
-        
-        # Bucket Name
-        ttk.Label(cred_frame, text="Bucket Name:").grid(row=3, column=0, sticky=tk.W, pady=5)
-        self.bucket_entry = ttk.Entry(cred_frame, textvariable=self.bucket_var, width=50)
-        self.bucket_entry.grid(row=3, column=1, padx=(10, 0), pady=5, sticky=tk.EW)
-        
-        # Resource (optional)
-        ttk.Label(cred_frame, text="Prefix Filter (optional):").grid(row=4, column=0, sticky=tk.W, pady=5)
-        self.resource_entry = ttk.Entry(cred_frame, textvariable=self.resource_var, width=50)
-        self.resource_entry.grid(row=4, column=1, padx=(10, 0), pady=5, sticky=tk.EW)
-        
-        # Add help text for prefix filter
-        help_label = ttk.Label(cred_frame, text="(Leave empty to see all files, or enter a prefix to filter files)", 
-                              font=("Arial", 8), foreground="gray")
-        help_label.grid(row=5, column=1, padx=(10, 0), pady=(0, 5), sticky=tk.W)
-        
-        # Configure grid weights
-        cred_frame.columnconfigure(1, weight=1)
-        
-        # Connect button
-        self.connect_button = ttk.Button(self.parent_frame, text="Connect", 
-                                        command=self._on_connect)
-        self.connect_button.pack(pady=10)
-        
-        # Status label
-        self.status_label = ttk.Label(self.parent_frame, text="Enter your AWS credentials to connect", 
-                                     foreground="blue")
-        self.status_label.pack(pady=5)
-        
-        # Add footer
-        Footer(self.parent_frame)
-        
-    def _on_connect(self):
-        """Handle connect button click."""
-        if self.connect_callback:
-            credentials = {
-                'access_key': self.access_key_var.get(),
-                'secret_key': self.secret_key_var.get(),
-                'region': self.region_var.get(),
-                'bucket_name': self.bucket_var.get(),
-                'resource_prefix': self.resource_var.get()
-            }
-            self.connect_callback(credentials)
-    
-    def set_status(self, message, color="blue"):
-        """
-        Update the status label.
-        
-        Args:
-            message (str): Status message to display
-            color (str): Text color for the message
-        """
-        if self.status_label:
-            self.status_label.config(text=message, foreground=color)
-    
-    def set_connect_button_state(self, enabled=True, text="Connect"):
-        """
-        Update the connect button state and text.
-        
-        Args:
-            enabled (bool): Whether the button should be enabled
-            text (str): Button text
-        """
-        if self.connect_button:
-            state = 'normal' if enabled else 'disabled'
-            self.connect_button.config(state=state, text=text)
-    
-    def get_credentials(self):
-        """
-        Get the current credential values.
-        
-        Returns:
-            dict: Dictionary containing all credential fields
-        """
-        return {
-            'access_key': self.access_key_var.get(),
-            'secret_key': self.secret_key_var.get(),
-            'region': self.region_var.get(),
-            'bucket_name': self.bucket_var.get(),
-            'resource_prefix': self.resource_var.get()
-        }
+# MIT License
+# 
+# Copyright (c) 2025 S3Ducky
+
+"""
+Credentials input page for S3Ducky.
+"""
+
+import tkinter as tk
+from tkinter import ttk, filedialog
+import os
+from ..utils.image_utils import load_png_image
+from ..core.s3_client import ADDRESSING_STYLES
+from .footer import Footer
+
+
+class CredentialsPage:
+    """
+    Page for entering AWS credentials and connection details.
+    """
+    
+    def __init__(self, parent_frame, connect_callback=None, initial_credentials=None, cancel_callback=None):
+        self.parent_frame = parent_frame
+        self.connect_callback = connect_callback
+        self.cancel_callback = cancel_callback
+        
+        # Variables for form inputs
+        self.access_key_var = tk.StringVar()
+        self.secret_key_var = tk.StringVar()
+        self.region_var = tk.StringVar(value="us-east-1")
+        self.bucket_var = tk.StringVar()
+        self.resource_var = tk.StringVar()
+        self.inventory_var = tk.StringVar()
+        self.inventory_top_up_var = tk.BooleanVar(value=False)
+        self.endpoint_var = tk.StringVar()
+        self.addressing_style_var = tk.StringVar(value="auto")
+        self.accelerate_var = tk.BooleanVar(value=False)
+        self.dualstack_var = tk.BooleanVar(value=False)
+        
+        # Pre-fill from the last connection so another bucket can be opened quickly
+        if initial_credentials:
+            self.access_key_var.set(initial_credentials.get('access_key', ''))
+            self.secret_key_var.set(initial_credentials.get('secret_key', ''))
+            self.region_var.set(initial_credentials.get('region') or 'us-east-1')
+            self.bucket_var.set(initial_credentials.get('bucket_name', ''))
+            self.resource_var.set(initial_credentials.get('resource_prefix') or '')
+            self.inventory_var.set(initial_credentials.get('inventory_manifest') or '')
+            self.inventory_top_up_var.set(bool(initial_credentials.get('inventory_top_up')))
+            self.endpoint_var.set(initial_credentials.get('endpoint_url') or '')
+            self.addressing_style_var.set(initial_credentials.get('addressing_style') or 'auto')
+            self.accelerate_var.set(bool(initial_credentials.get('accelerate')))
+            self.dualstack_var.set(bool(initial_credentials.get('dualstack')))
+        
+        # UI components
+        self.connect_button = None
+        self.status_label = None
+        self.logo_photo = None
+        
+        self._create_widgets()
+        
+    def _create_widgets(self):
+        """Create and layout all widgets for the credentials page."""
+        # Title with logo
+        title_frame = ttk.Frame(self.parent_frame)
+        title_frame.pack(pady=(0, 20))
+        
+        # Load and display logo
+        logo_path = os.path.join(os.path.dirname(__file__), '..', '..', 'asset', 'logo.png')
+        logo_path = os.path.abspath(logo_path)
+        self.logo_photo = load_png_image(logo_path, 48, 48)
+        
+        if self.logo_photo:
+            logo_label = ttk.Label(title_frame, image=self.logo_photo)
+            logo_label.pack(side=tk.LEFT, padx=(0, 10))
+        
+        title_label = ttk.Label(title_frame, text="S3Ducky", 
+                               font=("Arial", 16, "bold"))
+        title_label.pack(side=tk.LEFT)
+        
+        # Credentials frame
+        cred_frame = ttk.LabelFrame(self.parent_frame, text="AWS Credentials", padding=20)
+        cred_frame.pack(fill=tk.X, pady=(0, 20))
+        
+        # AWS Access Key
+        ttk.Label(cred_frame, text="AWS Access Key:").grid(row=0, column=0, sticky=tk.W, pady=5)
+        self.access_key_entry = ttk.Entry(cred_frame, textvariable=self.access_key_var, width=50)
+        self.access_key_entry.grid(row=0, column=1, padx=(10, 0), pady=5, sticky=tk.EW)
+        
+        # AWS Secret Key
+        ttk.Label(cred_frame, text="AWS Secret Key:").grid(row=1, column=0, sticky=tk.W, pady=5)
+        self.secret_key_entry = ttk.Entry(cred_frame, textvariable=self.secret_key_var, 
+                                         width=50, show="*")
+        self.secret_key_entry.grid(row=1, column=1, padx=(10, 0), pady=5, sticky=tk.EW)
+        
+        # AWS Region
+        ttk.Label(cred_frame, text="AWS Region:").grid(row=2, column=0, sticky=tk.W, pady=5)
+        self.region_entry = ttk.Entry(cred_frame, textvariable=self.region_var, width=50)
+        self.region_entry.grid(row=2, column=1, padx=(10, 0), pady=5, sticky=tk.EW)
+        
+        # Bucket Name
+        ttk.Label(cred_frame, text="Bucket Name:").grid(row=3, column=0, sticky=tk.W, pady=5)
+        self.bucket_entry = ttk.Entry(cred_frame, textvariable=self.bucket_var, width=50)
+        self.bucket_entry.grid(row=3, column=1, padx=(10, 0), pady=5, sticky=tk.EW)
+        bucket_help = ttk.Label(cred_frame, text="(or file:///path/to/folder to browse a local folder without credentials)", 
+                               font=("Arial", 8), foreground="gray")
+        bucket_help.grid(row=4, column=1, padx=(10, 0), pady=(0, 5), sticky=tk.W)
+        
+        # Resource (optional)
+        ttk.Label(cred_frame, text="Prefix Filter (optional):").grid(row=5, column=0, sticky=tk.W, pady=5)
+        self.resource_entry = ttk.Entry(cred_frame, textvariable=self.resource_var, width=50)
+        self.resource_entry.grid(row=5, column=1, padx=(10, 0), pady=5, sticky=tk.EW)
+        
+        # Add help text for prefix filter
+        help_label = ttk.Label(cred_frame, text="(Leave empty to see all files, or enter a prefix to filter files)", 
+                              font=("Arial", 8), foreground="gray")
+        help_label.grid(row=6, column=1, padx=(10, 0), pady=(0, 5), sticky=tk.W)
+        
+        # S3 Inventory manifest (optional, for very large buckets)
+        ttk.Label(cred_frame, text="Inventory Manifest (optional):").grid(row=7, column=0, sticky=tk.W, pady=5)
+        inventory_frame = ttk.Frame(cred_frame)
+        inventory_frame.grid(row=7, column=1, padx=(10, 0), pady=5, sticky=tk.EW)
+        self.inventory_entry = ttk.Entry(inventory_frame, textvariable=self.inventory_var)
+        self.inventory_entry.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        ttk.Button(inventory_frame, text="Browse...", 
+                  command=self._browse_manifest).pack(side=tk.LEFT, padx=(5, 0))
+        
+        ttk.Checkbutton(cred_frame, text="Top up with a live listing of keys newer than the report", 
+                       variable=self.inventory_top_up_var).grid(row=8, column=1, padx=(10, 0), sticky=tk.W)
+        inventory_help = ttk.Label(cred_frame, text="(manifest.json path or s3://bucket/path/manifest.json; lists from the report instead of S3)", 
+                                  font=("Arial", 8), foreground="gray")
+        inventory_help.grid(row=9, column=1, padx=(10, 0), pady=(0, 5), sticky=tk.W)
+        
+        # Endpoint (optional, for S3-compatible servers)
+        ttk.Label(cred_frame, text="Endpoint URL (optional):").grid(row=10, column=0, sticky=tk.W, pady=5)
+        self.endpoint_entry = ttk.Entry(cred_frame, textvariable=self.endpoint_var, width=50)
+        self.endpoint_entry.grid(row=10, column=1, padx=(10, 0), pady=5, sticky=tk.EW)
+        endpoint_help = ttk.Label(cred_frame, text="(Leave empty for AWS, or enter e.g. http://localhost:9000 for MinIO and other S3-compatible servers)", 
+                                 font=("Arial", 8), foreground="gray")
+        endpoint_help.grid(row=11, column=1, padx=(10, 0), pady=(0, 5), sticky=tk.W)
+        
+        ttk.Label(cred_frame, text="Addressing Style:").grid(row=12, column=0, sticky=tk.W, pady=5)
+        endpoint_frame = ttk.Frame(cred_frame)
+        endpoint_frame.grid(row=12, column=1, padx=(10, 0), pady=5, sticky=tk.EW)
+        ttk.Combobox(endpoint_frame, textvariable=self.addressing_style_var, values=ADDRESSING_STYLES, 
+                    state='readonly', width=10).pack(side=tk.LEFT)
+        ttk.Checkbutton(endpoint_frame, text="Transfer acceleration", 
+                       variable=self.accelerate_var).pack(side=tk.LEFT, padx=(10, 0))
+        ttk.Checkbutton(endpoint_frame, text="Dual-stack (IPv6)", 
+                       variable=self.dualstack_var).pack(side=tk.LEFT, padx=(10, 0))
+        
+        # Configure grid weights
+        cred_frame.columnconfigure(1, weight=1)
+        
+        # Connect button (plus a way back to open tabs)
+        button_frame = ttk.Frame(self.parent_frame)
+        button_frame.pack(pady=10)
+        
+        self.connect_button = ttk.Button(button_frame, text="Connect", 
+                                        command=self._on_connect)
+        self.connect_button.pack(side=tk.LEFT)
+        
+        if self.cancel_callback:
+            ttk.Button(button_frame, text="Back to Workspace", 
+                      command=self.cancel_callback).pack(side=tk.LEFT, padx=(10, 0))
+        
+        # Status label
+        self.status_label = ttk.Label(self.parent_frame, text="Enter your AWS credentials to connect", 
+                                     foreground="blue")
+        self.status_label.pack(pady=5)
+        
+        # Add footer
+        Footer(self.parent_frame)
+        
+    def _browse_manifest(self):
+        """Pick a local S3 Inventory manifest.json."""
+        path = filedialog.askopenfilename(
+            title="Choose S3 Inventory Manifest",
+            filetypes=[("Inventory manifest", "manifest.json"), ("JSON files", "*.json"), ("All files", "*.*")]
+        )
+        if path:
+            self.inventory_var.set(path)
+    
+    def _on_connect(self):
+        """Handle connect button click."""
+        if self.connect_callback:
+            credentials = {
+                'access_key': self.access_key_var.get(),
+                'secret_key': self.secret_key_var.get(),
+                'region': self.region_var.get(),
+                'bucket_name': self.bucket_var.get(),
+                'resource_prefix': self.resource_var.get(),
+                'inventory_manifest': self.inventory_var.get(),
+                'inventory_top_up': self.inventory_top_up_var.get(),
+                'endpoint_url': self.endpoint_var.get(),
+                'addressing_style': self.addressing_style_var.get(),
+                'accelerate': self.accelerate_var.get(),
+                'dualstack': self.dualstack_var.get()
+            }
+            self.connect_callback(credentials)
+    
+    def set_status(self, message, color="blue"):
+        """
+        Update the status label.
+        
+        Args:
+            message (str): Status message to display
+            color (str): Text color for the message
+        """
+        if self.status_label:
+            self.status_label.config(text=message, foreground=color)
+    
+    def set_connect_button_state(self, enabled=True, text="Connect"):
+        """
+        Update the connect button state and text.
+        
+        Args:
+            enabled (bool): Whether the button should be enabled
+            text (str): Button text
+        """
+        if self.connect_button:
+            state = 'normal' if enabled else 'disabled'
+            self.connect_button.config(state=state, text=text)
+    
+    def get_credentials(self):
+        """
+        Get the current credential values.
+        
+        Returns:
+            dict: Dictionary containing all credential fields
+        """
+        return {
+            'access_key': self.access_key_var.get(),
+            'secret_key': self.secret_key_var.get(),
+            'region': self.region_var.get(),
+            'bucket_name': self.bucket_var.get(),
+            'resource_prefix': self.resource_var.get(),
+            'inventory_manifest': self.inventory_var.get(),
+            'inventory_top_up': self.inventory_top_up_var.get(),
+            'endpoint_url': self.endpoint_var.get(),
+            'addressing_style': self.addressing_style_var.get(),
+            'accelerate': self.accelerate_var.get(),
+            'dualstack': self.dualstack_var.get()
+        }
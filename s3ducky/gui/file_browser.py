@@ -1,263 +1,862 @@
-# MIT License
-# 
-# Copyright (c) 2025 S3Ducky
-
-"""
-File browser page for S3Ducky.
-"""
-
-import tkinter as tk
-from tkinter import ttk, messagebox, filedialog
-import os
-from ..utils.formatters import format_file_size
-from .footer import Footer
-
-
-class FileBrowser:
-    """
-    Page for browsing and managing S3 bucket files.
-    """
-    
-    def __init__(self, parent_frame, bucket_name, files_list, 
-                 back_callback=None, refresh_callback=None, download_callback=None):
-        self.parent_frame = parent_frame
-        self.bucket_name = bucket_name
-        self.files_list = files_list or []
-        self.back_callback = back_callback
-        self.refresh_callback = refresh_callback
-        self.download_callback = download_callback
-        
-        # UI components
-        self.tree = None
-        self.download_status = None
-        self.info_label = None
-        
-        # Selection tracking
-        self.selected_files = set()
-        
-        self._create_widgets()
-        
-    def _create_widgets(self):
-        """Create and layout all widgets for the file browser page."""
-        # Title and info
-        title_label = ttk.Label(self.parent_frame, text=f"S3 Bucket: {self.bucket_name}", 
-                               font=("Arial", 14, "bold"))
-        title_label.pack(pady=(0, 10))
-        
-        self.info_label = ttk.Label(self.parent_frame, text=f"Found {len(self.files_list)} files")
-        self.info_label.pack(pady=(0, 10))
-        
-        # Navigation buttons frame
-        nav_frame = ttk.Frame(self.parent_frame)
-        nav_frame.pack(fill=tk.X, pady=(0, 10))
-        
-        # Back button
-        if self.back_callback:
-            back_button = ttk.Button(nav_frame, text="← Back to Credentials", 
-                                    command=self.back_callback)
-            back_button.pack(side=tk.LEFT)
-        
-        # Refresh button
-        if self.refresh_callback:
-            refresh_button = ttk.Button(nav_frame, text="🔄 Refresh Files", 
-                                       command=self._on_refresh)
-            refresh_button.pack(side=tk.LEFT, padx=(10, 0))
-        
-        # Files frame with scrollbar
-        files_frame = ttk.Frame(self.parent_frame)
-        files_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 10))
-        
-        self._create_file_tree(files_frame)
-        
-        # Download buttons frame
-        button_frame = ttk.Frame(self.parent_frame)
-        button_frame.pack(fill=tk.X, pady=10)
-        
-        # Select All / Deselect All buttons
-        select_frame = ttk.Frame(button_frame)
-        select_frame.pack(side=tk.LEFT)
-        
-        ttk.Button(select_frame, text="Select All", command=self.select_all_files).pack(side=tk.LEFT, padx=(0, 5))
-        ttk.Button(select_frame, text="Deselect All", command=self.deselect_all_files).pack(side=tk.LEFT)
-        
-        # Download buttons
-        download_frame = ttk.Frame(button_frame)
-        download_frame.pack(side=tk.RIGHT)
-        
-        ttk.Button(download_frame, text="Download Selected", 
-                  command=self._download_selected).pack(side=tk.LEFT, padx=(0, 5))
-        ttk.Button(download_frame, text="Download as Zip", 
-                  command=self._download_as_zip).pack(side=tk.LEFT)
-        
-        # Status label
-        self.download_status = ttk.Label(self.parent_frame, text="Select files to download")
-        self.download_status.pack(pady=5)
-        
-        # Create footer
-        Footer(self.parent_frame)
-        
-    def _create_file_tree(self, parent):
-        """Create the file tree view."""
-        # Create Treeview for file list
-        columns = ('Sl.No.', 'Select', 'File Name', 'Size', 'Last Modified')
-        self.tree = ttk.Treeview(parent, columns=columns, show='headings', height=15)
-        
-        # Define headings
-        self.tree.heading('Sl.No.', text='Sl.No.')
-        self.tree.heading('Select', text='Select')
-        self.tree.heading('File Name', text='File Name')
-        self.tree.heading('Size', text='Size')
-        self.tree.heading('Last Modified', text='Last Modified')
-        
-        # Configure column widths
-        self.tree.column('Sl.No.', width=60, anchor='center')
-        self.tree.column('Select', width=60, anchor='center')
-        self.tree.column('File Name', width=400, anchor='w')
-        self.tree.column('Size', width=100, anchor='e')
-        self.tree.column('Last Modified', width=150, anchor='center')
-        
-        # Scrollbars
-        v_scrollbar = ttk.Scrollbar(parent, orient=tk.VERTICAL, command=self.tree.yview)
-        h_scrollbar = ttk.Scrollbar(parent, orient=tk.HORIZONTAL, command=self.tree.xview)
-        self.tree.configure(yscrollcommand=v_scrollbar.set, xscrollcommand=h_scrollbar.set)
-        
-        # Pack treeview and scrollbars
-        self.tree.grid(row=0, column=0, sticky='nsew')
-        v_scrollbar.grid(row=0, column=1, sticky='ns')
-        h_scrollbar.grid(row=1, column=0, sticky='ew')
-        
-        parent.grid_rowconfigure(0, weight=1)
-        parent.grid_columnconfigure(0, weight=1)
-        
-        # Populate the tree with files
-        self._populate_tree()
-        
-        # Bind click event for selection
-        self.tree.bind('<Button-1>', self._on_tree_click)
-        
-    def _populate_tree(self):
-        """Populate the tree with file data."""
-        # Clear existing items
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        
-        self.selected_files.clear()
-        
-        for index, file_info in enumerate(self.files_list, 1):
-            size_str = format_file_size(file_info['size'])
-            modified_str = file_info['modified'].strftime('%Y-%m-%d %H:%M')
-            
-            item_id = self.tree.insert('', 'end', values=(
-                index, '☐', file_info['key'], size_str, modified_str))
-    
-    def _on_tree_click(self, event):
-        """Handle tree item click for selection."""
-        item = self.tree.identify('item', event.x, event.y)
-        if item:
-            column = self.tree.identify('column', event.x, event.y)
-            if column == '#2':  # Select column (second column)
-                if item in self.selected_files:
-                    self.selected_files.remove(item)
-                    self.tree.set(item, 'Select', '☐')
-                else:
-                    self.selected_files.add(item)
-                    self.tree.set(item, 'Select', '☑')
-                    
-                self._update_selection_status()
-    
-    def _on_refresh(self):
-        """Handle refresh button click."""
-        if self.refresh_callback:
-            self.refresh_callback()
-    
-    def select_all_files(self):
-        """Select all files."""
-        self.selected_files.clear()
-        for child in self.tree.get_children():
-            self.selected_files.add(child)
-            self.tree.set(child, 'Select', '☑')
-        self._update_selection_status()
-        
-    def deselect_all_files(self):
-        """Deselect all files."""
-        self.selected_files.clear()
-        for child in self.tree.get_children():
-            self.tree.set(child, 'Select', '☐')
-        self._update_selection_status()
-        
-    def _update_selection_status(self):
-        """Update the selection status label."""
-        count = len(self.selected_files)
-        if count == 0:
-            self.download_status.config(text="Select files to download")
-        elif count == 1:
-            self.download_status.config(text="1 file selected")
-        else:
-            self.download_status.config(text=f"{count} files selected")
-    
-    def _get_selected_file_keys(self):
-        """Get the S3 keys of selected files."""
-        selected_keys = []
-        for item in self.selected_files:
-            file_name = self.tree.set(item, 'File Name')
-            selected_keys.append(file_name)
-        return selected_keys
-    
-    def _download_selected(self):
-        """Handle download selected files."""
-        if not self.selected_files:
-            messagebox.showwarning("Warning", "Please select at least one file to download")
-            return
-            
-        # Choose destination folder
-        dest_folder = filedialog.askdirectory(title="Choose Download Destination")
-        if not dest_folder:
-            return
-            
-        selected_keys = self._get_selected_file_keys()
-        
-        if self.download_callback:
-            self.download_callback(selected_keys, dest_folder, as_zip=False)
-    
-    def _download_as_zip(self):
-        """Handle download as zip."""
-        if not self.selected_files:
-            messagebox.showwarning("Warning", "Please select at least one file to download")
-            return
-            
-        # Choose destination for zip file
-        zip_file_path = filedialog.asksaveasfilename(
-            title="Save Zip File As",
-            defaultextension=".zip",
-            filetypes=[("Zip files", "*.zip"), ("All files", "*.*")]
-        )
-        if not zip_file_path:
-            return
-            
-        selected_keys = self._get_selected_file_keys()
-        
-        if self.download_callback:
-            self.download_callback(selected_keys, zip_file_path, as_zip=True)
-    
-    def update_files_list(self, files_list):
-        """
-        Update the files list and refresh the display.
-        
-        Args:
-            files_list (list): New list of files
-        """
-        self.files_list = files_list or []
-        if self.info_label:
-            self.info_label.config(text=f"Found {len(self.files_list)} files")
-        self._populate_tree()
-    
-    def set_status(self, message, color="blue"):
-        """
-        Update the status label.
-        
-        Args:
-            message (str): Status message to display
-            color (str): Text color for the message
-        """
-        if self.download_status:
-            self.download_status.config(text=message, foreground=color)
+# MIT License
+# 
+# Copyright (c) 2025 S3Ducky
+
+"""
+File browser page for S3Ducky.
+"""
+
+import tkinter as tk
+from tkinter import ttk, messagebox, filedialog, simpledialog
+import os
+import functools
+from ..core.listing_store import ListingStore
+from ..core.object_metadata import storage_label, describe_metadata
+from ..core.selection import Selection
+from ..utils.formatters import format_file_size
+from ..utils.image_utils import load_png_image, PIL_AVAILABLE
+from ..utils.profiling import profiled, PHASE_RENDER
+from .footer import Footer
+from .row_window import RowWindow
+
+
+class FileBrowser:
+    """
+    Page for browsing and managing S3 bucket files.
+    """
+    
+    def __init__(self, parent_frame, bucket_name, files_list, 
+                 back_callback=None, refresh_callback=None, download_callback=None,
+                 thumbnail_generator=None, cache_enabled=False, cache_toggle_callback=None,
+                 tab_titles=None, active_tab_index=0, tab_switch_callback=None,
+                 tab_close_callback=None, selection=None, loading=False, rollup_callback=None,
+                 upload_callback=None, upload_prefix='', bandwidth_callback=None, query_callback=None,
+                 ui_pump=None, auto_refresh_enabled=False, auto_refresh_callback=None,
+                 export_callback=None, prefetcher=None, metadata_fetcher=None, prefix_download_callback=None,
+                 copy_callback=None, delete_callback=None):
+        self.parent_frame = parent_frame
+        self.bucket_name = bucket_name
+        self.files_list = files_list if files_list is not None else ListingStore()
+        self.back_callback = back_callback
+        self.refresh_callback = refresh_callback
+        self.download_callback = download_callback
+        self.thumbnail_generator = thumbnail_generator
+        self.cache_toggle_callback = cache_toggle_callback
+        self.cache_enabled_var = tk.BooleanVar(value=cache_enabled)
+        self.tab_titles = tab_titles or []
+        self.active_tab_var = tk.IntVar(value=active_tab_index)
+        self.tab_switch_callback = tab_switch_callback
+        self.tab_close_callback = tab_close_callback
+        self.loading = loading
+        self.rollup_callback = rollup_callback
+        self.upload_callback = upload_callback
+        self.upload_prefix = upload_prefix
+        self.bandwidth_callback = bandwidth_callback
+        self.query_callback = query_callback
+        self.ui_pump = ui_pump
+        self.auto_refresh_callback = auto_refresh_callback
+        self.auto_refresh_var = tk.BooleanVar(value=auto_refresh_enabled)
+        self.export_callback = export_callback
+        self.prefetcher = prefetcher
+        self.metadata_fetcher = metadata_fetcher
+        self.prefix_download_callback = prefix_download_callback
+        self.copy_callback = copy_callback
+        self.delete_callback = delete_callback
+        
+        # UI components
+        self.tree = None
+        self.v_scrollbar = None
+        self.download_status = None
+        self.info_label = None
+        
+        # Selection tracking, by key (rows are reused as the view scrolls)
+        self.selection = Selection()
+        
+        # Virtual list: the tree holds one screenful of rows, filled from files_list
+        self.window = RowWindow(rows=15)
+        self.item_by_key = {}
+        self.highlighted_keys = set()
+        self._top_key = None
+        
+        # Thumbnail state
+        self.thumbnail_images = {}
+        self.show_thumbnails_var = tk.BooleanVar(value=False)
+        self._thumbnail_update_job = None
+        self._last_view_start = 0
+        
+        # Object details (HEAD) state: (storage label, content type) per key
+        self.details = {}
+        self._details_update_job = None
+        
+        self._create_widgets()
+        if selection is not None:
+            self._restore_selection(selection)
+        
+    def _create_widgets(self):
+        """Create and layout all widgets for the file browser page."""
+        # Workspace tabs
+        if self.tab_titles:
+            self._create_tab_bar()
+        
+        # Title and info
+        title_label = ttk.Label(self.parent_frame, text=f"S3 Bucket: {self.bucket_name}", 
+                               font=("Arial", 14, "bold"))
+        title_label.pack(pady=(0, 10))
+        
+        self.info_label = ttk.Label(self.parent_frame, text=self._get_info_text())
+        self.info_label.pack(pady=(0, 10))
+        
+        # Navigation buttons frame
+        nav_frame = ttk.Frame(self.parent_frame)
+        nav_frame.pack(fill=tk.X, pady=(0, 10))
+        
+        # Back button
+        if self.back_callback:
+            back_button = ttk.Button(nav_frame, text="← Back to Credentials", 
+                                    command=self.back_callback)
+            back_button.pack(side=tk.LEFT)
+        
+        # Refresh button
+        if self.refresh_callback:
+            refresh_button = ttk.Button(nav_frame, text="🔄 Refresh Files", 
+                                       command=self._on_refresh)
+            refresh_button.pack(side=tk.LEFT, padx=(10, 0))
+        
+        # Folder size rollup
+        if self.rollup_callback:
+            ttk.Button(nav_frame, text="📊 Folder Sizes", 
+                      command=self.rollup_callback).pack(side=tk.LEFT, padx=(10, 0))
+        
+        # Listing export
+        if self.export_callback:
+            ttk.Button(nav_frame, text="Export Listing...", 
+                      command=self._export_listing).pack(side=tk.LEFT, padx=(10, 0))
+        
+        # Bandwidth limits
+        if self.bandwidth_callback:
+            ttk.Button(nav_frame, text="⇅ Bandwidth...", 
+                      command=self.bandwidth_callback).pack(side=tk.LEFT, padx=(10, 0))
+        
+        # Background polling for new and changed objects
+        if self.auto_refresh_callback:
+            ttk.Checkbutton(nav_frame, text="Auto Refresh", variable=self.auto_refresh_var,
+                            command=self._on_auto_refresh_toggle).pack(side=tk.RIGHT, padx=(10, 0))
+        
+        # Thumbnails toggle (needs PIL to decode images)
+        if self.thumbnail_generator and PIL_AVAILABLE:
+            ttk.Checkbutton(nav_frame, text="Show Thumbnails", variable=self.show_thumbnails_var,
+                            command=self._toggle_thumbnails).pack(side=tk.RIGHT)
+        
+        # Files frame with scrollbar
+        files_frame = ttk.Frame(self.parent_frame)
+        files_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 10))
+        
+        self._create_file_tree(files_frame)
+        
+        # Download buttons frame
+        button_frame = ttk.Frame(self.parent_frame)
+        button_frame.pack(fill=tk.X, pady=10)
+        
+        # Select All / Deselect All buttons
+        select_frame = ttk.Frame(button_frame)
+        select_frame.pack(side=tk.LEFT)
+        
+        ttk.Button(select_frame, text="Select All", command=self.select_all_files).pack(side=tk.LEFT, padx=(0, 5))
+        ttk.Button(select_frame, text="Deselect All", command=self.deselect_all_files).pack(side=tk.LEFT)
+        
+        # Local object cache toggle
+        if self.cache_toggle_callback:
+            ttk.Checkbutton(select_frame, text="Use Local Cache", variable=self.cache_enabled_var,
+                            command=self._on_cache_toggle).pack(side=tk.LEFT, padx=(10, 0))
+        
+        # Download buttons
+        download_frame = ttk.Frame(button_frame)
+        download_frame.pack(side=tk.RIGHT)
+        
+        ttk.Button(download_frame, text="Download Selected", 
+                  command=self._download_selected).pack(side=tk.LEFT, padx=(0, 5))
+        ttk.Button(download_frame, text="Download as Zip", 
+                  command=self._download_as_zip).pack(side=tk.LEFT)
+        
+        # Whole prefix, downloaded while it is listed
+        if self.prefix_download_callback:
+            ttk.Button(download_frame, text="Download Folder...", 
+                      command=self._download_prefix).pack(side=tk.LEFT, padx=(5, 0))
+        
+        # Server-side query of one CSV/JSON/Parquet object
+        if self.query_callback:
+            ttk.Button(download_frame, text="🔎 Query...", 
+                      command=self._query_selected).pack(side=tk.LEFT, padx=(5, 0))
+        
+        # Server-side copy and move
+        if self.copy_callback:
+            copy_frame = ttk.Frame(button_frame)
+            copy_frame.pack(side=tk.RIGHT, padx=(0, 15))
+            
+            ttk.Button(copy_frame, text="Copy To...", 
+                      command=lambda: self._copy_selected(move=False)).pack(side=tk.LEFT, padx=(0, 5))
+            ttk.Button(copy_frame, text="Move To...", 
+                      command=lambda: self._copy_selected(move=True)).pack(side=tk.LEFT)
+        
+        # Bulk delete of the selection or a whole prefix
+        if self.delete_callback:
+            delete_frame = ttk.Frame(button_frame)
+            delete_frame.pack(side=tk.RIGHT, padx=(0, 15))
+            
+            ttk.Button(delete_frame, text="Delete...", 
+                      command=self._delete_selected).pack(side=tk.LEFT, padx=(0, 5))
+            ttk.Button(delete_frame, text="Delete Folder...", 
+                      command=self._delete_prefix).pack(side=tk.LEFT)
+        
+        # Upload buttons
+        if self.upload_callback:
+            upload_frame = ttk.Frame(button_frame)
+            upload_frame.pack(side=tk.RIGHT, padx=(0, 15))
+            
+            ttk.Button(upload_frame, text="Upload Files...", 
+                      command=self._upload_files).pack(side=tk.LEFT, padx=(0, 5))
+            ttk.Button(upload_frame, text="Upload Folder...", 
+                      command=self._upload_folder).pack(side=tk.LEFT)
+        
+        # Status label
+        self.download_status = ttk.Label(self.parent_frame, text="Select files to download")
+        self.download_status.pack(pady=5)
+        
+        # Create footer
+        Footer(self.parent_frame)
+        
+    def _create_file_tree(self, parent):
+        """Create the file tree view."""
+        # Create Treeview for file list; it holds one screenful of rows, refilled as the view scrolls
+        columns = ('Sl.No.', 'Select', 'File Name', 'Size', 'Last Modified', 'Storage Class', 'Type')
+        self.tree = ttk.Treeview(parent, columns=columns, show='headings', height=self.window.rows)
+        
+        # Define headings
+        self.tree.heading('Sl.No.', text='Sl.No.')
+        self.tree.heading('Select', text='Select')
+        self.tree.heading('File Name', text='File Name')
+        self.tree.heading('Size', text='Size')
+        self.tree.heading('Last Modified', text='Last Modified')
+        self.tree.heading('Storage Class', text='Storage Class')
+        self.tree.heading('Type', text='Type')
+        
+        # Configure column widths
+        self.tree.column('Sl.No.', width=60, anchor='center')
+        self.tree.column('Select', width=60, anchor='center')
+        self.tree.column('File Name', width=400, anchor='w')
+        self.tree.column('Size', width=100, anchor='e')
+        self.tree.column('Last Modified', width=150, anchor='center')
+        self.tree.column('Storage Class', width=120, anchor='center')
+        self.tree.column('Type', width=120, anchor='w')
+        self.tree.tag_configure('changed', background='#fff3b0')
+        
+        # Scrollbars; the vertical one moves the window over files_list, not the tree
+        self.v_scrollbar = ttk.Scrollbar(parent, orient=tk.VERTICAL, command=self._on_scrollbar)
+        h_scrollbar = ttk.Scrollbar(parent, orient=tk.HORIZONTAL, command=self.tree.xview)
+        self.tree.configure(xscrollcommand=h_scrollbar.set)
+        
+        # Pack treeview and scrollbars
+        self.tree.grid(row=0, column=0, sticky='nsew')
+        self.v_scrollbar.grid(row=0, column=1, sticky='ns')
+        h_scrollbar.grid(row=1, column=0, sticky='ew')
+        
+        parent.grid_rowconfigure(0, weight=1)
+        parent.grid_columnconfigure(0, weight=1)
+        
+        # Populate the tree with files
+        self._populate_tree()
+        
+        # Bind click event for selection
+        self.tree.bind('<Button-1>', self._on_tree_click)
+        self.tree.bind('<Configure>', lambda event: self._fit_rows())
+        for sequence in ('<MouseWheel>', '<Button-4>', '<Button-5>'):
+            self.tree.bind(sequence, self._on_mouse_wheel)
+        
+    @profiled(PHASE_RENDER)
+    def _populate_tree(self):
+        """Show files_list from the top, dropping the row state of the previous listing."""
+        self.selection.clear()
+        self.highlighted_keys.clear()
+        self.thumbnail_images.clear()
+        self.details.clear()
+        self.window.set_total(len(self.files_list))
+        self.window.scroll_to(0)
+        
+        if self.show_thumbnails_var.get():
+            self.thumbnail_generator.cancel_pending()
+        self._render_rows()
+    
+    def _row_values(self, position, file_info):
+        """Column values of the row showing a listing entry."""
+        key = file_info['key']
+        storage, content_type = self.details.get(key) or (storage_label(file_info), '')
+        return (position + 1, '☑' if key in self.selection else '☐', key,
+                format_file_size(file_info['size']), file_info['modified'].strftime('%Y-%m-%d %H:%M'),
+                storage, content_type)
+    
+    def _render_rows(self):
+        """Fill the tree's rows with the entries in the window, reusing the rows it has."""
+        start, end = self.window.start, self.window.end
+        items = list(self.tree.get_children())
+        if len(items) > end - start:
+            self.tree.delete(*items[end - start:])
+            del items[end - start:]
+        items.extend(self.tree.insert('', 'end') for _ in range(end - start - len(items)))
+        
+        self.item_by_key = {}
+        for position, item in zip(range(start, end), items):
+            file_info = self.files_list[position]
+            key = file_info['key']
+            self.tree.item(item, values=self._row_values(position, file_info),
+                           image=self.thumbnail_images.get(key, ''),
+                           tags=('changed',) if key in self.highlighted_keys else ())
+            self.item_by_key[key] = item
+        self._top_key = self.files_list[start]['key'] if end > start else None
+        self.v_scrollbar.set(*self.window.fractions())
+        
+        if self.show_thumbnails_var.get():
+            self._schedule_thumbnail_update()
+        self._schedule_details_update()
+    
+    def _follow_top_row(self):
+        """Keep the row that was on top in view after entries came or went above it."""
+        self.window.set_total(len(self.files_list))
+        # Positions only follow keys once the listing is sorted (inventories sort at the end)
+        if self._top_key is not None and not self.loading:
+            self.window.scroll_to(self.files_list.bisect_key(self._top_key))
+    
+    def _on_scrollbar(self, *args):
+        """Move the window when the scrollbar is dragged or clicked."""
+        if self.window.scroll_command(*args):
+            self._render_rows()
+    
+    def _on_mouse_wheel(self, event):
+        """Move the window three rows per wheel step."""
+        up = event.num == 4 or (event.num != 5 and event.delta > 0)
+        if self.window.scroll_by(-3 if up else 3):
+            self._render_rows()
+        return 'break'
+    
+    def _fit_rows(self):
+        """Show as many rows as fit in the tree's height (after a resize or a row height change)."""
+        items = self.tree.get_children()
+        bbox = self.tree.bbox(items[0]) if items else ''
+        if not bbox:
+            return
+        # The first row's top is the heading height
+        rows = max(1, (self.tree.winfo_height() - bbox[1]) // bbox[3])
+        if rows != self.window.rows:
+            self.window.set_rows(rows)
+            self._render_rows()
+    
+    def _toggle_thumbnails(self):
+        """Show or hide the thumbnail column."""
+        if self.show_thumbnails_var.get():
+            size = self.thumbnail_generator.size
+            ttk.Style(self.tree).configure('Thumbnails.Treeview', rowheight=size + 4)
+            self.tree.configure(show=('tree', 'headings'), style='Thumbnails.Treeview')
+            self.tree.column('#0', width=size + 12, stretch=False)
+            self._schedule_thumbnail_update()
+        else:
+            self.thumbnail_generator.cancel_pending()
+            if self.prefetcher is not None:
+                self.prefetcher.schedule('thumbnails', [])
+            self.tree.configure(show='headings', style='Treeview')
+        # Taller or shorter rows change how many fit
+        self.tree.after_idle(self._fit_rows)
+    
+    def _schedule_thumbnail_update(self):
+        """Request thumbnails shortly after scrolling settles."""
+        if self._thumbnail_update_job:
+            self.tree.after_cancel(self._thumbnail_update_job)
+        self._thumbnail_update_job = self.tree.after(150, self._request_visible_thumbnails)
+    
+    def _get_visible_items(self):
+        """
+        Get the entries on screen and the next screenful below them.
+        
+        Returns:
+            tuple: (visible entries, nearby entries, entries of the two
+                screenfuls after those in the scroll direction)
+        """
+        start, end = self.window.start, self.window.end
+        span = end - start
+        if not span:
+            return [], [], []
+        length = len(self.files_list)
+        if start < self._last_view_start:
+            ahead = range(start - 1, max(0, start - 2 * span) - 1, -1)
+        else:
+            ahead = range(end + span, min(end + 3 * span, length))
+        self._last_view_start = start
+        
+        def entries(positions):
+            return [self.files_list[position] for position in positions]
+        return entries(range(start, end)), entries(range(end, min(end + span, length))), entries(ahead)
+    
+    def _request_visible_thumbnails(self):
+        """Queue thumbnails for visible rows first, then for the rows just below."""
+        self._thumbnail_update_job = None
+        visible, nearby, ahead = self._get_visible_items()
+        
+        # Anything queued for rows that scrolled away is no longer worth fetching
+        self.thumbnail_generator.cancel_pending()
+        for file_infos, is_visible in ((visible, True), (nearby, False)):
+            for file_info in file_infos:
+                if file_info['key'] not in self.thumbnail_images:
+                    self.thumbnail_generator.request(file_info, self._on_thumbnail_ready, visible=is_visible)
+                
+        # Rows further ahead are only warmed with the prefetcher's spare requests
+        if self.prefetcher is not None:
+            jobs = []
+            for file_info in ahead:
+                if self.thumbnail_generator.is_supported(file_info) and not self.thumbnail_generator.get_cached(file_info):
+                    jobs.append((file_info['key'], functools.partial(
+                        self.thumbnail_generator.warm, file_info, self.thumbnail_generator.s3_client)))
+            self.prefetcher.schedule('thumbnails', jobs)
+    
+    def _on_thumbnail_ready(self, key, path):
+        """Called from a worker thread when a thumbnail is available."""
+        if not path:
+            return
+        if self.ui_pump:
+            self.ui_pump.post_latest(('thumbnail', key), self._apply_thumbnail, key, path)
+        else:
+            self.tree.after(0, lambda: self._apply_thumbnail(key, path))
+    
+    def _apply_thumbnail(self, key, path):
+        """Show a generated thumbnail on its row, if the row is still on screen."""
+        item = self.item_by_key.get(key)
+        if not item or not self.tree.exists(item):
+            return
+        size = self.thumbnail_generator.size
+        photo = load_png_image(path, size, size)
+        if photo:
+            # Keep a reference so Tk doesn't drop the image
+            self.thumbnail_images[key] = photo
+            self.tree.item(item, image=photo)
+    
+    def _schedule_details_update(self):
+        """Request object details for the visible rows shortly after scrolling settles."""
+        if self.metadata_fetcher is None:
+            return
+        if self._details_update_job:
+            self.tree.after_cancel(self._details_update_job)
+        self._details_update_job = self.tree.after(200, self._request_visible_details)
+        
+    def _request_visible_details(self):
+        """Queue HEAD requests for the rows on screen that have no details yet."""
+        self._details_update_job = None
+        visible = [self.files_list[position] for position in range(self.window.start, self.window.end)]
+        
+        # Rows that scrolled away are not worth a request any more
+        self.metadata_fetcher.cancel_pending()
+        for file_info in visible:
+            if file_info['key'] not in self.details:
+                self.metadata_fetcher.request(file_info, self._on_details_ready)
+                
+    def _on_details_ready(self, key, head, show_status=False):
+        """Called from a worker thread when an object's HEAD metadata is available."""
+        if head is None:
+            return
+        if self.ui_pump is not None:
+            self.ui_pump.post_latest(('details', key), self._apply_details, key, head, show_status)
+        else:
+            self.tree.after(0, lambda: self._apply_details(key, head, show_status))
+            
+    def _apply_details(self, key, head, show_status=False):
+        """Show an object's storage class, restore status and content type on its row."""
+        file_info = self._find_file_info(key)
+        if file_info is None:
+            return
+        self.details[key] = (storage_label(file_info, head), head.get('content_type') or '')
+        item = self.item_by_key.get(key)
+        if item and self.tree.exists(item):
+            self.tree.set(item, 'Storage Class', self.details[key][0])
+            self.tree.set(item, 'Type', self.details[key][1])
+        if show_status:
+            self.set_status(f"{key}: {describe_metadata(head)}", "blue")
+            
+    def _create_tab_bar(self):
+        """Create the strip of open bucket tabs."""
+        tab_frame = ttk.Frame(self.parent_frame)
+        tab_frame.pack(fill=tk.X, pady=(0, 10))
+        
+        for index, title in enumerate(self.tab_titles):
+            ttk.Radiobutton(tab_frame, text=title, value=index, variable=self.active_tab_var,
+                            style='Toolbutton', command=self._on_tab_selected).pack(side=tk.LEFT)
+            if self.tab_close_callback:
+                ttk.Button(tab_frame, text="✕", width=2,
+                          command=lambda i=index: self.tab_close_callback(i)).pack(side=tk.LEFT, padx=(0, 5))
+        
+        if self.back_callback:
+            ttk.Button(tab_frame, text="+ New Tab", command=self.back_callback).pack(side=tk.LEFT)
+    
+    def _on_tab_selected(self):
+        """Handle a click on a workspace tab."""
+        if self.tab_switch_callback:
+            self.tab_switch_callback(self.active_tab_var.get())
+    
+    def _restore_selection(self, selection):
+        """
+        Re-select files (e.g. when coming back to a tab).
+        
+        Args:
+            selection (Selection): Selection to restore (copied)
+        """
+        self.selection = selection.copy()
+        self._show_selection_marks()
+        if self._selected_count():
+            self._update_selection_status()
+    
+    def _show_selection_marks(self):
+        """Update the Select column of the rows on screen."""
+        for key, item in self.item_by_key.items():
+            self.tree.set(item, 'Select', '☑' if key in self.selection else '☐')
+    
+    def _on_tree_click(self, event):
+        """Handle tree item click for selection."""
+        item = self.tree.identify('item', event.x, event.y)
+        if item:
+            column = self.tree.identify('column', event.x, event.y)
+            if column == '#2':  # Select column (second column)
+                key = self.tree.set(item, 'File Name')
+                if key in self.selection:
+                    self.selection.deselect(key)
+                    self.tree.set(item, 'Select', '☐')
+                else:
+                    self.selection.select(key)
+                    self.tree.set(item, 'Select', '☑')
+                    file_info = self._find_file_info(key)
+                    if self.metadata_fetcher is not None and file_info is not None:
+                        self.metadata_fetcher.request(
+                            file_info, functools.partial(self._on_details_ready, show_status=True),
+                            selected=True)
+                    
+                self._update_selection_status()
+    
+    def _on_cache_toggle(self):
+        """Handle the local cache checkbox."""
+        self.cache_toggle_callback(self.cache_enabled_var.get())
+    
+    def _on_auto_refresh_toggle(self):
+        """Handle the auto-refresh checkbox."""
+        self.auto_refresh_callback(self.auto_refresh_var.get())
+    
+    def _on_refresh(self):
+        """Handle refresh button click."""
+        if self.refresh_callback:
+            self.refresh_callback()
+    
+    def select_all_files(self):
+        """Select all files (without reading the listing until an action needs the keys)."""
+        self.selection.select_all()
+        self._show_selection_marks()
+        self._update_selection_status()
+        
+    def deselect_all_files(self):
+        """Deselect all files."""
+        self.selection.clear()
+        self._show_selection_marks()
+        self._update_selection_status()
+        
+    def _update_selection_status(self):
+        """Update the selection status label."""
+        count = self._selected_count()
+        if count == 0:
+            self.download_status.config(text="Select files to download")
+        elif count == 1:
+            self.download_status.config(text="1 file selected")
+        else:
+            self.download_status.config(text=f"{count} files selected")
+    
+    def get_selected_file_keys(self):
+        """Get the S3 keys of selected files, in key order."""
+        return self.selection.resolve(self.files_list)
+    
+    def _selected_count(self):
+        """Count the selected files."""
+        return self.selection.count(len(self.files_list))
+    
+    def _initial_folder(self):
+        """Folder of the first selected file, else the tab's prefix (to offer in prefix dialogs)."""
+        key = self.selection.first(self.files_list)
+        return (key if key is not None else self.upload_prefix).rpartition('/')[0]
+    
+    def _download_selected(self):
+        """Handle download selected files."""
+        if not self._selected_count():
+            messagebox.showwarning("Warning", "Please select at least one file to download")
+            return
+            
+        # Choose destination folder
+        dest_folder = filedialog.askdirectory(title="Choose Download Destination")
+        if not dest_folder:
+            return
+            
+        selected_keys = self.get_selected_file_keys()
+        
+        if self.download_callback:
+            self.download_callback(selected_keys, dest_folder, as_zip=False)
+    
+    def _download_as_zip(self):
+        """Handle download as zip."""
+        if not self._selected_count():
+            messagebox.showwarning("Warning", "Please select at least one file to download")
+            return
+            
+        # Choose destination for zip file
+        zip_file_path = filedialog.asksaveasfilename(
+            title="Save Zip File As",
+            defaultextension=".zip",
+            filetypes=[("Zip files", "*.zip"), ("All files", "*.*")]
+        )
+        if not zip_file_path:
+            return
+            
+        selected_keys = self.get_selected_file_keys()
+        
+        if self.download_callback:
+            self.download_callback(selected_keys, zip_file_path, as_zip=True)
+    
+    def _download_prefix(self):
+        """Handle download of everything below a prefix, keeping the folder structure."""
+        initial = self._initial_folder()
+        prefix = simpledialog.askstring("Download Folder", "Download everything under prefix (blank for all):",
+                                        initialvalue=initial, parent=self.parent_frame)
+        if prefix is None:
+            return
+            
+        dest_folder = filedialog.askdirectory(title="Choose Download Destination")
+        if dest_folder:
+            self.prefix_download_callback(prefix.strip(), dest_folder)
+    
+    def _copy_selected(self, move=False):
+        """Handle copying or moving the selected files to another prefix or bucket."""
+        if not self._selected_count():
+            messagebox.showwarning("Warning", f"Please select at least one file to {'move' if move else 'copy'}")
+            return
+            
+        selected_keys = self.get_selected_file_keys()
+        verb = "Move" if move else "Copy"
+        folder = os.path.commonprefix(selected_keys)
+        destination = simpledialog.askstring(
+            verb, f"{verb} {len(selected_keys)} files to (bucket/prefix; folders below the "
+                  f"common folder are kept):",
+            initialvalue=f"{self.bucket_name}/{folder[:folder.rfind('/') + 1]}", parent=self.parent_frame)
+        if not destination or not destination.strip():
+            return
+        if move and not messagebox.askyesno(
+                "Move", f"Move {len(selected_keys)} files to {destination.strip()}?\n\n"
+                        f"Each source is deleted once its copy exists."):
+            return
+        self.copy_callback(selected_keys, destination.strip(), move)
+    
+    def _delete_selected(self):
+        """Handle deleting the selected files (confirmed once the dry run has counted them)."""
+        if not self._selected_count():
+            messagebox.showwarning("Warning", "Please select at least one file to delete")
+            return
+        self.delete_callback(self.get_selected_file_keys(), None)
+    
+    def _delete_prefix(self):
+        """Handle deleting everything below a prefix (confirmed once the dry run has counted it)."""
+        initial = self._initial_folder()
+        prefix = simpledialog.askstring("Delete Folder", "Delete everything under prefix (blank for all):",
+                                        initialvalue=initial, parent=self.parent_frame)
+        if prefix is None:
+            return
+        self.delete_callback(None, prefix.strip())
+    
+    def _query_selected(self):
+        """Handle querying the selected file with S3 Select."""
+        if self._selected_count() != 1:
+            messagebox.showwarning("Warning", "Please select exactly one file to query")
+            return
+        self.query_callback(self.get_selected_file_keys()[0])
+    
+    def _export_listing(self):
+        """Handle export of the whole listing to a file."""
+        path = filedialog.asksaveasfilename(
+            title="Export Listing As",
+            defaultextension=".csv",
+            filetypes=[("CSV files", "*.csv"), ("JSON Lines", "*.jsonl"),
+                       ("Parquet files", "*.parquet")]
+        )
+        if path:
+            self.export_callback(path)
+    
+    def _ask_upload_prefix(self):
+        """Ask for the key prefix to upload under; None if cancelled."""
+        return simpledialog.askstring("Upload", "Upload under prefix (blank for bucket root):",
+                                      initialvalue=self.upload_prefix, parent=self.parent_frame)
+    
+    def _upload_files(self):
+        """Handle upload of individual files."""
+        paths = filedialog.askopenfilenames(title="Choose Files to Upload")
+        if not paths:
+            return
+        prefix = self._ask_upload_prefix()
+        if prefix is not None:
+            self.upload_callback(list(paths), prefix.strip())
+    
+    def _upload_folder(self):
+        """Handle upload of a whole folder."""
+        folder = filedialog.askdirectory(title="Choose Folder to Upload")
+        if not folder:
+            return
+        prefix = self._ask_upload_prefix()
+        if prefix is not None:
+            self.upload_callback([folder], prefix.strip())
+    
+    def _get_info_text(self):
+        """Text for the file count label."""
+        text = f"Found {len(self.files_list)} files"
+        if self.loading:
+            text += " (loading more...)"
+        return text
+    
+    def set_loading(self, loading):
+        """
+        Show or clear the "loading more" hint while the listing is still paging in.
+        
+        Args:
+            loading (bool): Whether more pages are still on their way
+        """
+        self.loading = loading
+        if self.info_label:
+            self.info_label.config(text=self._get_info_text())
+    
+    @profiled(PHASE_RENDER)
+    def show_appended_files(self):
+        """
+        Show entries the listing thread added to files_list since the last update.
+        
+        Only the scrollbar and the rows on screen change, however large the page.
+        """
+        self.window.set_total(len(self.files_list))
+        self._render_rows()
+        if self.info_label:
+            self.info_label.config(text=self._get_info_text())
+    
+    def _find_file_info(self, key):
+        """
+        Look up the listing entry of a key in the sorted files_list.
+        
+        Returns:
+            dict or None: Listing entry, or None if the key is not listed
+        """
+        index = self.files_list.bisect_key(key)
+        if index < len(self.files_list) and self.files_list[index]['key'] == key:
+            return self.files_list[index]
+        return None
+    
+    def _forget_rows(self, keys, deselect=False):
+        """Drop the thumbnails and details of keys (and optionally their selection)."""
+        for key in keys:
+            self.thumbnail_images.pop(key, None)
+            self.details.pop(key, None)
+            if deselect:
+                self.selection.forget((key,))
+                self.highlighted_keys.discard(key)
+    
+    @profiled(PHASE_RENDER)
+    def show_upserted_files(self, inserted, updated):
+        """
+        Show entries merged into files_list, keeping the top row in view.
+        
+        Args:
+            inserted (list): Ascending indexes of new entries in files_list
+            updated (list): Keys of existing entries that were replaced
+        """
+        self._forget_rows(updated)
+        self._follow_top_row()
+        self._render_rows()
+        if self.info_label:
+            self.info_label.config(text=self._get_info_text())
+    
+    @profiled(PHASE_RENDER)
+    def show_removed_files(self, keys):
+        """
+        Stop showing objects dropped from files_list, keeping the top row in view.
+        
+        Args:
+            keys (iterable): S3 keys of deleted or moved objects
+        """
+        self._forget_rows(keys, deselect=True)
+        self._follow_top_row()
+        self._render_rows()
+        if self.info_label:
+            self.info_label.config(text=self._get_info_text())
+        self._update_selection_status()
+    
+    @profiled(PHASE_RENDER)
+    def apply_listing_diff(self, files_list, diff):
+        """
+        Switch to a refreshed listing, keeping selection and scroll position.
+        
+        Selected objects that were deleted drop out of the selection.
+        
+        Args:
+            files_list (ListingStore): New listing entries, sorted by key
+            diff (ListingDiff): Changes from the listing currently shown
+        """
+        if diff.is_empty():
+            self.files_list = files_list
+            return
+        
+        self._forget_rows((self.files_list[index]['key'] for index in diff.deleted), deselect=True)
+        self._forget_rows(files_list[index]['key'] for index in diff.updated)
+        self.files_list = files_list
+        self._follow_top_row()
+        self._render_rows()
+        
+        if self.info_label:
+            self.info_label.config(text=self._get_info_text())
+        self._update_selection_status()
+    
+    def highlight_rows(self, keys, duration_ms=4000):
+        """
+        Briefly highlight the rows of new or changed objects.
+        
+        Args:
+            keys (iterable): S3 keys of the rows to highlight
+            duration_ms (int): How long the highlight stays
+        """
+        keys = set(keys)
+        if not keys:
+            return
+        self.highlighted_keys |= keys
+        for key in keys & self.item_by_key.keys():
+            self.tree.item(self.item_by_key[key], tags=('changed',))
+        
+        def clear():
+            if not self.tree.winfo_exists():
+                return
+            self.highlighted_keys -= keys
+            for key in keys & self.item_by_key.keys():
+                self.tree.item(self.item_by_key[key], tags=())
+        self.tree.after(duration_ms, clear)
+    
+    def update_files_list(self, files_list):
+        """
+        Update the files list and refresh the display.
+        
+        Args:
+            files_list (ListingStore): New list of files
+        """
+        self.files_list = files_list if files_list is not None else ListingStore()
+        if self.info_label:
+            self.info_label.config(text=self._get_info_text())
+        self._populate_tree()
+    
+    def set_status(self, message, color="blue"):
+        """
+        Update the status label.
+        
+        Args:
+            message (str): Status message to display
+            color (str): Text color for the message
+        """
+        if self.download_status:
+            self.download_status.config(text=message, foreground=color)
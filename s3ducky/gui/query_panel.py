@@ -0,0 +1,159 @@
+# MIT License
+# 
+# Copyright (c) 2025 S3Ducky
+
+"""
+S3 Select query window for S3Ducky.
+"""
+
+import tkinter as tk
+from tkinter import ttk, filedialog
+
+
+class QueryPanel:
+    """
+    Window for running a SQL query against one object and viewing the rows.
+    """
+    
+    def __init__(self, parent, key, expression, run_callback=None, save_callback=None,
+                 stop_callback=None, close_callback=None):
+        """
+        Args:
+            parent: Parent window
+            key (str): S3 key of the object to query
+            expression (str): Initial SQL expression
+            run_callback (callable, optional): Called with the expression to preview
+            save_callback (callable, optional): Called with (expression, output path)
+            stop_callback (callable, optional): Called to abandon the running query
+            close_callback (callable, optional): Called after the window closes
+        """
+        self.key = key
+        self.run_callback = run_callback
+        self.save_callback = save_callback
+        self.stop_callback = stop_callback
+        self.close_callback = close_callback
+        self.columns = []
+        
+        self.window = tk.Toplevel(parent)
+        self.window.title(f"Query: {key}")
+        self.window.geometry("800x550")
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+        
+        self.expression_text = None
+        self.run_button = None
+        self.save_button = None
+        self.stop_button = None
+        self.status_label = None
+        self.tree = None
+        
+        self._create_widgets(expression)
+        
+    def _create_widgets(self, expression):
+        """Create the SQL editor, buttons and result table."""
+        ttk.Label(self.window, text="SQL (the object is s3object):").pack(anchor=tk.W, padx=10, pady=(10, 0))
+        self.expression_text = tk.Text(self.window, height=4, font=("Courier", 10))
+        self.expression_text.insert('1.0', expression)
+        self.expression_text.pack(fill=tk.X, padx=10, pady=5)
+        
+        button_frame = ttk.Frame(self.window)
+        button_frame.pack(fill=tk.X, padx=10)
+        self.run_button = ttk.Button(button_frame, text="▶ Run", command=self._run)
+        self.run_button.pack(side=tk.LEFT)
+        self.save_button = ttk.Button(button_frame, text="Save Result...", command=self._save)
+        self.save_button.pack(side=tk.LEFT, padx=(5, 0))
+        self.stop_button = ttk.Button(button_frame, text="Stop", command=self._stop, state=tk.DISABLED)
+        self.stop_button.pack(side=tk.LEFT, padx=(5, 0))
+        
+        self.status_label = ttk.Label(button_frame, text="")
+        self.status_label.pack(side=tk.LEFT, padx=(15, 0))
+        
+        table_frame = ttk.Frame(self.window)
+        table_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        
+        self.tree = ttk.Treeview(table_frame, show='headings')
+        v_scrollbar = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=self.tree.yview)
+        h_scrollbar = ttk.Scrollbar(table_frame, orient=tk.HORIZONTAL, command=self.tree.xview)
+        self.tree.configure(yscrollcommand=v_scrollbar.set, xscrollcommand=h_scrollbar.set)
+        self.tree.grid(row=0, column=0, sticky='nsew')
+        v_scrollbar.grid(row=0, column=1, sticky='ns')
+        h_scrollbar.grid(row=1, column=0, sticky='ew')
+        table_frame.grid_rowconfigure(0, weight=1)
+        table_frame.grid_columnconfigure(0, weight=1)
+        
+    def _get_expression(self):
+        return self.expression_text.get('1.0', tk.END).strip()
+        
+    def _set_running(self, running, message):
+        """Enable the buttons that make sense while a query is (not) running."""
+        idle_state = tk.DISABLED if running else tk.NORMAL
+        self.run_button.config(state=idle_state)
+        self.save_button.config(state=idle_state)
+        self.stop_button.config(state=tk.NORMAL if running else tk.DISABLED)
+        self.set_status(message, "orange" if running else "blue")
+        
+    def _run(self):
+        """Clear the table and start a preview query."""
+        expression = self._get_expression()
+        if not expression or not self.run_callback:
+            return
+        self.tree.delete(*self.tree.get_children())
+        self.columns = []
+        self.tree.configure(columns=())
+        self._set_running(True, "Running query...")
+        self.run_callback(expression)
+        
+    def _save(self):
+        """Ask for an output file and run the query into it."""
+        expression = self._get_expression()
+        if not expression or not self.save_callback:
+            return
+        path = filedialog.asksaveasfilename(
+            title="Save Query Result As",
+            defaultextension=".csv",
+            filetypes=[("CSV files", "*.csv"), ("JSON lines", "*.jsonl"), ("All files", "*.*")],
+            parent=self.window
+        )
+        if not path:
+            return
+        self._set_running(True, "Saving query result...")
+        self.save_callback(expression, path)
+        
+    def _stop(self):
+        if self.stop_callback:
+            self.stop_callback()
+            
+    def add_rows(self, rows):
+        """
+        Append result rows, adding columns for keys not seen before.
+        
+        Args:
+            rows (list): Rows as dicts of column name to value
+        """
+        new_columns = [name for row in rows for name in row if name not in self.columns]
+        if new_columns:
+            # Existing rows keep their values; they are stored in column order
+            self.columns.extend(dict.fromkeys(new_columns))
+            self.tree.configure(columns=self.columns)
+            for column in self.columns:
+                self.tree.heading(column, text=column)
+                self.tree.column(column, width=120, stretch=False)
+                
+        for row in rows:
+            self.tree.insert('', 'end', values=[
+                '' if row.get(column) is None else str(row.get(column)) for column in self.columns])
+        self.set_status(f"{len(self.tree.get_children()):,} rows...", "orange")
+        
+    def finish(self, message, color="green"):
+        """Show the outcome of the query and re-enable the buttons."""
+        self._set_running(False, message)
+        self.set_status(message, color)
+        
+    def set_status(self, message, color="blue"):
+        self.status_label.config(text=message, foreground=color)
+        
+    def close(self):
+        """Close the window, abandoning a running query."""
+        self._stop()
+        self.window.destroy()
+        if self.close_callback:
+            self.close_callback()
@@ -0,0 +1,143 @@
+# MIT License
+# 
+# Copyright (c) 2025 S3Ducky
+
+"""
+Folder size rollup window for S3Ducky.
+"""
+
+import tkinter as tk
+from tkinter import ttk
+from ..utils.formatters import format_file_size
+
+
+class RollupView:
+    """
+    Window showing per-prefix totals as an expandable, sortable folder tree.
+    """
+    
+    COLUMNS = ('Size', 'Objects', 'Newest', 'Oldest')
+    SORT_FIELDS = {'#0': 'prefix', 'Size': 'bytes', 'Objects': 'count',
+                   'Newest': 'newest', 'Oldest': 'oldest'}
+                   
+    def __init__(self, parent, rollup, title="Folder Sizes", close_callback=None):
+        self.rollup = rollup
+        self.close_callback = close_callback
+        
+        # Largest folders first by default
+        self.sort_field = 'bytes'
+        self.sort_reverse = True
+        
+        self.window = tk.Toplevel(parent)
+        self.window.title(title)
+        self.window.geometry("700x500")
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+        
+        self.summary_label = None
+        self.tree = None
+        self._refresh_job = None
+        
+        self._create_widgets()
+        self.refresh()
+        
+    def _create_widgets(self):
+        """Create the summary label and the folder tree."""
+        self.summary_label = ttk.Label(self.window, text="")
+        self.summary_label.pack(pady=(10, 5))
+        
+        tree_frame = ttk.Frame(self.window)
+        tree_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
+        
+        self.tree = ttk.Treeview(tree_frame, columns=self.COLUMNS, show=('tree', 'headings'))
+        self.tree.heading('#0', text='Folder', command=lambda: self._sort_by('#0'))
+        self.tree.column('#0', width=300, anchor='w')
+        for column in self.COLUMNS:
+            self.tree.heading(column, text=column, command=lambda c=column: self._sort_by(c))
+            self.tree.column(column, width=100, anchor='e' if column in ('Size', 'Objects') else 'center')
+            
+        v_scrollbar = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=v_scrollbar.set)
+        self.tree.grid(row=0, column=0, sticky='nsew')
+        v_scrollbar.grid(row=0, column=1, sticky='ns')
+        tree_frame.grid_rowconfigure(0, weight=1)
+        tree_frame.grid_columnconfigure(0, weight=1)
+        
+        # Children are only inserted when a folder is expanded
+        self.tree.bind('<<TreeviewOpen>>', self._on_open)
+        
+    def _sort_by(self, column):
+        """Sort every folder level by a column; clicking again reverses the order."""
+        field = self.SORT_FIELDS[column]
+        if field == self.sort_field:
+            self.sort_reverse = not self.sort_reverse
+        else:
+            self.sort_field = field
+            self.sort_reverse = field != 'prefix'
+        self.refresh()
+        
+    def _sorted_rows(self, prefix):
+        """Get the child folder rows of a prefix in the current sort order."""
+        rows = self.rollup.child_rows(prefix)
+        field = self.sort_field
+        return sorted(rows, key=lambda row: row[field], reverse=self.sort_reverse)
+        
+    def _insert_children(self, parent_item, prefix):
+        """Insert the child folders of a prefix under a tree item."""
+        for row in self._sorted_rows(prefix):
+            name = row['prefix'][len(prefix):]
+            item = self.tree.insert(parent_item, 'end', iid=row['prefix'], text=name, values=(
+                format_file_size(row['bytes']),
+                f"{row['count']:,}",
+                row['newest'].strftime('%Y-%m-%d %H:%M') if row['newest'] else '',
+                row['oldest'].strftime('%Y-%m-%d %H:%M') if row['oldest'] else ''))
+            if self.rollup.has_children(row['prefix']):
+                # Placeholder so the folder shows an expand arrow
+                self.tree.insert(item, 'end', iid=row['prefix'] + '\0')
+                
+    def _on_open(self, event):
+        """Populate a folder the first time it is expanded."""
+        item = self.tree.focus()
+        placeholder = item + '\0'
+        if self.tree.exists(placeholder):
+            self.tree.delete(placeholder)
+            self._insert_children(item, item)
+            
+    def refresh(self):
+        """Redraw the tree from the rollup, keeping expanded folders open."""
+        self._refresh_job = None
+        open_items = [item for item in self._all_items() if self.tree.item(item, 'open')]
+        yview = self.tree.yview()[0]
+        
+        self.tree.delete(*self.tree.get_children())
+        self._insert_children('', self.rollup.ROOT)
+        for item in sorted(open_items, key=len):
+            if self.tree.exists(item):
+                self.tree.item(item, open=True)
+                placeholder = item + '\0'
+                if self.tree.exists(placeholder):
+                    self.tree.delete(placeholder)
+                    self._insert_children(item, item)
+        self.tree.yview_moveto(yview)
+        
+        total = self.rollup.get()
+        self.summary_label.config(
+            text=f"{total['count']:,} objects, {format_file_size(total['bytes'])} in total")
+            
+    def schedule_refresh(self, delay_ms=500):
+        """Refresh after a short delay, coalescing bursts of listing pages."""
+        if self._refresh_job is None:
+            self._refresh_job = self.window.after(delay_ms, self.refresh)
+            
+    def _all_items(self, parent=''):
+        """Iterate over all inserted tree items."""
+        for item in self.tree.get_children(parent):
+            yield item
+            yield from self._all_items(item)
+            
+    def close(self):
+        """Close the window."""
+        if self._refresh_job:
+            self.window.after_cancel(self._refresh_job)
+        self.window.destroy()
+        if self.close_callback:
+            self.close_callback()
@@ -0,0 +1,85 @@
+# MIT License
+# 
+# Copyright (c) 2025 S3Ducky
+
+"""
+Scroll position of a virtual list for S3Ducky.
+
+The file tree holds only the rows that fit on screen and fills them from
+the listing as the view moves, so a million objects cost a screenful of
+Tk items. RowWindow is the scroll arithmetic behind it, kept apart from
+Tk so it can be tested on its own.
+"""
+
+
+class RowWindow:
+    """
+    The slice [start, end) of a list of `total` rows that is on screen.
+    """
+    
+    def __init__(self, rows=20, total=0):
+        """
+        Args:
+            rows (int): Rows that fit on screen
+            total (int): Rows in the whole list
+        """
+        self.rows = max(1, rows)
+        self.total = total
+        self.start = 0
+        
+    @property
+    def end(self):
+        """Position after the last row on screen."""
+        return min(self.start + self.rows, self.total)
+        
+    def _clamp(self):
+        self.start = max(0, min(self.start, self.total - self.rows))
+        
+    def set_total(self, total):
+        """Follow a list that grew or shrank."""
+        self.total = total
+        self._clamp()
+        
+    def set_rows(self, rows):
+        """Follow a widget that was resized."""
+        self.rows = max(1, rows)
+        self._clamp()
+        
+    def scroll_to(self, start):
+        """
+        Put a row at the top, as far as the list allows.
+        
+        Returns:
+            bool: Whether the window moved
+        """
+        old_start = self.start
+        self.start = start
+        self._clamp()
+        return self.start != old_start
+        
+    def scroll_by(self, rows):
+        """Move by a number of rows (negative to go up); returns whether the window moved."""
+        return self.scroll_to(self.start + rows)
+        
+    def fractions(self):
+        """
+        Get the scrollbar position.
+        
+        Returns:
+            tuple: (first, last) fractions of the list on screen, as Scrollbar.set() takes them
+        """
+        if not self.total:
+            return 0.0, 1.0
+        return self.start / self.total, self.end / self.total
+        
+    def scroll_command(self, action, amount, unit=None):
+        """
+        Apply a Scrollbar command ('moveto', fraction) or ('scroll', n, 'units'/'pages').
+        
+        Returns:
+            bool: Whether the window moved
+        """
+        if action == 'moveto':
+            return self.scroll_to(int(round(float(amount) * self.total)))
+        step = max(1, self.rows - 1) if unit == 'pages' else 1
+        return self.scroll_by(int(amount) * step)
@@ -0,0 +1,108 @@
+# MIT License
+# 
+# Copyright (c) 2025 S3Ducky
+
+"""
+Coalescing update queue between worker threads and the Tk main loop.
+
+Worker threads never call into Tk. They post events to a thread-safe queue
+that one periodic after() callback drains on the Tk thread, so a busy
+transfer costs a handful of Tcl calls per interval however many
+notifications it produces. Redundant events are merged on the way:
+status updates keep only the latest value per key, and batches (listing
+pages, uploaded objects, query rows) are concatenated into one call.
+"""
+
+import threading
+
+
+class UIPump:
+    """
+    Runs callbacks posted from any thread on the Tk thread, in posting order.
+    """
+    
+    def __init__(self, root, interval_ms=50):
+        """
+        Args:
+            root: Tk root window whose main loop runs the callbacks
+            interval_ms (int): How often the queue is drained
+        """
+        self.root = root
+        self.interval_ms = interval_ms
+        self._events = []
+        self._slots = {}
+        self._lock = threading.Lock()
+        self.root.after(self.interval_ms, self._drain)
+        
+    def post(self, callback, *args):
+        """
+        Queue a call that must not be merged with others (e.g. an error dialog).
+        
+        Args:
+            callback (callable): Called with args on the Tk thread
+        """
+        with self._lock:
+            self._events.append([callback, args])
+            
+    def post_dialog(self, callback, *args):
+        """
+        Queue a call that opens a modal dialog.
+        
+        A modal dialog runs its own event loop until it closes, so it is
+        opened from a separate after() callback instead of from the drain:
+        the queue keeps draining (progress, listing pages) while it waits.
+        
+        Args:
+            callback (callable): Called with args on the Tk thread
+        """
+        self.post(self.root.after, 0, callback, *args)
+        
+    def post_latest(self, key, callback, *args):
+        """
+        Queue a call that replaces any call with the same key still queued.
+        
+        The call keeps the queue position of the first one it replaced, so
+        e.g. only the newest progress message of a job is shown per interval.
+        
+        Args:
+            key: Identifies updates that supersede each other
+            callback (callable): Called with args on the Tk thread
+        """
+        with self._lock:
+            event = self._slots.get(key)
+            if event is not None:
+                event[0] = callback
+                event[1] = args
+                return
+            event = self._slots[key] = [callback, args]
+            self._events.append(event)
+            
+    def post_merged(self, key, callback, items):
+        """
+        Queue a batch of items, joined with batches of the same key still queued.
+        
+        Args:
+            key: Identifies batches that can be joined
+            callback (callable): Called once with the list of all queued items
+            items (list): Items of this batch
+        """
+        with self._lock:
+            event = self._slots.get(key)
+            if event is not None:
+                event[1][0].extend(items)
+                return
+            event = self._slots[key] = [callback, (list(items),)]
+            self._events.append(event)
+            
+    def _drain(self):
+        """Run everything queued since the last interval."""
+        with self._lock:
+            events, self._events = self._events, []
+            self._slots = {}
+        # Reschedule first, so a callback that raises or waits cannot stop the pump
+        self.root.after(self.interval_ms, self._drain)
+        for callback, args in events:
+            try:
+                callback(*args)
+            except Exception as e:
+                print(f"Debug: UI update failed: {e}")
@@ -1,12 +1,16 @@
-# MIT License
-# 
-# Copyright (c) 2025 S3Ducky
-
-"""
-S3Ducky Utilities
-"""
-
-from .formatters import format_file_size
-from .image_utils import load_png_image, set_app_icon
-
-__all__ = ['format_file_size', 'load_png_image', 'set_app_icon']
+# MIT License
+# 
+# Copyright (c) 2025 S3Ducky
+
+"""
+S3Ducky Utilities
+"""
+
+from .formatters import format_file_size, format_duration
+from .image_utils import load_png_image, set_app_icon, is_image_file, create_thumbnail
+from .settings import load_settings, save_settings, update_settings
+from .profiling import enable_profiling, get_profiler, profile_phase, profiled
+
+__all__ = ['format_file_size', 'format_duration', 'load_png_image', 'set_app_icon', 'is_image_file', 'create_thumbnail',
+           'load_settings', 'save_settings', 'update_settings',
+           'enable_profiling', 'get_profiler', 'profile_phase', 'profiled']
@@ -1,28 +1,48 @@
-# MIT License
-# 
-# Copyright (c) 2025 S3Ducky
-
-"""
-Formatting utilities for S3Ducky.
-"""
-
-
-def format_file_size(size_bytes):
-    """
-    Format file size in human readable format.
-    
-    Args:
-        size_bytes (int): File size in bytes
-        
-    Returns:
-        str: Formatted file size (e.g., "1.5 MB", "256 KB")
-    """
-    if size_bytes == 0:
-        return "0 B"
-    
-    size_names = ["B", "KB", "MB", "GB", "TB"]
-    i = 0
-    while size_bytes >= 1024 and i < len(size_names) - 1:
-        size_bytes /= 1024.0
-        i += 1
-    return f"{size_bytes:.1f} {size_names[i]}"
+# MIT License
+# 
+# Copyright (c) 2025 S3Ducky
+
+"""
+Formatting utilities for S3Ducky.
+"""
+
+
+def format_file_size(size_bytes):
+    """
+    Format file size in human readable format.
+    
+    Args:
+        size_bytes (int): File size in bytes
+        
+    Returns:
+        str: Formatted file size (e.g., "1.5 MB", "256 KB")
+    """
+    if size_bytes == 0:
+        return "0 B"
+    
+    size_names = ["B", "KB", "MB", "GB", "TB"]
+    i = 0
+    while size_bytes >= 1024 and i < len(size_names) - 1:
+        size_bytes /= 1024.0
+        i += 1
+    return f"{size_bytes:.1f} {size_names[i]}"
+
+
+def format_duration(seconds):
+    """
+    Format a duration in human readable format.
+    
+    Args:
+        seconds (float): Duration in seconds
+        
+    Returns:
+        str: Formatted duration (e.g., "45s", "3m 20s", "1h 05m")
+    """
+    seconds = int(round(max(0, seconds)))
+    if seconds < 60:
+        return f"{seconds}s"
+    minutes, seconds = divmod(seconds, 60)
+    if minutes < 60:
+        return f"{minutes}m {seconds:02d}s"
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h {minutes:02d}m"
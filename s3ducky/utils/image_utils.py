@@ -1,91 +1,182 @@
-# MIT License
-# 
-# Copyright (c) 2025 S3Ducky
-
-"""
-Image utilities for S3Ducky.
-"""
-
-import os
-try:
-    from PIL import Image, ImageTk
-    PIL_AVAILABLE = True
-except ImportError:
-    PIL_AVAILABLE = False
-
-
-def load_png_image(image_path, width=48, height=48):
-    """
-    Load a PNG image and resize it.
-    
-    Args:
-        image_path (str): Path to the PNG image file
-        width (int): Target width in pixels
-        height (int): Target height in pixels
-        
-    Returns:
-        ImageTk.PhotoImage or None: Loaded image or None if failed
-    """
-    try:
-        if not PIL_AVAILABLE:
-            print("PIL not available for loading PNG images")
-            return None
-            
-        if os.path.exists(image_path):
-            # Load PNG image
-            pil_image = Image.open(image_path)
-            
-            # Resize to specified dimensions
-            pil_image = pil_image.resize((width, height), Image.Resampling.LANCZOS)
-            
-            # Convert to PhotoImage
-            photo = ImageTk.PhotoImage(pil_image)
-            
-            return photo
-        else:
-            print(f"Image file not found: {image_path}")
-            return None
-            
-    except Exception as e:
-        print(f"Failed to load PNG image: {e}")
-        return None
-
-
-def set_app_icon(root, icon_path):
-    """
-    Set the application icon from a PNG file.
-    
-    Args:
-        root (tk.Tk): The root window
-        icon_path (str): Path to the icon PNG file
-        
-    Returns:
-        ImageTk.PhotoImage or None: Icon photo object (keep reference to prevent GC)
-    """
-    try:
-        if not PIL_AVAILABLE:
-            print("PIL not available, using default icon")
-            return None
-            
-        if os.path.exists(icon_path):
-            # Load PNG image
-            pil_image = Image.open(icon_path)
-            
-            # Resize for icon (tkinter works best with 32x32 or 16x16)
-            pil_image = pil_image.resize((32, 32), Image.Resampling.LANCZOS)
-            
-            # Convert to PhotoImage
-            photo = ImageTk.PhotoImage(pil_image)
-            
-            # Set as window icon
-            root.iconphoto(True, photo)
-            
-            print("Successfully loaded PNG icon")
-            return photo
-        else:
-            print(f"Icon file not found: {icon_path}")
-            return None
-            
-    except Exception as e:
-        print(f"Failed to load icon: {e}")
-        return None
+# MIT License
+# 
+# Copyright (c) 2025 S3Ducky
+
+"""
+Image utilities for S3Ducky.
+"""
+
+import os
+import io
+try:
+    from PIL import Image, ImageTk, ExifTags
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+
+# File extensions that PIL can usually decode into a thumbnail
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.gif', '.bmp', '.webp', '.tif', '.tiff')
+
+
+def is_image_file(file_name):
+    """
+    Check whether a file name looks like an image PIL can decode.
+    
+    Args:
+        file_name (str): File name or S3 key
+        
+    Returns:
+        bool: True if the extension is a known image type
+    """
+    return file_name.lower().endswith(IMAGE_EXTENSIONS)
+
+
+def create_thumbnail(image_data, width=48, height=48):
+    """
+    Create a PNG thumbnail from encoded image bytes.
+    
+    The image is resized with LANCZOS keeping its aspect ratio and centered
+    on a transparent canvas of exactly width x height, so it can be loaded
+    back with load_png_image() without distortion.
+    
+    Args:
+        image_data (bytes): Encoded source image
+        width (int): Thumbnail width in pixels
+        height (int): Thumbnail height in pixels
+        
+    Returns:
+        bytes or None: PNG-encoded thumbnail or None if failed
+    """
+    try:
+        if not PIL_AVAILABLE:
+            return None
+        
+        pil_image = Image.open(io.BytesIO(image_data))
+        # Only decode what the thumbnail needs (fast path for JPEG)
+        pil_image.draft('RGB', (width * 2, height * 2))
+        pil_image = pil_image.convert('RGBA')
+        pil_image.thumbnail((width, height), Image.Resampling.LANCZOS)
+        
+        canvas = Image.new('RGBA', (width, height), (0, 0, 0, 0))
+        offset = ((width - pil_image.width) // 2, (height - pil_image.height) // 2)
+        canvas.paste(pil_image, offset)
+        
+        output = io.BytesIO()
+        canvas.save(output, format='PNG')
+        return output.getvalue()
+        
+    except Exception as e:
+        print(f"Failed to create thumbnail: {e}")
+        return None
+
+
+def extract_exif_thumbnail(image_data, min_size=0):
+    """
+    Get the preview JPEG a camera embedded in an image's EXIF block.
+    
+    EXIF comes before the image data, so the first few kilobytes of the
+    file are enough.
+    
+    Args:
+        image_data (bytes): Start of an encoded image (or all of it)
+        min_size (int): Smallest acceptable width or height of the preview
+        
+    Returns:
+        bytes or None: Encoded preview, or None if there is none big enough
+    """
+    if not PIL_AVAILABLE:
+        return None
+    try:
+        pil_image = Image.open(io.BytesIO(image_data))
+        exif = pil_image.info.get('exif')
+        if not exif:
+            return None
+        ifd1 = pil_image.getexif().get_ifd(ExifTags.IFD.IFD1)
+        offset, length = ifd1.get(0x0201), ifd1.get(0x0202)
+        if not offset or not length:
+            return None
+        # Offsets count from the TIFF header, which follows the "Exif\0\0" marker
+        preview = exif[6 + offset:6 + offset + length]
+        if len(preview) != length or max(Image.open(io.BytesIO(preview)).size) < min_size:
+            return None
+        return preview
+    except Exception:
+        return None
+
+
+def load_png_image(image_path, width=48, height=48):
+    """
+    Load a PNG image and resize it.
+    
+    Args:
+        image_path (str): Path to the PNG image file
+        width (int): Target width in pixels
+        height (int): Target height in pixels
+        
+    Returns:
+        ImageTk.PhotoImage or None: Loaded image or None if failed
+    """
+    try:
+        if not PIL_AVAILABLE:
+            print("PIL not available for loading PNG images")
+            return None
+            
+        if os.path.exists(image_path):
+            # Load PNG image
+            pil_image = Image.open(image_path)
+            
+            # Resize to specified dimensions
+            pil_image = pil_image.resize((width, height), Image.Resampling.LANCZOS)
+            
+            # Convert to PhotoImage
+            photo = ImageTk.PhotoImage(pil_image)
+            
+            return photo
+        else:
+            print(f"Image file not found: {image_path}")
+            return None
+            
+    except Exception as e:
+        print(f"Failed to load PNG image: {e}")
+        return None
+
+
+def set_app_icon(root, icon_path):
+    """
+    Set the application icon from a PNG file.
+    
+    Args:
+        root (tk.Tk): The root window
+        icon_path (str): Path to the icon PNG file
+        
+    Returns:
+        ImageTk.PhotoImage or None: Icon photo object (keep reference to prevent GC)
+    """
+    try:
+        if not PIL_AVAILABLE:
+            print("PIL not available, using default icon")
+            return None
+            
+        if os.path.exists(icon_path):
+            # Load PNG image
+            pil_image = Image.open(icon_path)
+            
+            # Resize for icon (tkinter works best with 32x32 or 16x16)
+            pil_image = pil_image.resize((32, 32), Image.Resampling.LANCZOS)
+            
+            # Convert to PhotoImage
+            photo = ImageTk.PhotoImage(pil_image)
+            
+            # Set as window icon
+            root.iconphoto(True, photo)
+            
+            print("Successfully loaded PNG icon")
+            return photo
+        else:
+            print(f"Icon file not found: {icon_path}")
+            return None
+            
+    except Exception as e:
+        print(f"Failed to load icon: {e}")
+        return None
@@ -0,0 +1,347 @@
+# MIT License
+# 
+# Copyright (c) 2025 S3Ducky
+
+"""
+Built-in profiling mode for S3Ducky.
+
+Set S3DUCKY_PROFILE (or pass --profile) to time the phases users notice:
+listing pages, rendering the file tree, downloading objects and writing
+zip archives. Each phase records wall time and peak RSS; with "cpu" it is
+also run under cProfile and with "memory" tracemalloc snapshots show where
+it allocated. A report per session is written to ~/.s3ducky/profiles/ when
+the process exits.
+
+Profiling is off unless enabled, and then every phase costs one global
+lookup, so the hooks stay in release builds.
+
+    S3DUCKY_PROFILE=1              timers and peak RSS
+    S3DUCKY_PROFILE=cpu,memory     also cProfile and tracemalloc
+    S3DUCKY_PROFILE=all            same as cpu,memory
+"""
+
+import os
+import io
+import sys
+import time
+import atexit
+import pstats
+import cProfile
+import threading
+import functools
+import tracemalloc
+from datetime import datetime
+
+try:
+    import resource
+    RESOURCE_AVAILABLE = True
+except ImportError:
+    RESOURCE_AVAILABLE = False
+
+
+PROFILE_ENV = 'S3DUCKY_PROFILE'
+PROFILES_DIR = os.path.join(os.path.expanduser('~'), '.s3ducky', 'profiles')
+
+# Phases wrapped by the application
+PHASE_LIST = 'list'
+PHASE_RENDER = 'render'
+PHASE_DOWNLOAD = 'download'
+PHASE_ZIP = 'zip'
+
+# Entries per phase in the report
+TOP_FUNCTIONS = 15
+TOP_ALLOCATIONS = 10
+
+
+def _current_rss():
+    """
+    Get the resident set size of the process in bytes.
+    
+    Returns:
+        int or None: Current RSS (peak RSS where only that is known)
+    """
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        pass
+    if RESOURCE_AVAILABLE:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Kilobytes on Linux, bytes on macOS
+        return peak if sys.platform == 'darwin' else peak * 1024
+    return None
+
+
+def _take_snapshot():
+    """Take a tracemalloc snapshot without the profiler's own allocations."""
+    return tracemalloc.take_snapshot().filter_traces([
+        tracemalloc.Filter(False, __file__),
+        tracemalloc.Filter(False, tracemalloc.__file__),
+    ])
+
+
+class _NullPhase:
+    """Context manager used while profiling is disabled."""
+    
+    def __enter__(self):
+        return self
+        
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_PHASE = _NullPhase()
+
+
+class PhaseStats:
+    """
+    Accumulated measurements of one phase.
+    """
+    
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.peak_rss = 0
+        self.cpu_stats = None
+        # Allocation site -> bytes allocated and kept during the phase
+        self.allocations = {}
+        
+    def summary(self):
+        """Get one report line with the timings of the phase."""
+        mean = self.total_time / self.calls if self.calls else 0.0
+        line = (f"{self.name}: {self.calls} calls, {self.total_time:.3f}s total, "
+                f"{mean * 1000:.1f}ms mean, {self.max_time * 1000:.1f}ms max")
+        if self.peak_rss:
+            line += f", peak RSS {self.peak_rss / (1024 * 1024):.1f} MiB"
+        return line
+
+
+class _PhaseRun:
+    """One execution of a phase."""
+    
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.peak_rss = 0
+        self.started = 0.0
+        self.cpu = None
+        self.snapshot = None
+        
+    def __enter__(self):
+        profiler = self.profiler
+        local = profiler.local
+        # Nested phases are timed, but cProfile and tracemalloc only
+        # follow the outermost phase of each thread
+        self.outermost = not getattr(local, 'depth', 0)
+        local.depth = getattr(local, 'depth', 0) + 1
+        
+        with profiler.lock:
+            profiler.active.add(self)
+        self.peak_rss = _current_rss() or 0
+        
+        if self.outermost and profiler.memory:
+            self.snapshot = _take_snapshot()
+        if self.outermost and profiler.cpu:
+            self.cpu = cProfile.Profile()
+            try:
+                self.cpu.enable()
+            except ValueError:
+                # Python 3.12+ allows one active cProfile per process
+                self.cpu = None
+        self.started = time.perf_counter()
+        return self
+        
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = time.perf_counter() - self.started
+        profiler = self.profiler
+        if self.cpu is not None:
+            self.cpu.disable()
+        allocations = None
+        if self.snapshot is not None:
+            allocations = _take_snapshot().compare_to(self.snapshot, 'lineno')
+        profiler.local.depth -= 1
+        
+        with profiler.lock:
+            profiler.active.discard(self)
+            stats = profiler.phases.get(self.name)
+            if stats is None:
+                stats = profiler.phases[self.name] = PhaseStats(self.name)
+            stats.calls += 1
+            stats.total_time += elapsed
+            stats.max_time = max(stats.max_time, elapsed)
+            stats.peak_rss = max(stats.peak_rss, self.peak_rss)
+            if self.cpu is not None:
+                if stats.cpu_stats is None:
+                    stats.cpu_stats = pstats.Stats(self.cpu, stream=io.StringIO())
+                else:
+                    stats.cpu_stats.add(self.cpu)
+            for diff in allocations or ():
+                if diff.size_diff > 0:
+                    site = str(diff.traceback[0])
+                    stats.allocations[site] = stats.allocations.get(site, 0) + diff.size_diff
+        return False
+
+
+class Profiler:
+    """
+    Collects phase measurements for one session.
+    """
+    
+    def __init__(self, cpu=False, memory=False, sample_interval=0.05):
+        """
+        Args:
+            cpu (bool): Run phases under cProfile
+            memory (bool): Trace allocations with tracemalloc
+            sample_interval (float): Seconds between RSS samples
+        """
+        self.cpu = cpu
+        self.memory = memory
+        self.sample_interval = sample_interval
+        self.started = datetime.now()
+        self.phases = {}
+        self.active = set()
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self._stop = threading.Event()
+        
+        if memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            
+        sampler = threading.Thread(target=self._sample_rss)
+        sampler.daemon = True
+        sampler.start()
+        
+    def _sample_rss(self):
+        """Raise the peak RSS of running phases while any are active."""
+        while not self._stop.wait(self.sample_interval):
+            with self.lock:
+                runs = list(self.active)
+            if not runs:
+                continue
+            rss = _current_rss() or 0
+            for run in runs:
+                run.peak_rss = max(run.peak_rss, rss)
+                
+    def phase(self, name):
+        """Get a context manager measuring one execution of a phase."""
+        return _PhaseRun(self, name)
+        
+    def report(self):
+        """
+        Render the session report.
+        
+        Returns:
+            str: Timings, top functions and allocation sites per phase
+        """
+        lines = [f"S3Ducky profile, session started {self.started.isoformat(timespec='seconds')}",
+                 f"cProfile: {'on' if self.cpu else 'off'}, tracemalloc: {'on' if self.memory else 'off'}",
+                 ""]
+        with self.lock:
+            phases = sorted(self.phases.values(), key=lambda stats: stats.total_time, reverse=True)
+        for stats in phases:
+            lines.append(stats.summary())
+        for stats in phases:
+            if stats.cpu_stats is not None:
+                stream = io.StringIO()
+                stats.cpu_stats.stream = stream
+                stats.cpu_stats.sort_stats('cumulative').print_stats(TOP_FUNCTIONS)
+                lines += ["", f"== {stats.name}: top functions (cumulative) ==", stream.getvalue().strip()]
+            if stats.allocations:
+                lines += ["", f"== {stats.name}: top allocation sites =="]
+                top = sorted(stats.allocations.items(), key=lambda item: item[1], reverse=True)
+                for site, size in top[:TOP_ALLOCATIONS]:
+                    lines.append(f"{size / 1024:10.1f} KiB  {site}")
+        return '\n'.join(lines) + '\n'
+        
+    def write(self, profiles_dir=PROFILES_DIR):
+        """
+        Write the report (and raw cProfile data per phase) to the profiles directory.
+        
+        Returns:
+            str or None: Path of the report, or None if it could not be written
+        """
+        self._stop.set()
+        if not self.phases:
+            return None
+        stem = os.path.join(profiles_dir, f"profile-{self.started.strftime('%Y%m%d-%H%M%S')}")
+        try:
+            os.makedirs(profiles_dir, exist_ok=True)
+            with self.lock:
+                phases = list(self.phases.values())
+            for stats in phases:
+                if stats.cpu_stats is not None:
+                    stats.cpu_stats.dump_stats(f"{stem}-{stats.name}.prof")
+            with open(stem + '.txt', 'w', encoding='utf-8') as f:
+                f.write(self.report())
+            return stem + '.txt'
+        except OSError as e:
+            print(f"Debug: Could not write profile report: {e}")
+            return None
+
+
+_profiler = None
+
+
+def enable_profiling(modes='1'):
+    """
+    Start profiling this process and write the report when it exits.
+    
+    Args:
+        modes (str): Comma-separated "cpu", "memory" or "all"; anything else
+            (e.g. "1") enables timers only
+            
+    Returns:
+        Profiler: The session profiler
+    """
+    global _profiler
+    if _profiler is None:
+        requested = {mode.strip().lower() for mode in modes.split(',')}
+        _profiler = Profiler(cpu=bool(requested & {'cpu', 'all'}),
+                             memory=bool(requested & {'memory', 'all'}))
+        atexit.register(_write_at_exit)
+    return _profiler
+
+
+def _write_at_exit():
+    path = _profiler.write()
+    if path:
+        print(f"Profile report written to {path}")
+
+
+def get_profiler():
+    """Get the session profiler, or None when profiling is disabled."""
+    return _profiler
+
+
+def profile_phase(name):
+    """
+    Measure a block as one execution of a phase.
+    
+    Args:
+        name (str): Phase name, e.g. PHASE_LIST
+        
+    Returns:
+        Context manager that does nothing when profiling is disabled
+    """
+    if _profiler is None:
+        return _NULL_PHASE
+    return _profiler.phase(name)
+
+
+def profiled(name):
+    """Decorator measuring each call of a function as one execution of a phase."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _profiler is None:
+                return func(*args, **kwargs)
+            with _profiler.phase(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+if os.environ.get(PROFILE_ENV, '').strip() not in ('', '0'):
+    enable_profiling(os.environ[PROFILE_ENV])
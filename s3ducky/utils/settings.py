@@ -0,0 +1,161 @@
+# MIT License
+# 
+# Copyright (c) 2025 S3Ducky
+
+"""
+User settings for S3Ducky.
+
+Settings are read from ~/.s3ducky/settings.json and can be overridden with
+S3DUCKY_<NAME> environment variables (e.g. S3DUCKY_DOWNLOAD_CACHE_ENABLED=1).
+Credentials are never stored here.
+"""
+
+import os
+import json
+
+
+SETTINGS_DIR = os.path.join(os.path.expanduser('~'), '.s3ducky')
+SETTINGS_PATH = os.path.join(SETTINGS_DIR, 'settings.json')
+
+DEFAULT_SETTINGS = {
+    # Local object cache for downloads (opt-in)
+    'download_cache_enabled': False,
+    'download_cache_dir': os.path.join(SETTINGS_DIR, 'cache', 'objects'),
+    'download_cache_max_mb': 2048,
+    # 'auto' tries a reflink (copy-on-write clone), then copies; 'copy' always copies
+    'download_cache_link_mode': 'auto',
+    # Check ETags/checksums while downloading and re-fetch on a mismatch
+    'verify_downloads': True,
+    # Bandwidth limits in KiB/s (0 = unlimited), shared by all transfers and
+    # applied to running jobs when this file changes. Schedule rules such as
+    # {"start": "09:00", "end": "18:00", "download_kbps": 1024} override them.
+    'download_limit_kbps': 0,
+    'upload_limit_kbps': 0,
+    'bandwidth_schedule': [],
+    # Uploads: files at or above the threshold use parallel multipart uploads
+    'upload_part_size_mb': 8,
+    'upload_multipart_threshold_mb': 16,
+    'upload_concurrency': 8,
+    # Downloads: objects at or above the threshold are fetched as parallel
+    # byte ranges written straight into a preallocated file
+    'ranged_download_threshold_mb': 64,
+    'ranged_download_part_mb': 16,
+    'ranged_download_concurrency': 8,
+    # Objects of a download job fetched at the same time; the job is planned
+    # largest first and small objects are batched per worker
+    'download_concurrency': 4,
+    # Server-side copies and moves: objects or parts copied at the same time,
+    # and the part size of objects over 5 GB (copied with UploadPartCopy)
+    'copy_concurrency': 16,
+    'copy_part_mb': 512,
+    # Bulk delete: DeleteObjects requests (1,000 keys each) sent at the same time
+    'delete_concurrency': 8,
+    # Auto-refresh (opt-in): poll for new keys, backing off from the interval
+    # up to the maximum while nothing changes; every n-th poll re-lists all
+    'auto_refresh_enabled': False,
+    'auto_refresh_interval_s': 15,
+    'auto_refresh_max_interval_s': 300,
+    'auto_refresh_full_every': 10,
+    # Listings whose entries pass this many MB in memory move to a temporary
+    # SQLite file (0 = keep everything in memory); '' spills to the temp dir
+    'listing_memory_budget_mb': 512,
+    'listing_spill_dir': '',
+    # Fetch content type, metadata and restore status (HEAD) for visible and
+    # selected rows; archived objects are restored for restore_days with
+    # restore_tier ('Expedited', 'Standard' or 'Bulk')
+    'object_details_enabled': True,
+    'restore_days': 7,
+    'restore_tier': 'Standard',
+    # Prefetch sibling prefixes and thumbnails ahead of the viewport on one
+    # low-priority thread, spending at most this many requests per step
+    'prefetch_enabled': True,
+    'prefetch_request_budget': 16,
+    # S3 endpoint defaults for the credentials page and CLI: a custom URL for
+    # S3-compatible servers ('' = AWS), 'auto'/'virtual'/'path' addressing,
+    # Transfer Acceleration and IPv4/IPv6 dual-stack endpoints
+    's3_endpoint_url': '',
+    's3_addressing_style': 'auto',
+    's3_accelerate': False,
+    's3_dualstack': False,
+}
+
+
+def _parse_env_value(raw, default):
+    """Convert an environment variable string to the type of its default."""
+    if isinstance(default, (list, dict)):
+        return json.loads(raw)
+    if isinstance(default, bool):
+        return raw.strip().lower() in ('1', 'true', 'yes', 'on')
+    if isinstance(default, int):
+        return int(raw)
+    if isinstance(default, float):
+        return float(raw)
+    return raw
+
+
+def load_settings(path=SETTINGS_PATH):
+    """
+    Load settings, falling back to defaults for anything missing.
+    
+    Args:
+        path (str): Settings file path
+        
+    Returns:
+        dict: Settings with every key from DEFAULT_SETTINGS present
+    """
+    settings = dict(DEFAULT_SETTINGS)
+    
+    if os.path.exists(path):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                settings.update(json.load(f))
+        except Exception as e:
+            print(f"Failed to read settings from {path}: {e}")
+            
+    for name, default in DEFAULT_SETTINGS.items():
+        raw = os.environ.get(f"S3DUCKY_{name.upper()}")
+        if raw is not None:
+            try:
+                settings[name] = _parse_env_value(raw, default)
+            except ValueError:
+                print(f"Ignoring invalid value for S3DUCKY_{name.upper()}: {raw}")
+                
+    return settings
+
+
+def save_settings(settings, path=SETTINGS_PATH):
+    """
+    Save settings to disk.
+    
+    Args:
+        settings (dict): Settings to save
+        path (str): Settings file path
+    """
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(settings, f, indent=2, sort_keys=True)
+    except Exception as e:
+        print(f"Failed to save settings to {path}: {e}")
+
+
+def update_settings(changes, path=SETTINGS_PATH):
+    """
+    Change some settings on disk, keeping everything else stored in the file.
+    
+    Unlike save_settings(), values written meanwhile by another process (or
+    only set through environment variables) are left alone.
+    
+    Args:
+        changes (dict): Settings to change
+        path (str): Settings file path
+    """
+    stored = {}
+    if os.path.exists(path):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+        except Exception as e:
+            print(f"Failed to read settings from {path}: {e}")
+    stored.update(changes)
+    save_settings(stored, path)
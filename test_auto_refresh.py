@@ -0,0 +1,87 @@
+# MIT License
+# 
+# Copyright (c) 2025 S3Ducky
+
+"""
+Tests for auto-refresh polling: the backoff, the cadence of full
+re-lists and the watermark of the polls in between, run against the
+in-memory backend.
+"""
+
+import threading
+from s3ducky.core.auto_refresh import RefreshPoller, POLL_FULL, POLL_NEW
+from s3ducky.core.listing_store import ListingStore
+from s3ducky.core.memory_storage import MemoryBackend
+
+
+def _backend(*keys):
+    backend = MemoryBackend()
+    backend.connect('mem')
+    for key in keys:
+        backend.add_object(key, b'x')
+    return backend
+
+
+def _keys(entries):
+    return [file_info['key'] for file_info in entries]
+
+
+def test_backoff_doubles_up_to_the_cap_and_resets_on_change():
+    poller = RefreshPoller(interval=10, max_interval=35)
+    delays = []
+    for _ in range(4):
+        poller.record(False)
+        delays.append(poller.delay)
+    assert delays == [20, 35, 35, 35]
+    poller.record(True)
+    assert poller.delay == 10
+
+
+def test_max_interval_never_below_the_interval():
+    poller = RefreshPoller(interval=60, max_interval=30)
+    poller.record(False)
+    assert poller.delay == 60
+
+
+def test_new_polls_list_after_the_watermark():
+    backend = _backend('logs/001', 'logs/002')
+    poller = RefreshPoller(full_every=0)
+    assert poller.poll(backend, 'logs/002') == (POLL_NEW, [])
+    backend.add_object('logs/003', b'x')
+    backend.add_object('logs/000', b'x')
+    kind, entries = poller.poll(backend, 'logs/002')
+    # A key sorting before the watermark waits for a full re-list
+    assert kind == POLL_NEW and _keys(entries) == ['logs/003']
+
+
+def test_every_nth_poll_relists_everything():
+    backend = _backend('a', 'b')
+    poller = RefreshPoller(full_every=3, new_listing=ListingStore)
+    kinds = [poller.poll(backend, 'b')[0] for _ in range(6)]
+    assert kinds == [POLL_NEW, POLL_NEW, POLL_FULL, POLL_NEW, POLL_NEW, POLL_FULL]
+    
+    kind, entries = RefreshPoller(full_every=3, new_listing=ListingStore).poll(backend, None)
+    # Without a watermark (an empty listing) there is nothing to list after
+    assert kind == POLL_FULL and isinstance(entries, ListingStore) and _keys(entries) == ['a', 'b']
+
+
+def test_poll_async_reports_results_and_errors():
+    backend = _backend('a')
+    results = []
+    done = threading.Event()
+    
+    def completed(kind, entries):
+        results.append((kind, _keys(entries)))
+        done.set()
+    RefreshPoller(full_every=0).poll_async(backend, None, completion_callback=completed)
+    assert done.wait(5) and results == [(POLL_FULL, ['a'])]
+    
+    backend.disconnect()
+    done.clear()
+    errors = []
+    
+    def failed(message):
+        errors.append(message)
+        done.set()
+    RefreshPoller(full_every=0).poll_async(backend, 'a', error_callback=failed)
+    assert done.wait(5) and errors
@@ -0,0 +1,132 @@
+# MIT License
+# 
+# Copyright (c) 2025 S3Ducky
+
+"""
+Tests for bandwidth limiting: token buckets, schedules and upload bodies
+paced while they are sent (and not while botocore hashes them).
+"""
+
+import io
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import boto3
+from botocore.config import Config
+from s3ducky.core.bandwidth import (TokenBucket, BandwidthLimiter, ThrottledReader,
+                                    active_schedule_rule, throttle_on_send, DOWNLOAD, UPLOAD)
+from s3ducky.core.s3_client import S3Client
+
+
+def test_token_bucket_paces_callers():
+    bucket = TokenBucket(rate=100000)
+    started = time.monotonic()
+    for _ in range(5):
+        bucket.consume(10000)
+    # The bucket starts empty, so 50 KB at 100 KB/s take about half a second
+    assert 0.4 <= time.monotonic() - started < 1.5
+
+
+def test_unlimited_bucket_never_waits():
+    bucket = TokenBucket()
+    started = time.monotonic()
+    bucket.consume(10 ** 12)
+    assert time.monotonic() - started < 0.1
+
+
+def test_schedule_rules():
+    schedule = [{'start': '22:00', 'end': '06:00', 'download_kbps': 1},
+                {'start': '09:00', 'end': '18:00', 'upload_kbps': 2}]
+    assert active_schedule_rule(schedule, datetime(2025, 1, 1, 23, 0)) is schedule[0]
+    assert active_schedule_rule(schedule, datetime(2025, 1, 1, 5, 59)) is schedule[0]
+    assert active_schedule_rule(schedule, datetime(2025, 1, 1, 12, 0)) is schedule[1]
+    assert active_schedule_rule(schedule, datetime(2025, 1, 1, 20, 0)) is None
+
+
+def test_limiter_buckets_follow_limits():
+    limiter = BandwidthLimiter(download_kbps=10, upload_kbps=0)
+    assert limiter.buckets[DOWNLOAD].rate == 10 * 1024
+    assert limiter.buckets[UPLOAD].rate == 0
+    limiter.set_limits(upload_kbps=5)
+    assert limiter.buckets[UPLOAD].rate == 5 * 1024
+
+
+class _RecordingLimiter:
+    def __init__(self):
+        self.consumed = []
+        
+    def consume(self, direction, nbytes):
+        self.consumed.append((direction, nbytes))
+
+
+def test_throttled_reader_charges_only_armed_passes():
+    limiter = _RecordingLimiter()
+    reader = ThrottledReader(io.BytesIO(b'x' * 20000), limiter)
+    # A hashing pass is free
+    assert len(reader.read()) == 20000 and not limiter.consumed
+    reader.seek(0)
+    reader.armed = True
+    while reader.read(8192):
+        pass
+    assert limiter.consumed == [(UPLOAD, 8192), (UPLOAD, 8192), (UPLOAD, 3616)]
+    # Rewinding for a retry disarms it again
+    reader.seek(0)
+    reader.read()
+    assert len(limiter.consumed) == 3
+
+
+class _FakeS3(BaseHTTPRequestHandler):
+    """Answers every PUT with an ETag after failing the first `failures` of them."""
+    
+    failures = 0
+    received = 0
+    
+    def do_PUT(self):
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        if _FakeS3.failures:
+            _FakeS3.failures -= 1
+            self.send_response(500)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        _FakeS3.received += len(body)
+        self.send_response(200)
+        self.send_header('ETag', '"etag"')
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+        
+    def log_message(self, *args):
+        pass
+
+
+def _http_client(limiter):
+    """An S3Client talking to a plain-http server, where botocore hashes every body before sending it."""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _FakeS3)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    client = S3Client(limiter=limiter)
+    client.bucket_name = 'b'
+    client.s3_client = boto3.client(
+        's3', endpoint_url=f"http://127.0.0.1:{server.server_address[1]}", region_name='us-east-1',
+        aws_access_key_id='test', aws_secret_access_key='test', config=Config(s3={'addressing_style': 'path'}))
+    throttle_on_send(client.s3_client)
+    return server, client
+
+
+def test_uploads_are_charged_once_per_send(tmp_path):
+    limiter = _RecordingLimiter()
+    server, client = _http_client(limiter)
+    try:
+        _FakeS3.received, _FakeS3.failures = 0, 0
+        assert client.upload_part('k', 'upload', 1, b'x' * 20000) == '"etag"'
+        assert sum(nbytes for _, nbytes in limiter.consumed) == _FakeS3.received == 20000
+        
+        # A retried PUT is charged for each time it went on the wire, never for hashing
+        limiter.consumed.clear()
+        _FakeS3.received, _FakeS3.failures = 0, 1
+        path = tmp_path / 'file.bin'
+        path.write_bytes(b'y' * 30000)
+        assert client.put_file('k', str(path)) == 'etag'
+        assert sum(nbytes for _, nbytes in limiter.consumed) == 2 * 30000
+    finally:
+        server.shutdown()
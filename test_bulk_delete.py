@@ -0,0 +1,61 @@
+# MIT License
+# 
+# Copyright (c) 2025 S3Ducky
+
+"""
+Tests for bulk delete: keys go out in batches of at most 1,000, refused
+keys are reported one by one, and a dry run deletes nothing.
+"""
+
+import threading
+from s3ducky.core.bulk_delete import bulk_delete, prefix_entries, MAX_DELETE_KEYS
+from s3ducky.core.memory_storage import MemoryBackend
+
+
+def _backend(count, prefix='logs/'):
+    backend = MemoryBackend()
+    backend.connect('mem')
+    backend.populate(count, size=2, prefix=prefix)
+    backend.add_object('other/keep.txt', b'x')
+    return backend
+
+
+class _RecordingBackend(MemoryBackend):
+    """Records the size of every DeleteObjects batch and refuses some keys."""
+    
+    def __init__(self, refused=()):
+        super().__init__()
+        self.batches = []
+        self.refused = set(refused)
+        self._batches_lock = threading.Lock()
+        
+    def delete_objects(self, keys):
+        with self._batches_lock:
+            self.batches.append(len(keys))
+        errors = super().delete_objects([key for key in keys if key not in self.refused])
+        errors.update({key: "AccessDenied" for key in keys if key in self.refused})
+        return errors
+
+
+def test_keys_are_deleted_in_batches_of_at_most_1000():
+    backend = _RecordingBackend(refused={'logs/000000007'})
+    backend.connect('mem')
+    backend.populate(2500, size=2, prefix='logs/')
+    backend.add_object('other/keep.txt', b'x')
+    deleted = []
+    result = bulk_delete(backend, prefix_entries(backend, 'logs'), concurrency=2,
+                         deleted_callback=deleted.extend)
+    assert sorted(backend.batches) == [500, MAX_DELETE_KEYS, MAX_DELETE_KEYS]
+    assert result.deleted == 2499 and result.bytes_deleted == 4998
+    assert list(result.failed) == ['logs/000000007']
+    assert len(deleted) == 2499
+    remaining = [file_info['key'] for entries in backend.list_object_pages() for file_info in entries]
+    assert remaining == ['logs/000000007', 'other/keep.txt']
+
+
+def test_dry_run_only_counts():
+    backend = _backend(1200)
+    result = bulk_delete(backend, prefix_entries(backend, 'logs/'), dry_run=True)
+    assert (result.deleted, result.bytes_deleted) == (1200, 2400)
+    assert result.summary() == "Would delete 1,200 objects (2.3 KB)"
+    assert sum(len(entries) for entries in backend.list_object_pages()) == 1201
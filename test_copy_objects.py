@@ -0,0 +1,141 @@
+# MIT License
+# 
+# Copyright (c) 2025 S3Ducky
+
+"""
+Tests for server-side copy and move, run against the in-memory backend.
+"""
+
+import os
+from datetime import datetime, timedelta, timezone
+import boto3
+import pytest
+from botocore.stub import Stubber
+from s3ducky.core import copy_objects
+from s3ducky.core.copy_objects import Copier, CopyState, copy_targets
+from s3ducky.core.memory_storage import MemoryBackend
+from s3ducky.core.s3_client import S3Client
+
+
+def _backend(objects):
+    backend = MemoryBackend()
+    backend.connect('mem')
+    for key, data in objects.items():
+        backend.add_object(key, data)
+    return backend
+
+
+def _read(backend, key):
+    return backend.get_object_bytes(key)
+
+
+def _keys(backend):
+    return [file_info['key'] for entries in backend.list_object_pages() for file_info in entries]
+
+
+def test_copy_targets_keep_the_path_below_the_common_folder():
+    file_infos = [{'key': 'logs/a/1.txt'}, {'key': 'logs/b/2.txt'}]
+    assert [dest for _, dest in copy_targets(file_infos, 'archive')] == ['archive/a/1.txt', 'archive/b/2.txt']
+
+
+def test_copy_small_and_multipart_objects(tmp_path, monkeypatch):
+    monkeypatch.setattr(copy_objects, 'MAX_COPY_OBJECT_SIZE', 1000)
+    big = os.urandom(2500)
+    backend = _backend({'src/small.txt': b'hello', 'src/big.bin': big})
+    copier = Copier(backend, backend, concurrency=4, state=CopyState(str(tmp_path / 'copies.json')))
+    # Parts below the S3 minimum, so the test object stays small
+    copier.part_size = 1000
+    file_infos = [file_info for entries in backend.list_object_pages() for file_info in entries]
+    copied = []
+    result = copier.copy(copy_targets(file_infos, 'dst/'), file_callback=copied.append)
+    assert sorted(entry['key'] for entry in copied) == ['dst/big.bin', 'dst/small.txt']
+    assert _read(backend, 'dst/big.bin') == big
+    assert _read(backend, 'dst/small.txt') == b'hello'
+    assert result.bytes_copied == 2505 and not result.removed
+
+
+def test_move_removes_each_copied_source(tmp_path):
+    backend = _backend({'src/a.txt': b'a', 'src/b.txt': b'b', 'other/c.txt': b'c'})
+    copier = Copier(backend, backend, state=CopyState(str(tmp_path / 'copies.json')))
+    file_infos = [file_info for entries in backend.list_object_pages() for file_info in entries
+                  if file_info['key'].startswith('src/')]
+    removed = []
+    result = copier.copy(copy_targets(file_infos, 'dst/'), move=True, removed_callback=removed.append)
+    assert sorted(removed) == ['src/a.txt', 'src/b.txt'] == sorted(result.removed)
+    assert _keys(backend) == ['dst/a.txt', 'dst/b.txt', 'other/c.txt']
+    assert result.summary() == "Moved 2 objects (2.0 B)"
+
+
+def test_move_never_deletes_a_source_it_did_not_copy(tmp_path):
+    # A newer, different object of the same size already sits at the destination
+    now = datetime.now(timezone.utc)
+    backend = MemoryBackend()
+    backend.connect('mem')
+    source = backend.add_object('src/report.csv', b'AAAA', modified=now - timedelta(days=1))
+    backend.add_object('dst/report.csv', b'BBBB', modified=now)
+    copier = Copier(backend, backend, state=CopyState(str(tmp_path / 'copies.json')))
+    result = copier.copy(copy_targets([source], 'dst/'), move=True)
+    assert _keys(backend) == ['dst/report.csv']
+    assert _read(backend, 'dst/report.csv') == b'AAAA'
+    assert result.removed == ['src/report.csv'] and not result.existing
+
+
+def test_copy_skips_only_destinations_with_the_source_etag(tmp_path, monkeypatch):
+    monkeypatch.setattr(copy_objects, 'MAX_COPY_OBJECT_SIZE', 1000)
+    backend = _backend({'src/same.txt': b'same', 'src/other.txt': b'AAAA', 'src/big.bin': os.urandom(2500),
+                        'dst/same.txt': b'same', 'dst/other.txt': b'BBBB'})
+    state = CopyState(str(tmp_path / 'copies.json'))
+    copier = Copier(backend, backend, state=state)
+    copier.part_size = 1000
+    file_infos = [file_info for entries in backend.list_object_pages() for file_info in entries
+                  if file_info['key'].startswith('src/')]
+    result = copier.copy(copy_targets(file_infos, 'dst/'))
+    assert sorted(entry['key'] for entry in result.copied) == ['dst/big.bin', 'dst/other.txt']
+    assert result.existing == 1 and _read(backend, 'dst/other.txt') == b'AAAA'
+    # The multipart copy's ETag differs from its source's, but was recorded
+    again = Copier(backend, backend, state=CopyState(state.path)).copy(copy_targets(file_infos, 'dst/'))
+    assert not again.copied and again.existing == 3
+
+
+def test_move_fails_for_sources_changed_since_listing(tmp_path, monkeypatch):
+    monkeypatch.setattr(copy_objects, 'MAX_COPY_OBJECT_SIZE', 1000)
+    backend = _backend({'src/a.txt': b'a', 'src/b.txt': b'b', 'src/big.bin': os.urandom(2500)})
+    file_infos = [file_info for entries in backend.list_object_pages() for file_info in entries]
+    # Overwritten between the listing and the copy
+    backend.add_object('src/a.txt', b'A')
+    backend.add_object('src/big.bin', os.urandom(2500))
+    copier = Copier(backend, backend, state=CopyState(str(tmp_path / 'copies.json')))
+    copier.part_size = 1000
+    
+    with pytest.raises(Exception, match='2 of 3 copies failed'):
+        copier.copy(copy_targets(file_infos, 'dst/'), move=True)
+    assert _keys(backend) == ['dst/b.txt', 'src/a.txt', 'src/big.bin']
+    assert _read(backend, 'src/a.txt') == b'A'
+
+
+def _stubbed_s3():
+    backend = S3Client()
+    backend.bucket_name = 'dst-bucket'
+    backend.s3_client = boto3.client('s3', region_name='us-east-1', aws_access_key_id='AKIA1',
+                                     aws_secret_access_key='secret')
+    return backend, Stubber(backend.s3_client)
+
+
+def test_s3_copies_only_the_listed_version():
+    backend, stubber = _stubbed_s3()
+    source = {'Bucket': 'src-bucket', 'Key': 'a.txt'}
+    stubber.add_response('copy_object', {'CopyObjectResult': {'ETag': '"copy"'}},
+                         {'Bucket': 'dst-bucket', 'Key': 'b.txt', 'CopySource': source,
+                          'CopySourceIfMatch': '"listed"'})
+    stubber.add_client_error('copy_object', 'PreconditionFailed', http_status_code=412)
+    stubber.add_response('upload_part_copy', {'CopyPartResult': {'ETag': '"part"'}},
+                         {'Bucket': 'dst-bucket', 'Key': 'b.txt', 'UploadId': 'upload', 'PartNumber': 1,
+                          'CopySource': source, 'CopySourceRange': 'bytes=0-9', 'CopySourceIfMatch': '"listed"'})
+    
+    with stubber:
+        assert backend.copy_object('src-bucket', 'a.txt', 'b.txt', source_etag='listed') == 'copy'
+        with pytest.raises(Exception, match='changed since it was listed'):
+            backend.copy_object('src-bucket', 'a.txt', 'b.txt', source_etag='listed')
+        assert backend.upload_part_copy('b.txt', 'upload', 1, 'src-bucket', 'a.txt', 0, 9,
+                                        source_etag='"listed"') == '"part"'
+    stubber.assert_no_pending_responses()
@@ -0,0 +1,58 @@
+# MIT License
+# 
+# Copyright (c) 2025 S3Ducky
+
+"""
+Tests for download planning: largest objects first, big objects on their
+own, small ones batched, and every object handed out exactly once.
+"""
+
+import threading
+from s3ducky.core.download_planner import DownloadPlan, run_plan, MAX_BATCH_OBJECTS
+
+
+def _entries(*sizes):
+    return [{'key': f"file-{index}", 'size': size} for index, size in enumerate(sizes)]
+
+
+def test_large_objects_come_first_and_alone():
+    plan = DownloadPlan(_entries(10, 500, 20, 300), ranged_threshold=300)
+    assert plan.next_unit() == [{'key': 'file-1', 'size': 500}]
+    assert plan.next_unit() == [{'key': 'file-3', 'size': 300}]
+    rest = []
+    for unit in iter(plan.next_unit, None):
+        rest.extend(file_info['key'] for file_info in unit)
+    assert rest == ['file-2', 'file-0']
+
+
+def test_batches_are_capped():
+    plan = DownloadPlan(_entries(*[1] * (MAX_BATCH_OBJECTS + 10)), workers=1)
+    # Requests so cheap that only the object cap ends a batch
+    plan.overhead = 0.001
+    assert len(plan.next_unit()) == MAX_BATCH_OBJECTS
+    assert len(plan.next_unit()) == 10
+
+
+def test_record_tracks_progress_and_estimate():
+    plan = DownloadPlan(_entries(100, 200), workers=2)
+    assert plan.estimate_seconds() > 0
+    while True:
+        unit = plan.next_unit()
+        if unit is None:
+            break
+        plan.record(unit, 0.01)
+    assert (plan.done_count, plan.done_bytes, plan.remaining_bytes) == (2, 300, 0)
+    assert plan.estimate_seconds() == 0.0
+    assert plan.progress_text().startswith("Downloaded 2/2 files")
+
+
+def test_run_plan_downloads_each_object_once():
+    file_infos = _entries(*range(1, 301))
+    seen = []
+    lock = threading.Lock()
+    
+    def download(file_info):
+        with lock:
+            seen.append(file_info['key'])
+    run_plan(DownloadPlan(file_infos, workers=4, ranged_threshold=250), download)
+    assert sorted(seen) == sorted(file_info['key'] for file_info in file_infos)
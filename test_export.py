@@ -0,0 +1,75 @@
+# MIT License
+# 
+# Copyright (c) 2025 S3Ducky
+
+"""
+Tests for listing export: rows as CSV, JSON Lines and Parquet, streamed
+from the in-memory backend and moved into place only when complete.
+"""
+
+import csv
+import json
+from datetime import datetime, timezone
+import pytest
+from s3ducky.core import export
+from s3ducky.core.export import export_listing, format_for_path, FORMAT_CSV, FORMAT_JSONL, FORMAT_PARQUET
+from s3ducky.core.memory_storage import MemoryBackend
+
+MODIFIED = datetime(2025, 3, 4, 5, 6, 7, tzinfo=timezone.utc)
+
+
+def _backend():
+    backend = MemoryBackend()
+    backend.connect('mem')
+    backend.add_object('a/one.txt', b'1', modified=MODIFIED)
+    backend.add_object('b/two, "quoted".txt', b'22', modified=MODIFIED)
+    return backend
+
+
+def test_format_from_extension():
+    assert format_for_path('out.CSV') == FORMAT_CSV
+    assert format_for_path('out.ndjson') == format_for_path('out.json') == FORMAT_JSONL
+    assert format_for_path('out.parquet') == FORMAT_PARQUET
+    assert format_for_path('out.txt') is None
+    with pytest.raises(ValueError):
+        export_listing(_backend(), 'out.txt')
+
+
+def test_csv_rows(tmp_path):
+    path = str(tmp_path / 'listing.csv')
+    assert export_listing(_backend(), path) == 2
+    with open(path, newline='', encoding='utf-8') as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == ['key', 'size', 'last_modified', 'etag', 'storage_class']
+    assert rows[1][:3] == ['a/one.txt', '1', '2025-03-04T05:06:07+00:00']
+    # Commas and quotes in keys survive the round trip
+    assert rows[2][0] == 'b/two, "quoted".txt' and rows[2][4] == 'STANDARD'
+    assert [p.name for p in tmp_path.iterdir()] == ['listing.csv']
+
+
+def test_jsonl_rows(tmp_path):
+    path = str(tmp_path / 'listing.jsonl')
+    export_listing(_backend(), path)
+    with open(path, encoding='utf-8') as f:
+        rows = [json.loads(line) for line in f]
+    assert rows[0] == {'key': 'a/one.txt', 'size': 1, 'last_modified': '2025-03-04T05:06:07+00:00',
+                       'etag': rows[0]['etag'], 'storage_class': 'STANDARD'}
+    assert len(rows[0]['etag']) == 32 and rows[1]['size'] == 2
+
+
+def test_parquet_rows(tmp_path):
+    if not export.PYARROW_AVAILABLE:
+        pytest.skip("pyarrow is not installed")
+    import pyarrow.parquet as pa_parquet
+    path = str(tmp_path / 'listing.parquet')
+    export_listing(_backend(), path)
+    table = pa_parquet.read_table(path).to_pylist()
+    assert [row['key'] for row in table] == ['a/one.txt', 'b/two, "quoted".txt']
+    assert table[0]['last_modified'] == MODIFIED and table[1]['size'] == 2
+
+
+def test_cancelled_export_leaves_no_file(tmp_path):
+    path = str(tmp_path / 'listing.csv')
+    with pytest.raises(Exception, match="cancelled"):
+        export_listing(_backend(), path, should_stop=lambda: True)
+    assert not list(tmp_path.iterdir())
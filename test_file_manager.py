@@ -0,0 +1,51 @@
+# MIT License
+# 
+# Copyright (c) 2025 S3Ducky
+
+"""
+Tests for downloads of a selection: objects keep their folders below the
+common folder of the selection, so objects with the same file name in
+different folders all arrive, on disk and in zip archives.
+"""
+
+import os
+import zipfile
+from s3ducky.core.file_manager import FileManager
+from s3ducky.core.memory_storage import MemoryBackend
+
+
+def _file_manager(*keys):
+    backend = MemoryBackend()
+    backend.connect('bucket')
+    for key in keys:
+        backend.add_object(key, key.encode())
+    return FileManager(backend, verify=False)
+
+
+def _files(folder):
+    return sorted(os.path.relpath(os.path.join(root, name), folder).replace(os.sep, '/')
+                  for root, _, names in os.walk(folder) for name in names)
+
+
+def test_same_names_in_different_folders_all_arrive(tmp_path):
+    keys = ['data/a/report.csv', 'data/b/report.csv', 'data/b/deep/report.csv']
+    _file_manager(*keys).download_files_individually(keys, str(tmp_path))
+    
+    assert _files(tmp_path) == ['a/report.csv', 'b/deep/report.csv', 'b/report.csv']
+    assert (tmp_path / 'b' / 'report.csv').read_bytes() == b'data/b/report.csv'
+
+
+def test_selection_from_one_folder_arrives_flat(tmp_path):
+    keys = ['data/a/one.csv', 'data/a/two.csv']
+    _file_manager(*keys).download_files_individually(keys, str(tmp_path))
+    assert _files(tmp_path) == ['one.csv', 'two.csv']
+
+
+def test_zip_keeps_the_folders(tmp_path):
+    keys = ['a/report.csv', 'b/report.csv', '..']
+    zip_path = str(tmp_path / 'out.zip')
+    _file_manager(*keys).download_files_as_zip(keys, zip_path)
+    
+    with zipfile.ZipFile(zip_path) as archive:
+        assert archive.namelist() == ['a/report.csv', 'b/report.csv', '_..']
+        assert archive.read('b/report.csv') == b'b/report.csv'
@@ -0,0 +1,181 @@
+# MIT License
+# 
+# Copyright (c) 2025 S3Ducky
+
+"""
+Tests for download verification: ETag and multipart checks, part sizes
+that can't be proven, and corrupt downloads never replacing a file.
+"""
+
+import hashlib
+import os
+import pytest
+from s3ducky.core.integrity import (StreamVerifier, PartVerifier,
+                                    CHECK_OK, CHECK_MISMATCH, CHECK_SKIPPED)
+from s3ducky.core.memory_storage import MemoryBackend
+from s3ducky.core.ranged_download import write_stream, TEMP_SUFFIX
+from s3ducky.core.s3_client import S3Client
+
+
+def _multipart_etag(data, part_size):
+    digests = b''.join(hashlib.md5(data[start:start + part_size]).digest()
+                       for start in range(0, len(data), part_size))
+    return f"{hashlib.md5(digests).hexdigest()}-{(len(data) + part_size - 1) // part_size}"
+
+
+def _stream(verifier, data, chunk=7):
+    for start in range(0, len(data), chunk):
+        verifier.update(data[start:start + chunk])
+    return verifier.finish()
+
+
+def test_single_part_etag():
+    data = os.urandom(100)
+    assert _stream(StreamVerifier(hashlib.md5(data).hexdigest(), 100), data) == {'ETag': CHECK_OK}
+    assert _stream(StreamVerifier(hashlib.md5(b'x').hexdigest(), 100), data) == {'ETag': CHECK_MISMATCH}
+
+
+def test_multipart_etag_with_proven_and_assumed_part_sizes():
+    data = os.urandom(100)
+    etag = _multipart_etag(data, 30)
+    assert _stream(StreamVerifier(etag, 100, part_size=30), data) == {'ETag': CHECK_OK}
+    # Parts were really 30 bytes, but 40 is assumed: a mismatch proves nothing
+    assert _stream(StreamVerifier(etag, 100, part_size=40, sizes_proven=False), data) == {'ETag': CHECK_SKIPPED}
+    assert _stream(StreamVerifier(etag, 100, part_size=40), data) == {'ETag': CHECK_MISMATCH}
+    # A matching value with assumed sizes still counts
+    assert _stream(StreamVerifier(etag, 100, part_size=30, sizes_proven=False), data) == {'ETag': CHECK_OK}
+
+
+def test_part_verifier_in_any_order():
+    data = os.urandom(100)
+    verifier = PartVerifier(_multipart_etag(data, 30), 100, 4)
+    for number in (3, 1, 4, 2):
+        hashes = verifier.part_hashes()
+        part = data[(number - 1) * 30:number * 30]
+        for part_hash in hashes.values():
+            part_hash.update(part)
+        verifier.add_part(number, hashes, len(part))
+    assert verifier.finish() == {'ETag': CHECK_OK}
+
+
+def test_corrupt_download_leaves_existing_file(tmp_path):
+    path = str(tmp_path / 'report.csv')
+    with open(path, 'wb') as f:
+        f.write(b'previous')
+    results = write_stream(path, [b'new ', b'bytes'], StreamVerifier(hashlib.md5(b'other').hexdigest(), 9))
+    assert results == {'ETag': CHECK_MISMATCH}
+    assert open(path, 'rb').read() == b'previous'
+    assert not os.path.exists(path + TEMP_SUFFIX)
+    
+    results = write_stream(path, [b'new ', b'bytes'], StreamVerifier(hashlib.md5(b'new bytes').hexdigest(), 9))
+    assert results == {'ETag': CHECK_OK}
+    assert open(path, 'rb').read() == b'new bytes'
+
+
+def test_backend_download_with_bad_etag(tmp_path):
+    backend = MemoryBackend()
+    backend.connect('mem')
+    backend.add_object('a.bin', b'content')['etag'] = hashlib.md5(b'something else').hexdigest()
+    path = tmp_path / 'a.bin'
+    path.write_bytes(b'old')
+    assert backend.download_file('a.bin', str(path), verify=True) == {'ETag': CHECK_MISMATCH}
+    assert path.read_bytes() == b'old'
+
+
+class _PartHeads:
+    """Stands in for the boto3 client's HEAD with PartNumber."""
+    
+    def __init__(self, part_sizes):
+        self.part_sizes = part_sizes
+        
+    def head_object(self, Bucket, Key, PartNumber):
+        return {'ContentLength': self.part_sizes[PartNumber - 1], 'PartsCount': len(self.part_sizes)}
+
+
+def _part_size(part_sizes):
+    client = S3Client()
+    client.bucket_name = 'b'
+    client.s3_client = _PartHeads(part_sizes)
+    return client.get_part_size('k', sum(part_sizes))
+
+
+def test_part_size_proof():
+    assert _part_size([10, 10, 5]) == (10, True)
+    assert _part_size([10, 10, 10, 5]) == (10, False)
+    # The last part gives away unequal parts
+    assert _part_size([10, 5, 10]) == (None, False)
+    # So does a part count that doesn't fit the first part's size
+    assert _part_size([10, 5, 5, 5]) == (None, False)
+
+
+class _Body:
+    """Response body that drops the connection after some bytes."""
+    
+    def __init__(self, data, fail_after=None):
+        self.data = data
+        self.fail_after = fail_after
+        self.closed = False
+        
+    def iter_chunks(self, chunk_size):
+        for start in range(0, len(self.data), 4):
+            if self.fail_after is not None and start >= self.fail_after:
+                raise ConnectionResetError("connection reset by peer")
+            yield self.data[start:start + 4]
+            
+    def close(self):
+        self.closed = True
+
+
+class _RangeClient:
+    """Serves ranged GETs of one object, dropping the first one mid-stream."""
+    
+    def __init__(self, data, etag):
+        self.data = data
+        self.etag = etag
+        self.ranges = []
+        self.bodies = []
+        
+    def get_object(self, Bucket, Key, Range, IfMatch=None):
+        assert IfMatch == f'"{self.etag}"'
+        start, end = (int(value) for value in Range[len('bytes='):].split('-'))
+        self.ranges.append((start, end))
+        body = _Body(self.data[start:end + 1], fail_after=6 if len(self.ranges) == 1 else None)
+        self.bodies.append(body)
+        return {'Body': body}
+
+
+def _client(data):
+    client = S3Client()
+    client.bucket_name = 'b'
+    client.s3_client = _RangeClient(data, hashlib.md5(data).hexdigest())
+    return client
+
+
+def test_streamed_download_resumes_after_reset(tmp_path, monkeypatch):
+    monkeypatch.setattr('time.sleep', lambda seconds: None)
+    data = os.urandom(40)
+    client = _client(data)
+    etag = hashlib.md5(data).hexdigest()
+    first = _Body(data, fail_after=12)
+    path = str(tmp_path / 'out')
+    
+    results = client._download_streamed('k', path, {'Body': first}, etag, 40, StreamVerifier(etag, 40))
+    assert results == {'ETag': CHECK_OK}
+    assert open(path, 'rb').read() == data
+    # Resumed at the broken offset, then once more after the second drop
+    assert client.s3_client.ranges == [(12, 39), (20, 39)]
+    assert first.closed and all(body.closed for body in client.s3_client.bodies)
+
+
+def test_ranged_download_closes_unread_first_body(tmp_path, monkeypatch):
+    monkeypatch.setattr('time.sleep', lambda seconds: None)
+    def failing_ranges(local_path, size, part_size, fetch_range, concurrency, verifier):
+        # Another range failed before the first one was started
+        raise RuntimeError("range 2 failed")
+    monkeypatch.setattr('s3ducky.core.s3_client.download_ranges', failing_ranges)
+    data = os.urandom(40)
+    first = _Body(data)
+    with pytest.raises(RuntimeError):
+        _client(data)._download_ranged('k', str(tmp_path / 'out'), {'Body': first},
+                                       hashlib.md5(data).hexdigest(), 40, 10)
+    assert first.closed
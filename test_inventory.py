@@ -0,0 +1,111 @@
+# MIT License
+# 
+# Copyright (c) 2025 S3Ducky
+
+"""
+Tests for S3 Inventory listings: filtering of old versions, delete markers
+and other prefixes, and column pages going into the listing store.
+"""
+
+import csv
+import gzip
+import io
+import json
+from datetime import datetime, timezone
+import pytest
+from s3ducky.core import inventory
+from s3ducky.core.inventory import InventorySource
+from s3ducky.core.listing_store import ListingStore, ColumnPage
+from s3ducky.core.rollups import PrefixRollup
+
+ROWS = [
+    # bucket, key, version, is latest, delete marker, size, modified, etag, storage class
+    ('b', 'logs/a+b.txt', '2', 'true', 'false', '10', '2024-01-02T03:04:05.000Z', '"e1"', 'STANDARD'),
+    ('b', 'logs/a+b.txt', '1', 'false', 'false', '99', '2023-01-01T00:00:00.000Z', '"old"', 'STANDARD'),
+    ('b', 'logs/gone.txt', '3', 'true', 'true', '', '2024-01-03T00:00:00.000Z', '', ''),
+    ('b', 'logs/100%25.txt', '4', 'true', 'false', '20', '2024-01-04T00:00:00.000Z', '"e2"', 'GLACIER'),
+    ('b', 'other/c.txt', '5', 'true', 'false', '30', '2024-01-05T00:00:00.000Z', '"e3"', ''),
+]
+SCHEMA = 'Bucket, Key, VersionId, IsLatest, IsDeleteMarker, Size, LastModifiedDate, ETag, StorageClass'
+
+
+def _csv_inventory(tmp_path):
+    out = io.StringIO()
+    csv.writer(out).writerows(ROWS)
+    (tmp_path / 'data.csv.gz').write_bytes(gzip.compress(out.getvalue().encode('utf-8')))
+    manifest = {'fileFormat': 'CSV', 'fileSchema': SCHEMA, 'destinationBucket': 'arn:aws:s3:::inv',
+                'files': [{'key': 'data.csv.gz'}]}
+    (tmp_path / 'manifest.json').write_text(json.dumps(manifest))
+    return InventorySource(str(tmp_path / 'manifest.json'))
+
+
+def _entries(pages):
+    return [dict(entry) for page in pages for entry in page]
+
+
+def test_csv_inventory_with_pyarrow(tmp_path):
+    pytest.importorskip('pyarrow')
+    source = _csv_inventory(tmp_path)
+    pages = list(source.iter_pages(None))
+    assert all(isinstance(page, ColumnPage) for page in pages)
+    assert _entries(pages) == [
+        {'key': 'logs/a b.txt', 'size': 10, 'modified': datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+         'etag': 'e1', 'storage_class': 'STANDARD'},
+        {'key': 'logs/100%.txt', 'size': 20, 'modified': datetime(2024, 1, 4, tzinfo=timezone.utc),
+         'etag': 'e2', 'storage_class': 'GLACIER'},
+        {'key': 'other/c.txt', 'size': 30, 'modified': datetime(2024, 1, 5, tzinfo=timezone.utc),
+         'etag': 'e3', 'storage_class': 'STANDARD'},
+    ]
+    assert source.last_key == 'other/c.txt'
+    assert [entry['key'] for entry in _entries(source.iter_pages(None, prefix='logs/'))] == \
+        ['logs/a b.txt', 'logs/100%.txt']
+
+
+def test_csv_inventory_without_pyarrow_matches(tmp_path, monkeypatch):
+    pytest.importorskip('pyarrow')
+    expected = _entries(_csv_inventory(tmp_path).iter_pages(None))
+    monkeypatch.setattr(inventory, 'PYARROW_AVAILABLE', False)
+    assert _entries(_csv_inventory(tmp_path).iter_pages(None)) == expected
+
+
+def test_parquet_inventory(tmp_path):
+    pa = pytest.importorskip('pyarrow')
+    import pyarrow.parquet as pq
+    table = pa.table({
+        'bucket': ['b', 'b', 'b'],
+        'key': ['x/1', 'x/2', 'x/3'],
+        'is_latest': [True, True, False],
+        'is_delete_marker': [False, True, False],
+        'size': pa.array([5, None, 7], pa.int64()),
+        'last_modified_date': pa.array([datetime(2024, 5, 1), datetime(2024, 5, 2), None],
+                                       pa.timestamp('ms')),
+        'e_tag': ['a', 'b', 'c'],
+    })
+    pq.write_table(table, tmp_path / 'data.parquet')
+    manifest = {'fileFormat': 'Parquet', 'destinationBucket': 'arn:aws:s3:::inv',
+                'files': [{'key': 'data.parquet'}]}
+    (tmp_path / 'manifest.json').write_text(json.dumps(manifest))
+    
+    entries = _entries(InventorySource(str(tmp_path / 'manifest.json')).iter_pages(None))
+    assert entries == [{'key': 'x/1', 'size': 5, 'modified': datetime(2024, 5, 1, tzinfo=timezone.utc),
+                        'etag': 'a'}]
+
+
+def test_column_pages_spill_and_roll_up():
+    page = ColumnPage(['a/1', 'a/2', 'b/3'], [1, 2, 3], [0.0, 10.0, 20.0], ['x', 'y', 'z'])
+    store = ListingStore(memory_budget=1)
+    store.extend([{'key': 'a/0', 'size': 4, 'modified': datetime(1970, 1, 1, tzinfo=timezone.utc),
+                   'etag': 'w'}])
+    store.extend(page)
+    try:
+        assert store.spilled
+        assert [entry['key'] for entry in store] == ['a/0', 'a/1', 'a/2', 'b/3']
+        assert store[2] == {'key': 'a/2', 'size': 2, 'etag': 'y', 'storage_class': 'STANDARD',
+                            'modified': datetime(1970, 1, 1, 0, 0, 10, tzinfo=timezone.utc)}
+    finally:
+        store.close()
+        
+    rollup = PrefixRollup()
+    rollup.add_entries(page)
+    assert rollup.get('a/')['bytes'] == 3
+    assert rollup.get()['count'] == 3
@@ -0,0 +1,73 @@
+# MIT License
+# 
+# Copyright (c) 2025 S3Ducky
+
+"""
+Tests for listing diffs: the merge-join reports inserted and updated
+entries by their index in the new listing and deleted ones by their
+index in the old listing, wherever in the listing they are.
+"""
+
+from datetime import datetime, timezone
+import pytest
+from s3ducky.core.listing_diff import diff_listings
+
+
+def _entry(key, size=1, etag=None):
+    return {'key': key, 'size': size, 'modified': datetime(2025, 1, 1, tzinfo=timezone.utc),
+            'etag': etag or f"etag-{key}"}
+
+
+def _listing(*keys):
+    return [_entry(key) for key in keys]
+
+
+def _diff(old, new):
+    diff = diff_listings(old, new)
+    return diff.inserted, diff.deleted, diff.updated
+
+
+@pytest.mark.parametrize('new_keys, inserted', [
+    (('0', 'b', 'd', 'f'), [0]),
+    (('b', 'c', 'd', 'f'), [1]),
+    (('b', 'd', 'f', 'g', 'h'), [3, 4]),
+])
+def test_inserts_at_head_middle_and_tail(new_keys, inserted):
+    assert _diff(_listing('b', 'd', 'f'), _listing(*new_keys)) == (inserted, [], [])
+
+
+@pytest.mark.parametrize('new_keys, deleted', [
+    (('d', 'f'), [0]),
+    (('b', 'f'), [1]),
+    (('b',), [1, 2]),
+])
+def test_deletes_at_head_middle_and_tail(new_keys, deleted):
+    assert _diff(_listing('b', 'd', 'f'), _listing(*new_keys)) == ([], deleted, [])
+
+
+@pytest.mark.parametrize('changed', [0, 1, 2])
+def test_updates_at_head_middle_and_tail(changed):
+    old = _listing('b', 'd', 'f')
+    new = _listing('b', 'd', 'f')
+    new[changed] = _entry(new[changed]['key'], size=99)
+    assert _diff(old, new) == ([], [], [changed])
+
+
+def test_etag_only_change_is_an_update():
+    old = _listing('a', 'b')
+    new = [_entry('a'), _entry('b', etag='rewritten')]
+    assert _diff(old, new) == ([], [], [1])
+
+
+def test_empty_old_or_new_listing():
+    assert _diff([], _listing('a', 'b')) == ([0, 1], [], [])
+    assert _diff(_listing('a', 'b'), []) == ([], [0, 1], [])
+    diff = diff_listings([], [])
+    assert diff.is_empty() and diff.summary() == "+0 / −0 / ~0"
+
+
+def test_mixed_changes_index_the_right_listing():
+    old = _listing('a', 'c', 'e', 'g')
+    new = [_entry('b'), _entry('c', size=5), _entry('e'), _entry('f'), _entry('h')]
+    # Inserted/updated index the new listing, deleted the old one
+    assert _diff(old, new) == ([0, 3, 4], [0, 3], [1])
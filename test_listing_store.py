@@ -0,0 +1,89 @@
+# MIT License
+# 
+# Copyright (c) 2025 S3Ducky
+
+"""
+Tests for the listing store: a spilled listing stays in key order and
+reads, inserts and removals by key match a plain sorted list.
+"""
+
+import bisect
+import random
+from datetime import datetime, timezone
+from s3ducky.core import listing_store
+from s3ducky.core.listing_store import ListingStore, ColumnPage
+
+
+def _entry(key, size=1):
+    return {'key': key, 'size': size, 'modified': datetime(2025, 1, 1, tzinfo=timezone.utc),
+            'etag': f"etag-{key}", 'storage_class': 'STANDARD'}
+
+
+def _keys(store):
+    return [store[index]['key'] for index in range(len(store))]
+
+
+def test_spill_keeps_key_order(monkeypatch, tmp_path):
+    monkeypatch.setattr(listing_store, 'BLOCK_ROWS', 4)
+    keys = [f"k{index:04d}" for index in range(200)]
+    shuffled = keys[:]
+    random.Random(7).shuffle(shuffled)
+    store = ListingStore(memory_budget=2000, spill_dir=str(tmp_path))
+    store.extend([_entry(key) for key in shuffled[:3]])
+    assert not store.spilled
+    store.extend([_entry(key) for key in shuffled[3:100]])
+    store.extend(ColumnPage(shuffled[100:], [1] * 100, [0.0] * 100, ['e'] * 100))
+    assert store.spilled
+    assert len(store) == 200
+    assert _keys(store) == keys
+    assert [file_info['key'] for file_info in store] == keys
+    assert store[-1]['key'] == keys[-1]
+    store.close()
+    assert not list(tmp_path.iterdir())
+
+
+def test_spilled_insert_remove_and_bisect(monkeypatch, tmp_path):
+    monkeypatch.setattr(listing_store, 'BLOCK_ROWS', 4)
+    store = ListingStore(memory_budget=1, spill_dir=str(tmp_path))
+    expected = [f"a/{index:03d}" for index in range(0, 100, 2)]
+    store.extend([_entry(key) for key in expected])
+    
+    for key in ('a/001', 'a/051', 'a/099', '0-first'):
+        index = store.bisect_key(key)
+        store.insert(index, _entry(key))
+        expected.insert(index, key)
+    assert _keys(store) == expected == sorted(expected)
+    
+    removed = store.remove_keys(['a/000', 'a/051', 'a/050', 'not-listed'] + expected[20:40])
+    gone = {'a/000', 'a/051', 'a/050'} | set(expected[20:40])
+    assert sorted(file_info['key'] for file_info in removed) == sorted(gone)
+    expected = [key for key in expected if key not in gone]
+    assert _keys(store) == expected
+    assert store.bisect_key('a/051') == bisect.bisect_left(expected, 'a/051')
+    assert store.bisect_key('zzz') == len(expected)
+    
+    store[3] = _entry(expected[3], size=99)
+    assert store[3]['size'] == 99 and _keys(store) == expected
+    store.close()
+
+
+def test_in_memory_store_removes_by_key():
+    store = ListingStore()
+    store.extend([_entry(key) for key in ('a', 'b', 'c')])
+    assert [file_info['key'] for file_info in store.remove_keys({'b', 'x'})] == ['b']
+    assert _keys(store) == ['a', 'c']
+    
+    keys = [f"k{index:03d}" for index in range(100)]
+    store = ListingStore()
+    store.extend([_entry(key) for key in keys])
+    # A run of neighbours, scattered keys and both ends
+    gone = set(keys[10:30]) | {keys[0], keys[45], keys[47], keys[99]}
+    removed = store.remove_keys(gone | {'k0455'})
+    assert [file_info['key'] for file_info in removed] == sorted(gone)
+    assert _keys(store) == [key for key in keys if key not in gone]
+    
+    # An inventory in report order is filtered instead of bisected
+    store = ListingStore()
+    store.extend([_entry(key) for key in ('c', 'a', 'd', 'b')])
+    assert [file_info['key'] for file_info in store.remove_keys({'a', 'b'})] == ['a', 'b']
+    assert _keys(store) == ['c', 'd']
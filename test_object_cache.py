@@ -0,0 +1,95 @@
+# MIT License
+# 
+# Copyright (c) 2025 S3Ducky
+
+"""
+Tests for the download object cache: LRU eviction and pinning, copies that
+stay independent of the cache, and zip builds that outgrow the cache cap.
+"""
+
+import os
+import zipfile
+from s3ducky.core.disk_cache import DiskCache
+from s3ducky.core.file_manager import FileManager
+from s3ducky.core.memory_storage import MemoryBackend
+from s3ducky.core.object_cache import ObjectCache
+
+
+def _backend(objects):
+    backend = MemoryBackend()
+    backend.connect('mem')
+    for key, data in objects.items():
+        backend.add_object(key, data)
+    return backend
+
+
+def test_disk_cache_evicts_least_recently_used(tmp_path):
+    cache = DiskCache(str(tmp_path), 10)
+    cache.put_bytes('a', b'1234')
+    cache.put_bytes('b', b'1234')
+    assert cache.get('a')
+    cache.put_bytes('c', b'1234')
+    assert 'b' not in cache
+    assert 'a' in cache and 'c' in cache
+    assert cache.total_bytes == 8
+    assert sorted(os.listdir(tmp_path)) == ['a', 'c']
+
+
+def test_disk_cache_keeps_pinned_entries_until_unpinned(tmp_path):
+    cache = DiskCache(str(tmp_path), 10)
+    cache.put_bytes('a', b'1234')
+    assert cache.get('a', pin=True)
+    cache.put_bytes('b', b'1234')
+    cache.put_bytes('c', b'1234')
+    assert 'a' in cache and 'b' not in cache
+    cache.unpin('a')
+    cache.put_bytes('d', b'1234')
+    assert 'a' not in cache
+
+
+def test_downloaded_file_is_independent_of_the_cache(tmp_path):
+    backend = _backend({'docs/a.txt': b'original'})
+    object_cache = ObjectCache(str(tmp_path / 'cache'), 1024)
+    manager = FileManager(backend, object_cache, verify=False)
+    dest = tmp_path / 'out'
+    dest.mkdir()
+    
+    manager.download_files_individually(['docs/a.txt'], str(dest))
+    # Edit the download in place, keeping its size
+    with open(dest / 'a.txt', 'r+b') as f:
+        f.write(b'EDITED!!')
+    os.remove(dest / 'a.txt')
+    manager.download_files_individually(['docs/a.txt'], str(dest))
+    
+    assert manager.last_cache_stats.hits == 1
+    assert (dest / 'a.txt').read_bytes() == b'original'
+
+
+def test_zip_larger_than_cache_cap(tmp_path):
+    objects = {f'docs/{i}.bin': bytes([i]) * (120 if i >= 4 else 100) for i in range(6)}
+    backend = _backend(objects)
+    object_cache = ObjectCache(str(tmp_path / 'cache'), 250)
+    manager = FileManager(backend, object_cache, verify=False, download_concurrency=1)
+    keys = sorted(objects)
+    
+    manager.download_files_individually(keys[4:], str(tmp_path))
+    # The two largest objects are cached and read first; storing the
+    # misses after them would evict them before the zip reads them
+    zip_path = str(tmp_path / 'all.zip')
+    file_infos = [{'key': key, 'size': len(data)} for key, data in objects.items()]
+    manager.download_files_as_zip(keys, zip_path, file_infos=file_infos)
+    
+    with zipfile.ZipFile(zip_path) as zipf:
+        assert {name: zipf.read(name) for name in zipf.namelist()} == \
+            {key.split('/')[-1]: data for key, data in objects.items()}
+    assert not object_cache.disk_cache._pins
+    assert object_cache.disk_cache.total_bytes <= 250
+
+
+def test_cache_turned_on_mid_job(tmp_path):
+    backend = _backend({'docs/a.txt': b'content'})
+    manager = FileManager(backend, verify=False)
+    manager.object_cache = ObjectCache(str(tmp_path / 'cache'), 1024)
+    manager._download_object('docs/a.txt', str(tmp_path / 'a.txt'), cache_stats=None)
+    manager._download_object('docs/a.txt', str(tmp_path / 'b.txt'), cache_stats=None)
+    assert (tmp_path / 'b.txt').read_bytes() == b'content'
@@ -0,0 +1,92 @@
+# MIT License
+# 
+# Copyright (c) 2025 S3Ducky
+
+"""
+Tests for archive awareness: which objects need a restore before they
+can be downloaded, judged from the listing alone or from a HEAD
+response, and how their storage class is labelled.
+"""
+
+from datetime import datetime, timezone
+import pytest
+from s3ducky.core.object_metadata import (
+    parse_restore, may_need_restore, needs_restore, storage_label, restore_objects)
+
+
+def _head(storage_class=None, archive_status=None, restore=None):
+    return {'storage_class': storage_class, 'archive_status': archive_status, 'restore': parse_restore(restore)}
+
+
+RESTORED = 'ongoing-request="false", expiry-date="Fri, 21 Dec 2012 00:00:00 GMT"'
+RESTORING = 'ongoing-request="true"'
+
+
+def test_parse_restore():
+    assert parse_restore(None) is None
+    assert parse_restore(RESTORING) == {'ongoing': True, 'expiry': None}
+    assert parse_restore(RESTORED) == {'ongoing': False,
+                                       'expiry': datetime(2012, 12, 21, tzinfo=timezone.utc)}
+
+
+@pytest.mark.parametrize('storage_class, may, needs', [
+    (None, False, False),
+    ('STANDARD', False, False),
+    ('STANDARD_IA', False, False),
+    ('GLACIER_IR', False, False),            # instant retrieval reads like STANDARD
+    ('GLACIER', True, True),
+    ('DEEP_ARCHIVE', True, True),
+    ('INTELLIGENT_TIERING', True, False),    # only HEAD shows an archive tier
+])
+def test_listing_entries(storage_class, may, needs):
+    file_info = {'key': 'a', 'storage_class': storage_class}
+    assert may_need_restore(file_info) is may
+    assert needs_restore(file_info) is needs
+
+
+@pytest.mark.parametrize('head, needs', [
+    (_head('GLACIER'), True),
+    (_head('GLACIER', restore=RESTORING), True),
+    (_head('GLACIER', restore=RESTORED), False),
+    (_head('INTELLIGENT_TIERING'), False),
+    (_head('INTELLIGENT_TIERING', archive_status='DEEP_ARCHIVE_ACCESS'), True),
+    (_head('INTELLIGENT_TIERING', archive_status='ARCHIVE_ACCESS', restore=RESTORED), False),
+])
+def test_head_responses(head, needs):
+    assert needs_restore({'key': 'a', 'storage_class': 'GLACIER'}, head) is needs
+
+
+@pytest.mark.parametrize('head, label', [
+    (None, 'DEEP_ARCHIVE'),
+    (_head(), 'DEEP_ARCHIVE'),
+    (_head('GLACIER', restore=RESTORING), 'GLACIER (restoring)'),
+    (_head('GLACIER', restore=RESTORED), 'GLACIER (restored until 2012-12-21)'),
+    (_head('GLACIER', restore='ongoing-request="false"'), 'GLACIER (restored)'),
+    (_head('INTELLIGENT_TIERING', archive_status='ARCHIVE_ACCESS'), 'INTELLIGENT_TIERING (archive_access)'),
+])
+def test_storage_labels(head, label):
+    assert storage_label({'key': 'a', 'storage_class': 'DEEP_ARCHIVE'}, head) == label
+
+
+class _RestoringBackend:
+    """Backend whose restore_object() records its calls."""
+    
+    def __init__(self):
+        self.calls = {}
+        
+    def restore_object(self, key, days=7, tier='Standard'):
+        if key == 'broken':
+            raise Exception("Access denied")
+        self.calls[key] = (days, tier)
+        return key != 'pending'
+
+
+def test_restore_objects_sorts_outcomes():
+    backend = _RestoringBackend()
+    started, in_progress, failed = restore_objects(
+        backend, ['a', 'pending', 'broken', 'tiered'], days=3, tier='Bulk', tiering_keys=['tiered'])
+    
+    assert sorted(started) == ['a', 'tiered'] and in_progress == ['pending']
+    assert failed == {'broken': "Access denied"}
+    # Intelligent-Tiering restores have no expiry
+    assert backend.calls['a'] == (3, 'Bulk') and backend.calls['tiered'] == (None, 'Bulk')
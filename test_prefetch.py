@@ -0,0 +1,50 @@
+# MIT License
+# 
+# Copyright (c) 2025 S3Ducky
+
+"""
+Tests for prefetched connections: the form's connection details find the
+connection prefetched for a tab's sibling however the fields were typed,
+and only fields that change the connection tell connections apart.
+"""
+
+import pytest
+from s3ducky.app import _prefetch_key
+from s3ducky.core.prefetch import PrefetchCache
+
+
+# Details of a prefetched sibling, as built from a tab's credentials
+SIBLING = {'bucket_name': 'data', 'resource_prefix': 'logs/', 'access_key': 'AKIA1', 'secret_key': 'secret',
+           'region': 'us-east-1', 'endpoint_url': '', 'addressing_style': 'auto', 'accelerate': False,
+           'dualstack': False, 'inventory_manifest': '', 'inventory_top_up': False}
+
+
+@pytest.mark.parametrize('typed', [
+    dict(resource_prefix='logs'),                                  # no trailing slash
+    dict(resource_prefix=' logs/ ', bucket_name=' data '),         # stray whitespace
+    dict(endpoint_url=None, addressing_style='', dualstack=None),  # blank defaults
+    dict(inventory_top_up=True),                                   # ignored without a manifest
+])
+def test_form_details_find_the_prefetched_connection(typed):
+    cache = PrefetchCache()
+    cache.put(_prefetch_key(SIBLING), 'connection')
+    assert cache.take(_prefetch_key(dict(SIBLING, **typed))) == 'connection'
+
+
+@pytest.mark.parametrize('changed', [
+    dict(resource_prefix='logs/2025/'),
+    dict(access_key='AKIA2'),
+    dict(region='eu-west-1'),
+    dict(endpoint_url='http://minio:9000'),
+    dict(addressing_style='path'),
+    dict(accelerate=True),
+    dict(inventory_manifest='s3://reports/manifest.json'),
+])
+def test_connection_fields_tell_connections_apart(changed):
+    assert _prefetch_key(dict(SIBLING, **changed)) != _prefetch_key(SIBLING)
+
+
+def test_local_and_synthetic_buckets_key_on_their_name():
+    details = dict(SIBLING, bucket_name='file:///srv/mirror', resource_prefix='logs')
+    assert _prefetch_key(details) == _prefetch_key({'bucket_name': 'file:///srv/mirror',
+                                                    'resource_prefix': 'logs/'})
@@ -0,0 +1,47 @@
+# MIT License
+# 
+# Copyright (c) 2025 S3Ducky
+
+"""
+Tests for prefix downloads: keys map below the destination folder, and
+no key can write outside it.
+"""
+
+import os
+from s3ducky.core.memory_storage import MemoryBackend
+from s3ducky.core.prefix_download import local_path_for, normalize_prefix, download_prefix
+
+
+def test_normalize_prefix():
+    assert normalize_prefix(None) == ''
+    assert normalize_prefix(' logs ') == 'logs/'
+    assert normalize_prefix('logs/') == 'logs/'
+
+
+def test_keys_keep_their_path_below_the_prefix(tmp_path):
+    dest = str(tmp_path)
+    assert local_path_for('logs/a/report.csv', 'logs/', dest) == os.path.join(dest, 'a', 'report.csv')
+    assert local_path_for('logs/b/report.csv', 'logs/', dest) == os.path.join(dest, 'b', 'report.csv')
+    assert local_path_for('logs/a/', 'logs/', dest) is None
+
+
+def test_dot_segments_cannot_leave_the_destination(tmp_path):
+    dest = str(tmp_path)
+    assert local_path_for('logs/../../etc/passwd', 'logs/', dest) == os.path.join(dest, 'etc', 'passwd')
+    assert local_path_for('logs/a/./..//b', 'logs/', dest) == os.path.join(dest, 'a', 'b')
+    assert local_path_for('logs/..', 'logs/', dest) is None
+
+
+def test_download_prefix_stops_at_the_end_of_the_prefix(tmp_path):
+    backend = MemoryBackend()
+    backend.connect('mem')
+    for key in ('logs/', 'logs/a/1.txt', 'logs/b/2.txt', 'logsx/3.txt', 'other/4.txt'):
+        backend.add_object(key, b'data')
+    downloaded = []
+    
+    def download(key, local_path):
+        downloaded.append((key, os.path.relpath(local_path, str(tmp_path))))
+    count, nbytes, skipped = download_prefix(backend, 'logs', str(tmp_path), download, workers=2)
+    assert (count, nbytes, skipped) == (2, 8, [])
+    assert sorted(downloaded) == [('logs/a/1.txt', os.path.join('a', '1.txt')),
+                                  ('logs/b/2.txt', os.path.join('b', '2.txt'))]
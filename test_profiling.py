@@ -0,0 +1,53 @@
+# MIT License
+# 
+# Copyright (c) 2025 S3Ducky
+
+"""
+Tests for the profiling mode: disabled phases cost nothing, enabled ones
+are timed (nested ones too) and written out as a report.
+"""
+
+from s3ducky.utils import profiling
+from s3ducky.utils.profiling import Profiler, profile_phase, profiled
+
+
+def test_disabled_profiling_is_a_no_op(monkeypatch):
+    monkeypatch.setattr(profiling, '_profiler', None)
+    assert profile_phase('list') is profiling._NULL_PHASE
+    
+    @profiled('render')
+    def render(value):
+        return value * 2
+    assert render(21) == 42
+
+
+def test_phases_are_timed_and_reported(monkeypatch, tmp_path):
+    profiler = Profiler()
+    monkeypatch.setattr(profiling, '_profiler', profiler)
+    
+    @profiled('render')
+    def render():
+        with profile_phase('list'):
+            return sum(range(1000))
+    for _ in range(3):
+        render()
+    
+    assert profiler.phases['render'].calls == 3 and profiler.phases['list'].calls == 3
+    assert profiler.phases['render'].total_time >= profiler.phases['list'].total_time
+    assert not profiler.active and profiler.local.depth == 0
+    path = profiler.write(str(tmp_path))
+    report = open(path, encoding='utf-8').read()
+    assert "render: 3 calls" in report and "list: 3 calls" in report
+
+
+def test_cpu_mode_keeps_top_functions(monkeypatch, tmp_path):
+    profiler = Profiler(cpu=True)
+    monkeypatch.setattr(profiling, '_profiler', profiler)
+    with profile_phase('zip'):
+        sorted(range(10000), reverse=True)
+    if profiler.phases['zip'].cpu_stats is None:
+        # Another cProfile (e.g. a coverage tool) was already running
+        return
+    assert "top functions" in profiler.report()
+    profiler.write(str(tmp_path))
+    assert any(p.suffix == '.prof' for p in tmp_path.iterdir())
@@ -0,0 +1,44 @@
+# MIT License
+# 
+# Copyright (c) 2025 S3Ducky
+
+"""
+Tests for per-prefix rollups: subtracting removed entries gives the same
+bytes and counts as adding up what is left.
+"""
+
+from datetime import datetime, timedelta, timezone
+import pytest
+from s3ducky.core import rollups
+from s3ducky.core.rollups import PrefixRollup
+
+
+def _entry(key, size, days=0):
+    return {'key': key, 'size': size,
+            'modified': datetime(2025, 1, 1, tzinfo=timezone.utc) + timedelta(days=days)}
+
+
+def _totals(rollup, prefix=''):
+    row = rollup.get(prefix)
+    return row['bytes'], row['count']
+
+
+@pytest.mark.parametrize('numpy', [True, False])
+def test_remove_entries_matches_a_recount(monkeypatch, numpy):
+    if numpy and not rollups.NUMPY_AVAILABLE:
+        pytest.skip("NumPy is not installed")
+    monkeypatch.setattr(rollups, 'NUMPY_AVAILABLE', numpy)
+    entries = [_entry('top.txt', 1), _entry('a/1.txt', 10, 1), _entry('a/2.txt', 20, 2),
+               _entry('a/b/3.txt', 300, 3), _entry('c/4.txt', 4000, 4)]
+    rollup = PrefixRollup()
+    rollup.add_entries(entries)
+    rollup.remove_entries([entries[2], entries[3]])
+    
+    recount = PrefixRollup()
+    recount.add_entries([entries[0], entries[1], entries[4]])
+    for prefix in ('', 'a/', 'c/'):
+        assert _totals(rollup, prefix) == _totals(recount, prefix)
+    # The emptied folder is gone from the folder list and has no dates
+    assert _totals(rollup, 'a/b/') == (0, 0) and rollup.get('a/b/')['newest'] is None
+    assert not rollup.has_children('a/')
+    assert [row['prefix'] for row in rollup.child_rows()] == ['a/', 'c/']
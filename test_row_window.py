@@ -0,0 +1,36 @@
+# MIT License
+# 
+# Copyright (c) 2025 S3Ducky
+
+"""
+Tests for the scroll arithmetic of the virtual file list.
+"""
+
+from s3ducky.gui.row_window import RowWindow
+
+
+def test_window_stays_within_the_list():
+    window = RowWindow(rows=10, total=25)
+    assert (window.start, window.end) == (0, 10)
+    assert window.scroll_by(100)
+    assert (window.start, window.end) == (15, 25)
+    assert not window.scroll_by(1)
+    window.set_total(12)
+    assert (window.start, window.end) == (2, 12)
+    window.set_total(4)
+    assert (window.start, window.end) == (0, 4)
+    assert window.fractions() == (0.0, 1.0)
+
+
+def test_scrollbar_commands():
+    window = RowWindow(rows=10, total=1000)
+    assert window.scroll_command('moveto', '0.5')
+    assert window.start == 500
+    assert window.fractions() == (0.5, 0.51)
+    window.scroll_command('scroll', '1', 'pages')
+    assert window.start == 509
+    window.scroll_command('scroll', '-2', 'units')
+    assert window.start == 507
+    window.set_rows(50)
+    window.scroll_command('moveto', '1.0')
+    assert (window.start, window.end) == (950, 1000)
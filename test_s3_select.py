@@ -0,0 +1,69 @@
+# MIT License
+# 
+# Copyright (c) 2025 S3Ducky
+
+"""
+Tests for S3 Select queries: the input serialization built from an
+object's name, and result payloads split mid-row turned back into rows.
+"""
+
+import json
+import pytest
+from s3ducky.core.s3_select import SelectQuery, input_serialization, is_queryable
+
+
+@pytest.mark.parametrize('key, expected', [
+    ('data/a.csv', {'CSV': {'FileHeaderInfo': 'USE'}, 'CompressionType': 'NONE'}),
+    ('data/A.TSV.gz', {'CSV': {'FileHeaderInfo': 'USE', 'FieldDelimiter': '\t'}, 'CompressionType': 'GZIP'}),
+    ('logs/events.ndjson.bz2', {'JSON': {'Type': 'LINES'}, 'CompressionType': 'BZIP2'}),
+    ('logs/events.jsonl', {'JSON': {'Type': 'LINES'}, 'CompressionType': 'NONE'}),
+    ('config.json', {'JSON': {'Type': 'DOCUMENT'}, 'CompressionType': 'NONE'}),
+    ('table.parquet', {'Parquet': {}}),
+    # Parquet compresses inside the file; S3 Select doesn't take it gzipped
+    ('table.parquet.gz', None),
+    ('photo.jpg', None),
+])
+def test_input_serialization_from_the_key(key, expected):
+    assert input_serialization(key) == expected
+    assert is_queryable(key) == (expected is not None)
+
+
+class _SelectClient:
+    """Yields a fixed result the way S3 splits it into record payloads."""
+    
+    def __init__(self, payloads):
+        self.payloads = payloads
+        self.calls = []
+        
+    def select_object(self, key, expression, serialization, stats):
+        self.calls.append((key, expression, serialization))
+        stats['returned'] = sum(len(payload) for payload in self.payloads)
+        yield from self.payloads
+
+
+def _rows_payloads():
+    data = b''.join(json.dumps({'id': index, 'name': f"n{index}"}).encode() + b'\n' for index in range(5))
+    # Cut mid-row, and leave the last row without its newline
+    return [data[:7], data[7:40], data[40:-1]]
+
+
+def test_rows_are_rebuilt_across_payloads():
+    client = _SelectClient(_rows_payloads())
+    query = SelectQuery(client, 'a.jsonl', "SELECT * FROM s3object s")
+    rows = [row for batch in query.iter_batches() for row in batch]
+    assert [row['id'] for row in rows] == list(range(5)) and query.row_count == 5
+    assert client.calls == [('a.jsonl', "SELECT * FROM s3object s", {'JSON': {'Type': 'LINES'},
+                                                                     'CompressionType': 'NONE'})]
+    assert query.stats['returned'] > 0
+
+
+def test_save_writes_csv_with_a_header(tmp_path):
+    query = SelectQuery(_SelectClient(_rows_payloads()), 'a.csv', "SELECT * FROM s3object s")
+    path = tmp_path / 'result.csv'
+    assert query.save(str(path)) == 5
+    assert path.read_text().splitlines()[:2] == ['id,name', '0,n0']
+
+
+def test_unqueryable_object_is_rejected():
+    with pytest.raises(ValueError):
+        SelectQuery(_SelectClient([]), 'photo.jpg', "SELECT * FROM s3object s")
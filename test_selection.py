@@ -0,0 +1,83 @@
+# MIT License
+# 
+# Copyright (c) 2025 S3Ducky
+
+"""
+Tests for selections: selecting everything reads no keys, deselections
+made afterwards are remembered, and the listing is only read when the
+selected keys are asked for.
+"""
+
+from datetime import datetime, timezone
+from s3ducky.core.listing_store import ListingStore
+from s3ducky.core.selection import Selection
+
+
+class _CountingListing(ListingStore):
+    """Listing that counts how often it is iterated."""
+    
+    def __init__(self, entries):
+        super().__init__()
+        self.extend(entries)
+        self.iterations = 0
+        
+    def __iter__(self):
+        self.iterations += 1
+        return super().__iter__()
+
+
+def _listing(count):
+    modified = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    return _CountingListing([{'key': f"k{i:04d}", 'size': 1, 'modified': modified, 'etag': str(i)}
+                             for i in range(count)])
+
+
+def test_select_all_does_not_read_the_listing():
+    files_list = _listing(1000)
+    selection = Selection()
+    selection.select_all()
+    selection.deselect('k0001')
+    
+    assert 'k0000' in selection and 'k0001' not in selection
+    assert selection.count(len(files_list)) == 999
+    assert files_list.iterations == 0
+
+
+def test_resolve_reads_the_listing_only_when_everything_is_selected():
+    files_list = _listing(5)
+    selection = Selection(['k0003', 'k0001'])
+    assert selection.resolve(files_list) == ['k0001', 'k0003']
+    assert files_list.iterations == 0
+    
+    selection.select_all()
+    selection.deselect('k0002')
+    assert selection.resolve(files_list) == ['k0000', 'k0001', 'k0003', 'k0004']
+    assert selection.first(files_list) == 'k0000'
+    
+    selection.select('k0002')
+    assert selection.count(len(files_list)) == 5
+
+
+def test_forget_drops_removed_keys_in_both_modes():
+    files_list = _listing(5)
+    selection = Selection(['k0001', 'k0002'])
+    selection.forget(['k0001'])
+    assert selection.count(len(files_list)) == 1
+    
+    selection.select_all()
+    selection.deselect('k0004')
+    removed = files_list.remove_keys({'k0004'})
+    selection.forget(entry['key'] for entry in removed)
+    assert selection.count(len(files_list)) == 4
+    assert selection.resolve(files_list) == ['k0000', 'k0001', 'k0002', 'k0003']
+
+
+def test_copy_is_independent():
+    selection = Selection()
+    selection.select_all()
+    saved = selection.copy()
+    selection.clear()
+    
+    assert saved.everything and 'k0000' in saved
+    assert 'k0000' not in selection
+    assert Selection().first(_listing(3)) is None
@@ -0,0 +1,76 @@
+# MIT License
+# 
+# Copyright (c) 2025 S3Ducky
+
+"""
+Tests for the storage backend interface.
+"""
+
+import os
+import pytest
+from s3ducky.core.storage import SimpleBackend
+from s3ducky.core.local_storage import LocalBackend
+from s3ducky.core.memory_storage import MemoryBackend
+
+
+class _NoDeleteBackend(SimpleBackend):
+    """Implements every primitive but _delete."""
+    
+    def _iter_objects(self, start_after=None):
+        return iter(())
+        
+    def _read(self, key, start, end):
+        return b''
+        
+    def _stat(self, key):
+        raise KeyError(key)
+        
+    def _write(self, key, chunks):
+        return {}
+
+
+def test_incomplete_backend_fails_when_created():
+    with pytest.raises(TypeError, match='_delete'):
+        _NoDeleteBackend()
+
+
+def test_memory_backend_is_complete():
+    backend = MemoryBackend()
+    backend.connect('mem')
+    backend.add_object('a.txt', b'abc')
+    assert backend.get_object_bytes('a.txt', (1, 2)) == b'bc'
+    backend.delete_object('a.txt')
+    assert backend.take_first_page() == ([], None)
+
+
+def test_local_writes_of_one_key_do_not_share_a_temporary_file(tmp_path):
+    backend = LocalBackend()
+    backend.connect(str(tmp_path))
+    
+    def chunks(data, inner=None):
+        yield data
+        # Start a second write of the key while this one is half done
+        if inner is not None:
+            backend._write('a.txt', inner)
+        yield data
+        
+    backend._write('a.txt', chunks(b'1', chunks(b'2')))
+    
+    assert backend.get_object_bytes('a.txt') == b'11'
+    assert os.listdir(tmp_path) == ['a.txt']
+    assert [entry['key'] for entry in backend.take_first_page()[0]] == ['a.txt']
+
+
+def test_local_write_failure_keeps_the_old_object(tmp_path):
+    backend = LocalBackend()
+    backend.connect(str(tmp_path))
+    backend._write('a.txt', [b'old'])
+    
+    def failing():
+        yield b'new'
+        raise OSError("connection lost")
+        
+    with pytest.raises(OSError):
+        backend._write('a.txt', failing())
+    assert backend.get_object_bytes('a.txt') == b'old'
+    assert os.listdir(tmp_path) == ['a.txt']
@@ -0,0 +1,77 @@
+# MIT License
+# 
+# Copyright (c) 2025 S3Ducky
+
+"""
+Tests for thumbnail generation: large JPEGs are thumbnailed from a ranged
+read of their EXIF preview, everything else from the whole object.
+"""
+
+import io
+import os
+import struct
+from PIL import Image
+from s3ducky.core.disk_cache import DiskCache
+from s3ducky.core.memory_storage import MemoryBackend
+from s3ducky.core.thumbnails import ThumbnailGenerator, PREVIEW_BYTES
+
+
+def _camera_jpeg(with_preview=True):
+    """A JPEG well over PREVIEW_BYTES, with an IFD1 preview as cameras write it."""
+    image = Image.frombytes('RGB', (800, 800), os.urandom(800 * 800 * 3))
+    if not with_preview:
+        out = io.BytesIO()
+        image.save(out, 'JPEG', quality=95)
+        return out.getvalue()
+        
+    preview = io.BytesIO()
+    Image.new('RGB', (160, 120), (200, 30, 30)).save(preview, 'JPEG')
+    preview = preview.getvalue()
+    # TIFF header, empty IFD0 pointing at IFD1 (compression, preview offset and length)
+    ifd1 = struct.pack('<H', 3)
+    ifd1 += struct.pack('<HHII', 0x0103, 3, 1, 6)
+    ifd1 += struct.pack('<HHII', 0x0201, 4, 1, 14 + 2 + 3 * 12 + 4)
+    ifd1 += struct.pack('<HHII', 0x0202, 4, 1, len(preview))
+    ifd1 += struct.pack('<I', 0)
+    tiff = b'II*\x00' + struct.pack('<I', 8) + struct.pack('<HI', 0, 14) + ifd1 + preview
+    out = io.BytesIO()
+    image.save(out, 'JPEG', exif=b'Exif\x00\x00' + tiff, quality=95)
+    return out.getvalue()
+
+
+def _generator(tmp_path, data):
+    backend = MemoryBackend()
+    backend.connect('mem')
+    file_info = backend.add_object('photos/big.jpg', data)
+    ranges = []
+    read = backend.get_object_bytes
+    
+    def recording_read(key, byte_range=None):
+        ranges.append(byte_range)
+        return read(key, byte_range)
+    backend.get_object_bytes = recording_read
+    
+    generator = ThumbnailGenerator(backend, cache=DiskCache(str(tmp_path), 1024 * 1024, suffix='.png'), workers=1)
+    return generator, file_info, ranges
+
+
+def test_large_jpeg_uses_exif_preview(tmp_path):
+    data = _camera_jpeg()
+    assert len(data) > PREVIEW_BYTES
+    generator, file_info, ranges = _generator(tmp_path, data)
+    try:
+        generator.warm(file_info)
+        assert ranges == [(0, PREVIEW_BYTES - 1)]
+        assert generator.get_cached(file_info)
+    finally:
+        generator.shutdown()
+
+
+def test_jpeg_without_preview_falls_back_to_whole_object(tmp_path):
+    generator, file_info, ranges = _generator(tmp_path, _camera_jpeg(with_preview=False))
+    try:
+        generator.warm(file_info)
+        assert ranges == [(0, PREVIEW_BYTES - 1), None]
+        assert generator.get_cached(file_info)
+    finally:
+        generator.shutdown()
@@ -0,0 +1,53 @@
+# MIT License
+# 
+# Copyright (c) 2025 S3Ducky
+
+"""
+Tests for the UI pump: the drain keeps itself scheduled whatever its
+callbacks do, and dialogs open outside it.
+"""
+
+from s3ducky.gui.ui_pump import UIPump
+
+
+class _FakeRoot:
+    """Records after() calls instead of running a Tk main loop."""
+    
+    def __init__(self):
+        self.scheduled = []
+        
+    def after(self, ms, callback, *args):
+        self.scheduled.append((ms, callback, args))
+        
+    def run_next(self):
+        ms, callback, args = self.scheduled.pop(0)
+        callback(*args)
+
+
+def test_drain_reschedules_before_running_callbacks():
+    root = _FakeRoot()
+    pump = UIPump(root, interval_ms=50)
+    seen = []
+    
+    def callback():
+        # The next drain is already scheduled while a callback runs
+        seen.append([entry[1] for entry in root.scheduled])
+        raise RuntimeError("boom")
+    pump.post(callback)
+    root.run_next()
+    assert seen == [[pump._drain]]
+    assert [entry[1] for entry in root.scheduled] == [pump._drain]
+
+
+def test_dialogs_open_from_their_own_after_callback():
+    root = _FakeRoot()
+    pump = UIPump(root, interval_ms=50)
+    opened = []
+    pump.post_latest('status', opened.append, 'status')
+    pump.post_dialog(opened.append, 'dialog')
+    root.run_next()
+    assert opened == ['status']
+    assert [(entry[0], entry[1]) for entry in root.scheduled] == [(50, pump._drain), (0, opened.append)]
+    root.scheduled.pop(0)
+    root.run_next()
+    assert opened == ['status', 'dialog']
@@ -0,0 +1,139 @@
+# MIT License
+# 
+# Copyright (c) 2025 S3Ducky
+
+"""
+Tests for the workspace: tab switching and closing keep a sensible tab
+active, tabs are told apart by endpoint and access key as well as by
+bucket, and the client cache hands out one client per connection.
+"""
+
+import pytest
+from s3ducky.core.listing_store import ListingStore
+from s3ducky.core.memory_storage import MemoryBackend
+from s3ducky.core.s3_client import S3Client, client_config
+from s3ducky.core.uploads import UploadState
+from s3ducky.core.workspace import ClientCache, Workspace, WorkspaceTab, credentials_location
+
+
+def _workspace(count):
+    workspace = Workspace()
+    for index in range(count):
+        backend = MemoryBackend()
+        backend.connect(f"bucket-{index}")
+        workspace.add_tab(WorkspaceTab(backend, None))
+    return workspace
+
+
+def test_switch_to_checks_the_index():
+    workspace = _workspace(2)
+    assert workspace.active_index == 1
+    assert workspace.switch_to(0) is workspace.tabs[0]
+    with pytest.raises(IndexError):
+        workspace.switch_to(2)
+    assert workspace.active_index == 0
+
+
+@pytest.mark.parametrize('active, closed, expected', [
+    (1, 1, 'bucket-2'),   # the active tab hands over to its right neighbour
+    (3, 3, 'bucket-2'),   # ... or to its left one when it was the last
+    (3, 0, 'bucket-3'),   # closing a tab before the active one shifts it left
+    (0, 2, 'bucket-0'),   # closing a tab after it changes nothing
+])
+def test_close_tab_keeps_a_neighbour_active(active, closed, expected):
+    workspace = _workspace(4)
+    workspace.switch_to(active)
+    closing = workspace.tabs[closed]
+    assert workspace.close_tab(closed).s3_client.bucket_name == expected
+    assert closing.s3_client.bucket_name == '' and len(workspace.tabs) == 3
+
+
+def test_closing_the_last_tab_leaves_none_active():
+    workspace = _workspace(1)
+    assert workspace.close_tab(0) is None
+    assert workspace.active_index is None and workspace.active_tab is None
+
+
+def test_refresh_diff_goes_stale_when_the_listing_changes():
+    backend = MemoryBackend()
+    backend.connect('bucket')
+    tab = WorkspaceTab(backend, None)
+    tab.files_list.extend([{'key': key, 'size': 1, 'modified': None, 'etag': key} for key in ('a', 'b')])
+    fresh = ListingStore()
+    fresh.extend([{'key': key, 'size': 1, 'modified': None, 'etag': key} for key in ('a', 'b', 'c')])
+    
+    diff, base = tab.diff_refresh(fresh)
+    assert tab.is_current(base) and diff.inserted == [2]
+    tab.remove_files(['a'])
+    assert not tab.is_current(base)
+    
+    diff, base = tab.diff_refresh(fresh)
+    assert tab.is_current(base)
+    assert tab.refresh_files(fresh, diff) is diff and tab.files_list is fresh
+
+
+def test_client_cache_reuses_clients_per_credentials():
+    cache = ClientCache()
+    first = cache.get('AKIA1', 'secret', 'us-east-1')
+    assert cache.get('AKIA1', 'secret', 'us-east-1') is first
+    assert cache.get('AKIA2', 'secret', 'us-east-1') is not first
+    assert cache.get('AKIA1', 'secret', 'eu-west-1') is not first
+    cache.discard('AKIA1', 'secret', 'us-east-1')
+    assert cache.get('AKIA1', 'secret', 'us-east-1') is not first
+
+
+def test_client_cache_keys_on_endpoint_options():
+    cache = ClientCache()
+    first = cache.get('AKIA1', 'secret', 'us-east-1')
+    assert cache.get('AKIA1', 'secret', 'us-east-1', addressing_style='auto') is first
+    others = [cache.get('AKIA1', 'secret', 'us-east-1', endpoint_url='http://localhost:9000'),
+              cache.get('AKIA1', 'secret', 'us-east-1', addressing_style='path'),
+              cache.get('AKIA1', 'secret', 'us-east-1', accelerate=True),
+              cache.get('AKIA1', 'secret', 'us-east-1', dualstack=True)]
+    assert len({id(entry) for entry in [first] + others}) == 5
+    assert cache.get('AKIA1', 'secret', 'us-east-1', accelerate=True) is others[2]
+
+
+@pytest.mark.parametrize('options, message', [
+    (dict(addressing_style='dns'), 'Unknown addressing style'),
+    (dict(endpoint_url='localhost:9000'), 'must start with http'),
+    (dict(endpoint_url='http://localhost:9000', accelerate=True), 'acceleration'),
+    (dict(addressing_style='path', accelerate=True), 'virtual-hosted'),
+    (dict(endpoint_url='http://localhost:9000', dualstack=True), 'Dual-stack'),
+])
+def test_client_config_rejects_options_s3_cant_combine(options, message):
+    with pytest.raises(ValueError, match=message):
+        client_config(**options)
+
+
+def _s3_tab(bucket_name, endpoint_url=None, access_key='AKIA1'):
+    # Only the connection details matter for matching, so no request is made
+    backend = S3Client()
+    backend.bucket_name, backend.endpoint_url, backend.access_key = bucket_name, endpoint_url, access_key
+    return WorkspaceTab(backend, None)
+
+
+def test_find_tab_tells_endpoints_and_access_keys_apart():
+    workspace = Workspace()
+    for tab in (_s3_tab('data'), _s3_tab('data', 'http://minio:9000'), _s3_tab('data', access_key='AKIA2')):
+        workspace.add_tab(tab)
+    credentials = {'bucket_name': ' data ', 'access_key': 'AKIA1', 'endpoint_url': '', 'resource_prefix': ''}
+    
+    assert workspace.find_tab(credentials_location(credentials), None) == 0
+    assert workspace.find_tab(credentials_location(dict(credentials, endpoint_url='http://minio:9000')), '') == 1
+    assert workspace.find_tab(credentials_location(dict(credentials, access_key='AKIA2')), None) == 2
+    assert workspace.find_tab(credentials_location(dict(credentials, access_key='AKIA3')), None) is None
+    assert workspace.find_tab(credentials_location(credentials), 'logs/') is None
+    # Local folders and synthetic buckets ignore leftover S3 fields
+    assert credentials_location({'bucket_name': 'memory://10', 'access_key': 'AKIA1'}) == (None, None, 'memory://10')
+
+
+def test_upload_records_are_kept_per_endpoint(tmp_path):
+    local_path = tmp_path / 'big.bin'
+    local_path.write_bytes(b'x')
+    state = UploadState(str(tmp_path / 'uploads.json'))
+    state.start(('http://minio:9000', 'AKIA1', 'data'), 'big.bin', str(local_path), 5, 'minio-upload')
+    
+    assert state.get((None, 'AKIA1', 'data'), 'big.bin', str(local_path), 5) is None
+    assert state.get(('http://minio:9000', 'AKIA2', 'data'), 'big.bin', str(local_path),
+                     5)['upload_id'] == 'minio-upload'